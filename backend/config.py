@@ -33,6 +33,18 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL") or "qwen2.5:7b"
 
+# Shared LLM transport (services/llm_transport.py): pooled keep-alive clients,
+# per-provider concurrency limits and jittered-backoff retries
+LLM_CONCURRENCY_OLLAMA = int(os.getenv("LLM_CONCURRENCY_OLLAMA", "2"))  # Concurrent requests to the Ollama server
+LLM_CONCURRENCY_OPENAI = int(os.getenv("LLM_CONCURRENCY_OPENAI", "8"))  # Concurrent requests to OpenAI
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))  # Retries after the first attempt on transient errors
+LLM_RETRY_BASE_DELAY = float(os.getenv("LLM_RETRY_BASE_DELAY", "1.0"))  # Seconds; backoff is uniform(0, base * 2^attempt)
+
+# LLM response cache (services/llm_response_cache.py): opt-in per call site
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"  # Global kill switch
+LLM_CACHE_MAX_MB = int(os.getenv("LLM_CACHE_MAX_MB", "512"))  # Stored responses beyond this are evicted (LRU)
+LLM_CACHE_DEFAULT_TTL = int(os.getenv("LLM_CACHE_DEFAULT_TTL", str(7 * 24 * 3600)))  # Seconds, when a call site sets none
+
 # LLM Provider Selection (can be overridden by user settings)
 LLM_PROVIDER = os.getenv("LLM_PROVIDER", "openai").lower()  # "openai" or "ollama"
 LLM_MODEL = os.getenv("LLM_MODEL")  # If not set, uses default for provider
@@ -59,8 +71,13 @@ else:
 
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")  # Required if using OpenAI
 
+# Batched embedding generation (generate_embeddings_batch)
+EMBEDDING_CONCURRENCY = int(os.getenv("EMBEDDING_CONCURRENCY", "4"))  # Concurrent Ollama /api/embed requests
+EMBEDDING_MAX_RETRIES = int(os.getenv("EMBEDDING_MAX_RETRIES", "3"))  # Per-item attempts after a batch request fails
+
 # Vector DB Configuration
 CHROMADB_PATH = os.getenv("CHROMADB_PATH", "data/chromadb")  # Relative to project root
+VECTOR_DB_UPSERT_BATCH_SIZE = int(os.getenv("VECTOR_DB_UPSERT_BATCH_SIZE", "512"))  # Vectors per ChromaDB upsert in the bulk APIs (capped at the client's max batch size)
 
 # RAG Configuration
 VECTOR_SEARCH_ENABLED = os.getenv("VECTOR_SEARCH_ENABLED", "true").lower() == "true"
@@ -72,11 +89,21 @@ HYBRID_FILTERING_ENABLED = os.getenv("HYBRID_FILTERING_ENABLED", "true").lower()
 CHUNK_SEARCH_ENABLED = os.getenv("CHUNK_SEARCH_ENABLED", "true").lower() == "true"
 CHUNK_SEARCH_TOP_K = int(os.getenv("CHUNK_SEARCH_TOP_K", "50"))  # Raised from 15→50 for full case analysis. For Ollama <32K context, reduce to 15.
 
+# Lexical (BM25, SQLite FTS5) chunk search fused with vector search by
+# reciprocal rank fusion; catches exact identifiers vector search misses
+LEXICAL_SEARCH_ENABLED = os.getenv("LEXICAL_SEARCH_ENABLED", "true").lower() == "true"
+LEXICAL_SEARCH_TOP_K = int(os.getenv("LEXICAL_SEARCH_TOP_K", "30"))
+RRF_K = int(os.getenv("RRF_K", "60"))  # Reciprocal rank fusion constant: score = sum(1 / (RRF_K + rank))
+
 # Hybrid retrieval configuration
 ENTITY_SEARCH_ENABLED = os.getenv("ENTITY_SEARCH_ENABLED", "true").lower() == "true"
 ENTITY_SEARCH_TOP_K = int(os.getenv("ENTITY_SEARCH_TOP_K", "50"))  # Raised from 10→50 for full case analysis. For Ollama <32K context, reduce to 15.
 GRAPH_TRAVERSAL_DEPTH = int(os.getenv("GRAPH_TRAVERSAL_DEPTH", "1"))
 
+# Answer → graph node extraction (services/entity_mention_matcher.py)
+ENTITY_MATCHER_LLM_FALLBACK = os.getenv("ENTITY_MATCHER_LLM_FALLBACK", "false").lower() == "true"  # Ask the LLM for Cypher when no names match
+ENTITY_MATCHER_MIN_NAME_LENGTH = int(os.getenv("ENTITY_MATCHER_MIN_NAME_LENGTH", "3"))  # Shorter names/aliases are not matched
+
 # Question classification
 QUESTION_CLASSIFICATION_ENABLED = os.getenv("QUESTION_CLASSIFICATION_ENABLED", "true").lower() == "true"
 
@@ -86,6 +113,26 @@ RERANK_METHOD = os.getenv("RERANK_METHOD", "score")  # "score" (fast) or "llm" (
 RERANK_TOP_CHUNKS = int(os.getenv("RERANK_TOP_CHUNKS", "15"))
 RERANK_TOP_ENTITIES = int(os.getenv("RERANK_TOP_ENTITIES", "10"))
 CONTEXT_TOKEN_BUDGET = int(os.getenv("CONTEXT_TOKEN_BUDGET", "80000"))  # Raised from 12K→80K for GPT-4 128K context. For Ollama <32K context, reduce to 15000.
+CONTEXT_WINDOW_FRACTION = float(os.getenv("CONTEXT_WINDOW_FRACTION", "0.7"))  # Share of the model window for retrieved context; the rest is system prompt, question and answer
+TOKEN_COUNT_CACHE_SIZE = int(os.getenv("TOKEN_COUNT_CACHE_SIZE", "50000"))  # Per-item (chunk/entity) token counts kept in memory
+
+# Semantic answer cache (AI assistant): reuse answers to near-identical questions
+# on the same case until its graph or evidence changes
+ANSWER_CACHE_ENABLED = os.getenv("ANSWER_CACHE_ENABLED", "true").lower() == "true"
+ANSWER_CACHE_SIMILARITY = float(os.getenv("ANSWER_CACHE_SIMILARITY", "0.95"))  # Min cosine similarity of question embeddings for a hit
+ANSWER_CACHE_TTL = int(os.getenv("ANSWER_CACHE_TTL", str(7 * 24 * 3600)))  # Max answer age in seconds
+ANSWER_CACHE_MAX_PER_CASE = int(os.getenv("ANSWER_CACHE_MAX_PER_CASE", "200"))  # Least-recently-hit answers beyond this are dropped
+
+# Per-conversation retrieval working set: follow-up chat turns reuse earlier
+# turns' chunks, entities and traversal, and keep a stable context prefix
+CHAT_WORKING_SET_ENABLED = os.getenv("CHAT_WORKING_SET_ENABLED", "true").lower() == "true"
+CHAT_WORKING_SET_TTL = int(os.getenv("CHAT_WORKING_SET_TTL", "3600"))  # Seconds of inactivity before a conversation's set is dropped
+CHAT_WORKING_SET_MAX = int(os.getenv("CHAT_WORKING_SET_MAX", "200"))  # Conversations kept per worker (least recently used dropped)
+
+# Background precompute of per-case suggested questions, entity briefs and
+# insights (runs after evidence processing and when the case graph changes)
+CASE_PRECOMPUTE_ENABLED = os.getenv("CASE_PRECOMPUTE_ENABLED", "true").lower() == "true"
+CASE_PRECOMPUTE_ENTITIES = int(os.getenv("CASE_PRECOMPUTE_ENTITIES", "10"))  # Top entities briefed and given insights
 
 # Ingestion chunking configuration
 # Keep these in sync with ingestion/scripts/config.py so the ingestion
@@ -96,6 +143,15 @@ CHUNK_OVERLAP = int(os.getenv("CHUNK_OVERLAP", "1600"))
 # Parallel Processing Configuration
 MAX_INGESTION_WORKERS = int(os.getenv("MAX_INGESTION_WORKERS", "4"))
 
+# Chunks of one document whose LLM extraction runs concurrently; entity
+# resolution and graph writes stay sequential in chunk order.
+# 0 = the provider's LLM concurrency limit, 1 = fully sequential
+CHUNK_EXTRACTION_WORKERS = int(os.getenv("CHUNK_EXTRACTION_WORKERS", "0"))
+
+# Re-ingesting a document only extracts and embeds chunks whose content hash
+# changed; chunks that disappeared have their vectors and citations retired
+INCREMENTAL_REINGEST = os.getenv("INCREMENTAL_REINGEST", "true").lower() == "true"
+
 # Triage Configuration
 TRIAGE_SCAN_BATCH_SIZE = int(os.getenv("TRIAGE_SCAN_BATCH_SIZE", "500"))
 TRIAGE_SCAN_WORKERS = int(os.getenv("TRIAGE_SCAN_WORKERS", "4"))
@@ -129,3 +185,19 @@ AUTH_TOKEN_EXPIRE_MINUTES = int(os.getenv("AUTH_TOKEN_EXPIRE_MINUTES", "1440"))
 API_HOST = os.getenv("API_HOST", "0.0.0.0")
 API_PORT = int(os.getenv("API_PORT", "8000"))
 CORS_ORIGINS = os.getenv("CORS_ORIGINS", "http://localhost:5173,http://localhost:3000").split(",")
+
+# Background task progress streams (SSE): how often an open stream checks the
+# shared task journal for updates, and the idle keep-alive interval
+TASK_STREAM_POLL_SECS = float(os.getenv("TASK_STREAM_POLL_SECS", "1.0"))
+TASK_STREAM_KEEPALIVE_SECS = float(os.getenv("TASK_STREAM_KEEPALIVE_SECS", "15"))
+
+# Workspace presence: how often each worker writes changed sessions (joins,
+# leaves, activity pings) to the shared presence table
+PRESENCE_FLUSH_SECS = float(os.getenv("PRESENCE_FLUSH_SECS", "5"))
+
+# System logs (data/system_logs.db): entries are queued and written in batches
+# by a background writer; whole days older than the retention window are deleted
+SYSTEM_LOG_RETENTION_DAYS = int(os.getenv("SYSTEM_LOG_RETENTION_DAYS", "90"))
+SYSTEM_LOG_FLUSH_SECS = float(os.getenv("SYSTEM_LOG_FLUSH_SECS", "0.5"))
+SYSTEM_LOG_BATCH_SIZE = int(os.getenv("SYSTEM_LOG_BATCH_SIZE", "500"))
+SYSTEM_LOG_QUEUE_SIZE = int(os.getenv("SYSTEM_LOG_QUEUE_SIZE", "50000"))
@@ -66,9 +66,8 @@ async def lifespan(app: FastAPI):
     # Startup
     print(f"Starting Investigation Console API (revision={GIT_REVISION})")
     try:
-        # Reload snapshots from disk (non-blocking)
-        snapshot_storage.reload()
-        print(f"Loaded {len(snapshot_storage.get_all())} snapshots from storage")
+        # Load the snapshot index (imports the legacy snapshots.json on first run)
+        print(f"Loaded {snapshot_storage.count()} snapshots from storage")
     except Exception as e:
         print(f"Warning: Failed to load snapshots: {e}")
 
@@ -138,7 +137,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-# Per-route traffic/error telemetry. Self-contained: aggregates per
+# Per-route traffic/error/latency telemetry. Self-contained: aggregates per
 # (day, route, method, status) into data/telemetry.db. The standalone Docket
 # instance (:8011) reads this DB read-only to measure how shipped tickets
 # actually perform in the platform. Guarded so the app boots without it.
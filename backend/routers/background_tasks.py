@@ -4,12 +4,19 @@ Background Tasks Router
 API endpoints for managing and monitoring background tasks.
 """
 
+import asyncio
+import json
+import time
 from typing import List, Optional
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, StreamingResponse
 from pydantic import BaseModel
 
+from config import TASK_STREAM_POLL_SECS, TASK_STREAM_KEEPALIVE_SECS
 from services.background_task_storage import background_task_storage, TaskStatus
 from services.evidence_service import EvidenceService
+from services.pipeline_profiler import load_trace, delete_trace
 from routers.auth import get_current_user
 
 
@@ -74,6 +81,137 @@ async def list_tasks(
     )
 
 
+_TERMINAL_STATUSES = {TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value}
+
+
+def _sse(event: str, data: dict, event_id: Optional[int] = None) -> str:
+    prefix = f"id: {event_id}\n" if event_id is not None else ""
+    return f"{prefix}event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+
+async def _task_events(
+    request: Request,
+    *,
+    owner: Optional[str] = None,
+    case_id: Optional[str] = None,
+    task_id: Optional[str] = None,
+):
+    """
+    Generate SSE events for the selected tasks from the shared task journal.
+
+    Every TASK_STREAM_POLL_SECS the stream asks the storage what changed
+    since its cursor, so updates recorded by any worker are pushed to every
+    open stream. A single-task stream ends once the task reaches a terminal
+    status.
+    """
+    cursor: Optional[int] = None
+    known: set = set()
+    last_sent = time.monotonic()
+    while True:
+        if await request.is_disconnected():
+            return
+        first = cursor is None
+        try:
+            messages, cursor = await run_in_threadpool(
+                background_task_storage.changes_since,
+                cursor,
+                known,
+                owner=owner,
+                case_id=case_id,
+                task_id=task_id,
+            )
+        except Exception as e:
+            yield _sse("error", {"message": str(e)})
+            return
+
+        finished = False
+        for message in messages:
+            kind = message["type"]
+            if kind == "snapshot":
+                task = message["task"]
+                known.add(task["id"])
+                yield _sse("snapshot", task, cursor)
+                finished = finished or task.get("status") in _TERMINAL_STATUSES
+            elif kind == "delta":
+                yield _sse("delta", {k: message[k] for k in ("task_id", "seq", "changes")}, message["seq"])
+                finished = finished or message["changes"].get("status") in _TERMINAL_STATUSES
+            elif kind == "deleted":
+                known.discard(message["task_id"])
+                yield _sse("deleted", {"task_id": message["task_id"]}, cursor)
+                finished = True
+        if first:
+            yield _sse("ready", {"tasks": len(known)}, cursor)
+        if messages or first:
+            last_sent = time.monotonic()
+        elif time.monotonic() - last_sent >= TASK_STREAM_KEEPALIVE_SECS:
+            yield ": keep-alive\n\n"
+            last_sent = time.monotonic()
+
+        if task_id and finished:
+            yield _sse("end", {"task_id": task_id})
+            return
+        await asyncio.sleep(TASK_STREAM_POLL_SECS)
+
+
+def _event_stream_response(events) -> StreamingResponse:
+    return StreamingResponse(
+        events,
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "Connection": "keep-alive",
+            "X-Accel-Buffering": "no",  # Disable nginx buffering
+        },
+    )
+
+
+@router.get("/stream")
+async def stream_tasks(
+    request: Request,
+    case_id: Optional[str] = None,
+    user: dict = Depends(get_current_user),
+):
+    """
+    Stream the current user's tasks via Server-Sent Events (SSE).
+
+    Replaces polling GET /api/background-tasks: the current tasks are sent
+    once, then only what changes.
+
+    SSE Events:
+    - snapshot: A full task (TaskResponse shape) — sent for every task on
+      connect, for tasks created later, and whenever the stream fell behind
+    - delta: {task_id, seq, changes} — the fields one update_task call set
+      (status, progress_total/completed/failed, file_status, stages, error,
+      started_at, completed_at, updated_at)
+    - deleted: {task_id}
+    - ready: {tasks} — the initial snapshots have all been sent
+    - error: The stream failed; reconnect
+    """
+    return _event_stream_response(_task_events(request, owner=user["username"], case_id=case_id))
+
+
+@router.get("/{task_id}/stream")
+async def stream_task(
+    task_id: str,
+    request: Request,
+    user: dict = Depends(get_current_user),
+):
+    """
+    Stream one task's progress via Server-Sent Events (SSE).
+
+    Same events as /stream, plus `end` once the task has completed, failed,
+    been cancelled or been deleted.
+    """
+    task = background_task_storage.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if task.get("owner") != user["username"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    return _event_stream_response(_task_events(request, task_id=task_id))
+
+
 @router.get("/{task_id}", response_model=TaskResponse)
 async def get_task(
     task_id: str,
@@ -99,6 +237,37 @@ async def get_task(
     return TaskResponse(**task)
 
 
+@router.get("/{task_id}/trace")
+async def get_task_trace(
+    task_id: str,
+    user: dict = Depends(get_current_user),
+):
+    """
+    Download a finished task's per-stage timing trace.
+
+    Chrome trace event JSON recorded by the pipeline profiler; open it in
+    chrome://tracing or ui.perfetto.dev.
+
+    Args:
+        task_id: Task ID
+    """
+    task = background_task_storage.get_task(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+
+    if task.get("owner") != user["username"]:
+        raise HTTPException(status_code=403, detail="Access denied")
+
+    trace = await run_in_threadpool(load_trace, task_id)
+    if trace is None:
+        raise HTTPException(status_code=404, detail="No trace recorded for this task")
+
+    return JSONResponse(
+        trace,
+        headers={"Content-Disposition": f'attachment; filename="trace-{task_id}.json"'},
+    )
+
+
 @router.delete("/{task_id}")
 async def delete_task(
     task_id: str,
@@ -131,6 +300,7 @@ async def delete_task(
     deleted = background_task_storage.delete_task(task_id)
     if not deleted:
         raise HTTPException(status_code=404, detail="Task not found")
+    delete_trace(task_id)
 
     return {"message": "Task deleted", "task_id": task_id}
 
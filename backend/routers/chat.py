@@ -2,6 +2,7 @@
 Chat Router - endpoints for AI question answering.
 """
 
+from datetime import datetime
 from typing import Any, Dict, List, Optional
 from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
@@ -9,6 +10,7 @@ from pydantic import BaseModel
 from services.rag_service import rag_service
 from services.llm_service import llm_service
 from services.system_log_service import system_log_service, LogType, LogOrigin
+from services.chat_history_storage import chat_history_storage
 from routers.auth import get_current_user
 
 import sys
@@ -49,6 +51,7 @@ class ChatRequest(BaseModel):
     confidence_threshold: Optional[float] = None  # Optional confidence threshold for vector search (0.0-1.0)
     case_id: str  # Required case ID for case isolation and cost tracking
     view_context: Optional[ViewContext] = None  # Phase 6: view-aware context
+    conversation_id: Optional[str] = None  # Chat panel session; lets follow-up turns reuse retrieval
 
 
 class ChatResponse(BaseModel):
@@ -65,6 +68,9 @@ class ChatResponse(BaseModel):
     document_summary: Optional[str] = None  # Document relevance summary (separate from answer)
     view_context_used: Optional[bool] = None  # Phase 6: whether view_context was applied
     view_context_summary: Optional[str] = None  # Phase 6: short description of what was used
+    cache_hit: Optional[bool] = None  # Answer served from the per-case semantic answer cache
+    cache_similarity: Optional[float] = None  # Question similarity to the cached answer's question
+    retrieval_ms: Optional[int] = None  # Time spent on retrieval for this turn
 
 
 class SuggestionsRequest(BaseModel):
@@ -180,7 +186,21 @@ async def chat(request: ChatRequest, user: dict = Depends(get_current_user)):
             confidence_threshold=request.confidence_threshold,
             case_id=request.case_id,
             view_context=request.view_context.dict() if request.view_context else None,
+            conversation_id=request.conversation_id,
         )
+
+        if request.conversation_id:
+            debug = result.get("debug_log") or {}
+            chat_history_storage.record_retrieval_turn(request.conversation_id, {
+                "timestamp": datetime.now().isoformat(),
+                "case_id": request.case_id,
+                "question": question[:200],
+                "retrieval_ms": result.get("retrieval_ms"),
+                "cache_hit": result.get("cache_hit"),
+                "chunks_reused": (debug.get("chunk_search") or {}).get("reused_from_conversation", 0),
+                "entities_reused": (debug.get("entity_search") or {}).get("reused_from_conversation", 0),
+                "traversal_reused": (debug.get("graph_traversal") or {}).get("reused_from_conversation", 0),
+            })
         
         # Clear cost tracking context after use
         try:
@@ -267,8 +287,9 @@ async def extract_nodes_from_answer(request: ExtractNodesRequest):
     """
     Extract node keys mentioned in an AI answer.
     
-    Uses the LLM to identify which nodes from the graph are discussed in the answer.
-    Returns the node keys that can be used to create a subgraph.
+    Matches the case's entity names and aliases against the answer text
+    (optionally falling back to the LLM). Returns the node keys that can be
+    used to create a subgraph.
 
     Args:
         request: Request with answer text
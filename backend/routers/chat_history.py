@@ -22,6 +22,7 @@ class ChatHistoryCreate(BaseModel):
     snapshot_id: Optional[str] = None
     case_id: Optional[str] = None
     case_version: Optional[int] = None
+    conversation_id: Optional[str] = None  # Chat panel session id sent with each /api/chat turn
 
 
 class ChatHistoryResponse(BaseModel):
@@ -36,6 +37,8 @@ class ChatHistoryResponse(BaseModel):
     case_id: Optional[str] = None
     case_version: Optional[int] = None
     message_count: int
+    conversation_id: Optional[str] = None
+    retrieval_turns: Optional[List[dict]] = None  # Per-turn retrieval timings recorded by /api/chat
 
 
 @router.post("", response_model=ChatHistoryResponse)
@@ -58,6 +61,7 @@ async def create_chat_history(chat: ChatHistoryCreate, user: dict = Depends(get_
         "snapshot_id": chat.snapshot_id,
         "case_id": chat.case_id,
         "case_version": chat.case_version,
+        "conversation_id": chat.conversation_id,
     }
     
     # Save to persistent storage
@@ -74,6 +78,7 @@ async def create_chat_history(chat: ChatHistoryCreate, user: dict = Depends(get_
         case_id=chat.case_id,
         case_version=chat.case_version,
         message_count=len(chat.messages),
+        conversation_id=chat.conversation_id,
     )
 
 
@@ -134,6 +139,8 @@ async def get_chat_history(chat_id: str, user: dict = Depends(get_current_user))
         case_id=chat.get("case_id"),
         case_version=chat.get("case_version"),
         message_count=len(chat.get("messages", [])),
+        conversation_id=chat.get("conversation_id"),
+        retrieval_turns=chat.get("retrieval_turns"),
     )
 
 
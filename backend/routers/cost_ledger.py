@@ -296,3 +296,14 @@ async def get_cost_summary(
             status_code=500,
             detail=f"Failed to load cost summary: {error_detail}. Please ensure the cost_records table exists (run database migrations)."
         )
+
+
+@router.get("/cache-savings")
+async def get_cache_savings_summary(
+    user: dict = Depends(get_current_user),
+):
+    """
+    Get LLM response cache hit/miss counts and the estimated cost it saved.
+    """
+    from services.cost_tracking_service import get_cache_savings
+    return get_cache_savings()
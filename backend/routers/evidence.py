@@ -2498,6 +2498,7 @@ def test_folder_profile(
                 sys.path.insert(0, str(INGESTION_SCRIPTS_PATH))
             
             from folder_ingestion import ingest_folder_with_profile
+            from services.pipeline_profiler import task_profiler
             
             def log_callback(message: str):
                 evidence_log_storage.add_log(
@@ -2515,12 +2516,17 @@ def test_folder_profile(
                     started_at=datetime.now().isoformat(),
                 )
                 
-                result = ingest_folder_with_profile(
-                    folder_path=full_folder_path,
-                    profile_name=request.profile_name,
-                    case_id=request.case_id,
-                    log_callback=log_callback
-                )
+                profiler = task_profiler(task_id, f"folder-profile-test {task_id}")
+                try:
+                    with profiler.activate():
+                        result = ingest_folder_with_profile(
+                            folder_path=full_folder_path,
+                            profile_name=request.profile_name,
+                            case_id=request.case_id,
+                            log_callback=log_callback
+                        )
+                finally:
+                    profiler.finish()
                 
                 background_task_storage.update_task(
                     task_id,
@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from services.neo4j_service import neo4j_service
 from services.last_graph_storage import last_graph_storage
 from services.insights_service import generate_entity_insights
+from services.case_precompute_service import case_precompute_service
 from services.llm_service import LLMService
 from services.geo_rescan_service import rescan_case_locations
 from services.system_log_service import system_log_service, LogType, LogOrigin
@@ -691,6 +692,10 @@ def load_case(request: CaseLoadRequest, user: dict = Depends(get_current_user)):
             query_preview = q[:100] + "..." if len(q) > 100 else q
             errors.append(f"Relationship query {idx + 1} failed: {error_msg}\nQuery: {query_preview}")
 
+    if executed:
+        # The statements name their case(s) only inside the Cypher text
+        neo4j_service.bump_case_graph_version(names=True)
+
     success = len(errors) == 0
     
     # Log the operation
@@ -734,6 +739,7 @@ def execute_single_query(request: SingleQueryRequest):
     
     try:
         neo4j_service.run_cypher(query, {})
+        neo4j_service.bump_case_graph_version(names=True)
         return {
             "success": True,
             "error": None,
@@ -829,7 +835,10 @@ def execute_batch_queries(request: BatchQueryRequest):
                 except Exception as e2:
                     query_preview = q[:100] + "..." if len(q) > 100 else q
                     errors.append(f"Relationship query {batch_start + idx + 1} failed: {str(e2)}\nQuery: {query_preview}")
-    
+
+    if executed:
+        neo4j_service.bump_case_graph_version(names=True)
+
     return {
         "success": len(errors) == 0,
         "executed": executed,
@@ -952,6 +961,7 @@ def create_node(request: CreateNodeRequest, user: dict = Depends(get_current_use
         
         # Execute the Cypher query to create the node
         neo4j_service.run_cypher(node_cypher, {})
+        neo4j_service.bump_case_graph_version(request.case_id, names=True)
         
         # Log the operation
         system_log_service.log(
@@ -1049,6 +1059,7 @@ def create_relationships(request: CreateRelationshipsRequest, user: dict = Depen
             if query:
                 # Execute each query separately in its own transaction
                 neo4j_service.run_cypher(query, {})
+        neo4j_service.bump_case_graph_version(request.case_id)
         
         # Log the operation
         system_log_service.log(
@@ -1246,6 +1257,7 @@ def update_node(node_key: str, request: UpdateNodeRequest, user: dict = Depends(
         
         # Execute the update
         neo4j_service.run_cypher(cypher, {})
+        neo4j_service.bump_case_graph_version(node_details.get("case_id"), names=True)
         
         # Log the operation
         system_log_service.log(
@@ -2020,8 +2032,17 @@ def generate_insights(
     max_entities: int = Query(10, description="Maximum entities to process"),
     user: dict = Depends(get_current_user),
 ):
-    """Generate AI insights for top entities in a case."""
+    """
+    Generate AI insights for top entities in a case.
+
+    Insights precomputed by the background job for the current graph version
+    are applied without any LLM calls; otherwise they are generated here.
+    """
     try:
+        applied = case_precompute_service.apply_insights(case_id, limit=max_entities)
+        if applied is not None:
+            return {**applied, "precomputed": True}
+
         llm = LLMService()
         entities = neo4j_service.get_entities_for_insights(case_id, max_entities)
 
@@ -2033,11 +2054,12 @@ def generate_insights(
                 entity_data={"name": entity["name"], "type": entity["type"], "summary": entity.get("summary")},
                 verified_facts=entity.get("verified_facts", []),
                 related_entities=entity.get("related_entities", []),
+                # Not cached: a replayed answer would append the same insights again
                 llm_call_fn=llm.call,
             )
             if new_insights:
-                neo4j_service.save_entity_insights(entity["key"], case_id, new_insights)
-                total_insights += len(new_insights)
+                saved = neo4j_service.save_entity_insights(entity["key"], case_id, new_insights)
+                total_insights += saved["added"]
             entities_processed += 1
 
         return {"entities_processed": entities_processed, "insights_generated": total_insights}
@@ -2045,6 +2067,35 @@ def generate_insights(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/cases/{case_id}/precomputed")
+def get_precomputed(case_id: str, user: dict = Depends(get_current_user)):
+    """
+    Precomputed suggested questions, top-entity briefs and insights for a case.
+
+    Schedules a refresh when results are missing or stale; ``stale`` tells the
+    UI the graph has changed since they were computed.
+    """
+    try:
+        result = case_precompute_service.get(case_id)
+        if result is None:
+            return {"case_id": case_id, "available": False}
+        return {"available": True, **result}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/cases/{case_id}/precompute")
+def run_precompute(case_id: str, user: dict = Depends(get_current_user)):
+    """Start (or re-run) the background precompute job for a case."""
+    try:
+        task_id = case_precompute_service.schedule(
+            case_id, owner=user.get("username"), reason="manual", force=True,
+        )
+        return {"task_id": task_id, "started": task_id is not None}
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.delete("/node/{node_key}/insights/{insight_index}")
 def reject_insight(
     node_key: str,
@@ -2216,6 +2267,7 @@ def geocode_node(node_key: str, body: GeocodeNodeRequest):
                 formatted_address=result["formatted_address"],
                 confidence=result["confidence"],
             )
+        neo4j_service.bump_case_graph_version(body.case_id)
 
         return {
             "success": True,
@@ -10,6 +10,7 @@ from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from services.maintenance_service import maintenance_service
+from services.evidence_storage import evidence_storage
 from services.system_log_service import system_log_service, LogType, LogOrigin
 from routers.auth import get_current_user
 
@@ -161,3 +162,33 @@ async def purge_orphans(request: PurgeRequest, user: dict = Depends(get_current_
     )
 
     return result
+
+
+@router.get("/evidence-indexes")
+async def evidence_index_stats(user: dict = Depends(get_current_user)):
+    """
+    Evidence storage secondary indexes: keys, on-disk size and last rebuild.
+
+    Read-only.
+    """
+    return evidence_storage.index_stats()
+
+
+@router.post("/evidence-indexes/rebuild")
+async def rebuild_evidence_indexes(user: dict = Depends(get_current_user)):
+    """
+    Rebuild the evidence entity-link index and refresh query planner statistics.
+
+    Returns the build time and number of entity links indexed.
+    """
+    username = user.get("username", "unknown")
+    result = evidence_storage.rebuild_indexes()
+    system_log_service.log(
+        log_type=LogType.GRAPH_OPERATION,
+        origin=LogOrigin.BACKEND,
+        action=f"Evidence Indexes Rebuilt in {result['seconds']}s",
+        details=result,
+        user=username,
+        success=True,
+    )
+    return result
@@ -12,7 +12,6 @@ from fastapi import APIRouter, HTTPException, Depends
 from pydantic import BaseModel
 
 from services.snapshot_storage import snapshot_storage
-from services.snapshot_chunk_storage import save_chunk, reassemble_chunks
 from .auth import get_current_user
 
 router = APIRouter(prefix="/api/snapshots", tags=["snapshots"])
@@ -77,9 +76,9 @@ class SnapshotResponse(BaseModel):
 async def create_snapshot(snapshot: SnapshotCreate, user: dict = Depends(get_current_user)):
     """
     Create a new snapshot.
-    
-    Automatically handles chunking for large snapshots that exceed JavaScript's
-    string length limits. The storage service will chunk the data if needed.
+
+    Large snapshots the frontend can't stringify in one request go through
+    /upload-chunk instead and are reassembled before saving.
     """
     snapshot_id = f"snapshot_{datetime.now().isoformat().replace(':', '-').replace('.', '-')}"
     timestamp = datetime.now().isoformat()
@@ -104,69 +103,45 @@ async def create_snapshot(snapshot: SnapshotCreate, user: dict = Depends(get_cur
         "case_name": getattr(snapshot, "case_name", None),
     }
     
-    # Save to persistent storage (will automatically chunk if too large)
+    # Save to persistent storage
     try:
         snapshot_storage.save(snapshot_id, snapshot_data)
     except Exception as e:
-        # If save fails, it might be due to size - the storage service should handle chunking
-        # But if it still fails, raise the error
         raise HTTPException(status_code=500, detail=f"Failed to save snapshot: {str(e)}")
-    
-    # Get the saved snapshot to check if it was chunked
-    saved_snapshot = snapshot_storage.get(snapshot_id)
+
+    saved_snapshot = snapshot_storage.get_summary(snapshot_id)
     if saved_snapshot is None:
         raise HTTPException(status_code=500, detail="Failed to retrieve saved snapshot")
-    
-    node_count = len(saved_snapshot.get("subgraph", {}).get("nodes", []))
-    link_count = len(saved_snapshot.get("subgraph", {}).get("links", []))
-    timeline_count = len(saved_snapshot.get("timeline", []))
-    
+
+    return _snapshot_response(saved_snapshot)
+
+
+def _snapshot_response(summary: dict) -> SnapshotResponse:
+    """Build a SnapshotResponse from a snapshot_storage summary."""
     return SnapshotResponse(
-        id=snapshot_id,
-        name=saved_snapshot["name"],
-        notes=saved_snapshot["notes"],
-        timestamp=saved_snapshot["timestamp"],
-        node_count=node_count,
-        link_count=link_count,
-        timeline_count=timeline_count,
-        created_at=saved_snapshot["created_at"],
-        ai_overview=saved_snapshot.get("ai_overview"),  # Include AI overview
-        case_id=saved_snapshot.get("case_id"),
-        case_version=saved_snapshot.get("case_version"),
-        case_name=saved_snapshot.get("case_name"),
+        id=summary["id"],
+        name=summary.get("name") or "",
+        notes=summary.get("notes") or "",
+        timestamp=summary.get("timestamp") or "",
+        node_count=summary.get("node_count", 0),
+        link_count=summary.get("link_count", 0),
+        timeline_count=summary.get("timeline_count", 0),
+        created_at=summary.get("created_at") or summary.get("timestamp") or "",
+        ai_overview=summary.get("ai_overview"),
+        case_id=summary.get("case_id"),
+        case_version=summary.get("case_version"),
+        case_name=summary.get("case_name"),
     )
 
 
 @router.get("", response_model=List[SnapshotResponse])
 async def list_snapshots(user: dict = Depends(get_current_user)):
     """List all snapshots for the current user."""
-    snapshots = []
-    all_snapshots = snapshot_storage.get_all()
-    
-    for snapshot_id, snapshot_data in all_snapshots.items():
-        # Enforce ownership
-        if snapshot_data.get("owner") != user["username"]:
-            continue
-
-        node_count = len(snapshot_data.get("subgraph", {}).get("nodes", []))
-        link_count = len(snapshot_data.get("subgraph", {}).get("links", []))
-        timeline_count = len(snapshot_data.get("timeline", []))
-        
-        snapshots.append(SnapshotResponse(
-            id=snapshot_data["id"],
-            name=snapshot_data["name"],
-            notes=snapshot_data["notes"],
-            timestamp=snapshot_data["timestamp"],
-            node_count=node_count,
-            link_count=link_count,
-            timeline_count=timeline_count,
-            created_at=snapshot_data["created_at"],
-            ai_overview=snapshot_data.get("ai_overview"),
-            case_id=snapshot_data.get("case_id"),
-            case_version=snapshot_data.get("case_version"),
-            case_name=snapshot_data.get("case_name"),
-        ))
-    
+    snapshots = [
+        _snapshot_response(summary)
+        for summary in snapshot_storage.list_summaries(owner=user["username"])
+    ]
+
     # Sort by created_at descending (newest first)
     snapshots.sort(key=lambda x: x.created_at, reverse=True)
     return snapshots
@@ -214,26 +189,12 @@ async def delete_snapshot(snapshot_id: str, user: dict = Depends(get_current_use
     """Delete a snapshot and remove it from all case versions."""
     from services.case_storage import case_storage
     
-    # Reload storage to ensure we have latest data before checking
-    snapshot_storage.reload()
-    
-    # Check if snapshot exists in storage (by checking the in-memory dict after reload)
-    # This is more efficient than calling get() which would reload again
-    all_snapshots = snapshot_storage.get_all()
-    snapshot_data = None
-    for sid, data in all_snapshots.items():
-        if sid == snapshot_id:
-            snapshot_data = data
-            break
-    
-    # If not found by key, try to find by id field (for backwards compatibility)
-    if snapshot_data is None:
-        for sid, data in all_snapshots.items():
-            if data.get("id") == snapshot_id:
-                snapshot_data = data
-                snapshot_id = sid  # Use the storage key
-                break
-    
+    # Accept either the storage key or the snapshot's id field (for backwards compatibility)
+    storage_key = snapshot_storage.resolve_key(snapshot_id)
+    snapshot_data = snapshot_storage.get_summary(storage_key) if storage_key else None
+    if storage_key:
+        snapshot_id = storage_key
+
     if snapshot_data is None or snapshot_data.get("owner") != user["username"]:
         raise HTTPException(status_code=404, detail="Snapshot not found")
     
@@ -281,20 +242,14 @@ async def delete_all_snapshots(user: dict = Depends(get_current_user)):
     """Delete all snapshots for the current user and remove them from all case versions."""
     from services.case_storage import case_storage
     
-    # Reload storage to ensure we have latest data
-    snapshot_storage.reload()
-    
     # Get all snapshots owned by the user
-    all_snapshots = snapshot_storage.get_all()
     user_snapshot_ids = []
-    
-    for snapshot_id, snapshot_data in all_snapshots.items():
-        if snapshot_data.get("owner") == user["username"]:
-            user_snapshot_ids.append(snapshot_id)
-            # Also get the id field if different
-            snapshot_id_field = snapshot_data.get("id")
-            if snapshot_id_field and snapshot_id_field != snapshot_id:
-                user_snapshot_ids.append(snapshot_id_field)
+    for summary in snapshot_storage.list_summaries(owner=user["username"]):
+        storage_key = snapshot_storage.resolve_key(summary["id"]) or summary["id"]
+        user_snapshot_ids.append(storage_key)
+        # Also get the id field if different
+        if summary["id"] != storage_key:
+            user_snapshot_ids.append(summary["id"])
     
     # Delete all user snapshots
     deleted_count = 0
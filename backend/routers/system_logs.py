@@ -5,6 +5,7 @@ System Logs Router - endpoints for viewing system logs.
 from typing import List, Optional
 from datetime import datetime
 from fastapi import APIRouter, HTTPException, Query, Depends
+from fastapi.concurrency import run_in_threadpool
 from pydantic import BaseModel
 
 from services.system_log_service import system_log_service, LogType, LogOrigin
@@ -43,6 +44,64 @@ class LogStatisticsResponse(BaseModel):
     failed: int
 
 
+def _parse_filters(
+    log_type: Optional[str],
+    origin: Optional[str],
+    start_time: Optional[str],
+    end_time: Optional[str],
+    user: Optional[str],
+    success_only: Optional[bool],
+    case_id: Optional[str],
+    search: Optional[str],
+) -> dict:
+    """Turn the query parameters shared by the list and statistics endpoints into service filters."""
+    # Parse log types (support comma-separated list)
+    parsed_log_types = None
+    if log_type:
+        log_type_list = [t.strip() for t in log_type.split(',') if t.strip()]
+        if log_type_list:
+            try:
+                parsed_log_types = [LogType(t) for t in log_type_list]
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid log type: {str(e)}")
+
+    # Parse origins (support comma-separated list)
+    parsed_origins = None
+    if origin:
+        origin_list = [o.strip() for o in origin.split(',') if o.strip()]
+        if origin_list:
+            try:
+                parsed_origins = [LogOrigin(o) for o in origin_list]
+            except ValueError as e:
+                raise HTTPException(status_code=400, detail=f"Invalid origin: {str(e)}")
+
+    # Parse times
+    parsed_start_time = None
+    if start_time:
+        try:
+            parsed_start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid start_time format: {start_time}")
+
+    parsed_end_time = None
+    if end_time:
+        try:
+            parsed_end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
+        except ValueError:
+            raise HTTPException(status_code=400, detail=f"Invalid end_time format: {end_time}")
+
+    return {
+        "log_types": parsed_log_types,
+        "origins": parsed_origins,
+        "start_time": parsed_start_time,
+        "end_time": parsed_end_time,
+        "user": user or None,
+        "success_only": success_only,
+        "case_id": case_id or None,
+        "search": search.strip() if search and search.strip() else None,
+    }
+
+
 @router.get("", response_model=LogsResponse)
 async def get_logs(
     log_type: Optional[str] = Query(None, description="Filter by log type (comma-separated for multiple)"),
@@ -54,6 +113,7 @@ async def get_logs(
     user: Optional[str] = Query(None, description="Filter by user"),
     success_only: Optional[bool] = Query(None, description="Filter by success status"),
     case_id: Optional[str] = Query(None, description="Filter by case ID"),
+    search: Optional[str] = Query(None, description="Text search over action, user, error and details"),
     current_user: dict = Depends(get_current_user),
 ):
     """
@@ -68,73 +128,41 @@ async def get_logs(
         offset: Offset for pagination
         user: Filter by username
         success_only: Filter by success status
+        case_id: Filter by case ID
+        search: Text search over action, user, error and details
         current_user: Current authenticated user
     """
+    filters = _parse_filters(log_type, origin, start_time, end_time, user, success_only, case_id, search)
     try:
-        # Parse log types (support comma-separated list)
-        parsed_log_types = None
-        if log_type:
-            log_type_list = [t.strip() for t in log_type.split(',') if t.strip()]
-            if log_type_list:
-                try:
-                    parsed_log_types = [LogType(t) for t in log_type_list]
-                except ValueError as e:
-                    raise HTTPException(status_code=400, detail=f"Invalid log type: {str(e)}")
-        
-        # Parse origins (support comma-separated list)
-        parsed_origins = None
-        if origin:
-            origin_list = [o.strip() for o in origin.split(',') if o.strip()]
-            if origin_list:
-                try:
-                    parsed_origins = [LogOrigin(o) for o in origin_list]
-                except ValueError as e:
-                    raise HTTPException(status_code=400, detail=f"Invalid origin: {str(e)}")
-        
-        # Parse times
-        parsed_start_time = None
-        if start_time:
-            try:
-                parsed_start_time = datetime.fromisoformat(start_time.replace('Z', '+00:00'))
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid start_time format: {start_time}")
-        
-        parsed_end_time = None
-        if end_time:
-            try:
-                parsed_end_time = datetime.fromisoformat(end_time.replace('Z', '+00:00'))
-            except ValueError:
-                raise HTTPException(status_code=400, detail=f"Invalid end_time format: {end_time}")
-        
-        result = system_log_service.get_logs(
-            log_type=parsed_log_types[0] if parsed_log_types and len(parsed_log_types) == 1 else None,
-            log_types=parsed_log_types if parsed_log_types and len(parsed_log_types) > 1 else None,
-            origin=parsed_origins[0] if parsed_origins and len(parsed_origins) == 1 else None,
-            origins=parsed_origins if parsed_origins and len(parsed_origins) > 1 else None,
-            start_time=parsed_start_time,
-            end_time=parsed_end_time,
-            limit=limit,
-            offset=offset,
-            user=user,
-            success_only=success_only,
-            case_id=case_id,
+        result = await run_in_threadpool(
+            system_log_service.get_logs, limit=limit, offset=offset, **filters
         )
-        
         return LogsResponse(**result)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/statistics", response_model=LogStatisticsResponse)
-async def get_log_statistics(current_user: dict = Depends(get_current_user)):
+async def get_log_statistics(
+    log_type: Optional[str] = Query(None, description="Filter by log type (comma-separated for multiple)"),
+    origin: Optional[str] = Query(None, description="Filter by origin (comma-separated for multiple)"),
+    start_time: Optional[str] = Query(None, description="Start time (ISO format)"),
+    end_time: Optional[str] = Query(None, description="End time (ISO format)"),
+    user: Optional[str] = Query(None, description="Filter by user"),
+    success_only: Optional[bool] = Query(None, description="Filter by success status"),
+    case_id: Optional[str] = Query(None, description="Filter by case ID"),
+    search: Optional[str] = Query(None, description="Text search over action, user, error and details"),
+    current_user: dict = Depends(get_current_user),
+):
     """
-    Get log statistics.
+    Get log statistics, optionally for the same filters as the log list.
     
     Args:
         current_user: Current authenticated user
     """
+    filters = _parse_filters(log_type, origin, start_time, end_time, user, success_only, case_id, search)
     try:
-        stats = system_log_service.get_log_statistics()
+        stats = await run_in_threadpool(system_log_service.get_log_statistics, **filters)
         return LogStatisticsResponse(**stats)
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -149,7 +177,7 @@ async def clear_logs(current_user: dict = Depends(get_current_user)):
         current_user: Current authenticated user
     """
     try:
-        system_log_service.clear_logs()
+        await run_in_threadpool(system_log_service.clear_logs)
         return {"message": "Logs cleared successfully"}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -126,6 +126,8 @@ def backfill_chunk_embeddings(
         "extraction_failed": 0,
         "embedding_failed": 0,
         "total_chunks_created": 0,
+        "vectors_upserted": 0,
+        "upsert_seconds": 0.0,
         "file_not_found_names": [],
     }
 
@@ -204,51 +206,66 @@ def backfill_chunk_embeddings(
             stats["total_chunks_created"] += len(chunks)
             continue
 
-        # Embed and store each chunk
-        chunks_stored = 0
+        # Embed each chunk, then store the whole document in one bulk upsert
+        chunk_ids = []
+        chunk_texts = []
+        chunk_vectors = []
+        chunk_metadatas = []
         for chunk_idx, chunk_data in enumerate(chunks):
             chunk_text = chunk_data.get("text", "")
             if not chunk_text.strip():
                 continue
 
-            chunk_id = f"{doc_id}_chunk_{chunk_idx}"
-
             try:
                 # Generate embedding
                 embedding = embedding_service.generate_embedding(chunk_text)
                 if not embedding:
                     log("warning", f"  Chunk {chunk_idx}: empty embedding")
                     continue
+            except Exception as e:
+                log("error", f"  Chunk {chunk_idx}: failed to embed: {e}")
+                stats["embedding_failed"] += 1
+                continue
 
-                # Build metadata
-                page_start = chunk_data.get("page_start")
-                page_end = chunk_data.get("page_end")
+            # Build metadata
+            page_start = chunk_data.get("page_start")
+            page_end = chunk_data.get("page_end")
 
-                metadata = {
-                    "doc_id": doc_id,
-                    "doc_name": doc_name,
-                    "doc_key": doc_key or "",
-                    "chunk_index": chunk_idx,
-                    "total_chunks": len(chunks),
-                    "page_start": page_start if page_start is not None else -1,
-                    "page_end": page_end if page_end is not None else -1,
-                }
+            metadata = {
+                "doc_id": doc_id,
+                "doc_name": doc_name,
+                "doc_key": doc_key or "",
+                "chunk_index": chunk_idx,
+                "total_chunks": len(chunks),
+                "page_start": page_start if page_start is not None else -1,
+                "page_end": page_end if page_end is not None else -1,
+            }
 
-                if doc_case_id:
-                    metadata["case_id"] = doc_case_id
+            if doc_case_id:
+                metadata["case_id"] = doc_case_id
 
+            chunk_ids.append(f"{doc_id}_chunk_{chunk_idx}")
+            chunk_texts.append(chunk_text)
+            chunk_vectors.append(embedding)
+            chunk_metadatas.append(metadata)
+
+        chunks_stored = 0
+        if chunk_ids:
+            try:
                 # Store in ChromaDB
-                vector_db_service.add_chunk(
-                    chunk_id=chunk_id,
-                    text=chunk_text,
-                    embedding=embedding,
-                    metadata=metadata,
+                upsert = vector_db_service.add_chunks_bulk(
+                    chunk_ids=chunk_ids,
+                    embeddings=chunk_vectors,
+                    texts=chunk_texts,
+                    metadatas=chunk_metadatas,
                 )
-                chunks_stored += 1
-
+                chunks_stored = upsert["written"]
+                stats["vectors_upserted"] += upsert["written"]
+                stats["upsert_seconds"] += upsert["elapsed_ms"] / 1000
+                log("info", f"  Upserted {chunks_stored} vectors ({upsert['vectors_per_sec']:.0f} vectors/sec)")
             except Exception as e:
-                log("error", f"  Chunk {chunk_idx}: failed to embed/store: {e}")
-                stats["embedding_failed"] += 1
+                log("error", f"  Failed to store chunk embeddings: {e}")
+                stats["embedding_failed"] += len(chunk_ids)
 
         if chunks_stored > 0:
             log("info", f"  Stored {chunks_stored}/{len(chunks)} chunk embeddings")
@@ -284,6 +301,8 @@ def backfill_chunk_embeddings(
     log("info", f"\nTime elapsed: {elapsed:.1f} seconds")
     if stats['processed'] > 0:
         log("info", f"Average time per document: {elapsed/stats['processed']:.2f} seconds")
+    if stats["upsert_seconds"] > 0:
+        log("info", f"Upsert throughput: {stats['vectors_upserted']/stats['upsert_seconds']:.0f} vectors/sec")
 
     if stats["file_not_found_names"]:
         log("info", f"\nFiles not found ({len(stats['file_not_found_names'])}):")
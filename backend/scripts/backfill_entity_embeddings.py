@@ -24,6 +24,9 @@ from services.neo4j_service import neo4j_service
 from services.vector_db_service import vector_db_service
 from services.embedding_service import embedding_service
 
+# Number of entity embeddings buffered per vector DB bulk upsert
+UPSERT_FLUSH_SIZE = 256
+
 
 def build_entity_embedding_text(
     name: str,
@@ -159,6 +162,32 @@ def backfill_entity_embeddings(
     print("-" * 60)
     
     start_time = time.time()
+
+    # Embeddings are stored in bulk upserts of UPSERT_FLUSH_SIZE entities
+    pending = {"keys": [], "texts": [], "vectors": [], "metadatas": []}
+    upsert_seconds = 0.0
+
+    def flush_pending():
+        nonlocal upsert_seconds
+        if not pending["keys"]:
+            return
+        count = len(pending["keys"])
+        try:
+            print(f"  Storing {count} embeddings in vector DB...")
+            result = vector_db_service.add_entities_bulk(
+                entity_keys=pending["keys"],
+                embeddings=pending["vectors"],
+                texts=pending["texts"],
+                metadatas=pending["metadatas"],
+            )
+            upsert_seconds += result["elapsed_ms"] / 1000
+            stats["processed"] += result["written"]
+            print(f"  ✓ Stored {result['written']} in vector DB ({result['vectors_per_sec']:.0f} vectors/sec)")
+        except Exception as e:
+            print(f"  ✗ Failed to store {count} embeddings in vector DB: {e}")
+            stats["failed"] += count
+        for values in pending.values():
+            values.clear()
     
     for i, ent in enumerate(entities, 1):
         entity_key = ent.get("key")
@@ -219,26 +248,17 @@ def backfill_entity_embeddings(
             stats["failed"] += 1
             continue
         
-        # Store in vector DB
-        try:
-            print("  Storing in vector DB...")
-            vector_db_service.add_entity(
-                entity_key=entity_key,
-                text=embedding_text,
-                embedding=embedding,
-                metadata={
-                    "name": name,
-                    "entity_type": entity_type,
-                }
-            )
-            print("  ✓ Stored in vector DB")
-        except Exception as e:
-            print(f"  ✗ Failed to store in vector DB: {e}")
-            stats["failed"] += 1
-            continue
-        
-        stats["processed"] += 1
-        
+        # Queue for the next bulk upsert
+        pending["keys"].append(entity_key)
+        pending["texts"].append(embedding_text)
+        pending["vectors"].append(embedding)
+        pending["metadatas"].append({
+            "name": name,
+            "entity_type": entity_type,
+        })
+        if len(pending["keys"]) >= UPSERT_FLUSH_SIZE:
+            flush_pending()
+
         # Progress update every batch_size entities
         if i % batch_size == 0:
             elapsed = time.time() - start_time
@@ -248,6 +268,8 @@ def backfill_entity_embeddings(
             print(f"\n  Progress: {i}/{stats['total']} ({i/stats['total']*100:.1f}%)")
             print(f"  Rate: {rate:.1f} entities/sec, ETA: {eta:.0f} seconds")
     
+    flush_pending()
+
     # Final summary
     elapsed = time.time() - start_time
     print("\n" + "=" * 60)
@@ -263,6 +285,8 @@ def backfill_entity_embeddings(
     print(f"\nTime elapsed: {elapsed:.1f} seconds")
     if stats['processed'] > 0:
         print(f"Average time per entity: {elapsed/stats['processed']:.2f} seconds")
+    if upsert_seconds > 0 and not dry_run:
+        print(f"Upsert throughput: {stats['processed']/upsert_seconds:.0f} vectors/sec")
     
     return {
         "status": "complete",
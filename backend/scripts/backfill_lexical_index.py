@@ -0,0 +1,102 @@
+"""
+Backfill the per-case BM25 lexical index from existing chunk embeddings.
+
+New ingestion keeps data/lexical_index/ in step with the ChromaDB chunks
+collection automatically. This script builds the index for chunks that
+were stored before hybrid retrieval existed. It reads chunk text and
+metadata straight from ChromaDB — no re-chunking, embedding or LLM calls.
+
+Usage:
+    python backend/scripts/backfill_lexical_index.py
+    python backend/scripts/backfill_lexical_index.py --case-id <case_id>
+    python backend/scripts/backfill_lexical_index.py --rebuild
+"""
+
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+# Add backend directory so config imports resolve correctly
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from services.vector_db_service import vector_db_service
+from services.chunk_lexical_index import chunk_lexical_index
+
+PAGE_SIZE = 1000
+
+
+def backfill_lexical_index(case_id: Optional[str] = None, rebuild: bool = False) -> Dict:
+    """
+    Index every chunk in ChromaDB (optionally one case) into the lexical index.
+
+    Args:
+        case_id: Only backfill this case
+        rebuild: Drop the existing case index(es) first
+
+    Returns:
+        Dict with chunks_indexed, cases, elapsed_seconds
+    """
+    if vector_db_service is None:
+        raise RuntimeError("Vector DB service is not available")
+
+    collection = vector_db_service.chunk_collection
+    where = {"case_id": case_id} if case_id else None
+    stats = {"chunks_indexed": 0, "cases": set(), "elapsed_seconds": 0.0}
+    rebuilt = set()
+    start = time.time()
+
+    offset = 0
+    while True:
+        page = collection.get(
+            where=where,
+            include=["documents", "metadatas"],
+            limit=PAGE_SIZE,
+            offset=offset,
+        )
+        ids = page.get("ids") or []
+        if not ids:
+            break
+        metadatas = page.get("metadatas") or [{}] * len(ids)
+
+        if rebuild:
+            for metadata in metadatas:
+                cid = (metadata or {}).get("case_id")
+                if cid and cid not in rebuilt:
+                    chunk_lexical_index.delete_case(cid)
+                    rebuilt.add(cid)
+
+        stats["chunks_indexed"] += chunk_lexical_index.add_chunks(
+            ids, page.get("documents") or [""] * len(ids), metadatas
+        )
+        stats["cases"].update((m or {}).get("case_id") for m in metadatas if (m or {}).get("case_id"))
+        offset += len(ids)
+        print(f"  Indexed {stats['chunks_indexed']} chunks ({offset} read)")
+
+    stats["elapsed_seconds"] = round(time.time() - start, 2)
+    stats["cases"] = sorted(stats["cases"])
+    return stats
+
+
+def main():
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Build the per-case BM25 lexical index from existing ChromaDB chunks"
+    )
+    parser.add_argument("--case-id", type=str, default=None, help="Only backfill this case")
+    parser.add_argument("--rebuild", action="store_true", help="Drop existing index(es) before indexing")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("Lexical index backfill")
+    print("=" * 60)
+    stats = backfill_lexical_index(case_id=args.case_id, rebuild=args.rebuild)
+    print(f"\nIndexed {stats['chunks_indexed']} chunks across {len(stats['cases'])} case(s) "
+          f"in {stats['elapsed_seconds']}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""
+Benchmark Ollama embedding throughput against a local stub server.
+
+Starts an in-process HTTP server that mimics Ollama's /api/embeddings
+(single prompt) and /api/embed (batch input) endpoints with a fixed
+per-request and per-item latency, then compares:
+
+  before: EmbeddingService.generate_embedding() called once per text
+  after:  EmbeddingService.generate_embeddings_batch() (batched, concurrent)
+
+No real Ollama server or model is needed.
+
+Usage:
+    python backend/scripts/benchmark_embeddings.py
+    python backend/scripts/benchmark_embeddings.py --texts 1000 --request-ms 20 --item-ms 2
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+STUB_DIM = 768
+
+
+def _stub_vector(text: str) -> list:
+    """Deterministic pseudo-embedding so results can be checked for alignment."""
+    seed = hashlib.sha256(text.encode("utf-8")).digest()
+    return [seed[i % len(seed)] / 255.0 for i in range(STUB_DIM)]
+
+
+def make_handler(request_ms: float, item_ms: float):
+    class StubOllamaHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send_json(self, payload: dict, status: int = 200):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/api/tags":
+                self._send_json({"models": [{"name": "stub-embed", "model": "stub-embed"}]})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            if self.path == "/api/embeddings":
+                time.sleep((request_ms + item_ms) / 1000)
+                self._send_json({"embedding": _stub_vector(request.get("prompt", ""))})
+            elif self.path == "/api/embed":
+                inputs = request.get("input", [])
+                if isinstance(inputs, str):
+                    inputs = [inputs]
+                time.sleep((request_ms + item_ms * len(inputs)) / 1000)
+                self._send_json({"embeddings": [_stub_vector(t) for t in inputs]})
+            else:
+                self._send_json({"error": "not found"}, status=404)
+
+    return StubOllamaHandler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Ollama embedding throughput against a stub server")
+    parser.add_argument("--texts", type=int, default=500, help="Number of texts to embed (default: 500)")
+    parser.add_argument("--batch-size", type=int, default=32, help="Texts per /api/embed request (default: 32)")
+    parser.add_argument("--request-ms", type=float, default=15.0, help="Simulated per-request latency (default: 15)")
+    parser.add_argument("--item-ms", type=float, default=2.0, help="Simulated per-text latency (default: 2)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(args.request_ms, args.item_ms))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}"
+
+    # Point both the ollama client and the batched HTTP path at the stub
+    # before the backend config is imported
+    os.environ["OLLAMA_HOST"] = base_url
+    os.environ["OLLAMA_BASE_URL"] = base_url
+    os.environ["EMBEDDING_PROVIDER"] = "ollama"
+    os.environ["EMBEDDING_MODEL"] = "stub-embed"
+
+    backend_dir = Path(__file__).parent.parent
+    if str(backend_dir) not in sys.path:
+        sys.path.insert(0, str(backend_dir))
+
+    import numpy as np
+    from services.embedding_service import EmbeddingService
+    from config import EMBEDDING_CONCURRENCY
+
+    service = EmbeddingService(provider="ollama", model="stub-embed")
+    texts = [f"Benchmark passage {i}: wire transfer to account {1000 + i}" for i in range(args.texts)]
+
+    print("=" * 60)
+    print(f"Embedding benchmark: {args.texts} texts, stub latency "
+          f"{args.request_ms}ms/request + {args.item_ms}ms/text")
+    print("=" * 60)
+
+    start = time.perf_counter()
+    before = [service.generate_embedding(t) for t in texts]
+    before_elapsed = time.perf_counter() - start
+    print(f"before  generate_embedding loop:     {args.texts / before_elapsed:8.1f} embeddings/sec "
+          f"({before_elapsed:.2f}s)")
+
+    start = time.perf_counter()
+    after = service.generate_embeddings_batch(texts, batch_size=args.batch_size)
+    after_elapsed = time.perf_counter() - start
+    print(f"after   generate_embeddings_batch:   {args.texts / after_elapsed:8.1f} embeddings/sec "
+          f"({after_elapsed:.2f}s, batch_size={args.batch_size}, concurrency={EMBEDDING_CONCURRENCY})")
+
+    aligned = np.allclose(np.asarray(before, dtype=np.float32), after)
+    print(f"\nSpeed-up: {before_elapsed / after_elapsed:.1f}x, results aligned: {aligned}")
+
+    server.shutdown()
+    sys.exit(0 if aligned else 1)
+
+
+if __name__ == "__main__":
+    main()
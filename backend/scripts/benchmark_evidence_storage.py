@@ -0,0 +1,207 @@
+"""
+Benchmark EvidenceStorage (SQLite) against the legacy evidence.json store.
+
+Generates synthetic evidence records (spread over --cases cases, ~5% content
+duplicates) in a temporary directory and times:
+
+  list_files(case_id=...)   one case's records, newest first
+  find_by_hash(sha256)      dedup lookup on upload
+  list_by_entity(...)       evidence linked to a case entity (~1 in 10 records is linked)
+  mark_processed([id])      single-record status write
+  mark_processed(100 ids)   batch status write at the end of a processing run
+
+"before" re-creates the JSON store's behaviour: reads scan the worker's
+in-memory dict, and every mutation reloads and rewrites the whole file under
+the lock. It needs the whole store in memory several times over, so it only
+runs for sizes up to --baseline-max.
+
+Usage:
+    python backend/scripts/benchmark_evidence_storage.py
+    python backend/scripts/benchmark_evidence_storage.py --records 100000 1000000 --ops 200
+"""
+
+import argparse
+import hashlib
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from services._timeutil import utcnow_iso
+from services.evidence_storage import _INSERT, _row_values, EvidenceStorage
+
+
+def make_records(count: int, cases: int):
+    """Yield (id, record) pairs resembling real uploads."""
+    rng = random.Random(42)
+    first_by_sha = {}
+    for i in range(count):
+        # ~5% re-uploads of earlier content
+        if i and rng.random() < 0.05:
+            sha = hashlib.sha256(str(rng.randrange(i)).encode()).hexdigest()
+        else:
+            sha = hashlib.sha256(str(i).encode()).hexdigest()
+        evidence_id = f"ev_{sha[:16]}" if sha not in first_by_sha else f"ev_{sha[:12]}_{i}"
+        first_by_sha.setdefault(sha, evidence_id)
+        yield evidence_id, {
+            "id": evidence_id,
+            "case_id": f"case_{i % cases}",
+            "owner": f"user{i % 7}@example.com",
+            "original_filename": f"IMG_{i:07d}.jpg",
+            "stored_path": f"/srv/owl/ingestion/data/case_{i % cases}/IMG_{i:07d}.jpg",
+            "size": 100_000 + i,
+            "sha256": sha,
+            "status": "processed" if i % 3 else "unprocessed",
+            "is_duplicate": first_by_sha[sha] != evidence_id,
+            "duplicate_of": None if first_by_sha[sha] == evidence_id else first_by_sha[sha],
+            "is_relevant": False,
+            "created_at": f"2026-05-{1 + i % 28:02d}T{i % 24:02d}:00:00+00:00",
+            "processed_at": None,
+            "last_error": None,
+            "relative_path": f"DCIM/{i // 1000}/IMG_{i:07d}.jpg",
+            **({"linked_entity_ids": [f"ent_{i % 500}"]} if i % 10 == 0 else {}),
+        }
+
+
+def timed(fn, runs: int) -> dict:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+class JsonBaseline:
+    """The evidence.json store's access pattern, reduced to these operations."""
+
+    def __init__(self, path: Path, records: dict):
+        self.path = path
+        self.records = records
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(records, f, indent=2, ensure_ascii=False)
+
+    def list_files(self, case_id):
+        results = [r for r in self.records.values() if r.get("case_id") == case_id]
+        results.sort(key=lambda r: r.get("created_at", ""), reverse=True)
+        return results
+
+    def find_by_hash(self, sha256):
+        for rec in self.records.values():
+            if rec.get("sha256") == sha256:
+                return rec
+        return None
+
+    def list_by_entity(self, case_id, entity_id):
+        return [
+            r for r in self.records.values()
+            if r.get("case_id") == case_id and entity_id in (r.get("linked_entity_ids") or [])
+        ]
+
+    def mark_processed(self, evidence_ids):
+        with open(self.path, "r", encoding="utf-8") as f:
+            fresh = json.load(f)
+        now = utcnow_iso()
+        for evid in evidence_ids:
+            rec = fresh.get(evid)
+            if rec:
+                rec["status"] = "processed"
+                rec["processed_at"] = now
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(fresh, f, indent=2, ensure_ascii=False)
+        tmp.replace(self.path)
+        self.records = fresh
+
+
+def run_size(count: int, args) -> None:
+    print("=" * 72)
+    print(f"{count:,} records, {args.cases} cases ({count // args.cases:,} records/case)")
+    print("=" * 72)
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        storage = EvidenceStorage(tmp / "evidence.db", legacy_file=None)
+        start = time.perf_counter()
+        ids, hashes = [], []
+        with storage._write() as conn:
+            batch = []
+            for evidence_id, rec in make_records(count, args.cases):
+                ids.append(evidence_id)
+                hashes.append(rec["sha256"])
+                batch.append(_row_values(evidence_id, rec))
+                if len(batch) >= 10_000:
+                    conn.executemany(_INSERT, batch)
+                    batch.clear()
+            conn.executemany(_INSERT, batch)
+        print(f"load: {time.perf_counter() - start:.1f}s, "
+              f"db size {(tmp / 'evidence.db').stat().st_size / 1e6:.0f} MB")
+        build = storage.rebuild_indexes()
+        stats = storage.index_stats()
+        print(f"index rebuild: {build['seconds']:.2f}s ({build['entity_links']:,} entity links)")
+        for name, index in stats["indexes"].items():
+            size = f"{index['bytes'] / 1e6:.1f} MB" if index["bytes"] is not None else "n/a"
+            print(f"  index {name:<20} {index['keys']:>10,} keys {size:>10}")
+
+        rng = random.Random(7)
+        list_runs = max(3, args.ops // 20)
+        cases = [f"case_{rng.randrange(args.cases)}" for _ in range(list_runs)]
+        # ent_k is linked from record i where i % 500 == k (i % 10 == 0), i.e. case i % cases
+        entities = [(f"case_{k % args.cases}", f"ent_{k}") for k in (rng.randrange(0, 500, 10) for _ in range(args.ops))]
+        lookups = [rng.choice(hashes) for _ in range(args.ops)]
+        targets = [rng.choice(ids) for _ in range(args.ops)]
+        batches = [rng.sample(ids, 100) for _ in range(max(3, args.ops // 20))]
+
+        def bench(store, write_runs):
+            case_iter, hash_iter, id_iter, batch_iter = iter(cases), iter(lookups), iter(targets), iter(batches)
+            entity_iter = iter(entities)
+            return {
+                "list_files(case)": timed(lambda: store.list_files(case_id=next(case_iter)), list_runs),
+                "find_by_hash": timed(lambda: store.find_by_hash(next(hash_iter)), args.ops),
+                "list_by_entity": timed(lambda: store.list_by_entity(*next(entity_iter)), args.ops),
+                "mark_processed(1)": timed(lambda: store.mark_processed([next(id_iter)]), write_runs),
+                "mark_processed(100)": timed(lambda: store.mark_processed(next(batch_iter)), min(write_runs, len(batches))),
+            }
+
+        after = bench(storage, args.ops)
+        before = None
+        if count <= args.baseline_max:
+            with storage._read() as conn:
+                records = {row[0]: json.loads(row[1]) for row in conn.execute("SELECT id, record FROM evidence ORDER BY rowid")}
+            before = bench(JsonBaseline(tmp / "evidence.json", records), 3)
+
+        print(f"{'operation':<22}{'before median':>15}{'after median':>15}{'after p95':>12}{'speed-up':>10}")
+        for name, result in after.items():
+            b = before[name]["median_ms"] if before else None
+            before_text = f"{b:.2f}ms" if b is not None else "-"
+            speedup = f"{b / result['median_ms']:.1f}x" if b else "-"
+            print(f"{name:<22}{before_text:>15}{result['median_ms']:>13.2f}ms"
+                  f"{result['p95_ms']:>10.2f}ms{speedup:>10}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SQLite evidence store")
+    parser.add_argument("--records", type=int, nargs="+", default=[100_000, 1_000_000],
+                        help="Store sizes to benchmark (default: 100000 1000000)")
+    parser.add_argument("--cases", type=int, default=20, help="Cases the records are spread over (default: 20)")
+    parser.add_argument("--ops", type=int, default=200, help="Lookups/writes timed per operation (default: 200)")
+    parser.add_argument("--baseline-max", type=int, default=100_000,
+                        help="Largest size to also run the JSON baseline for (default: 100000)")
+    args = parser.parse_args()
+    for count in args.records:
+        run_size(count, args)
+
+
+if __name__ == "__main__":
+    main()
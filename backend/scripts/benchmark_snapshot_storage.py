@@ -0,0 +1,197 @@
+"""
+Benchmark SnapshotStorage (per-snapshot files) against the legacy snapshots.json store.
+
+Generates --snapshots synthetic snapshots (subgraph, timeline, chat history,
+citations) in a temporary directory and times:
+
+  save          replace one existing snapshot
+  list          the user's snapshot listing (GET /api/snapshots)
+  get(full)     one snapshot with every section
+  get(summary)  one snapshot's small fields only
+
+"before" re-creates the single-file store's behaviour: save deep-copies the
+snapshot, JSON round-trips it, re-reads the whole file (save never refreshed
+the worker's mtime), round-trips every snapshot into a backup, deep-copies
+them all, then serialises, writes and re-reads the whole store twice. The
+old save also slept 100ms before its second read-back; that is left out.
+Listing deep-copied every snapshot.
+
+Usage:
+    python backend/scripts/benchmark_snapshot_storage.py
+    python backend/scripts/benchmark_snapshot_storage.py --snapshots 200 --nodes 1000 --ops 20
+"""
+
+import argparse
+import contextlib
+import copy
+import io
+import json
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+import services.snapshot_storage as snapshot_module
+from services.snapshot_storage import SnapshotStorage
+
+
+def make_snapshot(i: int, nodes: int, rng: random.Random) -> dict:
+    """A snapshot shaped like the ones the graph view saves."""
+    node_list = [
+        {
+            "id": f"n{i}_{k}",
+            "key": f"entity-{i}-{k}",
+            "name": f"Entity {k} of snapshot {i}",
+            "type": rng.choice(["Person", "Company", "Account", "Phone", "Location"]),
+            "summary": " ".join(rng.choice(["wire", "transfer", "met", "called", "owns", "paid"]) for _ in range(30)),
+            "properties": {"source_doc": f"doc_{k % 40}.pdf", "confidence": rng.random()},
+        }
+        for k in range(nodes)
+    ]
+    links = [
+        {"source": f"n{i}_{k}", "target": f"n{i}_{(k * 7 + 3) % nodes}", "type": "RELATED_TO"}
+        for k in range(nodes * 2)
+    ]
+    return {
+        "id": f"snapshot_{i:04d}",
+        "name": f"Snapshot {i}",
+        "notes": f"Working notes for snapshot {i}",
+        "subgraph": {"nodes": node_list, "links": links},
+        "timeline": [{"date": f"2026-01-{1 + k % 28:02d}", "title": f"Event {k}", "key": f"n{i}_{k}"} for k in range(nodes // 3)],
+        "overview": {"nodeCount": nodes, "linkCount": nodes * 2},
+        "citations": {f"n{i}_{k}": [{"doc": f"doc_{k % 40}.pdf", "page": k % 12}] for k in range(nodes // 2)},
+        "chat_history": [{"role": "user" if k % 2 == 0 else "assistant", "content": "x" * 400} for k in range(20)],
+        "ai_overview": "Overview " * 40,
+        "work_state": {},
+        "timestamp": f"2026-05-{1 + i % 28:02d}T10:00:00",
+        "created_at": f"2026-05-{1 + i % 28:02d}T10:00:00",
+        "owner": f"user{i % 4}@example.com",
+        "case_id": f"case_{i % 10}",
+        "case_version": 1,
+        "case_name": f"Case {i % 10}",
+    }
+
+
+def timed(fn, runs: int) -> dict:
+    samples = []
+    for i in range(runs):
+        start = time.perf_counter()
+        fn(i)
+        samples.append((time.perf_counter() - start) * 1000)
+    samples.sort()
+    return {
+        "median_ms": statistics.median(samples),
+        "p95_ms": samples[min(len(samples) - 1, int(len(samples) * 0.95))],
+    }
+
+
+class JsonBaseline:
+    """The snapshots.json store's save/list path, minus its debug logging."""
+
+    def __init__(self, path: Path, snapshots: dict):
+        self.path = path
+        self.snapshots = snapshots
+        self._write(snapshots)
+
+    def _write(self, snapshots):
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(snapshots, f, indent=2, ensure_ascii=False)
+
+    def _load(self):
+        with open(self.path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, snapshot_id, snapshot_data):
+        data = json.loads(json.dumps(copy.deepcopy(snapshot_data), ensure_ascii=False))
+        self.snapshots = self._load()
+        backup = json.loads(json.dumps(self.snapshots, ensure_ascii=False))
+        json.dumps(data, ensure_ascii=False)
+        updated = {k: copy.deepcopy(v) for k, v in self.snapshots.items() if k != snapshot_id}
+        updated[snapshot_id] = json.loads(json.dumps(data, ensure_ascii=False))
+        assert len(backup) >= len(updated) - 1
+        json.loads(json.dumps(updated, ensure_ascii=False))
+        self._write(updated)
+        self._load()
+        self._load()
+
+    def list(self, owner):
+        everything = copy.deepcopy(self.snapshots)
+        return [s for s in everything.values() if s.get("owner") == owner]
+
+    def get(self, snapshot_id):
+        return copy.deepcopy(self.snapshots.get(snapshot_id))
+
+
+def point_storage_at(directory: Path) -> None:
+    snapshot_module.STORAGE_DIR = directory / "snapshots"
+    snapshot_module.INDEX_FILE = snapshot_module.STORAGE_DIR / "_index.json"
+    snapshot_module.LOCK_FILE = snapshot_module.STORAGE_DIR / "_index.json.lock"
+    snapshot_module.LEGACY_FILE = directory / "snapshots.json"
+    snapshot_module.LEGACY_CHUNK_DIR = directory / "snapshot_chunks"
+
+
+def dir_size(path: Path) -> int:
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the per-snapshot file store")
+    parser.add_argument("--snapshots", type=int, default=200, help="Snapshots in the store (default: 200)")
+    parser.add_argument("--nodes", type=int, default=300, help="Subgraph nodes per snapshot (default: 300)")
+    parser.add_argument("--ops", type=int, default=20, help="Timed runs per operation (default: 20)")
+    parser.add_argument("--baseline-runs", type=int, default=5, help="Timed runs per operation for the JSON baseline (default: 5)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    snapshots = {}
+    for i in range(args.snapshots):
+        snap = make_snapshot(i, args.nodes, rng)
+        snapshots[snap["id"]] = snap
+    ids = list(snapshots)
+    owner = "user1@example.com"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        point_storage_at(tmp)
+        storage = SnapshotStorage()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for snapshot_id, snap in snapshots.items():
+                storage.save(snapshot_id, snap)
+        print(f"{args.snapshots} snapshots x {args.nodes} nodes, written in {time.perf_counter() - start:.1f}s")
+
+        targets = [rng.choice(ids) for _ in range(max(args.ops, args.baseline_runs))]
+
+        def bench(store, runs, full_get, summary_get):
+            return {
+                "save": timed(lambda i: store.save(targets[i], snapshots[targets[i]]), runs),
+                "list": timed(lambda i: store.list(owner) if isinstance(store, JsonBaseline)
+                              else store.list_summaries(owner=owner), runs),
+                "get(full)": timed(lambda i: full_get(targets[i]), runs),
+                "get(summary)": timed(lambda i: summary_get(targets[i]), runs),
+            }
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            after = bench(storage, args.ops, storage.get, lambda sid: storage.get(sid, sections=[]))
+        new_size = dir_size(snapshot_module.STORAGE_DIR)
+
+        baseline = JsonBaseline(tmp / "snapshots.json", snapshots)
+        old_size = (tmp / "snapshots.json").stat().st_size
+        before = bench(baseline, args.baseline_runs, baseline.get, baseline.get)
+
+    print(f"on disk: snapshots.json {old_size / 1e6:.1f} MB, per-snapshot files {new_size / 1e6:.1f} MB")
+    print(f"{'operation':<16}{'before median':>15}{'after median':>15}{'after p95':>12}{'speed-up':>10}")
+    for name, result in after.items():
+        b = before[name]["median_ms"]
+        print(f"{name:<16}{b:>13.2f}ms{result['median_ms']:>13.2f}ms"
+              f"{result['p95_ms']:>10.2f}ms{b / result['median_ms']:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
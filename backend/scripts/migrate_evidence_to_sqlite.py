@@ -0,0 +1,50 @@
+"""
+Import the legacy data/evidence.json into the SQLite evidence store (data/evidence.db).
+
+The backend does this automatically the first time evidence storage is opened;
+run this script to do it ahead of a deploy (a ~1GB evidence.json takes a while
+to parse) or to re-import with --replace. The source file is renamed to
+evidence.json.migrated afterwards.
+
+Usage:
+    python backend/scripts/migrate_evidence_to_sqlite.py
+    python backend/scripts/migrate_evidence_to_sqlite.py --source data/evidence.json.migrated --replace
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+backend_dir = Path(__file__).parent.parent
+if str(backend_dir) not in sys.path:
+    sys.path.insert(0, str(backend_dir))
+
+from services.evidence_storage import DB_FILE, STORAGE_FILE, EvidenceStorage, migrate_legacy_json
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import evidence.json into the SQLite evidence store")
+    parser.add_argument("--source", type=Path, default=STORAGE_FILE, help=f"Legacy JSON file (default: {STORAGE_FILE})")
+    parser.add_argument("--db", type=Path, default=DB_FILE, help=f"Target database (default: {DB_FILE})")
+    parser.add_argument("--replace", action="store_true", help="Drop existing database rows before importing")
+    args = parser.parse_args()
+
+    if not args.source.exists():
+        print(f"No source file at {args.source}; nothing to migrate.")
+        return 0
+
+    start = time.perf_counter()
+    result = migrate_legacy_json(args.source, args.db, replace=args.replace)
+    elapsed = time.perf_counter() - start
+    if result["status"] != "migrated":
+        print(f"Not migrated ({result['status']}): {result.get('reason')}")
+        return 0 if result["status"] == "skipped" else 1
+
+    total = EvidenceStorage(args.db, legacy_file=None).count()
+    print(f"Imported {result['records']} records in {elapsed:.1f}s; {args.db} now holds {total} records.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -13,8 +13,8 @@ stacked here:
 
 This is the lighter helper for storages whose mutation methods don't yet
 reload-before-save. The heavier per-class reload-under-lock variant lives
-in evidence_storage / evidence_log_storage / background_task_storage and
-additionally prevents lost-updates from stale in-memory caches.
+in evidence_log_storage and additionally prevents lost-updates from stale
+in-memory caches.
 """
 
 from __future__ import annotations
@@ -32,8 +32,7 @@ def file_lock(lock_path: Path):
     """Hold an exclusive fcntl lock on `lock_path` for the with-block.
 
     The lock file is kept world-writable (0o666) so a root-owned re-create
-    by a sudo'd maintenance script can't lock out the backend user — same
-    rationale as evidence_storage._file_locked.
+    by a sudo'd maintenance script can't lock out the backend user.
     """
     lock_path.parent.mkdir(parents=True, exist_ok=True)
     with open(lock_path, "a") as lf:
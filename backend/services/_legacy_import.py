@@ -0,0 +1,160 @@
+"""Shared one-shot import of a legacy JSON store into its replacement.
+
+Evidence, background tasks, system logs, workspace data and snapshots each
+moved off a JSON file. Every import follows the same rules, kept here so
+they can't drift apart again:
+
+  1. the import is claimed in the same transaction (or under the same lock)
+     that writes the imported records, so workers starting together import
+     once;
+  2. the claim outlives the source file, so a legacy file that is put back
+     (or one that could not be renamed) never brings back records deleted
+     since the import;
+  3. a file that can't be read is left where it is and retried next start;
+  4. an imported file is renamed to ``<name>.migrated``.
+
+SQLite stores record claims in a ``legacy_imports`` table; directory stores
+(snapshots) record them as a marker file next to their lock.
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+from services._json_file_lock import file_lock
+
+MIGRATED_SUFFIX = ".migrated"
+MARKER_PREFIX = "_legacy_imported."
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS legacy_imports (
+    name        TEXT PRIMARY KEY,
+    source      TEXT NOT NULL,
+    imported_at TEXT NOT NULL
+)
+"""
+
+
+def read_json(path: Path) -> Any:
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def retire(source: Path, tag: str) -> None:
+    """Rename an imported file to ``<name>.migrated``."""
+    try:
+        source.replace(source.with_name(source.name + MIGRATED_SUFFIX))
+    except OSError as e:
+        print(f"[{tag}] Imported {source} but could not rename it: {e}")
+
+
+def import_into_sqlite(
+    conn: sqlite3.Connection,
+    name: str,
+    source: Path,
+    write: Callable[[sqlite3.Connection, Any], int],
+    tag: str,
+    *,
+    load: Callable[[Path], Any] = read_json,
+    populated: Optional[Callable[[sqlite3.Connection], bool]] = None,
+    force: bool = False,
+) -> Dict:
+    """
+    Import ``source`` into the database behind ``conn`` once.
+
+    ``conn`` must be in autocommit mode (isolation_level=None); the import
+    runs in its own ``BEGIN IMMEDIATE`` transaction.
+
+    Args:
+        name: Import name recorded in legacy_imports
+        source: Legacy file
+        write: fn(conn, loaded data) -> records imported, run inside the transaction
+        tag: Log prefix
+        load: fn(source) -> data; ValueError/OSError leave the file for a retry
+        populated: fn(conn) -> True if the database already holds this data
+            (databases created before imports were recorded); the import is
+            then recorded without writing anything
+        force: Import even if already recorded (explicit re-runs)
+
+    Returns:
+        Dict with 'status' ('migrated' | 'skipped' | 'failed') and 'records' imported
+    """
+    source = Path(source)
+    if not source.exists():
+        return {"status": "skipped", "reason": "no legacy file", "records": 0}
+    conn.execute(_SCHEMA)
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        if not force:
+            if conn.execute("SELECT 1 FROM legacy_imports WHERE name = ?", (name,)).fetchone():
+                conn.execute("ROLLBACK")
+                print(f"[{tag}] {source} was already imported; ignoring it")
+                return {"status": "skipped", "reason": "already imported", "records": 0}
+            if populated is not None and populated(conn):
+                _claim(conn, name, source)
+                conn.execute("COMMIT")
+                return {"status": "skipped", "reason": "database already populated", "records": 0}
+        try:
+            data = load(source)
+        except (ValueError, OSError) as e:
+            conn.execute("ROLLBACK")
+            print(f"[{tag}] Could not read {source} for import: {e}")
+            return {"status": "failed", "reason": str(e), "records": 0}
+        imported = write(conn, data)
+        _claim(conn, name, source)
+        conn.execute("COMMIT")
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    retire(source, tag)
+    print(f"[{tag}] Imported {imported} record(s) from {source}")
+    return {"status": "migrated", "records": imported}
+
+
+def import_into_directory(
+    directory: Path,
+    lock_path: Path,
+    name: str,
+    source: Path,
+    write: Callable[[Any], int],
+    tag: str,
+    *,
+    load: Callable[[Path], Any] = read_json,
+) -> Dict:
+    """
+    Import ``source`` into a directory store once, under ``lock_path``.
+
+    The claim is a ``_legacy_imported.<name>`` marker in ``directory``,
+    written after ``write`` returns. Same arguments and result as
+    import_into_sqlite, except that ``write`` takes only the loaded data.
+    """
+    source = Path(source)
+    marker = directory / f"{MARKER_PREFIX}{name}"
+    with file_lock(lock_path):
+        if not source.exists():
+            return {"status": "skipped", "reason": "no legacy file", "records": 0}
+        if marker.exists():
+            print(f"[{tag}] {source} was already imported; ignoring it")
+            return {"status": "skipped", "reason": "already imported", "records": 0}
+        try:
+            data = load(source)
+        except (ValueError, OSError) as e:
+            print(f"[{tag}] Could not read {source} for import: {e}")
+            return {"status": "failed", "reason": str(e), "records": 0}
+        imported = write(data)
+        marker.touch()
+        retire(source, tag)
+    print(f"[{tag}] Imported {imported} record(s) from {source}")
+    return {"status": "migrated", "records": imported}
+
+
+def _claim(conn: sqlite3.Connection, name: str, source: Path) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO legacy_imports (name, source, imported_at) VALUES (?, ?, ?)",
+        (name, str(source), datetime.now().isoformat()),
+    )
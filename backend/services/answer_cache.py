@@ -0,0 +1,251 @@
+"""
+Answer Cache — per-case semantic cache of AI assistant answers.
+
+Investigators on one case keep asking the same things in slightly different
+words ("who are the main suspects?", "main suspects?", the suggested
+questions). Each of those used to run the full RAG pipeline and an LLM call.
+
+Design:
+  - Entries are keyed by case and a scope hash of everything besides the
+    question that shapes the answer: provider/model, selected nodes,
+    confidence threshold and view context. Only entries with the same scope
+    are candidates.
+  - Within a scope, the question embedding (already computed for retrieval)
+    is compared by cosine similarity; the best match at or above
+    ANSWER_CACHE_SIMILARITY is a hit.
+  - Every entry records the case's graph version and evidence version at
+    answer time: per-case write counters kept by the stores themselves
+    (a :CaseGraphVersion node bumped by every graph write path, and the
+    case_versions table of evidence.db bumped by every evidence write), each
+    read with one indexed lookup. Entries from any other version are never
+    served and are pruned on the next store, so ingestion, merges, edits and
+    evidence changes invalidate the case's answers without explicit hooks.
+  - Storage: data/answer_cache.db (SQLite, WAL), shared by all workers.
+  - Never fails a question: errors are logged and treated as a miss.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from config import (
+    ANSWER_CACHE_ENABLED, ANSWER_CACHE_SIMILARITY, ANSWER_CACHE_TTL, ANSWER_CACHE_MAX_PER_CASE,
+)
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_FILE = BASE_DIR / "data" / "answer_cache.db"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS answers (
+    id                INTEGER PRIMARY KEY,
+    case_id           TEXT NOT NULL,
+    scope             TEXT NOT NULL,
+    question          TEXT NOT NULL,
+    embedding         BLOB NOT NULL,
+    graph_version     TEXT NOT NULL,
+    evidence_version  TEXT NOT NULL,
+    result            TEXT NOT NULL,
+    created_at        REAL NOT NULL,
+    last_hit_at       REAL NOT NULL,
+    hits              INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_answers_case_scope ON answers(case_id, scope);
+"""
+
+
+def _unit(vector) -> np.ndarray:
+    v = np.asarray(vector, dtype=np.float32)
+    norm = float(np.linalg.norm(v))
+    return v / norm if norm else v
+
+
+class AnswerCache:
+    """SQLite-backed semantic answer cache shared by all workers."""
+
+    def __init__(self, db_file: Path = DB_FILE):
+        self.db_file = Path(db_file)
+        self.enabled = ANSWER_CACHE_ENABLED
+        self.threshold = ANSWER_CACHE_SIMILARITY
+        self._lock = threading.Lock()
+        self._initialised = False
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    conn.executescript(_SCHEMA)
+                    conn.commit()
+                    self._initialised = True
+        return conn
+
+    # ------------------------------------------------------------------
+    # Scope and versions
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def make_scope(
+        provider: str,
+        model_id: str,
+        selected_keys: Optional[List[str]] = None,
+        confidence_threshold: Optional[float] = None,
+        view_context: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Hash of the non-question inputs that change an answer."""
+        material = json.dumps(
+            [
+                (provider or "").lower(),
+                model_id or "",
+                sorted(selected_keys or []),
+                confidence_threshold,
+                view_context or None,
+            ],
+            sort_keys=True,
+            separators=(",", ":"),
+            default=str,
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def case_versions(case_id: str) -> Tuple[str, str]:
+        """(graph_version, evidence_version) of a case: one indexed lookup each."""
+        from services.neo4j_service import neo4j_service
+        from services.evidence_storage import evidence_storage
+        return neo4j_service.get_case_graph_version(case_id), evidence_storage.case_version(case_id)
+
+    def invalidate(self, case_id: str) -> None:
+        """Drop every cached answer for a case."""
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM answers WHERE case_id = ?", (case_id,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[AnswerCache] Invalidate failed for case {case_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def lookup(
+        self,
+        case_id: str,
+        scope: str,
+        embedding,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Best prior answer for a question embedding in this case and scope.
+
+        Returns:
+            {"result", "question", "similarity", "created_at"} or None
+        """
+        if not self.enabled or not case_id or embedding is None:
+            return None
+        try:
+            graph_version, evidence_version = self.case_versions(case_id)
+            conn = self._connect()
+            try:
+                rows = conn.execute(
+                    "SELECT id, question, embedding, result, created_at FROM answers "
+                    "WHERE case_id = ? AND scope = ? AND graph_version = ? AND evidence_version = ? "
+                    "AND created_at >= ?",
+                    (case_id, scope, graph_version, evidence_version, time.time() - ANSWER_CACHE_TTL),
+                ).fetchall()
+                if not rows:
+                    return None
+                query = _unit(embedding)
+                matrix = np.stack([np.frombuffer(r["embedding"], dtype=np.float32) for r in rows])
+                if matrix.shape[1] != query.shape[0]:
+                    return None  # embedding model changed
+                similarities = matrix @ query
+                best = int(np.argmax(similarities))
+                similarity = float(similarities[best])
+                if similarity < self.threshold:
+                    return None
+                row = rows[best]
+                conn.execute(
+                    "UPDATE answers SET hits = hits + 1, last_hit_at = ? WHERE id = ?",
+                    (time.time(), row["id"]),
+                )
+                conn.commit()
+                return {
+                    "result": json.loads(row["result"]),
+                    "question": row["question"],
+                    "similarity": round(similarity, 4),
+                    "created_at": row["created_at"],
+                }
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[AnswerCache] Lookup failed for case {case_id}: {e}")
+            return None
+
+    def store(
+        self,
+        case_id: str,
+        scope: str,
+        question: str,
+        embedding,
+        result: Dict[str, Any],
+    ) -> None:
+        """Store an answer; prunes stale-version and excess entries for the case."""
+        if not self.enabled or not case_id or embedding is None:
+            return
+        try:
+            graph_version, evidence_version = self.case_versions(case_id)
+            now = time.time()
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "DELETE FROM answers WHERE case_id = ? AND "
+                    "(graph_version != ? OR evidence_version != ? OR created_at < ?)",
+                    (case_id, graph_version, evidence_version, now - ANSWER_CACHE_TTL),
+                )
+                conn.execute(
+                    """INSERT INTO answers
+                       (case_id, scope, question, embedding, graph_version, evidence_version,
+                        result, created_at, last_hit_at)
+                       VALUES (?,?,?,?,?,?,?,?,?)""",
+                    (case_id, scope, question, _unit(embedding).tobytes(),
+                     graph_version, evidence_version, json.dumps(result, default=str), now, now),
+                )
+                conn.execute(
+                    "DELETE FROM answers WHERE case_id = ? AND id NOT IN ("
+                    "SELECT id FROM answers WHERE case_id = ? ORDER BY last_hit_at DESC LIMIT ?)",
+                    (case_id, case_id, ANSWER_CACHE_MAX_PER_CASE),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[AnswerCache] Store failed for case {case_id}: {e}")
+
+    def stats(self, case_id: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            conn = self._connect()
+            try:
+                where, params = ("WHERE case_id = ?", (case_id,)) if case_id else ("", ())
+                entries, hits = conn.execute(
+                    f"SELECT COUNT(*), COALESCE(SUM(hits), 0) FROM answers {where}", params
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[AnswerCache] Failed to read stats: {e}")
+            entries, hits = 0, 0
+        return {"enabled": self.enabled, "threshold": self.threshold, "entries": entries, "hits": hits}
+
+
+answer_cache = AnswerCache()
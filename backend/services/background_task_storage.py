@@ -2,38 +2,80 @@
 Background Task Storage
 
 Stores background task information so the frontend can monitor progress.
+
+Storage: data/background_tasks.db (SQLite, WAL), shared by all workers.
+
+  - ``tasks`` is the materialised view: one row per task holding the task
+    dict as of the last compaction (``applied_seq``).
+  - ``task_events`` is an append-only journal: every update_task call is a
+    single INSERT of just the fields it changed, so progress ticks never
+    rewrite other tasks (or even the task itself).
+
+get_task / list_tasks read the view and fold in the task's journal entries
+newer than ``applied_seq``. Compaction folds a task's pending entries into
+its row and deletes them: after COMPACT_EVERY_EVENTS updates, when the task
+reaches a terminal status, and every COMPACT_INTERVAL_SECS for all tasks.
+
+The previous data/background_tasks.json store is imported once, the first
+time the database is opened, and renamed to background_tasks.json.migrated.
 """
 
 from __future__ import annotations
 
 import json
-import os
+import sqlite3
+import threading
+import time
 import uuid
-import fcntl
 from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Optional, Dict
-from datetime import datetime
+from typing import Iterable, List, Optional, Dict, Tuple
 from enum import Enum
-from threading import RLock
 
 from config import BASE_DIR
+from services._legacy_import import import_into_sqlite
 from services._timeutil import utcnow_iso
 
 
 TASK_DIR = BASE_DIR / "data"
+DB_FILE = TASK_DIR / "background_tasks.db"
+
+# Legacy JSON store, imported into DB_FILE on first open
 TASK_FILE = TASK_DIR / "background_tasks.json"
-LOCK_FILE = TASK_DIR / "background_tasks.json.lock"
 
 # Maximum number of task entries to retain (oldest are dropped)
 MAX_TASK_ENTRIES = 500
 
 # Maximum number of per-file status entries kept on a single task. Bulk
 # folder uploads can otherwise grow this list into the tens of thousands
-# (one per file) and bloat the on-disk JSON to ~20MB+, which dominates the
-# upload-loop write time.
+# (one per file), which every read of the task then has to carry.
 MAX_FILES_PER_TASK = 100
 
+# Journal compaction: fold a task's pending updates into its row after this
+# many, and fold everything at least this often
+COMPACT_EVERY_EVENTS = 50
+COMPACT_INTERVAL_SECS = 30
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id          TEXT PRIMARY KEY,
+    owner       TEXT,
+    case_id     TEXT,
+    created_at  TEXT NOT NULL DEFAULT '',
+    applied_seq INTEGER NOT NULL DEFAULT 0,
+    record      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_case ON tasks(case_id);
+CREATE INDEX IF NOT EXISTS idx_tasks_owner ON tasks(owner);
+
+CREATE TABLE IF NOT EXISTS task_events (
+    seq     INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id TEXT NOT NULL,
+    changes TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_task_events_task ON task_events(task_id, seq);
+"""
+
 
 class TaskStatus(str, Enum):
     """Task status enumeration."""
@@ -44,113 +86,172 @@ class TaskStatus(str, Enum):
     CANCELLED = "cancelled"
 
 
-def _ensure_dir() -> None:
-    TASK_DIR.mkdir(parents=True, exist_ok=True)
-
-
-def _load_tasks() -> List[Dict]:
-    _ensure_dir()
-    if not TASK_FILE.exists():
-        return []
-    try:
-        with open(TASK_FILE, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            if isinstance(data, list):
-                return data
-            return []
-    except (json.JSONDecodeError, OSError):
-        return []
-
-
-def _save_tasks(tasks: List[Dict]) -> None:
-    _ensure_dir()
-    tmp = TASK_FILE.with_suffix(".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(tasks, f, indent=2, ensure_ascii=False)
-    tmp.replace(TASK_FILE)
+_TERMINAL_STATUSES = {TaskStatus.COMPLETED.value, TaskStatus.FAILED.value, TaskStatus.CANCELLED.value}
+
+
+def _apply_changes(task: Dict, changes: Dict) -> Dict:
+    """Apply one journal entry (the non-None update_task arguments plus
+    updated_at) to a task dict in place."""
+    if "status" in changes:
+        task["status"] = changes["status"]
+    progress = task.setdefault("progress", {"total": 0, "completed": 0, "failed": 0})
+    for key in ("total", "completed", "failed"):
+        if f"progress_{key}" in changes:
+            progress[key] = changes[f"progress_{key}"]
+    file_status = changes.get("file_status")
+    if file_status is not None:
+        file_id = file_status.get("file_id")
+        files = task.setdefault("files", [])
+        existing_file = next((f for f in files if f.get("file_id") == file_id), None)
+        if existing_file:
+            existing_file.update(file_status)
+        else:
+            files.append(file_status)
+            if len(files) > MAX_FILES_PER_TASK:
+                task["files"] = files[-MAX_FILES_PER_TASK:]
+    for key in ("error", "started_at", "completed_at", "updated_at"):
+        if key in changes:
+            task[key] = changes[key]
+    if "stages" in changes:
+        task.setdefault("metadata", {})["stages"] = changes["stages"]
+    if "profile" in changes:
+        task.setdefault("metadata", {})["profile"] = changes["profile"]
+    return task
 
 
 class BackgroundTaskStorage:
-    """JSON-file backed storage for background tasks.
-
-    Multi-process safe: every mutation reloads the on-disk JSON under an
-    fcntl file lock, applies the change, then atomically saves. See the
-    EvidenceStorage docstring for the same bug pattern.
+    """SQLite-backed storage for background tasks (view + progress journal).
+
+    Multi-process safe: all workers share data/background_tasks.db, writes
+    are single-row transactions, and reads always see every worker's
+    committed updates (no per-worker cache to go stale — the JSON store
+    this replaced needed an mtime check for that: a task created by worker
+    A "disappeared" from polls landing on workers B/C/D, observed on case
+    43f1afb1 2026-05-23).
     """
 
-    def __init__(self) -> None:
-        self._tasks: List[Dict] = _load_tasks()
-        self._lock = RLock()  # Reentrant lock for thread-safe operations
-        # mtime of the on-disk file at the time we last loaded it.
-        # Read methods compare against the current file mtime and
-        # reload if another worker process has mutated since. Without
-        # this, each uvicorn worker serves a stale copy of the task
-        # list — a task created by worker A is invisible to read
-        # requests routed to workers B/C/D. Symptom: cellebrite ingest
-        # starts, task appears briefly in the panel, then "disappears"
-        # the next time the poll lands on a worker with a stale cache.
-        # Observed on case 43f1afb1 2026-05-23 13:42 UTC.
-        try:
-            self._mtime: float = TASK_FILE.stat().st_mtime
-        except OSError:
-            self._mtime = 0.0
-
-    def _refresh_if_stale(self) -> None:
-        """Reload `self._tasks` if the on-disk file has been mutated since
-        we last cached it (almost always by another uvicorn worker).
-        Cheap — single stat() call per read; file is local + small.
-        """
-        try:
-            current_mtime = TASK_FILE.stat().st_mtime
-        except OSError:
-            return
-        if current_mtime > self._mtime:
+    def __init__(self, db_file: Path = DB_FILE, legacy_file: Optional[Path] = TASK_FILE) -> None:
+        self.db_file = Path(db_file)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self._lock = threading.Lock()
+        self._initialised = False
+        self._last_compaction = time.monotonic()
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialised:
             with self._lock:
-                # Re-check inside the lock to avoid duplicate reloads.
-                try:
-                    current_mtime = TASK_FILE.stat().st_mtime
-                except OSError:
-                    return
-                if current_mtime > self._mtime:
-                    self._tasks = _load_tasks()
-                    self._mtime = current_mtime
+                if not self._initialised:
+                    conn.executescript(_SCHEMA)
+                    if self.legacy_file is not None:
+                        self._import_legacy(conn)
+                    self._initialised = True
+        return conn
 
     @contextmanager
-    def _file_locked(self):
-        """Yield a freshly-loaded tasks list that will be persisted on exit."""
-        with self._lock:
-            _ensure_dir()
-            with open(LOCK_FILE, "a") as lf:
-                # See evidence_storage._file_locked — defends against a sudo'd
-                # script re-creating the lock with restrictive root ownership.
-                try:
-                    os.chmod(LOCK_FILE, 0o666)
-                except OSError:
-                    pass
-                fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
-                try:
-                    fresh = _load_tasks()
-                    yield fresh
-                    _save_tasks(fresh)
-                    self._tasks = fresh
-                    try:
-                        self._mtime = TASK_FILE.stat().st_mtime
-                    except OSError:
-                        pass
-                finally:
-                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
+    def _read(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
 
-    def reload(self) -> None:
-        """Reload tasks from disk."""
-        with self._lock:
-            self._tasks = _load_tasks()
+    @contextmanager
+    def _write(self):
+        """Connection inside a ``BEGIN IMMEDIATE`` transaction, committed on
+        successful exit and rolled back on error."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
             try:
-                self._mtime = TASK_FILE.stat().st_mtime
-            except OSError:
-                self._mtime = 0.0
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _import_legacy(self, conn: sqlite3.Connection) -> None:
+        """One-shot import of background_tasks.json (see services._legacy_import)."""
+        def write(conn: sqlite3.Connection, tasks) -> int:
+            tasks = [t for t in (tasks if isinstance(tasks, list) else []) if isinstance(t, dict) and t.get("id")]
+            tasks = tasks[-MAX_TASK_ENTRIES:]
+            conn.executemany(
+                "INSERT OR REPLACE INTO tasks (id, owner, case_id, created_at, record) VALUES (?, ?, ?, ?, ?)",
+                [
+                    (t["id"], t.get("owner"), t.get("case_id"), t.get("created_at") or "", json.dumps(t, ensure_ascii=False))
+                    for t in tasks
+                ],
+            )
+            return len(tasks)
+
+        import_into_sqlite(
+            conn, "background_tasks", self.legacy_file, write, "BackgroundTasks",
+            populated=lambda c: c.execute("SELECT 1 FROM tasks LIMIT 1").fetchone() is not None,
+        )
+
+    @staticmethod
+    def _pending_events(conn: sqlite3.Connection, task_ids: Optional[Iterable[str]] = None) -> Dict[str, List[Tuple[int, Dict]]]:
+        """Journal entries not yet folded into their task's row, in order."""
+        sql = (
+            "SELECT e.seq, e.task_id, e.changes FROM task_events e "
+            "JOIN tasks t ON t.id = e.task_id WHERE e.seq > t.applied_seq"
+        )
+        params: Tuple = ()
+        if task_ids is not None:
+            ids = list(task_ids)
+            if not ids:
+                return {}
+            sql += f" AND e.task_id IN ({','.join('?' * len(ids))})"
+            params = tuple(ids)
+        pending: Dict[str, List[Tuple[int, Dict]]] = {}
+        for row in conn.execute(sql + " ORDER BY e.seq", params):
+            pending.setdefault(row["task_id"], []).append((row["seq"], json.loads(row["changes"])))
+        return pending
+
+    @staticmethod
+    def _materialise(record: str, events: List[Tuple[int, Dict]]) -> Dict:
+        task = json.loads(record)
+        for _, changes in events:
+            _apply_changes(task, changes)
+        return task
 
-    def _persist(self) -> None:
-        _save_tasks(self._tasks)
+    @staticmethod
+    def _fold(conn: sqlite3.Connection, task_id: str, task: Dict, last_seq: int) -> None:
+        """Store ``task`` (already folded up to ``last_seq``) as the view row
+        and drop the journal entries it absorbed."""
+        conn.execute(
+            "UPDATE tasks SET record = ?, applied_seq = ? WHERE id = ?",
+            (json.dumps(task, ensure_ascii=False), last_seq, task_id),
+        )
+        conn.execute("DELETE FROM task_events WHERE task_id = ? AND seq <= ?", (task_id, last_seq))
+
+    def compact(self) -> int:
+        """Fold every pending journal entry into its task row. Returns the
+        number of journal entries folded."""
+        folded = 0
+        with self._write() as conn:
+            pending = self._pending_events(conn)
+            for task_id, events in pending.items():
+                row = conn.execute("SELECT record FROM tasks WHERE id = ?", (task_id,)).fetchone()
+                if row is None:
+                    continue
+                self._fold(conn, task_id, self._materialise(row["record"], events), events[-1][0])
+                folded += len(events)
+            # Entries for tasks that no longer exist
+            conn.execute("DELETE FROM task_events WHERE task_id NOT IN (SELECT id FROM tasks)")
+        self._last_compaction = time.monotonic()
+        return folded
+
+    def reload(self) -> None:
+        """No-op, kept for callers of the JSON store: reads always hit the database."""
 
     def create_task(
         self,
@@ -196,21 +297,27 @@ class BackgroundTaskStorage:
             "error": None,
             "metadata": metadata or {},
         }
-        with self._file_locked() as tasks:
-            tasks.append(task)
-            if len(tasks) > MAX_TASK_ENTRIES:
-                # Mutate in place — the context manager persists the list.
-                del tasks[:-MAX_TASK_ENTRIES]
+        with self._write() as conn:
+            conn.execute(
+                "INSERT INTO tasks (id, owner, case_id, created_at, record) VALUES (?, ?, ?, ?, ?)",
+                (task_id, owner, case_id, timestamp, json.dumps(task, ensure_ascii=False)),
+            )
+            excess = conn.execute("SELECT COUNT(*) FROM tasks").fetchone()[0] - MAX_TASK_ENTRIES
+            if excess > 0:
+                dropped = [row[0] for row in conn.execute("SELECT id FROM tasks ORDER BY rowid LIMIT ?", (excess,))]
+                marks = ",".join("?" * len(dropped))
+                conn.execute(f"DELETE FROM tasks WHERE id IN ({marks})", dropped)
+                conn.execute(f"DELETE FROM task_events WHERE task_id IN ({marks})", dropped)
         return task
 
     def get_task(self, task_id: str) -> Optional[Dict]:
         """Get a task by ID."""
-        self._refresh_if_stale()
-        with self._lock:
-            for task in self._tasks:
-                if task.get("id") == task_id:
-                    return task
-            return None
+        with self._read() as conn:
+            row = conn.execute("SELECT record FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
+                return None
+            events = self._pending_events(conn, [task_id]).get(task_id, [])
+        return self._materialise(row["record"], events)
 
     def update_task(
         self,
@@ -225,10 +332,14 @@ class BackgroundTaskStorage:
         started_at: Optional[str] = None,
         completed_at: Optional[str] = None,
         stages: Optional[List[Dict]] = None,
+        profile: Optional[Dict] = None,
     ) -> Optional[Dict]:
         """
         Update a task's status and progress.
 
+        Appends one journal entry holding just the given fields; cheap
+        enough for sub-second progress reporting.
+
         Args:
             task_id: Task ID
             status: New status
@@ -241,71 +352,52 @@ class BackgroundTaskStorage:
             completed_at: When task completed (ISO timestamp)
             stages: Per-stage progress checklist (list of stage dicts), stored
                 under metadata.stages for the UI ingestion status panel
+            profile: Per-stage timing summary from the job's PipelineProfiler,
+                stored under metadata.profile
 
         Returns:
             Updated task dict or None if not found
         """
-        with self._file_locked() as tasks:
-            task = None
-            for t in tasks:
-                if t.get("id") == task_id:
-                    task = t
-                    break
-            if not task:
+        changes = {
+            key: value
+            for key, value in (
+                ("status", status),
+                ("progress_total", progress_total),
+                ("progress_completed", progress_completed),
+                ("progress_failed", progress_failed),
+                ("error", error),
+                ("started_at", started_at),
+                ("completed_at", completed_at),
+                ("stages", stages),
+                ("profile", profile),
+            )
+            if value is not None
+        }
+        if file_status is not None and file_status.get("file_id"):
+            changes["file_status"] = file_status
+        if not changes:
+            return self.get_task(task_id)
+        changes["updated_at"] = utcnow_iso()
+
+        with self._write() as conn:
+            row = conn.execute("SELECT record FROM tasks WHERE id = ?", (task_id,)).fetchone()
+            if row is None:
                 return None
-
-            updated = False
-
-            if status is not None:
-                task["status"] = status
-                updated = True
-
-            if progress_total is not None:
-                task["progress"]["total"] = progress_total
-                updated = True
-
-            if progress_completed is not None:
-                task["progress"]["completed"] = progress_completed
-                updated = True
-
-            if progress_failed is not None:
-                task["progress"]["failed"] = progress_failed
-                updated = True
-
-            if file_status is not None:
-                file_id = file_status.get("file_id")
-                if file_id:
-                    existing_file = next(
-                        (f for f in task["files"] if f.get("file_id") == file_id),
-                        None,
-                    )
-                    if existing_file:
-                        existing_file.update(file_status)
-                    else:
-                        task["files"].append(file_status)
-                        if len(task["files"]) > MAX_FILES_PER_TASK:
-                            task["files"] = task["files"][-MAX_FILES_PER_TASK:]
-                    updated = True
-
-            if error is not None:
-                task["error"] = error
-                updated = True
-
-            if started_at is not None:
-                task["started_at"] = started_at
-                updated = True
-
-            if completed_at is not None:
-                task["completed_at"] = completed_at
-                updated = True
-
-            if stages is not None:
-                task.setdefault("metadata", {})["stages"] = stages
-                updated = True
-
-            if updated:
-                task["updated_at"] = utcnow_iso()
-            return task
+            conn.execute(
+                "INSERT INTO task_events (task_id, changes) VALUES (?, ?)",
+                (task_id, json.dumps(changes, ensure_ascii=False)),
+            )
+            events = self._pending_events(conn, [task_id]).get(task_id, [])
+            task = self._materialise(row["record"], events)
+            if len(events) >= COMPACT_EVERY_EVENTS or changes.get("status") in _TERMINAL_STATUSES:
+                self._fold(conn, task_id, task, events[-1][0])
+
+        if time.monotonic() - self._last_compaction >= COMPACT_INTERVAL_SECS:
+            try:
+                self.compact()
+            except sqlite3.Error as e:
+                print(f"[BackgroundTasks] Journal compaction failed: {e}")
+        return task
 
     def list_tasks(
         self,
@@ -327,22 +419,104 @@ class BackgroundTaskStorage:
         Returns:
             List of task dicts
         """
-        self._refresh_if_stale()
-        with self._lock:
-            tasks = self._tasks.copy()  # Copy to avoid modification during iteration
-
-            if owner:
-                tasks = [t for t in tasks if t.get("owner") == owner]
+        clauses, params = [], []
+        if owner:
+            clauses.append("owner = ?")
+            params.append(owner)
+        if case_id:
+            clauses.append("case_id = ?")
+            params.append(case_id)
+        sql = "SELECT id, record FROM tasks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        with self._read() as conn:
+            rows = conn.execute(sql + " ORDER BY rowid", params).fetchall()
+            pending = self._pending_events(conn, [row["id"] for row in rows] if clauses else None)
+
+        tasks = [self._materialise(row["record"], pending.get(row["id"], [])) for row in rows]
+        if status:
+            tasks = [t for t in tasks if t.get("status") == status]
+
+        # Return most recent first, up to limit
+        tasks = sorted(tasks, key=lambda t: t.get("created_at", ""), reverse=True)
+        return tasks[:limit]
+
+    def changes_since(
+        self,
+        cursor: Optional[int],
+        known: Iterable[str] = (),
+        *,
+        owner: Optional[str] = None,
+        case_id: Optional[str] = None,
+        task_id: Optional[str] = None,
+    ) -> Tuple[List[Dict], int]:
+        """
+        What changed for the selected tasks since journal position ``cursor``.
 
-            if case_id:
-                tasks = [t for t in tasks if t.get("case_id") == case_id]
+        Backs the progress streams: each open stream calls this on a short
+        poll with the cursor it got last time, so updates made by any worker
+        (or the ingestion subprocess) reach every subscriber.
 
-            if status:
-                tasks = [t for t in tasks if t.get("status") == status]
+        Args:
+            cursor: Journal seq returned by the previous call (None on the first)
+            known: IDs of the tasks the caller has already been sent
+            owner / case_id / task_id: Which tasks to watch
 
-            # Return most recent first, up to limit
-            tasks = sorted(tasks, key=lambda t: t.get("created_at", ""), reverse=True)
-            return tasks[:limit]
+        Returns:
+            (messages, new_cursor). Each message is one of
+              {"type": "snapshot", "task": {...}}  full task: new to the caller,
+                  or journal entries it hadn't seen were compacted away
+              {"type": "delta", "task_id", "seq", "changes"}  one update_task call
+              {"type": "deleted", "task_id"}
+        """
+        clauses, params = [], []
+        for column, value in (("id", task_id), ("owner", owner), ("case_id", case_id)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        sql = "SELECT id, applied_seq FROM tasks"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        known = set(known)
+        messages: List[Dict] = []
+        with self._read() as conn:
+            # One read transaction, so the cursor matches what was read
+            conn.execute("BEGIN")
+            try:
+                row = conn.execute("SELECT seq FROM sqlite_sequence WHERE name = 'task_events'").fetchone()
+                high = row[0] if row else 0
+                since = high if cursor is None else cursor
+                rows = conn.execute(sql + " ORDER BY rowid", params).fetchall()
+                ids = [r["id"] for r in rows]
+                stale_ids = [
+                    r["id"] for r in rows
+                    if cursor is None or r["id"] not in known or r["applied_seq"] > since
+                ]
+                snapshots = []
+                if stale_ids:
+                    pending = self._pending_events(conn, stale_ids)
+                    for stale_id in stale_ids:
+                        record = conn.execute("SELECT record FROM tasks WHERE id = ?", (stale_id,)).fetchone()["record"]
+                        snapshots.append(self._materialise(record, pending.get(stale_id, [])))
+                deltas: List[sqlite3.Row] = []
+                skip = set(stale_ids)
+                fresh = [i for i in ids if i not in skip]
+                for start in range(0, len(fresh), 500):
+                    batch = fresh[start:start + 500]
+                    deltas.extend(conn.execute(
+                        f"SELECT seq, task_id, changes FROM task_events WHERE seq > ? AND seq <= ? "
+                        f"AND task_id IN ({','.join('?' * len(batch))}) ORDER BY seq",
+                        (since, high, *batch),
+                    ).fetchall())
+            finally:
+                conn.execute("COMMIT")
+
+        messages.extend({"type": "snapshot", "task": task} for task in snapshots)
+        for seq, changed_id, changes in sorted(deltas, key=lambda d: d[0]):
+            messages.append({"type": "delta", "task_id": changed_id, "seq": seq, "changes": json.loads(changes)})
+        for gone in known.difference(ids):
+            messages.append({"type": "deleted", "task_id": gone})
+        return messages, high
 
     def delete_task(self, task_id: str) -> bool:
         """
@@ -354,22 +528,11 @@ class BackgroundTaskStorage:
         Returns:
             True if deleted, False if not found
         """
-        with self._file_locked() as tasks:
-            task = None
-            for t in tasks:
-                if t.get("id") == task_id:
-                    task = t
-                    break
-            if not task:
-                return False
-            tasks.remove(task)
-            return True
+        with self._write() as conn:
+            deleted = conn.execute("DELETE FROM tasks WHERE id = ?", (task_id,)).rowcount
+            conn.execute("DELETE FROM task_events WHERE task_id = ?", (task_id,))
+        return deleted > 0
 
 
 # Singleton instance
 background_task_storage = BackgroundTaskStorage()
-
-
-
-
-
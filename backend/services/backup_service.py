@@ -329,6 +329,8 @@ class BackupService:
                         results["relationships_imported"] += 1
                     except Exception as e:
                         results["errors"].append(f"Failed to import relationship: {e}")
+
+            neo4j_service.bump_case_graph_version(target_case_id, names=True)
             
             # 3. Import Vector DB data
             if vector_db_service is None:
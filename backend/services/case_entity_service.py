@@ -148,7 +148,8 @@ def create_entity(
             props=props,
         )
         rec = result.single()
-        return _entity_from_record(rec["e"]) if rec else None
+    neo4j_service.bump_case_graph_version(case_id, names=True)
+    return _entity_from_record(rec["e"]) if rec else None
 
 
 def get_entity(case_id: str, entity_id: str) -> Optional[Dict[str, Any]]:
@@ -235,7 +236,8 @@ def update_entity(
             entity_id=entity_id,
             props=props,
         ).single()
-        return _entity_from_record(rec["e"]) if rec else None
+    neo4j_service.bump_case_graph_version(case_id, names=True)
+    return _entity_from_record(rec["e"]) if rec else None
 
 
 def archive_entity(case_id: str, entity_id: str) -> bool:
@@ -250,7 +252,8 @@ def archive_entity(case_id: str, entity_id: str) -> bool:
             entity_id=entity_id,
             now=_now_iso(),
         ).single()
-        return rec is not None
+    neo4j_service.bump_case_graph_version(case_id)
+    return rec is not None
 
 
 def delete_entity(case_id: str, entity_id: str) -> bool:
@@ -267,7 +270,8 @@ def delete_entity(case_id: str, entity_id: str) -> bool:
             case_id=case_id,
             entity_id=entity_id,
         ).single()
-        return rec is not None
+    neo4j_service.bump_case_graph_version(case_id, names=True)
+    return rec is not None
 
 
 # ----------------------------------------------------------------------------
@@ -292,7 +296,8 @@ def link_graph_node(case_id: str, entity_id: str, node_key: str) -> bool:
             node_key=node_key,
             now=_now_iso(),
         ).single()
-        return rec is not None
+    neo4j_service.bump_case_graph_version(case_id)
+    return rec is not None
 
 
 def unlink_graph_node(case_id: str, entity_id: str, node_key: str) -> bool:
@@ -315,7 +320,8 @@ def unlink_graph_node(case_id: str, entity_id: str, node_key: str) -> bool:
             entity_id=entity_id,
             now=_now_iso(),
         )
-        return True
+    neo4j_service.bump_case_graph_version(case_id)
+    return True
 
 
 # ----------------------------------------------------------------------------
@@ -0,0 +1,468 @@
+"""
+Case Precompute Service — background precomputation of per-case AI content.
+
+Suggested questions used to be static templates, and insight generation ran
+one LLM call per entity inside the request. This service computes, per case
+and per graph version:
+
+  - suggested questions grounded in the case's top entities;
+  - briefs for the top entities (a few sentences each);
+  - investigative insights for those entities (pending review).
+
+It runs as a ``case_precompute`` task in background_task_storage, so it shows
+in the task panel like ingestion. Runs are scheduled when evidence processing
+completes and whenever a read finds the stored results are for an older graph
+version (neo4j_service.get_case_graph_version). Reads never wait for the job: they
+serve whatever is stored, or the caller's fallback.
+
+Storage: data/case_precompute.db (SQLite, WAL), one row per case, shared by
+all workers.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from config import CASE_PRECOMPUTE_ENABLED, CASE_PRECOMPUTE_ENTITIES
+from services.background_task_storage import background_task_storage, TaskStatus
+from services._timeutil import utcnow_iso
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_FILE = BASE_DIR / "data" / "case_precompute.db"
+
+TASK_TYPE = "case_precompute"
+MAX_SUGGESTED_QUESTIONS = 6
+RESCHEDULE_DEBOUNCE_SECS = 60   # min gap between stale-read reschedules per case
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS case_precompute (
+    case_id             TEXT PRIMARY KEY,
+    graph_version       TEXT NOT NULL,
+    computed_at         TEXT NOT NULL,
+    task_id             TEXT,
+    suggested_questions TEXT NOT NULL,
+    entity_briefs       TEXT NOT NULL,
+    insights            TEXT NOT NULL,
+    insights_applied    INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def _suggestions_prompt(entities: List[Dict]) -> str:
+    lines = "\n".join(
+        f"- {e['name']} ({e.get('type') or 'Entity'}): {(e.get('summary') or '')[:300]}"
+        for e in entities
+    )
+    return f"""You are assisting a defense investigator reviewing a case.
+These are the most documented entities in the case:
+
+{lines}
+
+Write {MAX_SUGGESTED_QUESTIONS} short questions the investigator could ask an AI assistant
+about this case. Refer to entities by name. Cover people, money flows, timeline and
+inconsistencies.
+
+Return ONLY valid JSON: {{"questions": ["...", "..."]}}
+"""
+
+
+def _brief_prompt(entity: Dict) -> str:
+    facts = "\n".join(
+        f"- {f.get('text', str(f)) if isinstance(f, dict) else f}"
+        for f in (entity.get("verified_facts") or [])[:10]
+    ) or "None."
+    related = ", ".join(
+        f"{r.get('name')} ({r.get('relationship', 'related')})"
+        for r in (entity.get("related_entities") or [])[:10]
+    ) or "None."
+    return f"""Write a 2-3 sentence investigative brief for this entity.
+
+ENTITY: {entity['name']} (Type: {entity.get('type') or 'Unknown'})
+SUMMARY: {entity.get('summary') or 'No summary available.'}
+VERIFIED FACTS:
+{facts}
+CONNECTED TO: {related}
+
+Return ONLY valid JSON: {{"brief": "..."}}
+"""
+
+
+class CasePrecomputeService:
+    """Schedules, runs and serves per-case precomputed AI content."""
+
+    def __init__(self, db_file: Path = DB_FILE):
+        self.db_file = Path(db_file)
+        self.enabled = CASE_PRECOMPUTE_ENABLED
+        self._lock = threading.Lock()
+        self._initialised = False
+        self._running: set = set()
+        self._last_scheduled: Dict[str, float] = {}
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    conn.executescript(_SCHEMA)
+                    conn.commit()
+                    self._initialised = True
+        return conn
+
+    @staticmethod
+    def _graph_version(case_id: str) -> str:
+        from services.neo4j_service import neo4j_service
+        return neo4j_service.get_case_graph_version(case_id)
+
+    @staticmethod
+    def _save_insights(case_id: str, key: str, insights: List[Dict]) -> int:
+        """Append insights to an entity (bumps the case's graph version once)."""
+        from services.neo4j_service import neo4j_service
+        return neo4j_service.save_entity_insights(key, case_id, insights)["added"]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, case_id: str, refresh_if_stale: bool = True) -> Optional[Dict[str, Any]]:
+        """
+        Stored results for a case, or None if nothing has been computed yet.
+
+        The result carries ``stale`` (computed for an older graph version).
+        Stale or missing results schedule a refresh unless one is running.
+        """
+        if not self.enabled or not case_id:
+            return None
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT * FROM case_precompute WHERE case_id = ?", (case_id,)
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[Precompute] Read failed for case {case_id}: {e}")
+            return None
+
+        try:
+            current = self._graph_version(case_id)
+        except Exception as e:
+            print(f"[Precompute] Could not read graph version for {case_id}: {e}")
+            current = None
+        stale = row is None or (current is not None and row["graph_version"] != current)
+        if stale and refresh_if_stale:
+            now = time.time()
+            if now - self._last_scheduled.get(case_id, 0.0) >= RESCHEDULE_DEBOUNCE_SECS:
+                self.schedule(case_id, reason="graph_version_changed" if row else "missing")
+        if row is None:
+            return None
+        return {
+            "case_id": case_id,
+            "graph_version": row["graph_version"],
+            "computed_at": row["computed_at"],
+            "task_id": row["task_id"],
+            "stale": stale,
+            "suggested_questions": json.loads(row["suggested_questions"]),
+            "entity_briefs": json.loads(row["entity_briefs"]),
+            "insights": json.loads(row["insights"]),
+            "insights_applied": bool(row["insights_applied"]),
+        }
+
+    def take_insights(self, case_id: str, limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """
+        Precomputed insights for the current graph version, once.
+
+        Returns up to ``limit`` per-entity insight lists and removes them from
+        the stored row (marking it applied once nothing is left), so a second
+        call (or another worker) neither appends them again nor loses the
+        entities beyond the limit. Returns None when nothing current and
+        unapplied is stored.
+        """
+        if not self.enabled or not case_id:
+            return None
+        try:
+            current = self._graph_version(case_id)
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute(
+                    "SELECT insights FROM case_precompute "
+                    "WHERE case_id = ? AND graph_version = ? AND insights_applied = 0",
+                    (case_id, current),
+                ).fetchone()
+                if row is None:
+                    conn.rollback()
+                    return None
+                insights = json.loads(row["insights"]) if row["insights"] else []
+                taken = insights if limit is None else insights[:limit]
+                rest = [] if limit is None else insights[limit:]
+                if rest:
+                    conn.execute(
+                        "UPDATE case_precompute SET insights = ? WHERE case_id = ?",
+                        (json.dumps(rest), case_id),
+                    )
+                else:
+                    conn.execute(
+                        "UPDATE case_precompute SET insights_applied = 1 WHERE case_id = ?",
+                        (case_id,),
+                    )
+                conn.commit()
+                return taken
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[Precompute] Could not take insights for case {case_id}: {e}")
+            return None
+
+    def apply_insights(self, case_id: str, limit: Optional[int] = None) -> Optional[Dict[str, int]]:
+        """
+        Take up to ``limit`` precomputed insights (see take_insights) and
+        append them to their entities.
+
+        Each save bumps the case's graph version. When nothing else wrote to
+        the case meanwhile, the stored row is moved to the resulting version:
+        the graph now holds exactly what the job computed for, so the rest of
+        the insights stay takeable and the briefs and suggested questions are
+        not recomputed.
+
+        Returns:
+            {"entities_processed", "insights_generated"}, or None when nothing
+            current and unapplied is stored
+        """
+        try:
+            before = self._graph_version(case_id) if self.enabled and case_id else None
+        except Exception as e:
+            print(f"[Precompute] Could not read graph version for {case_id}: {e}")
+            return None
+        taken = self.take_insights(case_id, limit=limit)
+        if taken is None:
+            return None
+        saved, added = 0, 0
+        for item in taken:
+            try:
+                added += self._save_insights(case_id, item["key"], item["insights"])
+                saved += 1
+            except ValueError:
+                continue  # entity removed since the job ran
+        if saved:
+            self._restamp(case_id, before, saved)
+        return {"entities_processed": len(taken), "insights_generated": added}
+
+    def _restamp(self, case_id: str, before: str, bumps: int) -> None:
+        """Move the row from ``before`` to the current graph version if the
+        only writes since were our own ``bumps`` ("<epoch>:<counter>")."""
+        epoch, _, counter = before.rpartition(":")
+        try:
+            expected = f"{epoch}:{int(counter) + bumps}"
+            if self._graph_version(case_id) != expected:
+                return
+            conn = self._connect()
+            try:
+                conn.execute(
+                    "UPDATE case_precompute SET graph_version = ? WHERE case_id = ? AND graph_version = ?",
+                    (expected, case_id, before),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception as e:
+            print(f"[Precompute] Could not restamp case {case_id}: {e}")
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _active_task(self, case_id: str) -> Optional[Dict]:
+        for task in background_task_storage.list_tasks(case_id=case_id, limit=50):
+            if task.get("task_type") == TASK_TYPE and task.get("status") in (
+                TaskStatus.PENDING.value, TaskStatus.RUNNING.value,
+            ):
+                return task
+        return None
+
+    def schedule(
+        self,
+        case_id: str,
+        owner: Optional[str] = None,
+        reason: str = "manual",
+        force: bool = False,
+    ) -> Optional[str]:
+        """
+        Start a precompute task for a case in a background thread.
+
+        Skipped (returns None) when disabled, when a run for the case is
+        already pending/running in any worker, or — unless ``force`` — when
+        the stored results already match the current graph version.
+
+        Returns:
+            The background task id, or None if nothing was started
+        """
+        if not self.enabled or not case_id:
+            return None
+        self._last_scheduled[case_id] = time.time()
+        if not force:
+            try:
+                stored = self._stored_version(case_id)
+                if stored is not None and stored == self._graph_version(case_id):
+                    return None
+            except Exception:
+                pass
+        with self._lock:
+            if case_id in self._running or self._active_task(case_id):
+                return None
+            self._running.add(case_id)
+
+        try:
+            task = background_task_storage.create_task(
+                task_type=TASK_TYPE,
+                task_name="Precomputing suggested questions, entity briefs and insights",
+                owner=owner,
+                case_id=case_id,
+                metadata={"reason": reason},
+            )
+        except Exception:
+            with self._lock:
+                self._running.discard(case_id)
+            raise
+        thread = threading.Thread(
+            target=self._run, args=(case_id, task["id"]),
+            daemon=True, name=f"case-precompute-{task['id']}",
+        )
+        thread.start()
+        print(f"[Precompute] Scheduled case {case_id} ({reason}), task {task['id']}")
+        return task["id"]
+
+    def _stored_version(self, case_id: str) -> Optional[str]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT graph_version FROM case_precompute WHERE case_id = ?", (case_id,)
+            ).fetchone()
+            return row["graph_version"] if row else None
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # The job
+    # ------------------------------------------------------------------
+
+    def _run(self, case_id: str, task_id: str) -> None:
+        from services.llm_service import LLMService
+        from services.neo4j_service import neo4j_service
+        from services.insights_service import generate_entity_insights
+
+        try:
+            background_task_storage.update_task(
+                task_id, status=TaskStatus.RUNNING.value, started_at=utcnow_iso(),
+            )
+            # Version first: if the graph changes mid-run the stored row is
+            # already stale and the next read reschedules
+            graph_version = self._graph_version(case_id)
+            llm = LLMService()
+            entities = neo4j_service.get_entities_for_insights(case_id, CASE_PRECOMPUTE_ENTITIES)
+            total = len(entities) + 1
+            background_task_storage.update_task(
+                task_id, progress_total=total, progress_completed=0, progress_failed=0,
+            )
+
+            completed, failed = 0, 0
+            questions = self._suggest_questions(llm, entities)
+            completed += 1
+            background_task_storage.update_task(task_id, progress_completed=completed)
+
+            briefs, insights = [], []
+            for entity in entities:
+                try:
+                    briefs.append({
+                        "key": entity["key"],
+                        "name": entity["name"],
+                        "type": entity.get("type"),
+                        "brief": self._entity_brief(llm, entity),
+                        "related_count": len(entity.get("related_entities") or []),
+                    })
+                    new_insights = generate_entity_insights(
+                        entity_data={
+                            "name": entity["name"], "type": entity["type"],
+                            "summary": entity.get("summary"),
+                        },
+                        verified_facts=entity.get("verified_facts", []),
+                        related_entities=entity.get("related_entities", []),
+                        # Not cached: the insights are appended to the entity
+                        llm_call_fn=llm.call,
+                    )
+                    if new_insights:
+                        insights.append({"key": entity["key"], "insights": new_insights})
+                    completed += 1
+                except Exception as e:
+                    print(f"[Precompute] Entity {entity.get('key')} failed: {e}")
+                    failed += 1
+                background_task_storage.update_task(
+                    task_id, progress_completed=completed, progress_failed=failed,
+                )
+
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """INSERT OR REPLACE INTO case_precompute
+                       (case_id, graph_version, computed_at, task_id, suggested_questions,
+                        entity_briefs, insights, insights_applied)
+                       VALUES (?,?,?,?,?,?,?,0)""",
+                    (case_id, graph_version, utcnow_iso(), task_id, json.dumps(questions),
+                     json.dumps(briefs), json.dumps(insights)),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+
+            background_task_storage.update_task(
+                task_id, status=TaskStatus.COMPLETED.value, completed_at=utcnow_iso(),
+            )
+            print(f"[Precompute] Case {case_id}: {len(questions)} questions, "
+                  f"{len(briefs)} briefs, {sum(len(i['insights']) for i in insights)} insights")
+        except Exception as e:
+            print(f"[Precompute] Case {case_id} failed: {e}")
+            background_task_storage.update_task(
+                task_id, status=TaskStatus.FAILED.value, error=str(e), completed_at=utcnow_iso(),
+            )
+        finally:
+            with self._lock:
+                self._running.discard(case_id)
+
+    @staticmethod
+    def _suggest_questions(llm, entities: List[Dict]) -> List[str]:
+        if not entities:
+            return []
+        try:
+            response = llm.call(
+                _suggestions_prompt(entities), 0.4, True,
+                cache_site="suggested_questions", cache_ttl=24 * 3600,
+            )
+            questions = json.loads(response).get("questions", [])
+            return [q.strip() for q in questions if isinstance(q, str) and q.strip()][:MAX_SUGGESTED_QUESTIONS]
+        except Exception as e:
+            print(f"[Precompute] Suggested questions failed: {e}")
+            return []
+
+    @staticmethod
+    def _entity_brief(llm, entity: Dict) -> str:
+        try:
+            response = llm.call(
+                _brief_prompt(entity), 0.2, True,
+                cache_site="entity_brief", cache_ttl=24 * 3600,
+            )
+            brief = json.loads(response).get("brief")
+            if isinstance(brief, str) and brief.strip():
+                return brief.strip()
+        except Exception as e:
+            print(f"[Precompute] Brief for {entity.get('key')} failed: {e}")
+        return (entity.get("summary") or "")[:500]
+
+
+case_precompute_service = CasePrecomputeService()
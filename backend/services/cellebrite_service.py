@@ -251,6 +251,7 @@ def process_cellebrite_report(
     from .background_task_storage import background_task_storage, TaskStatus
     from .evidence_storage import evidence_storage
     from .evidence_log_storage import evidence_log_storage
+    from .pipeline_profiler import task_profiler
 
     # Update task to running
     background_task_storage.update_task(
@@ -324,7 +325,7 @@ def process_cellebrite_report(
         #   - the stalled-task heuristic in BackgroundTasksPanel
         #   - the startup watchdog (V3) — anything older than 5 min is
         #     declared dead.
-        # The orchestrator already throttles to ~1 call/2s; no
+        # The orchestrator already throttles to ~2 calls/s; no
         # additional rate-limiting needed here.
         # The pipeline emits a `phase` on its progress payloads; we translate
         # phase→stage and stamp start/end times as stages transition.
@@ -366,15 +367,20 @@ def process_cellebrite_report(
             except Exception as e:
                 _log(f"WARNING: heartbeat update failed: {e}")
 
-        result = ingest_cellebrite_report(
-            report_dir=folder_path,
-            case_id=case_id,
-            log_callback=_log,
-            owner=owner,
-            evidence_storage=evidence_storage,
-            progress_callback=_heartbeat,
-            device_identifier=device_identifier,
-        )
+        profiler = task_profiler(task_id, f"cellebrite-ingest {task_id}")
+        try:
+            with profiler.activate():
+                result = ingest_cellebrite_report(
+                    report_dir=folder_path,
+                    case_id=case_id,
+                    log_callback=_log,
+                    owner=owner,
+                    evidence_storage=evidence_storage,
+                    progress_callback=_heartbeat,
+                    device_identifier=device_identifier,
+                )
+        finally:
+            profiler.finish()
 
         if result.get("status") == "success":
             # Failure-rate threshold: if more than 5% of expected
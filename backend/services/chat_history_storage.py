@@ -4,6 +4,11 @@ Chat History Storage Service
 Per-chat JSON files under data/chat_histories/ plus a lightweight _index.json of
 summaries. Startup only loads the index, not the chat bodies, so memory stays
 bounded regardless of total chat volume.
+
+Per-turn retrieval metrics are appended by the chat endpoint, keyed by the
+conversation id the chat panel sends, to data/chat_histories/_retrieval/
+<conversation_id>.jsonl. A saved chat that carries the conversation_id gets
+them back as ``retrieval_turns``.
 """
 
 import json
@@ -13,9 +18,10 @@ from typing import Dict, List, Optional
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 STORAGE_DIR = BASE_DIR / "data" / "chat_histories"
 INDEX_FILE = STORAGE_DIR / "_index.json"
+RETRIEVAL_DIR = STORAGE_DIR / "_retrieval"
 
 SUMMARY_FIELDS = ("id", "name", "timestamp", "created_at", "owner",
-                  "snapshot_id", "case_id", "case_version")
+                  "snapshot_id", "case_id", "case_version", "conversation_id")
 
 
 def _ensure_dir() -> None:
@@ -72,15 +78,20 @@ class ChatHistoryStorage:
             return None
         try:
             with open(path, "r", encoding="utf-8") as f:
-                return json.load(f)
+                chat = json.load(f)
         except (json.JSONDecodeError, IOError) as e:
             print(f"Error loading chat {chat_id}: {e}")
             return None
+        if chat.get("conversation_id"):
+            chat["retrieval_turns"] = self.get_retrieval_turns(chat["conversation_id"])
+        return chat
 
     def save(self, chat_id: str, chat_data: Dict) -> None:
         if not _safe_chat_id(chat_id):
             raise ValueError(f"unsafe chat_id: {chat_id!r}")
         _ensure_dir()
+        # retrieval_turns live in the per-conversation log, not the chat body
+        chat_data = {k: v for k, v in chat_data.items() if k != "retrieval_turns"}
         _atomic_write(_chat_path(chat_id), chat_data)
         self._index[chat_id] = _summarize(chat_id, chat_data)
         _atomic_write(INDEX_FILE, self._index)
@@ -109,6 +120,36 @@ class ChatHistoryStorage:
         """Return summary dicts (no messages) for a snapshot's chats."""
         return [s for s in self._index.values() if s.get("snapshot_id") == snapshot_id]
 
+    def record_retrieval_turn(self, conversation_id: str, turn: Dict) -> None:
+        """Append one turn's retrieval metrics to the conversation's log."""
+        if not _safe_chat_id(conversation_id):
+            return
+        try:
+            RETRIEVAL_DIR.mkdir(parents=True, exist_ok=True)
+            with open(RETRIEVAL_DIR / f"{conversation_id}.jsonl", "a", encoding="utf-8") as f:
+                f.write(json.dumps(turn, ensure_ascii=False) + "\n")
+        except OSError as e:
+            print(f"Error recording retrieval turn for {conversation_id}: {e}")
+
+    def get_retrieval_turns(self, conversation_id: str) -> List[Dict]:
+        """Per-turn retrieval metrics recorded for a conversation, oldest first."""
+        if not _safe_chat_id(conversation_id):
+            return []
+        path = RETRIEVAL_DIR / f"{conversation_id}.jsonl"
+        if not path.exists():
+            return []
+        turns = []
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        turns.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        continue
+        except OSError as e:
+            print(f"Error loading retrieval turns for {conversation_id}: {e}")
+        return turns
+
     def reload(self) -> None:
         self._index = _load_index()
 
@@ -0,0 +1,300 @@
+"""
+Chunk Lexical Index — per-case BM25 search over chunk text (SQLite FTS5).
+
+Vector search is good at meaning but poor at exact identifiers: account
+numbers, phone numbers, case references. This index complements the
+ChromaDB chunks collection so RAG retrieval can fuse both rankings.
+
+Design:
+  - One SQLite file per case under data/lexical_index/, so BM25 statistics
+    are per case and deleting a case is a file unlink.
+  - A plain ``chunks`` table (keyed by chunk_id) is the FTS5 external-content
+    source, kept in sync by triggers, so upserts and deletes by chunk_id are
+    indexed lookups.
+  - Two indexed columns: the chunk text (unicode61 tokenizer) and an
+    ``identifiers`` column holding separator-free forms of number/code-like
+    spans, so "(240) 429-1127", "240.429.1127" and "2404291127" all match.
+  - Maintained incrementally by VectorDBService: every chunk upsert/delete
+    there is mirrored here, so ingestion builds the index as it goes.
+"""
+
+import json
+import re
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+INDEX_DIR = BASE_DIR / "data" / "lexical_index"
+
+IDENTIFIER_WEIGHT = 5.0     # bm25 column weight of identifiers vs. text (1.0)
+MAX_QUERY_TERMS = 32
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS chunks (
+    id          INTEGER PRIMARY KEY,
+    chunk_id    TEXT NOT NULL UNIQUE,
+    doc_id      TEXT,
+    doc_key     TEXT,
+    metadata    TEXT NOT NULL,
+    text        TEXT NOT NULL,
+    identifiers TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_chunks_doc_id ON chunks(doc_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS chunk_fts USING fts5(
+    text, identifiers,
+    content='chunks', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2'
+);
+
+CREATE TRIGGER IF NOT EXISTS chunks_ai AFTER INSERT ON chunks BEGIN
+    INSERT INTO chunk_fts(rowid, text, identifiers) VALUES (new.id, new.text, new.identifiers);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_ad AFTER DELETE ON chunks BEGIN
+    INSERT INTO chunk_fts(chunk_fts, rowid, text, identifiers) VALUES ('delete', old.id, old.text, old.identifiers);
+END;
+CREATE TRIGGER IF NOT EXISTS chunks_au AFTER UPDATE ON chunks BEGIN
+    INSERT INTO chunk_fts(chunk_fts, rowid, text, identifiers) VALUES ('delete', old.id, old.text, old.identifiers);
+    INSERT INTO chunk_fts(rowid, text, identifiers) VALUES (new.id, new.text, new.identifiers);
+END;
+"""
+
+# Runs of digits broken up by spaces/punctuation: phone, account, card numbers
+_NUMBER_SPAN = re.compile(r"\+?\d[\d\s().\-/]{3,}\d")
+# Codes joining letters and digits with separators: "ACC-1234", "CR/2023/001"
+_CODE_SPAN = re.compile(r"\b[A-Za-z0-9]+(?:[-_/.:][A-Za-z0-9]+)+\b")
+_WORD = re.compile(r"\w+")
+
+_STOPWORDS = frozenset(
+    "a an and are as at be by did do does for from had has have he her him his how i if in "
+    "into is it its me my of on or our she so than that the their them then there these they "
+    "this to was we were what when where which who whom why will with you your".split()
+)
+
+
+def extract_identifiers(text: str) -> List[str]:
+    """Separator-free, lower-cased forms of number and code spans in ``text``."""
+    found = []
+    for m in _NUMBER_SPAN.finditer(text):
+        digits = re.sub(r"\D", "", m.group())
+        if len(digits) >= 5:
+            found.append(digits)
+        if len(digits) > 10:
+            # Also the national part, so "+1 240 429 1127" matches "240-429-1127"
+            found.append(digits[-10:])
+    for m in _CODE_SPAN.finditer(text):
+        span = m.group()
+        if any(c.isdigit() for c in span):
+            found.append(re.sub(r"[^0-9A-Za-z]", "", span).lower())
+    return list(dict.fromkeys(found))
+
+
+def _fts_term(term: str) -> str:
+    return '"' + term.replace('"', '""') + '"'
+
+
+def build_match_query(question: str) -> Optional[str]:
+    """FTS5 MATCH expression: OR of the question's terms and identifiers."""
+    terms = []
+    for word in _WORD.findall(question.lower()):
+        if len(word) > 1 and word not in _STOPWORDS and word not in terms:
+            terms.append(word)
+    identifiers = extract_identifiers(question)
+    clauses = [_fts_term(t) for t in terms[:MAX_QUERY_TERMS]]
+    clauses += [f"identifiers : {_fts_term(i)}" for i in identifiers]
+    return " OR ".join(clauses) if clauses else None
+
+
+def _safe_name(case_id: str) -> str:
+    return re.sub(r"[^A-Za-z0-9_.-]", "_", case_id)
+
+
+class ChunkLexicalIndex:
+    """Per-case SQLite FTS5 indexes over chunk text."""
+
+    def __init__(self, index_dir: Path = INDEX_DIR):
+        self.index_dir = Path(index_dir)
+        self._initialised: set = set()
+        self._lock = threading.Lock()
+
+    def _path(self, case_id: str) -> Path:
+        return self.index_dir / f"{_safe_name(case_id)}.db"
+
+    def _connect(self, case_id: str, create: bool = True) -> Optional[sqlite3.Connection]:
+        path = self._path(case_id)
+        if not create and not path.exists():
+            return None
+        path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(path, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        if case_id not in self._initialised:
+            with self._lock:
+                conn.executescript(_SCHEMA)
+                conn.commit()
+                self._initialised.add(case_id)
+        return conn
+
+    def add_chunks(
+        self,
+        chunk_ids: Sequence[str],
+        texts: Sequence[str],
+        metadatas: Sequence[Optional[Dict]],
+    ) -> int:
+        """
+        Upsert chunks; rows are routed to their case by ``metadata["case_id"]``.
+
+        Returns:
+            Number of chunks indexed (rows without a case_id are skipped)
+        """
+        by_case: Dict[str, List[tuple]] = {}
+        for chunk_id, text, metadata in zip(chunk_ids, texts, metadatas):
+            metadata = metadata or {}
+            case_id = metadata.get("case_id")
+            if not case_id or not text:
+                continue
+            by_case.setdefault(str(case_id), []).append((
+                chunk_id,
+                metadata.get("doc_id"),
+                metadata.get("doc_key"),
+                json.dumps(metadata, default=str),
+                text,
+                " ".join(extract_identifiers(text)),
+            ))
+
+        written = 0
+        for case_id, rows in by_case.items():
+            try:
+                conn = self._connect(case_id)
+                try:
+                    conn.executemany(
+                        """INSERT INTO chunks (chunk_id, doc_id, doc_key, metadata, text, identifiers)
+                           VALUES (?,?,?,?,?,?)
+                           ON CONFLICT(chunk_id) DO UPDATE SET
+                               doc_id = excluded.doc_id, doc_key = excluded.doc_key,
+                               metadata = excluded.metadata, text = excluded.text,
+                               identifiers = excluded.identifiers""",
+                        rows,
+                    )
+                    conn.commit()
+                    written += len(rows)
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                print(f"[LexicalIndex] Failed to index {len(rows)} chunks for case {case_id}: {e}")
+        return written
+
+    def delete_chunks(self, case_id: str, chunk_ids: Sequence[str]) -> None:
+        """Remove chunks by id from one case's index."""
+        if not chunk_ids:
+            return
+        try:
+            conn = self._connect(case_id, create=False)
+            if conn is None:
+                return
+            try:
+                conn.executemany("DELETE FROM chunks WHERE chunk_id = ?", [(c,) for c in chunk_ids])
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LexicalIndex] Delete failed for case {case_id}: {e}")
+
+    def delete_case(self, case_id: str) -> None:
+        """Drop a case's index file."""
+        path = self._path(case_id)
+        for suffix in ("", "-wal", "-shm"):
+            Path(str(path) + suffix).unlink(missing_ok=True)
+        self._initialised.discard(case_id)
+
+    def count(self, case_id: str) -> int:
+        try:
+            conn = self._connect(case_id, create=False)
+            if conn is None:
+                return 0
+            try:
+                return conn.execute("SELECT COUNT(*) FROM chunks").fetchone()[0]
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return 0
+
+    def search(
+        self,
+        case_id: str,
+        query: str,
+        top_k: int = 20,
+        doc_keys: Optional[List[str]] = None,
+    ) -> List[Dict]:
+        """
+        BM25-ranked chunks for a free-text query.
+
+        Returns:
+            List of result dicts with: id, text, metadata, bm25 (lower = better)
+        """
+        match = build_match_query(query or "")
+        if not match or not case_id:
+            return []
+        try:
+            conn = self._connect(case_id, create=False)
+            if conn is None:
+                return []
+            try:
+                sql = (
+                    "SELECT c.chunk_id, c.text, c.metadata, "
+                    f"bm25(chunk_fts, 1.0, {IDENTIFIER_WEIGHT}) AS score "
+                    "FROM chunk_fts JOIN chunks c ON c.id = chunk_fts.rowid "
+                    "WHERE chunk_fts MATCH ?"
+                )
+                params: list = [match]
+                if doc_keys:
+                    sql += f" AND c.doc_key IN ({','.join('?' * len(doc_keys))})"
+                    params.extend(doc_keys)
+                sql += " ORDER BY score LIMIT ?"
+                params.append(top_k)
+                rows = conn.execute(sql, params).fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LexicalIndex] Search failed for case {case_id}: {e}")
+            return []
+
+        return [
+            {
+                "id": r["chunk_id"],
+                "text": r["text"],
+                "metadata": json.loads(r["metadata"]),
+                "bm25": r["score"],
+            }
+            for r in rows
+        ]
+
+
+def reciprocal_rank_fusion(
+    rankings: Dict[str, List[Dict]],
+    k: int = 60,
+    limit: Optional[int] = None,
+) -> List[Dict]:
+    """
+    Fuse ranked result lists (each item needs an "id") by reciprocal rank.
+
+    Each fused item is the first dict seen for its id, annotated with
+    ``rrf_score`` and ``<name>_rank`` (1-based) for every list it appeared in.
+    """
+    fused: Dict[str, Dict] = {}
+    for name, results in rankings.items():
+        for rank, result in enumerate(results, start=1):
+            item = fused.get(result["id"])
+            if item is None:
+                item = fused[result["id"]] = dict(result)
+                item["rrf_score"] = 0.0
+            item["rrf_score"] += 1.0 / (k + rank)
+            item[f"_{name}_rank"] = rank
+    ordered = sorted(fused.values(), key=lambda r: r["rrf_score"], reverse=True)
+    return ordered[:limit] if limit else ordered
+
+
+chunk_lexical_index = ChunkLexicalIndex()
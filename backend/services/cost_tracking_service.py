@@ -163,9 +163,61 @@ def record_cost(
             db.close()
 
 
+def record_cache_event(
+    hit: bool,
+    call_site: str,
+    provider: str,
+    model_id: str,
+    prompt_tokens: Optional[int] = None,
+    completion_tokens: Optional[int] = None,
+) -> None:
+    """
+    Record an LLM response cache hit or miss.
+    
+    A hit is priced at what the original call cost (OpenAI only), so the
+    savings from caching show up next to the real spend.
+    
+    Args:
+        hit: True if the response was served from cache
+        call_site: Name the caller opted into caching with
+        provider: Provider name ("openai" or "ollama")
+        model_id: Model ID
+        prompt_tokens: Prompt tokens of the cached response (hits only)
+        completion_tokens: Completion tokens of the cached response (hits only)
+    """
+    from services.llm_response_cache import llm_response_cache
+    
+    saved_cost = 0.0
+    if hit and provider == "openai":
+        saved_cost = calculate_cost(model_id, prompt_tokens or 0, completion_tokens or 0)
+    
+    llm_response_cache.record_stats(
+        call_site=call_site,
+        provider=provider,
+        model_id=model_id,
+        hit=hit,
+        saved_prompt_tokens=(prompt_tokens or 0) if hit else 0,
+        saved_completion_tokens=(completion_tokens or 0) if hit else 0,
+        saved_cost_usd=saved_cost,
+    )
+
+
+def get_cache_savings() -> Dict[str, Any]:
+    """
+    Get LLM response cache hit/miss counts and estimated savings.
+    
+    Returns:
+        Dict with totals and a per-call-site breakdown
+    """
+    from services.llm_response_cache import llm_response_cache
+    return llm_response_cache.stats()
+
+
 # Singleton instance
 cost_tracking_service = {
     "record_cost": record_cost,
     "calculate_cost": calculate_cost,
     "get_model_pricing": get_model_pricing,
+    "record_cache_event": record_cache_event,
+    "get_cache_savings": get_cache_savings,
 }
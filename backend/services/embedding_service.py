@@ -4,8 +4,15 @@ Embedding generation service.
 Supports both OpenAI and local (Ollama) models for generating text embeddings.
 """
 
-from typing import List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
 import os
+import random
+import time
+
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
 
 # Try to import OpenAI (optional)
 try:
@@ -21,7 +28,21 @@ try:
 except ImportError:
     OLLAMA_AVAILABLE = False
 
-from config import EMBEDDING_PROVIDER, EMBEDDING_MODEL, OPENAI_API_KEY, LLM_PROVIDER
+from config import (
+    EMBEDDING_PROVIDER, EMBEDDING_MODEL, OPENAI_API_KEY, LLM_PROVIDER,
+    OLLAMA_BASE_URL, EMBEDDING_CONCURRENCY, EMBEDDING_MAX_RETRIES,
+)
+from services.pipeline_profiler import stage
+
+
+def l2_normalise(vectors: List[List[float]]) -> List[List[float]]:
+    """Scale each vector to unit length (zero vectors are left as they are)."""
+    normalised = []
+    for vector in vectors:
+        arr = np.asarray(vector, dtype=np.float64)
+        norm = np.linalg.norm(arr)
+        normalised.append((arr / norm).tolist() if norm > 0 else list(vector))
+    return normalised
 
 
 class EmbeddingService:
@@ -65,8 +86,20 @@ class EmbeddingService:
         elif self.provider == "ollama":
             if not OLLAMA_AVAILABLE:
                 raise ImportError("Ollama package not installed. Install with: pip install ollama")
-            self.client = ollama
+            # Bound to OLLAMA_BASE_URL like the /api/embed requests (the
+            # module-level client would follow OLLAMA_HOST instead)
+            self.client = ollama.Client(host=OLLAMA_BASE_URL)
             self._validate_ollama_model()
+            # Persistent keep-alive session for the batched /api/embed path,
+            # with one pooled connection per concurrent worker
+            self._session = requests.Session()
+            adapter = HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=max(1, EMBEDDING_CONCURRENCY),
+            )
+            self._session.mount("http://", adapter)
+            self._session.mount("https://", adapter)
+            self._ollama_batch_supported = True
         
         else:
             raise ValueError(f"Unsupported embedding provider: {self.provider}. Use 'openai' or 'ollama'")
@@ -103,87 +136,177 @@ class EmbeddingService:
         if not text or not text.strip():
             raise ValueError("Text cannot be empty")
         
-        try:
-            if self.provider == "openai":
-                response = self.client.embeddings.create(
-                    model=self.model,
-                    input=text
-                )
-                return response.data[0].embedding
+        with stage("embeddings:single") as span:
+            span.add(count=1, bytes=len(text))
+            try:
+                if self.provider == "openai":
+                    response = self.client.embeddings.create(
+                        model=self.model,
+                        input=text
+                    )
+                    return response.data[0].embedding
             
-            elif self.provider == "ollama":
-                response = self.client.embeddings(
-                    model=self.model,
-                    prompt=text
-                )
-                return response["embedding"]
+                elif self.provider == "ollama":
+                    # Same path as document batches, so query and stored
+                    # vectors are comparable
+                    return self._embed_ollama_batch([text])[0]
             
-            else:
-                raise ValueError(f"Unsupported provider: {self.provider}")
+                else:
+                    raise ValueError(f"Unsupported provider: {self.provider}")
         
-        except Exception as e:
-            error_msg = str(e)
-            # Provide more helpful error messages
-            if "Failed to connect" in error_msg or "Connection refused" in error_msg or "ollama" in error_msg.lower():
-                if self.provider == "ollama":
-                    raise ConnectionError(
-                        f"Failed to connect to Ollama. Please check that Ollama is running and accessible at the configured URL. "
-                        f"Error: {error_msg}. "
-                        f"To fix: 1) Start Ollama (docker run -d -p 11434:11434 ollama/ollama or 'ollama serve'), "
-                        f"2) Or switch to OpenAI embeddings by setting EMBEDDING_PROVIDER=openai and OPENAI_API_KEY in your .env file"
-                    )
-            print(f"[Embedding] Error generating embedding: {e}")
-            raise
+            except Exception as e:
+                error_msg = str(e)
+                # Provide more helpful error messages
+                if "Failed to connect" in error_msg or "Connection refused" in error_msg or "ollama" in error_msg.lower():
+                    if self.provider == "ollama":
+                        raise ConnectionError(
+                            f"Failed to connect to Ollama. Please check that Ollama is running and accessible at the configured URL. "
+                            f"Error: {error_msg}. "
+                            f"To fix: 1) Start Ollama (docker run -d -p 11434:11434 ollama/ollama or 'ollama serve'), "
+                            f"2) Or switch to OpenAI embeddings by setting EMBEDDING_PROVIDER=openai and OPENAI_API_KEY in your .env file"
+                        )
+                print(f"[Embedding] Error generating embedding: {e}")
+                raise
     
+    def _embed_ollama_batch(self, texts: List[str]) -> List[List[float]]:
+        """
+        Embed a list of texts with a single Ollama request.
+
+        Uses the batch ``/api/embed`` input form; falls back to one
+        ``/api/embeddings`` request per text on Ollama servers that predate it.
+        Only ``/api/embed`` normalises, so both results are L2-normalised here:
+        ChromaDB's L2 distance (and rag_service's thresholds on it) then mean
+        the same whichever endpoint produced a vector. Vectors stored before
+        this are rescaled once by VectorDBService.
+        """
+        base_url = OLLAMA_BASE_URL.rstrip("/")
+        if self._ollama_batch_supported:
+            response = self._session.post(
+                f"{base_url}/api/embed",
+                json={"model": self.model, "input": texts},
+                timeout=300,
+            )
+            # Ollama also answers 404 for an unknown model; only an endpoint
+            # miss means the server predates /api/embed
+            if response.status_code == 404 and "model" not in response.text.lower():
+                print("[Embedding] Ollama server has no /api/embed; falling back to /api/embeddings")
+                self._ollama_batch_supported = False
+            else:
+                response.raise_for_status()
+                embeddings = response.json().get("embeddings") or []
+                if len(embeddings) != len(texts):
+                    raise ValueError(
+                        f"Ollama returned {len(embeddings)} embeddings for {len(texts)} inputs"
+                    )
+                return l2_normalise(embeddings)
+
+        embeddings = []
+        for text in texts:
+            response = self._session.post(
+                f"{base_url}/api/embeddings",
+                json={"model": self.model, "prompt": text},
+                timeout=300,
+            )
+            response.raise_for_status()
+            embeddings.append(response.json()["embedding"])
+        return l2_normalise(embeddings)
+
+    def _embed_batch(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of texts with one provider request."""
+        if self.provider == "openai":
+            response = self.client.embeddings.create(
+                model=self.model,
+                input=texts
+            )
+            return [item.embedding for item in response.data]
+        return self._embed_ollama_batch(texts)
+
+    def _embed_single_with_retry(self, text: str) -> Optional[List[float]]:
+        """Embed one text, retrying with jittered exponential backoff. Returns None on failure."""
+        for attempt in range(1, EMBEDDING_MAX_RETRIES + 1):
+            try:
+                return self._embed_batch([text])[0]
+            except Exception as e:
+                if attempt == EMBEDDING_MAX_RETRIES:
+                    print(f"[Embedding] Giving up on item after {attempt} attempts: {e}")
+                    return None
+                time.sleep(min(8.0, 0.5 * 2 ** (attempt - 1)) * (0.5 + random.random()))
+        return None
+
+    def _embed_indexed_batch(self, indexed: List[tuple]) -> Dict[int, List[float]]:
+        """
+        Embed one batch of (input_index, text) pairs.
+
+        If the batch request fails, each item is retried on its own so a
+        single bad input doesn't drop its neighbours.
+        """
+        try:
+            vectors = self._embed_batch([text for _, text in indexed])
+            return {idx: vec for (idx, _), vec in zip(indexed, vectors)}
+        except Exception as e:
+            print(f"[Embedding] Batch of {len(indexed)} failed ({e}); retrying items individually")
+
+        results = {}
+        for idx, text in indexed:
+            vec = self._embed_single_with_retry(text)
+            if vec is not None:
+                results[idx] = vec
+        return results
+
     def generate_embeddings_batch(
         self,
         texts: List[str],
-        batch_size: int = 100
-    ) -> List[List[float]]:
+        batch_size: int = 100,
+        max_workers: Optional[int] = None,
+    ) -> np.ndarray:
         """
         Generate embeddings for multiple texts in batches.
+
+        OpenAI batches are sent sequentially. Ollama batches use the
+        ``/api/embed`` input form and are sent concurrently over a pooled
+        keep-alive session, bounded by ``EMBEDDING_CONCURRENCY``.
         
         Args:
             texts: List of texts to embed
             batch_size: Number of texts per batch (OpenAI supports up to 2048)
+            max_workers: Concurrent Ollama requests (defaults to EMBEDDING_CONCURRENCY)
             
         Returns:
-            List of embedding vectors
+            float32 array of shape (len(texts), dim), row-aligned with ``texts``.
+            Rows for empty texts, or texts that still failed after per-item
+            retry, are NaN — check with ``np.isnan(result).any(axis=1)``.
         """
         if not texts:
-            return []
-        
-        embeddings = []
-        
-        # Filter out empty texts
-        valid_texts = [t for t in texts if t and t.strip()]
-        if len(valid_texts) < len(texts):
-            print(f"[Embedding] Warning: {len(texts) - len(valid_texts)} empty texts filtered out")
-        
-        for i in range(0, len(valid_texts), batch_size):
-            batch = valid_texts[i:i + batch_size]
-            
-            try:
-                if self.provider == "openai":
-                    # OpenAI supports batch requests (up to 2048 texts)
-                    response = self.client.embeddings.create(
-                        model=self.model,
-                        input=batch
-                    )
-                    batch_embeddings = [item.embedding for item in response.data]
-                else:
-                    # Ollama: process one by one (no batch support)
-                    batch_embeddings = [
-                        self.generate_embedding(text) for text in batch
-                    ]
-                
-                embeddings.extend(batch_embeddings)
-            
-            except Exception as e:
-                print(f"[Embedding] Error in batch {i//batch_size + 1}: {e}")
-                # Continue with remaining batches
-                continue
-        
+            return np.zeros((0, self.get_embedding_dimension()), dtype=np.float32)
+
+        # Skip empty texts but keep their positions
+        indexed = [(i, t) for i, t in enumerate(texts) if t and t.strip()]
+        if len(indexed) < len(texts):
+            print(f"[Embedding] Warning: {len(texts) - len(indexed)} empty texts skipped")
+
+        batches = [indexed[i:i + batch_size] for i in range(0, len(indexed), batch_size)]
+        results: Dict[int, List[float]] = {}
+
+        with stage("embeddings:batch") as span:
+            span.add(count=len(indexed), bytes=sum(len(t) for _, t in indexed))
+            if self.provider == "ollama" and len(batches) > 1:
+                workers = max(1, min(max_workers or EMBEDDING_CONCURRENCY, len(batches)))
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    for batch_results in executor.map(self._embed_indexed_batch, batches):
+                        results.update(batch_results)
+            else:
+                for batch in batches:
+                    results.update(self._embed_indexed_batch(batch))
+
+        dim = len(next(iter(results.values()))) if results else self.get_embedding_dimension()
+        embeddings = np.full((len(texts), dim), np.nan, dtype=np.float32)
+        for idx, vec in results.items():
+            embeddings[idx] = vec
+
+        failed = len(indexed) - len(results)
+        if failed:
+            print(f"[Embedding] Warning: {failed}/{len(indexed)} texts could not be embedded")
+
         return embeddings
     
     def get_embedding_dimension(self) -> int:
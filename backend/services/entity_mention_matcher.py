@@ -0,0 +1,214 @@
+"""
+Entity Mention Matcher — finds which graph nodes an answer text mentions.
+
+Replaces the LLM round trip in RAGService.extract_nodes_from_answer (ask the
+model for Cypher, then run it) with a deterministic scan:
+
+  - One Aho-Corasick automaton per case over every node name and alias
+    (case-folded, whitespace-collapsed), built from a single Neo4j query.
+  - Scanning an answer is linear in its length regardless of how many
+    entities the case has; matches must sit on word boundaries, and a
+    mention wholly inside a longer one ("John" in "John Smith") is dropped.
+  - Automata are cached per case and rebuilt when the case's entity names
+    version changes (a counter bumped by every write that adds, removes,
+    renames or merges named nodes — including by ingestion or another worker;
+    one indexed lookup per match), when invalidate() is called, or after
+    MAX_AGE_SECS as a backstop.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Set, Tuple
+
+from config import ENTITY_MATCHER_MIN_NAME_LENGTH
+
+MAX_AGE_SECS = 15 * 60         # rebuild regardless after this long
+
+
+def normalise_text(text: str) -> str:
+    """Case-fold and collapse whitespace so names and answers compare equally."""
+    return " ".join(text.casefold().split())
+
+
+class AhoCorasick:
+    """Multi-pattern string matcher (goto/fail/output automaton)."""
+
+    def __init__(self):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+        self.patterns: List[str] = []
+        self.pattern_keys: List[Set[str]] = []
+        self._index: Dict[str, int] = {}
+
+    def add(self, pattern: str, key: str) -> None:
+        """Add a pattern mapping to ``key`` (call build() afterwards)."""
+        idx = self._index.get(pattern)
+        if idx is not None:
+            self.pattern_keys[idx].add(key)
+            return
+        idx = len(self.patterns)
+        self._index[pattern] = idx
+        self.patterns.append(pattern)
+        self.pattern_keys.append({key})
+
+        state = 0
+        for ch in pattern:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(idx)
+
+    def build(self) -> None:
+        """Compute failure links breadth-first."""
+        queue = deque()
+        for nxt in self._goto[0].values():
+            self._fail[nxt] = 0
+            queue.append(nxt)
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fail = self._fail[state]
+                while fail and ch not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(ch, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, pattern_index) for every occurrence in ``text``."""
+        state = 0
+        goto, fail, out, patterns = self._goto, self._fail, self._out, self.patterns
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for idx in out[state]:
+                yield i - len(patterns[idx]) + 1, i + 1, idx
+
+    def __len__(self) -> int:
+        return len(self.patterns)
+
+
+def _on_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else " "
+    after = text[end] if end < len(text) else " "
+    return not (before.isalnum() or before == "_") and not (after.isalnum() or after == "_")
+
+
+class EntityMentionMatcher:
+    """Per-case cache of name automata over the Neo4j graph."""
+
+    def __init__(self, neo4j=None):
+        self._neo4j = neo4j
+        self._cases: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._build_locks: Dict[str, threading.Lock] = {}
+
+    @property
+    def neo4j(self):
+        if self._neo4j is None:
+            from services.neo4j_service import neo4j_service
+            self._neo4j = neo4j_service
+        return self._neo4j
+
+    def invalidate(self, case_id: Optional[str] = None) -> None:
+        """Drop the cached automaton for one case (or all cases)."""
+        with self._lock:
+            if case_id is None:
+                self._cases.clear()
+            else:
+                self._cases.pop(case_id, None)
+
+    def _build(self, case_id: str, version: str) -> Dict:
+        start = time.perf_counter()
+        automaton = AhoCorasick()
+        for row in self.neo4j.get_entity_names(case_id):
+            for name in [row.get("name")] + list(row.get("aliases") or []):
+                if not isinstance(name, str):
+                    continue
+                pattern = normalise_text(name)
+                if len(pattern) >= ENTITY_MATCHER_MIN_NAME_LENGTH:
+                    automaton.add(pattern, row["key"])
+        automaton.build()
+        now = time.time()
+        entry = {
+            "automaton": automaton,
+            "version": version,
+            "built_at": now,
+            "build_ms": round((time.perf_counter() - start) * 1000, 1),
+        }
+        print(f"[EntityMatcher] Built matcher for case {case_id}: "
+              f"{len(automaton)} names in {entry['build_ms']}ms")
+        return entry
+
+    def _get(self, case_id: str) -> Dict:
+        version = self.neo4j.get_entity_names_version(case_id)
+        entry = self._cases.get(case_id)
+        if entry and entry["version"] == version and time.time() - entry["built_at"] < MAX_AGE_SECS:
+            return entry
+
+        with self._lock:
+            build_lock = self._build_locks.setdefault(case_id, threading.Lock())
+        with build_lock:
+            # Another thread may have rebuilt while we waited
+            current = self._cases.get(case_id)
+            if current is not entry and current is not None:
+                return current
+            entry = self._build(case_id, version)
+            with self._lock:
+                self._cases[case_id] = entry
+            return entry
+
+    def match(self, case_id: str, text: str) -> List[str]:
+        """
+        Return the keys of nodes whose name or alias appears in ``text``.
+
+        Overlapping mentions resolve leftmost-longest, so "John Smith" does
+        not also report a separate "John" node.
+        """
+        if not text or not case_id:
+            return []
+        automaton: AhoCorasick = self._get(case_id)["automaton"]
+        if not len(automaton):
+            return []
+
+        normalised = normalise_text(text)
+        candidates: List[Tuple[int, int, int]] = [
+            m for m in automaton.iter_matches(normalised)
+            if _on_word_boundary(normalised, m[0], m[1])
+        ]
+        candidates.sort(key=lambda m: (m[0], -(m[1] - m[0])))
+
+        keys: List[str] = []
+        seen: Set[str] = set()
+        covered_until = 0
+        for start, end, idx in candidates:
+            if start < covered_until:
+                continue
+            covered_until = end
+            for key in sorted(automaton.pattern_keys[idx]):
+                if key not in seen:
+                    seen.add(key)
+                    keys.append(key)
+        return keys
+
+    def stats(self) -> Dict[str, Dict]:
+        """Cached automata per case (for diagnostics)."""
+        return {
+            case_id: {
+                "names": len(entry["automaton"]),
+                "build_ms": entry["build_ms"],
+                "age_secs": round(time.time() - entry["built_at"], 1),
+            }
+            for case_id, entry in list(self._cases.items())
+        }
+
+
+entity_mention_matcher = EntityMentionMatcher()
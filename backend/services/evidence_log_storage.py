@@ -58,8 +58,8 @@ class EvidenceLogStorage:
     """JSON-file backed storage for evidence ingestion logs.
 
     Multi-process safe: every mutation reloads under an fcntl LOCK_EX,
-    appends, atomically saves, and releases — same shape as
-    EvidenceStorage / BackgroundTaskStorage. Without this, the bare
+    appends, atomically saves, and releases — the shape EvidenceStorage /
+    BackgroundTaskStorage had before moving to SQLite. Without this, the bare
     atomic-write pattern in `_save_logs` (open `.tmp` → rename) raced
     across uvicorn workers writing concurrent log entries during a
     Cellebrite ingest: worker A opens `.tmp`, worker B opens the
@@ -103,7 +103,7 @@ class EvidenceLogStorage:
         with self._lock:
             _ensure_dir()
             with open(LOCK_FILE, "a") as lf:
-                # See evidence_storage._file_locked — defends against a sudo'd
+                # See _json_file_lock.file_lock — defends against a sudo'd
                 # script re-creating the lock with restrictive root ownership.
                 try:
                     os.chmod(LOCK_FILE, 0o666)
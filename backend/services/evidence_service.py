@@ -17,6 +17,7 @@ from config import BASE_DIR, MAX_INGESTION_WORKERS
 from .evidence_storage import evidence_storage, EVIDENCE_ROOT_DIR
 from .evidence_log_storage import evidence_log_storage
 from .background_task_storage import background_task_storage, TaskStatus
+from .pipeline_profiler import task_profiler
 from services.neo4j_service import neo4j_service
 from services.case_storage import case_storage
 
@@ -299,15 +300,15 @@ class EvidenceService:
             def upload_folder_task(folder_files_param, task_id_param, folder_name_param):
                 """Background upload task function for a single folder.
 
-                Batches the JSON writes: evidence.json (~hundreds of MB) and
-                background_tasks.json (~tens of MB) are rewritten once per
-                BATCH_SIZE files instead of per file. Without this batching a
-                93k-file folder upload spends almost all its time fsyncing.
+                Batches the storage writes: evidence records and task
+                progress are committed once per BATCH_SIZE files (one
+                transaction each) instead of per file, so a 93k-file folder
+                upload isn't dominated by per-file commits.
                 """
                 from datetime import datetime
 
                 # Persist every N files. Sized so that a 100k-file upload
-                # incurs ~1k JSON rewrites instead of ~300k.
+                # incurs ~1k commits instead of ~300k.
                 BATCH_SIZE = 100
 
                 try:
@@ -1036,6 +1037,8 @@ class EvidenceService:
             """Background task function."""
             from datetime import datetime
 
+            # Per-stage timing for this job, published to the task record
+            profiler = task_profiler(task_id, f"evidence-process {task_id}")
             try:
                 # Update task status to running
                 background_task_storage.update_task(
@@ -1135,7 +1138,9 @@ class EvidenceService:
                     # Process the file
                     try:
                         buf = io.StringIO()
-                        with contextlib.redirect_stdout(buf):
+                        with contextlib.redirect_stdout(buf), profiler.activate(), \
+                                profiler.stage("file:ingest", file=filename) as span:
+                            span.add(count=1, bytes=path.stat().st_size)
                             self._ingest_file(path, case_id=case_id, log_callback=log_callback, profile_name=task_profile)
 
                         # Mark as processed
@@ -1249,17 +1254,27 @@ class EvidenceService:
                         print(f"Warning: failed to save case version: {e}")
 
                 # Mark task as completed
+                profiler.finish()
                 background_task_storage.update_task(
                     task_id,
                     status=TaskStatus.COMPLETED.value,
                     completed_at=datetime.now().isoformat(),
                 )
+
+                # Refresh suggested questions, entity briefs and insights for the new graph
+                if case_id and processed_count > 0:
+                    try:
+                        from services.case_precompute_service import case_precompute_service
+                        case_precompute_service.schedule(case_id, owner=task_owner, reason="ingestion")
+                    except Exception as e:
+                        print(f"Warning: failed to schedule case precompute: {e}")
             except Exception as e:
                 # Mark task as failed and log the error with full traceback
                 import traceback
                 error_traceback = traceback.format_exc()
                 error_msg = f"{str(e)}\n\nTraceback:\n{error_traceback}"
                 print(f"Error in background evidence processing task {task_id}: {error_msg}")
+                profiler.finish()
                 background_task_storage.update_task(
                     task_id,
                     status=TaskStatus.FAILED.value,
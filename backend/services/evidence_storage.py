@@ -2,31 +2,113 @@
 Evidence Storage Service
 
 Handles persistent storage of uploaded evidence files and their processing status.
+
+Records live in data/evidence.db (SQLite, WAL), one row per evidence file.
+The full record is stored as JSON; the fields queries filter on (case_id,
+owner, sha256, status, created_at, cellebrite_file_id) are also stored as
+indexed columns, so lookups are index seeks and every mutation is a
+row-level UPDATE of just the records it touches. All uvicorn workers share
+the one database, so there is no per-worker in-memory copy to go stale.
+
+Secondary indexes: sha256, case_id, owner, status and (case_id,
+cellebrite_file_id) are SQLite indexes on those columns; entity links
+(linked_entity_ids) are indexed in evidence_entity_links, maintained by
+every write. See index_stats / rebuild_indexes.
+
+case_versions holds a per-case write counter, bumped in the same
+transaction as every insert, update and delete of the case's records; caches
+derived from a case's evidence (answer cache) read it with one primary-key
+lookup (case_version) instead of hashing the case's records.
+
+The previous data/evidence.json store is imported once, the first time the
+database is opened, and renamed to evidence.json.migrated (see
+migrate_legacy_json and backend/scripts/migrate_evidence_to_sqlite.py).
 """
 
 import json
-import os
 import hashlib
-import fcntl
+import sqlite3
+import time
+import uuid
 from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, List, Optional
-from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from threading import RLock
 
 from config import BASE_DIR
+from services._legacy_import import import_into_sqlite
 from services._timeutil import utcnow_iso
 
 
 # BASE_DIR in config.py already points to the project root (e.g. /.../owl-n4j)
 # Store metadata under <project>/data and binary files under <project>/ingestion/data
 DATA_DIR = BASE_DIR / "data"
+DB_FILE = DATA_DIR / "evidence.db"
+
+# Legacy JSON store, imported into DB_FILE on first open
 STORAGE_FILE = DATA_DIR / "evidence.json"
-LOCK_FILE = DATA_DIR / "evidence.json.lock"
 
 # Physical file storage root – reuse ingestion data directory so ingest_data.py can read files
 EVIDENCE_ROOT_DIR = BASE_DIR / "ingestion" / "data"
 
+# Max ids per "IN (...)" query (SQLite's default variable limit is 32766)
+_ID_BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS evidence (
+    id                 TEXT PRIMARY KEY,
+    case_id            TEXT,
+    owner              TEXT,
+    sha256             TEXT,
+    status             TEXT,
+    created_at         TEXT NOT NULL DEFAULT '',
+    cellebrite_file_id TEXT,
+    record             TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_evidence_case ON evidence(case_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_evidence_sha256 ON evidence(sha256);
+CREATE INDEX IF NOT EXISTS idx_evidence_status ON evidence(status);
+CREATE INDEX IF NOT EXISTS idx_evidence_owner ON evidence(owner);
+CREATE INDEX IF NOT EXISTS idx_evidence_cellebrite ON evidence(case_id, cellebrite_file_id);
+
+CREATE TABLE IF NOT EXISTS evidence_entity_links (
+    entity_id   TEXT NOT NULL,
+    evidence_id TEXT NOT NULL,
+    case_id     TEXT,
+    PRIMARY KEY (entity_id, evidence_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_entity_links_evidence ON evidence_entity_links(evidence_id);
+
+CREATE TABLE IF NOT EXISTS case_versions (
+    case_id TEXT PRIMARY KEY,
+    epoch   TEXT NOT NULL,
+    version INTEGER NOT NULL
+) WITHOUT ROWID;
+"""
+
+# Bumped when an index is added that existing rows must be backfilled into
+# (PRAGMA user_version); opening an older database runs rebuild_indexes once
+_SCHEMA_VERSION = 1
+
+# Reported by index_stats: lookup key -> SQLite index (or table) serving it
+_INDEXES = {
+    "sha256": "idx_evidence_sha256",
+    "case_id": "idx_evidence_case",
+    "cellebrite_file_id": "idx_evidence_cellebrite",
+    "entity_id": "evidence_entity_links",
+}
+
+_INSERT = """
+INSERT INTO evidence (case_id, owner, sha256, status, created_at, cellebrite_file_id, record, id)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_UPDATE = """
+UPDATE evidence
+SET case_id = ?, owner = ?, sha256 = ?, status = ?, created_at = ?, cellebrite_file_id = ?, record = ?
+WHERE id = ?
+"""
+
 
 def ensure_dirs():
     """Ensure all storage directories exist."""
@@ -34,28 +116,6 @@ def ensure_dirs():
     EVIDENCE_ROOT_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def _load_evidence() -> Dict[str, dict]:
-    """Load evidence records from JSON file."""
-    ensure_dirs()
-    if not STORAGE_FILE.exists():
-        return {}
-    try:
-        with open(STORAGE_FILE, "r", encoding="utf-8") as f:
-            return json.load(f)
-    except (json.JSONDecodeError, OSError) as e:
-        print(f"Error loading evidence storage: {e}")
-        return {}
-
-
-def _save_evidence(records: Dict[str, dict]) -> None:
-    """Persist evidence records to JSON file (atomic write)."""
-    ensure_dirs()
-    tmp = STORAGE_FILE.with_suffix(".tmp")
-    with open(tmp, "w", encoding="utf-8") as f:
-        json.dump(records, f, indent=2, ensure_ascii=False)
-    tmp.replace(STORAGE_FILE)
-
-
 def _compute_sha256(data: bytes) -> str:
     """Compute SHA256 hash of given bytes."""
     h = hashlib.sha256()
@@ -63,169 +123,424 @@ def _compute_sha256(data: bytes) -> str:
     return h.hexdigest()
 
 
+def _dump(rec: dict) -> str:
+    return json.dumps(rec, ensure_ascii=False)
+
+
+def _row_values(evidence_id: str, rec: dict, record_json: Optional[str] = None) -> tuple:
+    """Parameters for _INSERT / _UPDATE (indexed columns, record, id)."""
+    return (
+        rec.get("case_id"),
+        rec.get("owner"),
+        rec.get("sha256"),
+        rec.get("status"),
+        rec.get("created_at") or "",
+        rec.get("cellebrite_file_id"),
+        record_json if record_json is not None else _dump(rec),
+        evidence_id,
+    )
+
+
+def _batches(ids: List[str]) -> Iterable[List[str]]:
+    for start in range(0, len(ids), _ID_BATCH):
+        yield ids[start:start + _ID_BATCH]
+
+
+def _placeholders(values: List) -> str:
+    return ",".join("?" * len(values))
+
+
+def _write_records(
+    conn: sqlite3.Connection,
+    entries: List[Tuple[str, dict, Optional[str]]],
+    insert: bool = False,
+) -> None:
+    """Insert or update ``(evidence_id, record, record_json)`` rows and keep
+    the entity-link index in step with them."""
+    if not entries:
+        return
+    conn.executemany(
+        _INSERT if insert else _UPDATE,
+        [_row_values(evidence_id, rec, record_json) for evidence_id, rec, record_json in entries],
+    )
+    _sync_entity_links(conn, [(evidence_id, rec) for evidence_id, rec, _ in entries], fresh=insert)
+    _bump_case_versions(conn, {rec.get("case_id") for _, rec, _ in entries})
+
+
+def _sync_entity_links(conn: sqlite3.Connection, records: List[Tuple[str, dict]], fresh: bool = False) -> None:
+    """Replace the entity-link index rows of the given records
+    (``fresh``: the records are new, so there is nothing to delete)."""
+    if not fresh:
+        ids = [evidence_id for evidence_id, _ in records]
+        for part in _batches(ids):
+            conn.execute(f"DELETE FROM evidence_entity_links WHERE evidence_id IN ({_placeholders(part)})", part)
+    links = [
+        (entity_id, evidence_id, rec.get("case_id"))
+        for evidence_id, rec in records
+        for entity_id in set(rec.get("linked_entity_ids") or [])
+        if entity_id
+    ]
+    if links:
+        conn.executemany(
+            "INSERT OR IGNORE INTO evidence_entity_links (entity_id, evidence_id, case_id) VALUES (?, ?, ?)",
+            links,
+        )
+
+
+def _bump_case_versions(conn: sqlite3.Connection, case_ids: Iterable[Optional[str]]) -> None:
+    """Count a write to each case (the epoch is fixed when a case's row is
+    first created, so a recreated database never repeats old versions)."""
+    conn.executemany(
+        "INSERT INTO case_versions (case_id, epoch, version) VALUES (?, ?, 1) "
+        "ON CONFLICT(case_id) DO UPDATE SET version = version + 1",
+        [(case_id, uuid.uuid4().hex[:12]) for case_id in case_ids if case_id],
+    )
+
+
+def _delete_records(conn: sqlite3.Connection, evidence_ids: List[str]) -> None:
+    for part in _batches(evidence_ids):
+        _bump_case_versions(conn, [
+            row[0] for row in conn.execute(
+                f"SELECT DISTINCT case_id FROM evidence WHERE id IN ({_placeholders(part)})", part
+            )
+        ])
+        conn.execute(f"DELETE FROM evidence WHERE id IN ({_placeholders(part)})", part)
+        conn.execute(f"DELETE FROM evidence_entity_links WHERE evidence_id IN ({_placeholders(part)})", part)
+
+
+def _new_evidence_id(conn: sqlite3.Connection, sha256: str) -> str:
+    """First free id for content ``sha256``: ev_<16 hex>, then ev_<12 hex>_<n>."""
+    evidence_id = f"ev_{sha256[:16]}"
+    suffix = 1
+    while conn.execute("SELECT 1 FROM evidence WHERE id = ?", (evidence_id,)).fetchone():
+        evidence_id = f"ev_{sha256[:12]}_{suffix}"
+        suffix += 1
+    return evidence_id
+
+
+def _normalise_legacy(rec: dict) -> dict:
+    """Legacy records: separate 'duplicate' status into is_duplicate flag,
+    and ensure is_relevant field exists."""
+    if "is_relevant" not in rec:
+        rec["is_relevant"] = False
+    if "is_duplicate" not in rec:
+        if rec.get("status") == "duplicate":
+            rec["is_duplicate"] = True
+            rec["status"] = "processed" if rec.get("processed_at") else "unprocessed"
+        else:
+            rec["is_duplicate"] = bool(rec.get("duplicate_of"))
+    return rec
+
+
+def _import_records(conn: sqlite3.Connection, records: Dict[str, dict]) -> int:
+    """Insert legacy records in their original (insertion) order."""
+    entries = []
+    for evidence_id, rec in records.items():
+        if not isinstance(rec, dict):
+            continue
+        rec = _normalise_legacy(rec)
+        rec.setdefault("id", evidence_id)
+        entries.append((evidence_id, rec, None))
+    _write_records(conn, entries, insert=True)
+    return len(entries)
+
+
+def migrate_legacy_json(
+    source: Path = STORAGE_FILE,
+    db_file: Path = DB_FILE,
+    replace: bool = False,
+) -> Dict:
+    """
+    One-shot import of a legacy evidence.json into the SQLite store.
+
+    Runs once per database (see services._legacy_import), and not at all if
+    the database already has evidence rows. ``replace`` re-runs it, dropping
+    the existing rows first.
+
+    Returns:
+        Dict with 'status' ('migrated' | 'skipped' | 'failed') and 'records' imported
+    """
+    db_file = Path(db_file)
+    db_file.parent.mkdir(parents=True, exist_ok=True)
+
+    def write(conn: sqlite3.Connection, records) -> int:
+        if replace:
+            conn.execute("DELETE FROM evidence")
+            conn.execute("DELETE FROM evidence_entity_links")
+        imported = _import_records(conn, records if isinstance(records, dict) else {})
+        # Every row was written with its index entries
+        conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+        return imported
+
+    conn = sqlite3.connect(db_file, timeout=30.0, isolation_level=None)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.executescript(_SCHEMA)
+        return import_into_sqlite(
+            conn, "evidence", source, write, "EvidenceStorage",
+            populated=lambda c: c.execute("SELECT 1 FROM evidence LIMIT 1").fetchone() is not None,
+            force=replace,
+        )
+    finally:
+        conn.close()
+
+
 class EvidenceStorage:
     """Service for managing evidence file metadata and status.
 
-    Multi-process safe: every mutation reloads the on-disk JSON under an
-    fcntl file lock, applies the change, then atomically saves and refreshes
-    the in-memory cache. Without this, uvicorn's multiple worker processes
-    each held independent in-memory dicts and any single-record mutation from
-    worker A would overwrite the latest disk state written by worker B (which
-    held records A had never seen). Observed on case 43f1afb1 2026-05-22:
-    a 93k-row C5 upload completed in worker 3, then a single DELETE request
-    landed on worker 1 and wiped all 93k rows on save.
+    Multi-process safe: all workers share data/evidence.db, and every
+    mutation is a read-modify-write of just the affected rows inside one
+    ``BEGIN IMMEDIATE`` transaction, so concurrent writers serialize on the
+    SQLite write lock instead of rewriting each other's view of the whole
+    store. (The JSON store this replaced had to reload and rewrite every
+    record per mutation — observed on case 43f1afb1 2026-05-22, when a
+    stale worker's single DELETE wiped a 93k-row C5 upload.)
     """
 
-    def __init__(self) -> None:
-        self._records: Dict[str, dict] = _load_evidence()
-        self._lock = RLock()  # Reentrant lock for thread-safe operations
+    def __init__(self, db_file: Path = DB_FILE, legacy_file: Optional[Path] = STORAGE_FILE) -> None:
+        self.db_file = Path(db_file)
+        self.legacy_file = Path(legacy_file) if legacy_file else None
+        self._lock = RLock()
+        self._initialised = False
+        self._last_build: Optional[Dict] = None
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    ensure_dirs()
+                    conn.executescript(_SCHEMA)
+                    if self.legacy_file is not None:
+                        migrate_legacy_json(self.legacy_file, self.db_file)
+                    if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                        self._rebuild_indexes(conn, only_if_outdated=True)
+                    self._initialised = True
+        return conn
+
+    @contextmanager
+    def _read(self):
+        conn = self._connect()
         try:
-            self._mtime: float = STORAGE_FILE.stat().st_mtime
-        except OSError:
-            self._mtime = 0.0
-        self._migrate_records()
-
-    def _refresh_if_stale(self) -> None:
-        """Reload `self._records` if the on-disk file has been mutated by
-        another uvicorn worker since we last cached. The _file_locked
-        write path covers writes; this is the corresponding read-side
-        guard so READS don't serve stale data from a worker that hasn't
-        mutated lately. See background_task_storage._refresh_if_stale —
-        same bug pattern: a record created by worker A is invisible to
-        reads routed to workers B/C/D until they happen to perform a
-        mutation themselves.
-        """
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self):
+        """Connection inside a ``BEGIN IMMEDIATE`` transaction, committed on
+        successful exit and rolled back on error."""
+        conn = self._connect()
         try:
-            current_mtime = STORAGE_FILE.stat().st_mtime
-        except OSError:
-            return
-        if current_mtime > self._mtime:
-            with self._lock:
-                try:
-                    current_mtime = STORAGE_FILE.stat().st_mtime
-                except OSError:
-                    return
-                if current_mtime > self._mtime:
-                    self._records = _load_evidence()
-                    self._mtime = current_mtime
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _select(self, where: str = "", params: tuple = (), order: str = "rowid") -> List[dict]:
+        sql = "SELECT record FROM evidence"
+        if where:
+            sql += f" WHERE {where}"
+        sql += f" ORDER BY {order}"
+        with self._read() as conn:
+            return [json.loads(row[0]) for row in conn.execute(sql, params)]
+
+    def _modify(self, evidence_ids: Iterable[str], mutate: Callable[[dict], bool]) -> int:
+        """Row-level read-modify-write of the given records in one transaction.
+
+        ``mutate(rec)`` edits a record in place and returns True if it counts
+        as updated. Only records whose JSON actually changed are written.
+        Returns the number of records counted as updated.
+        """
+        ids = list(dict.fromkeys(evid for evid in evidence_ids if evid))
+        if not ids:
+            return 0
+        updated = 0
+        with self._write() as conn:
+            for part in _batches(ids):
+                rows = conn.execute(
+                    f"SELECT id, record FROM evidence WHERE id IN ({_placeholders(part)})", part
+                ).fetchall()
+                changed = []
+                for row in rows:
+                    rec = json.loads(row["record"])
+                    if mutate(rec):
+                        updated += 1
+                    record_json = _dump(rec)
+                    if record_json != row["record"]:
+                        changed.append((row["id"], rec, record_json))
+                _write_records(conn, changed)
+        return updated
 
     @contextmanager
     def _file_locked(self):
-        """Yield a freshly-loaded records dict that will be atomically
-        persisted on successful exit. Holds an exclusive fcntl file lock
-        across the entire reload-mutate-save window so writes from other
-        worker processes serialize correctly.
+        """Bulk-edit escape hatch for maintenance scripts and the Cellebrite
+        file linker: yields every record as an ``{id: record}`` dict under
+        the database write lock, then writes back only the records that were
+        added, changed or removed. Loads the whole store, so request paths
+        should use the row-level methods instead.
         """
-        with self._lock:
-            ensure_dirs()
-            with open(LOCK_FILE, "a") as lf:
-                # Keep the lock file world-writable so a root-owned re-create
-                # (e.g., a sudo'd maintenance script) cannot lock out the
-                # backend user. chmod only succeeds for owner or root; if the
-                # current process owns the file every call refreshes mode 666.
-                try:
-                    os.chmod(LOCK_FILE, 0o666)
-                except OSError:
-                    pass
-                fcntl.flock(lf.fileno(), fcntl.LOCK_EX)
-                try:
-                    fresh = _load_evidence()
-                    yield fresh
-                    _save_evidence(fresh)
-                    self._records = fresh
-                    try:
-                        self._mtime = STORAGE_FILE.stat().st_mtime
-                    except OSError:
-                        pass
-                finally:
-                    fcntl.flock(lf.fileno(), fcntl.LOCK_UN)
-
-    def _migrate_records(self) -> None:
-        """Migrate legacy records: separate 'duplicate' status into is_duplicate flag,
-        and ensure is_relevant field exists."""
-        # Check first against in-memory copy; only take the file lock if a
-        # migration is actually needed (avoids contention on every worker boot).
-        needs_migration = any(
-            ("is_relevant" not in rec) or ("is_duplicate" not in rec)
-            for rec in self._records.values()
-        )
-        if not needs_migration:
-            return
-        with self._file_locked() as records:
-            for rec in records.values():
-                if "is_relevant" not in rec:
-                    rec["is_relevant"] = False
-                if "is_duplicate" not in rec:
-                    if rec.get("status") == "duplicate":
-                        rec["is_duplicate"] = True
-                        rec["status"] = "processed" if rec.get("processed_at") else "unprocessed"
-                    else:
-                        rec["is_duplicate"] = bool(rec.get("duplicate_of"))
+        with self._write() as conn:
+            original = {row["id"]: row["record"] for row in conn.execute("SELECT id, record FROM evidence ORDER BY rowid")}
+            records = {evidence_id: json.loads(text) for evidence_id, text in original.items()}
+            yield records
+            _delete_records(conn, [evidence_id for evidence_id in original if evidence_id not in records])
+            inserts, updates = [], []
+            for evidence_id, rec in records.items():
+                record_json = _dump(rec)
+                previous = original.get(evidence_id)
+                if previous is None:
+                    inserts.append((evidence_id, rec, record_json))
+                elif previous != record_json:
+                    updates.append((evidence_id, rec, record_json))
+            _write_records(conn, inserts, insert=True)
+            _write_records(conn, updates)
+
+    # ------------- Secondary indexes -------------
+
+    def _rebuild_indexes(self, conn: sqlite3.Connection, only_if_outdated: bool = False) -> Optional[Dict]:
+        start = time.perf_counter()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            # Another worker may have rebuilt while we waited for the lock
+            if only_if_outdated and conn.execute("PRAGMA user_version").fetchone()[0] >= _SCHEMA_VERSION:
+                conn.execute("ROLLBACK")
+                return None
+            conn.execute("DELETE FROM evidence_entity_links")
+            cursor = conn.execute(
+                "SELECT id, record FROM evidence WHERE instr(record, '\"linked_entity_ids\"') > 0"
+            )
+            while True:
+                rows = cursor.fetchmany(10_000)
+                if not rows:
+                    break
+                _sync_entity_links(conn, [(row[0], json.loads(row[1])) for row in rows], fresh=True)
+            conn.execute("ANALYZE")
+            conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        links = conn.execute("SELECT COUNT(*) FROM evidence_entity_links").fetchone()[0]
+        self._last_build = {
+            "built_at": utcnow_iso(),
+            "seconds": round(time.perf_counter() - start, 3),
+            "entity_links": links,
+        }
+        print(f"[EvidenceStorage] Rebuilt secondary indexes in {self._last_build['seconds']}s "
+              f"({links} entity links)")
+        return self._last_build
+
+    def rebuild_indexes(self) -> Dict:
+        """Rebuild the entity-link index from the records and refresh SQLite's
+        planner statistics (ANALYZE). Runs automatically the first time a
+        database from before an index existed is opened. Returns build stats."""
+        conn = self._connect()
+        try:
+            return self._rebuild_indexes(conn)
+        finally:
+            conn.close()
+
+    def index_stats(self) -> Dict:
+        """Entry counts, on-disk size and last build time of the secondary indexes."""
+        with self._read() as conn:
+            counts = {
+                "sha256": conn.execute("SELECT COUNT(DISTINCT sha256) FROM evidence").fetchone()[0],
+                "case_id": conn.execute("SELECT COUNT(DISTINCT case_id) FROM evidence").fetchone()[0],
+                "cellebrite_file_id": conn.execute(
+                    "SELECT COUNT(*) FROM evidence WHERE cellebrite_file_id IS NOT NULL"
+                ).fetchone()[0],
+                "entity_id": conn.execute("SELECT COUNT(DISTINCT entity_id) FROM evidence_entity_links").fetchone()[0],
+            }
+            entity_links = conn.execute("SELECT COUNT(*) FROM evidence_entity_links").fetchone()[0]
+            try:
+                sizes = dict(conn.execute("SELECT name, SUM(pgsize) FROM dbstat GROUP BY name").fetchall())
+            except sqlite3.OperationalError:
+                sizes = {}  # SQLite built without the dbstat table
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+            records = conn.execute("SELECT COUNT(*) FROM evidence").fetchone()[0]
+        return {
+            "records": records,
+            "database_bytes": page_size * page_count,
+            "indexes": {
+                name: {"keys": counts[name], "bytes": sizes.get(index_name)}
+                for name, index_name in _INDEXES.items()
+            },
+            "entity_links": entity_links,
+            "last_build": self._last_build,
+        }
 
     # ------------- Basic accessors -------------
 
     def reload(self) -> None:
-        """Reload evidence records from disk."""
-        with self._lock:
-            self._records = _load_evidence()
+        """No-op, kept for callers of the JSON store: reads always hit the database."""
 
-    def _persist(self) -> None:
-        _save_evidence(self._records)
+    def count(self) -> int:
+        """Total number of evidence records."""
+        with self._read() as conn:
+            return conn.execute("SELECT COUNT(*) FROM evidence").fetchone()[0]
 
     def get_all(self) -> List[dict]:
         """Return all evidence records as a list."""
-        self._refresh_if_stale()
-        with self._lock:
-            return list(self._records.values())
+        return self._select()
 
     def get(self, evidence_id: str) -> Optional[dict]:
         """Get a single evidence record by id."""
-        self._refresh_if_stale()
-        with self._lock:
-            return self._records.get(evidence_id)
+        with self._read() as conn:
+            row = conn.execute("SELECT record FROM evidence WHERE id = ?", (evidence_id,)).fetchone()
+        return json.loads(row[0]) if row else None
 
     # ------------- Query helpers -------------
 
-    def list_files(  # noqa: D401 — read path; calls _refresh_if_stale below
+    def list_files(
         self,
         case_id: Optional[str] = None,
         status: Optional[str] = None,
         owner: Optional[str] = None,
     ) -> List[dict]:
         """List evidence files, optionally filtered by case_id, status, and owner."""
-        self._refresh_if_stale()
-        with self._lock:
-            results = []
-            for rec in self._records.values():
-                if case_id and rec.get("case_id") != case_id:
-                    continue
-                if status and rec.get("status") != status:
-                    continue
-                if owner and rec.get("owner") != owner:
-                    continue
-                results.append(rec)
-            # Sort newest first
-            results.sort(key=lambda r: r.get("created_at", ""), reverse=True)
-            return results
+        clauses, params = [], []
+        for column, value in (("case_id", case_id), ("status", status), ("owner", owner)):
+            if value:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        # Newest first; ties keep insertion order
+        return self._select(" AND ".join(clauses), tuple(params), order="created_at DESC, rowid")
+
+    def case_version(self, case_id: str) -> str:
+        """Version of a case's evidence records, "<epoch>:<counter>" ("0" if
+        the case has never had any); changes with every write to the case."""
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT epoch, version FROM case_versions WHERE case_id = ?", (case_id,)
+            ).fetchone()
+        return f"{row['epoch']}:{row['version']}" if row else "0"
 
     def find_by_hash(self, sha256: str) -> Optional[dict]:
         """Find first record matching a given hash."""
-        self._refresh_if_stale()
-        with self._lock:
-            for rec in self._records.values():
-                if rec.get("sha256") == sha256:
-                    return rec
-            return None
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT record FROM evidence WHERE sha256 = ? ORDER BY rowid LIMIT 1", (sha256,)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
 
     def find_all_by_hash(self, sha256: str) -> List[dict]:
         """Find all records matching a given hash."""
-        self._refresh_if_stale()
-        with self._lock:
-            results = []
-            for rec in self._records.values():
-                if rec.get("sha256") == sha256:
-                    results.append(rec)
-            return results
+        return self._select("sha256 = ?", (sha256,))
 
     # ------------- Mutating operations -------------
 
@@ -259,7 +574,7 @@ class EvidenceStorage:
             List of evidence records that were created.
         """
         created_records: List[dict] = []
-        with self._file_locked() as records:
+        with self._write() as conn:
             now = utcnow_iso()
             for file_info in files:
                 original_filename = file_info["original_filename"]
@@ -270,23 +585,16 @@ class EvidenceStorage:
                 else:
                     content: bytes = file_info["content"]
                     sha256 = _compute_sha256(content)
-                duplicate_rec = None
-                for rec in records.values():
-                    if rec.get("sha256") == sha256:
-                        duplicate_rec = rec
-                        break
-
-                evidence_id = f"ev_{sha256[:16]}"
-                suffix = 1
-                while evidence_id in records:
-                    evidence_id = f"ev_{sha256[:12]}_{suffix}"
-                    suffix += 1
+                duplicate_row = conn.execute(
+                    "SELECT id FROM evidence WHERE sha256 = ? ORDER BY rowid LIMIT 1", (sha256,)
+                ).fetchone()
+                evidence_id = _new_evidence_id(conn, sha256)
 
                 duplicate_of = None
                 is_duplicate = False
-                if duplicate_rec:
+                if duplicate_row:
                     is_duplicate = True
-                    duplicate_of = duplicate_rec.get("id")
+                    duplicate_of = duplicate_row["id"]
 
                 record = {
                     "id": evidence_id,
@@ -307,29 +615,63 @@ class EvidenceStorage:
                 if file_info.get("relative_path") is not None:
                     record["relative_path"] = file_info["relative_path"]
 
-                records[evidence_id] = record
+                _write_records(conn, [(evidence_id, record, None)], insert=True)
                 created_records.append(record)
         return created_records
 
+    def upsert_by_hash(self, case_id: str, entries: List[Tuple[dict, dict]]) -> List[dict]:
+        """
+        Register records for a case, merging by content hash.
+
+        Each entry is ``(record, merge_fields)``. If the case already has a
+        record with the same sha256 (the first one registered), only
+        ``merge_fields`` are merged into it, leaving user-set fields alone;
+        otherwise ``record`` is inserted under a fresh evidence id. One
+        transaction, one indexed lookup per entry.
+
+        Returns:
+            The resulting (merged or inserted) records, in entry order
+        """
+        results: List[dict] = []
+        with self._write() as conn:
+            for record, merge_fields in entries:
+                sha256 = record["sha256"]
+                row = conn.execute(
+                    "SELECT id, record FROM evidence WHERE sha256 = ? AND case_id = ? ORDER BY rowid LIMIT 1",
+                    (sha256, case_id),
+                ).fetchone()
+                if row is not None:
+                    existing = json.loads(row["record"])
+                    existing.update(merge_fields)
+                    _write_records(conn, [(row["id"], existing, None)])
+                    results.append(existing)
+                    continue
+                record = {"id": None, **record}
+                record["id"] = _new_evidence_id(conn, sha256)
+                record["case_id"] = case_id
+                _write_records(conn, [(record["id"], record, None)], insert=True)
+                results.append(record)
+        return results
+
     def delete_record(self, evidence_id: str) -> Optional[dict]:
         """
         Delete an evidence record by ID. Returns the deleted record or None.
         Does NOT delete the physical file — caller is responsible for that.
         """
-        deleted = [None]
-        with self._file_locked() as records:
-            deleted[0] = records.pop(evidence_id, None)
-        return deleted[0]
+        with self._write() as conn:
+            row = conn.execute("SELECT record FROM evidence WHERE id = ?", (evidence_id,)).fetchone()
+            if row is None:
+                return None
+            _delete_records(conn, [evidence_id])
+        return json.loads(row[0])
 
     def update_record(self, evidence_id: str, **kwargs) -> bool:
         """Merge kwargs into an evidence record. Returns True if the record exists."""
-        found = [False]
-        with self._file_locked() as records:
-            rec = records.get(evidence_id)
-            if rec is not None:
-                rec.update(kwargs)
-                found[0] = True
-        return found[0]
+        def mutate(rec: dict) -> bool:
+            rec.update(kwargs)
+            return True
+
+        return self._modify([evidence_id], mutate) > 0
 
     def get_by_cellebrite_file_ids(
         self, case_id: str, file_ids: List[str]
@@ -340,34 +682,35 @@ class EvidenceStorage:
         """
         if not file_ids:
             return {}
-        wanted = set(file_ids)
+        wanted = list(dict.fromkeys(fid for fid in file_ids if fid))
         out: Dict[str, dict] = {}
-        self._refresh_if_stale()
-        with self._lock:
-            for rec in self._records.values():
-                if rec.get("case_id") != case_id:
-                    continue
-                fid = rec.get("cellebrite_file_id")
-                if not fid or fid not in wanted:
-                    continue
-                # Prefer non-duplicate originals over duplicates
-                existing = out.get(fid)
-                if existing is None or (existing.get("is_duplicate") and not rec.get("is_duplicate")):
-                    out[fid] = rec
+        with self._read() as conn:
+            for part in _batches(wanted):
+                rows = conn.execute(
+                    f"SELECT cellebrite_file_id, record FROM evidence "
+                    f"WHERE case_id = ? AND cellebrite_file_id IN ({_placeholders(part)}) ORDER BY rowid",
+                    (case_id, *part),
+                ).fetchall()
+                for row in rows:
+                    fid = row["cellebrite_file_id"]
+                    rec = json.loads(row["record"])
+                    # Prefer non-duplicate originals over duplicates
+                    existing = out.get(fid)
+                    if existing is None or (existing.get("is_duplicate") and not rec.get("is_duplicate")):
+                        out[fid] = rec
         return out
 
     def mark_processing(self, evidence_ids: List[str]) -> None:
         """Mark selected evidence as 'processing'."""
-        with self._file_locked() as records:
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if not rec:
-                    continue
-                if rec.get("status") in ("processed", "processing"):
-                    continue
-                rec["status"] = "processing"
-                rec["last_error"] = None
-                rec["processed_at"] = None
+        def mutate(rec: dict) -> bool:
+            if rec.get("status") in ("processed", "processing"):
+                return False
+            rec["status"] = "processing"
+            rec["last_error"] = None
+            rec["processed_at"] = None
+            return True
+
+        self._modify(evidence_ids, mutate)
 
     def mark_processed(
         self,
@@ -375,30 +718,27 @@ class EvidenceStorage:
         error: Optional[str] = None,
     ) -> None:
         """Mark selected evidence as processed or failed."""
-        with self._file_locked() as records:
-            now = utcnow_iso()
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if not rec:
-                    continue
-                if error:
-                    rec["status"] = "failed"
-                    rec["last_error"] = error
-                else:
-                    rec["status"] = "processed"
-                    rec["last_error"] = None
-                rec["processed_at"] = now
+        now = utcnow_iso()
+
+        def mutate(rec: dict) -> bool:
+            if error:
+                rec["status"] = "failed"
+                rec["last_error"] = error
+            else:
+                rec["status"] = "processed"
+                rec["last_error"] = None
+            rec["processed_at"] = now
+            return True
+
+        self._modify(evidence_ids, mutate)
 
     def set_relevance(self, evidence_ids: List[str], is_relevant: bool) -> int:
         """Mark evidence files as relevant or non-relevant. Returns count updated."""
-        updated = 0
-        with self._file_locked() as records:
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if rec:
-                    rec["is_relevant"] = is_relevant
-                    updated += 1
-        return updated
+        def mutate(rec: dict) -> bool:
+            rec["is_relevant"] = is_relevant
+            return True
+
+        return self._modify(evidence_ids, mutate)
 
     # ------------------------------------------------------------------
     # Phase 5: Tag and Entity-link helpers
@@ -411,76 +751,65 @@ class EvidenceStorage:
         clean = [t.strip() for t in tags if t and t.strip()]
         if not clean:
             return 0
-        updated = 0
-        with self._file_locked() as records:
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if rec is None:
-                    continue
-                existing = set(rec.get("tags") or [])
-                before = len(existing)
-                existing.update(clean)
-                if len(existing) != before:
-                    rec["tags"] = sorted(existing)
-                    updated += 1
-                elif "tags" not in rec:
-                    rec["tags"] = sorted(existing)
-        return updated
+
+        def mutate(rec: dict) -> bool:
+            existing = set(rec.get("tags") or [])
+            before = len(existing)
+            existing.update(clean)
+            if len(existing) != before:
+                rec["tags"] = sorted(existing)
+                return True
+            if "tags" not in rec:
+                rec["tags"] = sorted(existing)
+            return False
+
+        return self._modify(evidence_ids, mutate)
 
     def remove_tags(self, evidence_ids: List[str], tags: List[str]) -> int:
         """Remove tags from one or more evidence records."""
         if not tags:
             return 0
         remove = set(t.strip() for t in tags if t and t.strip())
-        updated = 0
-        with self._file_locked() as records:
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if rec is None:
-                    continue
-                existing = set(rec.get("tags") or [])
-                if existing & remove:
-                    rec["tags"] = sorted(existing - remove)
-                    updated += 1
-        return updated
+
+        def mutate(rec: dict) -> bool:
+            existing = set(rec.get("tags") or [])
+            if existing & remove:
+                rec["tags"] = sorted(existing - remove)
+                return True
+            return False
+
+        return self._modify(evidence_ids, mutate)
 
     def set_tags(self, evidence_id: str, tags: List[str]) -> bool:
         """Replace the tag list on a single evidence record."""
         clean = sorted({t.strip() for t in (tags or []) if t and t.strip()})
-        success = [False]
-        with self._file_locked() as records:
-            rec = records.get(evidence_id)
-            if rec is not None:
-                rec["tags"] = clean
-                success[0] = True
-        return success[0]
+
+        def mutate(rec: dict) -> bool:
+            rec["tags"] = clean
+            return True
+
+        return self._modify([evidence_id], mutate) > 0
 
     def set_analysis(self, evidence_id: str, kind: str, result: dict) -> bool:
         """Persist an on-demand AI media-analysis result onto an evidence
         record under `media_analysis[kind]` (kind = "transcription" |
-        "image_analysis"). Locked reload-mutate-save so it's safe under
-        --workers N and visible to other workers via _refresh_if_stale on get()
-        (no backend restart needed). Used by the transcribe / image-recognition
-        actions so re-opening a file or attachment shows the cached result.
+        "image_analysis"). A row-level write, so it's safe under --workers N
+        and visible to every worker on its next get() (no backend restart
+        needed). Used by the transcribe / image-recognition actions so
+        re-opening a file or attachment shows the cached result.
         """
-        success = [False]
-        with self._file_locked() as records:
-            rec = records.get(evidence_id)
-            if rec is not None:
-                rec.setdefault("media_analysis", {})[kind] = result
-                success[0] = True
-        return success[0]
+        def mutate(rec: dict) -> bool:
+            rec.setdefault("media_analysis", {})[kind] = result
+            return True
+
+        return self._modify([evidence_id], mutate) > 0
 
     def get_tag_counts(self, case_id: str) -> List[Dict]:
         """Return a case-wide tag cloud sorted by usage."""
         counts: Dict[str, int] = {}
-        self._refresh_if_stale()
-        with self._lock:
-            for rec in self._records.values():
-                if rec.get("case_id") != case_id:
-                    continue
-                for t in rec.get("tags") or []:
-                    counts[t] = counts.get(t, 0) + 1
+        for rec in self._select("case_id = ? AND instr(record, '\"tags\"') > 0", (case_id,)):
+            for t in rec.get("tags") or []:
+                counts[t] = counts.get(t, 0) + 1
         return [
             {"tag": t, "count": c}
             for t, c in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0]))
@@ -493,68 +822,65 @@ class EvidenceStorage:
         to_add = [e for e in entity_ids if e]
         if not to_add:
             return 0
-        updated = 0
-        with self._file_locked() as records:
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if rec is None:
-                    continue
-                existing = set(rec.get("linked_entity_ids") or [])
-                before = len(existing)
-                existing.update(to_add)
-                if len(existing) != before:
-                    rec["linked_entity_ids"] = sorted(existing)
-                    updated += 1
-                elif "linked_entity_ids" not in rec:
-                    rec["linked_entity_ids"] = sorted(existing)
-        return updated
+
+        def mutate(rec: dict) -> bool:
+            existing = set(rec.get("linked_entity_ids") or [])
+            before = len(existing)
+            existing.update(to_add)
+            if len(existing) != before:
+                rec["linked_entity_ids"] = sorted(existing)
+                return True
+            if "linked_entity_ids" not in rec:
+                rec["linked_entity_ids"] = sorted(existing)
+            return False
+
+        return self._modify(evidence_ids, mutate)
 
     def unlink_entities(self, evidence_ids: List[str], entity_ids: List[str]) -> int:
         """Remove entity links from evidence records."""
         remove = set(entity_ids or [])
         if not remove:
             return 0
-        updated = 0
-        with self._file_locked() as records:
-            for evid in evidence_ids:
-                rec = records.get(evid)
-                if rec is None:
-                    continue
-                existing = set(rec.get("linked_entity_ids") or [])
-                if existing & remove:
-                    rec["linked_entity_ids"] = sorted(existing - remove)
-                    updated += 1
-        return updated
+
+        def mutate(rec: dict) -> bool:
+            existing = set(rec.get("linked_entity_ids") or [])
+            if existing & remove:
+                rec["linked_entity_ids"] = sorted(existing - remove)
+                return True
+            return False
+
+        return self._modify(evidence_ids, mutate)
+
+    def _linked_ids(self, case_id: str, entity_id: str) -> List[str]:
+        with self._read() as conn:
+            return [
+                row[0] for row in conn.execute(
+                    "SELECT evidence_id FROM evidence_entity_links WHERE entity_id = ? AND case_id = ?",
+                    (entity_id, case_id),
+                )
+            ]
 
     def list_by_entity(self, case_id: str, entity_id: str) -> List[Dict]:
         """All evidence records in a case that are linked to a given entity."""
-        out: List[Dict] = []
-        self._refresh_if_stale()
-        with self._lock:
-            for rec in self._records.values():
-                if rec.get("case_id") != case_id:
-                    continue
-                linked = rec.get("linked_entity_ids") or []
-                if entity_id in linked:
-                    out.append(rec)
-        return out
+        return self._select(
+            "id IN (SELECT evidence_id FROM evidence_entity_links WHERE entity_id = ? AND case_id = ?)",
+            (entity_id, case_id),
+        )
 
     def unlink_entities_from_all(self, case_id: str, entity_id: str) -> int:
         """Used when a CaseEntity is deleted — remove its link from every record in the case."""
-        updated = 0
-        with self._file_locked() as records:
-            for rec in records.values():
-                if rec.get("case_id") != case_id:
-                    continue
-                linked = set(rec.get("linked_entity_ids") or [])
-                if entity_id in linked:
-                    linked.discard(entity_id)
-                    rec["linked_entity_ids"] = sorted(linked)
-                    updated += 1
-        return updated
+        linked_ids = self._linked_ids(case_id, entity_id)
 
+        def mutate(rec: dict) -> bool:
+            linked = set(rec.get("linked_entity_ids") or [])
+            if rec.get("case_id") != case_id or entity_id not in linked:
+                return False
+            linked.discard(entity_id)
+            rec["linked_entity_ids"] = sorted(linked)
+            return True
 
-# Singleton instance
-evidence_storage = EvidenceStorage()
+        return self._modify(linked_ids, mutate)
 
 
+# Singleton instance
+evidence_storage = EvidenceStorage()
@@ -14,6 +14,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 from typing import Dict, List, Optional, Tuple
 
 from services.llm_service import LLMService
+from services.llm_transport import get_llm_transport
 from services.neo4j_service import neo4j_service
 
 
@@ -142,7 +143,9 @@ TRANSACTIONS:
 
 BATCH_SIZE = 50
 MAX_LLM_TRANSACTIONS = 2000     # Cap to avoid extreme runtimes
-LLM_CONCURRENCY = 6             # Parallel LLM API calls
+EXTRACTION_PROVIDER = "openai"  # Batches always run on this provider/model
+EXTRACTION_MODEL = "gpt-4o-mini"
+LLM_CACHE_TTL = 30 * 24 * 3600  # Re-runs over unchanged transactions reuse earlier answers
 
 
 def _format_transaction_for_llm(idx: int, txn: Dict) -> str:
@@ -171,10 +174,13 @@ def _process_single_batch(batch_start: int, batch: List[Dict], llm: LLMService)
 
     # Each thread uses its own LLMService instance for thread safety
     thread_llm = LLMService()
-    thread_llm.set_config("openai", "gpt-4o-mini")
+    thread_llm.set_config(EXTRACTION_PROVIDER, EXTRACTION_MODEL)
 
     try:
-        raw = thread_llm.call(prompt, temperature=0.1, json_mode=True, timeout=120)
+        raw = thread_llm.call(
+            prompt, temperature=0.1, json_mode=True, timeout=120,
+            cache_site="from_to_extraction", cache_ttl=LLM_CACHE_TTL,
+        )
     except Exception as e:
         print(f"[FromToExtract] LLM batch at {batch_start} failed: {e}")
         return []
@@ -219,13 +225,15 @@ def extract_from_to_llm(transactions: List[Dict], llm: LLMService) -> List[Dict]
         batches.append((batch_start, batch))
 
     total_batches = len(batches)
+    # As many batches in flight as the transport lets the provider serve
+    concurrency = get_llm_transport().concurrency_limit(EXTRACTION_PROVIDER)
     print(f"[FromToExtract] Processing {len(transactions)} transactions in {total_batches} batches "
-          f"({LLM_CONCURRENCY} concurrent)")
+          f"({concurrency} concurrent)")
 
     all_results = []
     completed = 0
 
-    with ThreadPoolExecutor(max_workers=LLM_CONCURRENCY) as executor:
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
         futures = {
             executor.submit(_process_single_batch, bs, b, llm): bs
             for bs, b in batches
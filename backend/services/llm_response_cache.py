@@ -0,0 +1,404 @@
+"""
+LLM Response Cache — content-addressed cache for repeatable LLM calls.
+
+Re-ingesting a document, re-running from/to extraction or regenerating
+insights sends byte-identical prompts to the model. Call sites that opt in
+(by passing ``cache_site`` to LLMService.call / llm_client.call_llm) get the
+stored response back instead of paying the latency and token cost again.
+
+Design:
+  - Key: sha256 over (provider, model, temperature, json_mode, system prompt,
+    sha256(prompt)). Any change to any of these is a different entry.
+  - Storage: data/llm_cache.db (SQLite, WAL) so every uvicorn worker and the
+    ingestion process share one cache.
+  - TTL is chosen by the call site and checked on read, so a site can tighten
+    or relax it without invalidating what is already stored.
+  - Size-based eviction: once the stored responses exceed LLM_CACHE_MAX_MB,
+    least-recently-hit entries are dropped down to 90% of the budget.
+  - Hits and misses go to cost_tracking_service, which prices the tokens a
+    hit avoided; per-site totals are kept in the cache_stats table.
+  - Only usable responses are stored: callers pass a ``validate`` check
+    (json_mode calls default to "contains a parseable JSON object"), so a
+    malformed or truncated answer is retried rather than replayed for the
+    whole TTL. A stored entry that fails the check is dropped on lookup.
+  - The cache never fails a call: any SQLite error is logged and treated as
+    a miss.
+"""
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from config import LLM_CACHE_ENABLED, LLM_CACHE_MAX_MB, LLM_CACHE_DEFAULT_TTL
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+DB_FILE = BASE_DIR / "data" / "llm_cache.db"
+
+EVICT_CHECK_EVERY = 20      # puts between size checks
+EVICT_TARGET_RATIO = 0.9    # evict down to this fraction of the budget
+
+
+def is_json_object(response: str) -> bool:
+    """True if the response holds a parseable JSON object (the same brace
+    span parse_json_response extracts)."""
+    start = response.find("{")
+    end = response.rfind("}")
+    if start == -1 or end <= start:
+        return False
+    try:
+        return isinstance(json.loads(response[start:end + 1]), dict)
+    except ValueError:
+        return False
+
+
+def response_validator(
+    validate: Optional[Callable[[str], Any]],
+    json_mode: bool,
+) -> Optional[Callable[[str], bool]]:
+    """The check a call site's responses must pass to be cached or replayed:
+    ``validate`` if given (raising counts as failing), else is_json_object
+    for json_mode calls, else none."""
+    if validate is None:
+        return is_json_object if json_mode else None
+
+    def _check(response: str) -> bool:
+        try:
+            return bool(validate(response))
+        except Exception:
+            return False
+
+    return _check
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key               TEXT PRIMARY KEY,
+    call_site         TEXT NOT NULL,
+    provider          TEXT NOT NULL,
+    model_id          TEXT NOT NULL,
+    response          TEXT NOT NULL,
+    prompt_tokens     INTEGER,
+    completion_tokens INTEGER,
+    size              INTEGER NOT NULL,
+    created_at        REAL NOT NULL,
+    last_hit_at       REAL NOT NULL,
+    hits              INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_responses_last_hit ON responses(last_hit_at);
+
+CREATE TABLE IF NOT EXISTS cache_stats (
+    call_site               TEXT NOT NULL,
+    provider                TEXT NOT NULL,
+    model_id                TEXT NOT NULL,
+    hits                    INTEGER NOT NULL DEFAULT 0,
+    misses                  INTEGER NOT NULL DEFAULT 0,
+    saved_prompt_tokens     INTEGER NOT NULL DEFAULT 0,
+    saved_completion_tokens INTEGER NOT NULL DEFAULT 0,
+    saved_cost_usd          REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (call_site, provider, model_id)
+);
+"""
+
+
+class LLMResponseCache:
+    """SQLite-backed LLM response cache shared by all workers."""
+
+    def __init__(self, db_file: Path = DB_FILE, max_mb: int = LLM_CACHE_MAX_MB):
+        self.db_file = Path(db_file)
+        self.max_bytes = max(1, max_mb) * 1024 * 1024
+        self.enabled = LLM_CACHE_ENABLED
+        self._lock = threading.Lock()
+        self._initialised = False
+        self._puts_since_check = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    conn.executescript(_SCHEMA)
+                    conn.commit()
+                    self._initialised = True
+        return conn
+
+    @staticmethod
+    def make_key(
+        provider: str,
+        model_id: str,
+        temperature: float,
+        json_mode: bool,
+        system_prompt: Optional[str],
+        prompt: str,
+    ) -> str:
+        """Content address for one request."""
+        material = json.dumps(
+            [
+                (provider or "").lower(),
+                model_id or "",
+                round(float(temperature), 4),
+                bool(json_mode),
+                system_prompt or "",
+                hashlib.sha256(prompt.encode("utf-8")).hexdigest(),
+            ],
+            separators=(",", ":"),
+        )
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    def get(self, key: str, ttl: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """
+        Return the stored entry for ``key`` if it is younger than ``ttl`` seconds.
+
+        Returns:
+            {"response", "prompt_tokens", "completion_tokens"} or None
+        """
+        ttl = LLM_CACHE_DEFAULT_TTL if ttl is None else ttl
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                row = conn.execute(
+                    "SELECT response, prompt_tokens, completion_tokens, created_at "
+                    "FROM responses WHERE key = ?",
+                    (key,),
+                ).fetchone()
+                if row is None:
+                    return None
+                if ttl and now - row["created_at"] > ttl:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    conn.commit()
+                    return None
+                conn.execute(
+                    "UPDATE responses SET last_hit_at = ?, hits = hits + 1 WHERE key = ?",
+                    (now, key),
+                )
+                conn.commit()
+                return {
+                    "response": row["response"],
+                    "prompt_tokens": row["prompt_tokens"],
+                    "completion_tokens": row["completion_tokens"],
+                }
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Lookup failed: {e}")
+            return None
+
+    def put(
+        self,
+        key: str,
+        response: str,
+        call_site: str,
+        provider: str,
+        model_id: str,
+        prompt_tokens: Optional[int] = None,
+        completion_tokens: Optional[int] = None,
+    ) -> None:
+        """Store a response; periodically evicts to stay within the size budget."""
+        if not response:
+            return
+        now = time.time()
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """INSERT OR REPLACE INTO responses
+                       (key, call_site, provider, model_id, response,
+                        prompt_tokens, completion_tokens, size, created_at, last_hit_at, hits)
+                       VALUES (?,?,?,?,?,?,?,?,?,?,0)""",
+                    (key, call_site, provider, model_id, response,
+                     prompt_tokens, completion_tokens,
+                     len(response.encode("utf-8")), now, now),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Store failed: {e}")
+            return
+
+        with self._lock:
+            self._puts_since_check += 1
+            check = self._puts_since_check >= EVICT_CHECK_EVERY
+            if check:
+                self._puts_since_check = 0
+        if check:
+            self.evict()
+
+    def delete(self, key: str) -> None:
+        """Remove one entry."""
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Delete failed: {e}")
+
+    def evict(self, max_bytes: Optional[int] = None) -> int:
+        """
+        Drop least-recently-hit entries until the cache fits its budget.
+
+        Returns:
+            Number of entries removed
+        """
+        budget = max_bytes or self.max_bytes
+        try:
+            conn = self._connect()
+            try:
+                total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+                if total <= budget:
+                    return 0
+                to_free = total - int(budget * EVICT_TARGET_RATIO)
+                victims = []
+                freed = 0
+                for row in conn.execute("SELECT key, size FROM responses ORDER BY last_hit_at ASC"):
+                    victims.append((row["key"],))
+                    freed += row["size"]
+                    if freed >= to_free:
+                        break
+                conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+                conn.commit()
+                print(f"[LLMCache] Evicted {len(victims)} entries ({freed / 1024 / 1024:.1f} MB)")
+                return len(victims)
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Eviction failed: {e}")
+            return 0
+
+    def lookup(
+        self,
+        call_site: str,
+        provider: str,
+        model_id: str,
+        temperature: float,
+        json_mode: bool,
+        system_prompt: Optional[str],
+        prompt: str,
+        ttl: Optional[int] = None,
+        validate: Optional[Callable[[str], bool]] = None,
+    ) -> Tuple[str, Optional[str]]:
+        """
+        Look up a request and report the hit or miss to cost tracking.
+
+        An entry failing ``validate`` is deleted and reported as a miss.
+
+        Returns:
+            (key, cached response or None); pass the key to put() on a miss.
+        """
+        key = self.make_key(provider, model_id, temperature, json_mode, system_prompt, prompt)
+        entry = self.get(key, ttl)
+        if entry is not None and validate is not None and not validate(entry["response"]):
+            print(f"[LLMCache] Dropping invalid cached response for {call_site}")
+            self.delete(key)
+            entry = None
+        self._record_event(
+            hit=entry is not None,
+            call_site=call_site,
+            provider=provider,
+            model_id=model_id,
+            prompt_tokens=entry["prompt_tokens"] if entry else None,
+            completion_tokens=entry["completion_tokens"] if entry else None,
+        )
+        return key, entry["response"] if entry else None
+
+    def _record_event(self, hit: bool, call_site: str, provider: str, model_id: str,
+                      prompt_tokens: Optional[int], completion_tokens: Optional[int]) -> None:
+        try:
+            from services.cost_tracking_service import record_cache_event
+        except ImportError:
+            # Standalone ingestion without the backend: count it, unpriced
+            self.record_stats(call_site, provider, model_id, hit,
+                              prompt_tokens or 0, completion_tokens or 0, 0.0)
+            return
+        record_cache_event(hit, call_site, provider, model_id, prompt_tokens, completion_tokens)
+
+    def record_stats(
+        self,
+        call_site: str,
+        provider: str,
+        model_id: str,
+        hit: bool,
+        saved_prompt_tokens: int = 0,
+        saved_completion_tokens: int = 0,
+        saved_cost_usd: float = 0.0,
+    ) -> None:
+        """Additively update the per-site hit/miss and savings counters."""
+        try:
+            conn = self._connect()
+            try:
+                conn.execute(
+                    """INSERT INTO cache_stats
+                       (call_site, provider, model_id, hits, misses,
+                        saved_prompt_tokens, saved_completion_tokens, saved_cost_usd)
+                       VALUES (?,?,?,?,?,?,?,?)
+                       ON CONFLICT(call_site, provider, model_id)
+                       DO UPDATE SET hits = hits + excluded.hits,
+                                     misses = misses + excluded.misses,
+                                     saved_prompt_tokens = saved_prompt_tokens + excluded.saved_prompt_tokens,
+                                     saved_completion_tokens = saved_completion_tokens + excluded.saved_completion_tokens,
+                                     saved_cost_usd = saved_cost_usd + excluded.saved_cost_usd""",
+                    (call_site, provider, model_id, 1 if hit else 0, 0 if hit else 1,
+                     saved_prompt_tokens, saved_completion_tokens, saved_cost_usd),
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Failed to record stats: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        """Per-site counters plus current cache size."""
+        try:
+            conn = self._connect()
+            try:
+                sites = [dict(r) for r in conn.execute(
+                    "SELECT * FROM cache_stats ORDER BY saved_cost_usd DESC, hits DESC"
+                )]
+                entries, size = conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+                ).fetchone()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Failed to read stats: {e}")
+            sites, entries, size = [], 0, 0
+
+        hits = sum(s["hits"] for s in sites)
+        misses = sum(s["misses"] for s in sites)
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "size_bytes": size,
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / (hits + misses), 4) if hits + misses else 0.0,
+            "saved_cost_usd": round(sum(s["saved_cost_usd"] for s in sites), 6),
+            "by_site": sites,
+        }
+
+    def clear(self) -> None:
+        """Remove all cached responses (counters are kept)."""
+        try:
+            conn = self._connect()
+            try:
+                conn.execute("DELETE FROM responses")
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            print(f"[LLMCache] Clear failed: {e}")
+
+
+llm_response_cache = LLMResponseCache()
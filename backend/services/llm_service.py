@@ -2,8 +2,7 @@
 LLM Service - handles all AI API interactions for the investigation console.
 """
 
-from typing import Dict, Any, Optional
-import requests
+from typing import Callable, Dict, Any, List, Optional
 import json
 
 from config import OLLAMA_BASE_URL, OLLAMA_MODEL, OPENAI_MODEL, LLM_PROVIDER, LLM_MODEL, OPENAI_API_KEY, QUESTION_CLASSIFICATION_ENABLED
@@ -17,13 +16,17 @@ if str(backend_dir) not in sys.path:
 
 from models.llm_models import LLMProvider, get_default_model, get_model_by_id
 
-from openai import OpenAI
-
 from utils.prompt_trace import log_section
+from services.llm_transport import get_llm_transport
+from services.llm_response_cache import llm_response_cache, response_validator
+from services.token_budget import token_counter
+from services.platform_telemetry import span as telemetry_span
+from services.pipeline_profiler import stage
 
 client = None
 if OPENAI_API_KEY:
-    client = OpenAI(api_key=OPENAI_API_KEY)
+    # Shared pooled client (keep-alive, per-provider concurrency limit)
+    client = get_llm_transport().openai_client()
 
 config = get_chat_config()
 system_context = config.get("system_context", "You are an AI assistant.")
@@ -88,6 +91,9 @@ class LLMService:
         temperature: float = 0.3,
         json_mode: bool = False,
         timeout: int = 600,  # 10 minutes default for large models
+        cache_site: Optional[str] = None,
+        cache_ttl: Optional[int] = None,
+        validate: Optional[Callable[[str], Any]] = None,
     ) -> str:
         """
         Call the LLM (Ollama or OpenAI).
@@ -97,6 +103,13 @@ class LLMService:
             temperature: Sampling temperature
             json_mode: Request JSON output
             timeout: Request timeout
+            cache_site: Opt into the response cache under this call-site name.
+                Only for calls where replaying an identical earlier answer is fine.
+            cache_ttl: Max age in seconds of a cached response for this site
+                (defaults to LLM_CACHE_DEFAULT_TTL)
+            validate: Only responses for which this returns truthy (without
+                raising) are cached or replayed. json_mode calls default to
+                requiring a parseable JSON object.
 
         Returns:
             Model response text
@@ -105,71 +118,233 @@ class LLMService:
         self._last_prompt = prompt
         self._last_raw_response = None
 
-        if self.provider == "ollama":
-            result = self._call_ollama(prompt, temperature, json_mode, timeout)
-        elif self.provider == "openai":
-            result = self._call_openai(prompt, temperature, json_mode, timeout)
-        else:
-            raise ValueError(f"Unknown provider: {self.provider}")
+        cache_key = None
+        cacheable = response_validator(validate, json_mode)
+        if cache_site and llm_response_cache.enabled:
+            cache_key, cached = llm_response_cache.lookup(
+                cache_site, self.provider, self.model_id, temperature, json_mode,
+                system_context, prompt, ttl=cache_ttl, validate=cacheable,
+            )
+            if cached is not None:
+                print(f"[LLM] Cache hit ({cache_site}) for {self.provider}/{self.model_id}")
+                self._last_raw_response = cached
+                return cached
+
+        usage: Dict[str, int] = {}
+        with telemetry_span("llm"), stage(f"llm:{cache_site or 'call'}", provider=self.provider) as s:
+            if self.provider == "ollama":
+                result = self._call_ollama(prompt, temperature, json_mode, timeout, usage_out=usage)
+            elif self.provider == "openai":
+                result = self._call_openai(prompt, temperature, json_mode, timeout, usage_out=usage)
+            else:
+                raise ValueError(f"Unknown provider: {self.provider}")
+            s.add(count=1, bytes=len(prompt) + len(result or ""))
+
+        if cache_key and (cacheable is None or cacheable(result)):
+            llm_response_cache.put(
+                cache_key, result, cache_site, self.provider, self.model_id,
+                prompt_tokens=usage.get("prompt_tokens"),
+                completion_tokens=usage.get("completion_tokens"),
+            )
 
         # Track response for pipeline trace
         self._last_raw_response = result
         return result
-    
+
+    async def acall(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        json_mode: bool = False,
+        timeout: int = 600,
+    ) -> str:
+        """
+        Async variant of call() so independent LLM requests can overlap.
+
+        Concurrency is bounded per provider by the shared LLM transport.
+        Does not update the _last_prompt / _last_raw_response trace, since
+        overlapping calls would race on it.
+        """
+        with telemetry_span("llm"), stage("llm:acall", provider=self.provider) as s:
+            if self.provider == "ollama":
+                result = await self._acall_ollama(prompt, temperature, json_mode, timeout)
+            elif self.provider == "openai":
+                result = await self._acall_openai(prompt, temperature, json_mode, timeout)
+            else:
+                raise ValueError(f"Unknown provider: {self.provider}")
+            s.add(count=1, bytes=len(prompt) + len(result or ""))
+        return result
+
+    def _ollama_messages(self, prompt: str) -> List[Dict]:
+        return [
+            {"role": "system", "content": system_context},
+            {"role": "user", "content": prompt}
+        ]
+
     def _call_ollama(
         self,
         prompt: str,
         temperature: float = 0.3,
         json_mode: bool = False,
         timeout: int = 600,  # 10 minutes default for large models
+        usage_out: Optional[Dict] = None,
     ) -> str:
-        """Call Ollama LLM."""
+        """Call Ollama LLM; the reported prompt size calibrates the token estimator."""
         try:
-            url = f"{OLLAMA_BASE_URL}/api/chat"
-
-            payload: Dict = {
-                "model": self.model_id,
-                "messages": [
-                    {"role": "system", "content": system_context},
-                    {"role": "user", "content": prompt}
-                ],
-                "stream": False,
-                "options": {
-                    "temperature": temperature,
-                },
-            }
-
-            if json_mode:
-                payload["format"] = "json"
+            messages = self._ollama_messages(prompt)
 
             log_section(
                 source_file=__file__,
                 source_func="_call_ollama",
                 title="HTTP request: Ollama /api/chat payload",
                 content={
-                    "url": url,
+                    "url": f"{OLLAMA_BASE_URL}/api/chat",
                     "model_id": self.model_id,
                     "provider": self.provider,
                     "json_mode": json_mode,
                     "temperature": temperature,
-                    "payload": payload,
+                    "messages": messages,
                 },
                 as_json=True,
             )
 
-            # Use tuple timeout: (connect_timeout, read_timeout)
-            # Connect timeout: 10 seconds, Read timeout: as specified (for large models)
-            resp = requests.post(url, json=payload, timeout=(10, timeout))
-            resp.raise_for_status()
+            # Pooled keep-alive connection; connect timeout 10s, read timeout as specified
+            usage = {} if usage_out is None else usage_out
+            content = get_llm_transport().ollama_chat(
+                model_id=self.model_id,
+                messages=messages,
+                temperature=temperature,
+                json_mode=json_mode,
+                timeout=timeout,
+                usage_out=usage,
+            )
+            token_counter.observe(
+                self.model_id,
+                "\n".join(m["content"] for m in messages),
+                usage.get("prompt_tokens"),
+            )
+            if not content.strip():
+                raise ValueError("LLM returned empty response")
+            return content
+        except Exception as e:
+            print(f"[LLM] ERROR calling Ollama: {e}")
+            raise
 
-            data = resp.json()
-            content = (data.get("message") or {}).get("content", "") or ""
+    async def _acall_ollama(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        json_mode: bool = False,
+        timeout: int = 600,
+    ) -> str:
+        """Async call to Ollama LLM."""
+        try:
+            content = await get_llm_transport().aollama_chat(
+                model_id=self.model_id,
+                messages=self._ollama_messages(prompt),
+                temperature=temperature,
+                json_mode=json_mode,
+                timeout=timeout,
+            )
             if not content.strip():
                 raise ValueError("LLM returned empty response")
             return content
         except Exception as e:
             print(f"[LLM] ERROR calling Ollama: {e}")
             raise
+
+    def _openai_kwargs(
+        self,
+        prompt: str,
+        temperature: float,
+        json_mode: bool,
+        timeout: int,
+    ) -> Dict[str, Any]:
+        """Build chat.completions.create() arguments for the configured model."""
+        # Some OpenAI models (like o1, o3, gpt-5) don't support custom temperature
+        # They only support the default value of 1.0
+        # Check if the model doesn't support custom temperature
+        models_without_temperature_support = ["o1", "o3", "gpt-5"]
+        supports_custom_temperature = not any(
+            self.model_id.startswith(prefix) for prefix in models_without_temperature_support
+        )
+        
+        kwargs = {
+            "model": self.model_id,
+            "messages": [
+                {"role": "system", "content": system_context},
+                {"role": "user", "content": prompt}
+            ],
+            "timeout": timeout,
+        }
+        
+        # Only add temperature if the model supports custom temperature values
+        # Some models (like o1, o3, gpt-5) only support the default temperature (1.0)
+        # and will error if any temperature parameter is provided
+        if supports_custom_temperature:
+            kwargs["temperature"] = temperature
+        # For models that don't support custom temperature, omit the parameter
+        # OpenAI will use the default value (1.0) automatically
+
+        # Force JSON response if requested
+        if json_mode:
+            kwargs["response_format"] = {"type": "json_object"}
+        return kwargs
+
+    def _record_openai_usage(self, usage) -> None:
+        """Record token usage and cost for an OpenAI response (never raises)."""
+        try:
+            from services.cost_tracking_service import record_cost, CostJobType
+            from postgres.session import get_db
+            import uuid as uuid_lib
+            
+            if usage:
+                # Get database session
+                db = next(get_db())
+                try:
+                    # Get context from instance variable
+                    context = self._cost_tracking_context or {}
+                    job_type_str = context.get("job_type", "ai_assistant")
+                    job_type = CostJobType.AI_ASSISTANT if job_type_str == "ai_assistant" else CostJobType.INGESTION
+                    
+                    # Parse case_id and user_id if provided
+                    case_id = None
+                    if context.get("case_id"):
+                        try:
+                            case_id = uuid_lib.UUID(context["case_id"])
+                        except (ValueError, TypeError):
+                            pass
+                    
+                    user_id = None
+                    if context.get("user_id"):
+                        try:
+                            user_id = uuid_lib.UUID(context["user_id"])
+                        except (ValueError, TypeError):
+                            pass
+                    
+                    record_cost(
+                        job_type=job_type,
+                        provider="openai",
+                        model_id=self.model_id,
+                        prompt_tokens=usage.prompt_tokens,
+                        completion_tokens=usage.completion_tokens,
+                        total_tokens=usage.total_tokens,
+                        case_id=case_id,
+                        user_id=user_id,
+                        description=context.get("description"),
+                        extra_metadata=context.get("extra_metadata"),
+                        db=db,
+                    )
+                except Exception as e:
+                    print(f"[LLM] WARNING: Failed to record cost: {e}")
+                finally:
+                    db.close()
+        except ImportError:
+            # Cost tracking not available, skip
+            pass
+        except Exception as e:
+            # Don't fail the request if cost tracking fails
+            print(f"[LLM] WARNING: Cost tracking error: {e}")
     
     def _call_openai(
         self,
@@ -177,40 +352,14 @@ class LLMService:
         temperature: float = 0.3,
         json_mode: bool = False,
         timeout: int = 600,  # 10 minutes default for large models
+        usage_out: Optional[Dict[str, int]] = None,
     ) -> str:
-        """Call OpenAI LLM."""
+        """Call OpenAI LLM. Token counts are copied into ``usage_out`` if given."""
         if not client:
             raise ValueError("OpenAI client not initialized. OPENAI_API_KEY not set.")
         
         try:
-            # Some OpenAI models (like o1, o3, gpt-5) don't support custom temperature
-            # They only support the default value of 1.0
-            # Check if the model doesn't support custom temperature
-            models_without_temperature_support = ["o1", "o3", "gpt-5"]
-            supports_custom_temperature = not any(
-                self.model_id.startswith(prefix) for prefix in models_without_temperature_support
-            )
-            
-            kwargs = {
-                "model": self.model_id,
-                "messages": [
-                    {"role": "system", "content": system_context},
-                    {"role": "user", "content": prompt}
-                ],
-                "timeout": timeout,
-            }
-            
-            # Only add temperature if the model supports custom temperature values
-            # Some models (like o1, o3, gpt-5) only support the default temperature (1.0)
-            # and will error if any temperature parameter is provided
-            if supports_custom_temperature:
-                kwargs["temperature"] = temperature
-            # For models that don't support custom temperature, omit the parameter
-            # OpenAI will use the default value (1.0) automatically
-
-            # Force JSON response if requested
-            if json_mode:
-                kwargs["response_format"] = {"type": "json_object"}
+            kwargs = self._openai_kwargs(prompt, temperature, json_mode, timeout)
 
             log_section(
                 source_file=__file__,
@@ -227,7 +376,7 @@ class LLMService:
             )
 
             print(f"[LLM] Calling OpenAI model {self.model_id} with prompt length {len(prompt)}")
-            response = client.chat.completions.create(**kwargs)
+            response = get_llm_transport().openai_chat(**kwargs)
 
             # Extract content
             content = response.choices[0].message.content
@@ -236,95 +385,38 @@ class LLMService:
                 raise ValueError("LLM returned empty response")
             
             # Track token usage and cost
-            try:
-                from services.cost_tracking_service import record_cost, CostJobType
-                from postgres.session import get_db
-                import uuid as uuid_lib
-                
-                usage = response.usage
-                if usage:
-                    # Get database session
-                    db = next(get_db())
-                    try:
-                        # Get context from instance variable
-                        context = self._cost_tracking_context or {}
-                        job_type_str = context.get("job_type", "ai_assistant")
-                        job_type = CostJobType.AI_ASSISTANT if job_type_str == "ai_assistant" else CostJobType.INGESTION
-                        
-                        # Parse case_id and user_id if provided
-                        case_id = None
-                        if context.get("case_id"):
-                            try:
-                                case_id = uuid_lib.UUID(context["case_id"])
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        user_id = None
-                        if context.get("user_id"):
-                            try:
-                                user_id = uuid_lib.UUID(context["user_id"])
-                            except (ValueError, TypeError):
-                                pass
-                        
-                        record_cost(
-                            job_type=job_type,
-                            provider="openai",
-                            model_id=self.model_id,
-                            prompt_tokens=usage.prompt_tokens,
-                            completion_tokens=usage.completion_tokens,
-                            total_tokens=usage.total_tokens,
-                            case_id=case_id,
-                            user_id=user_id,
-                            description=context.get("description"),
-                            extra_metadata=context.get("extra_metadata"),
-                            db=db,
-                        )
-                    except Exception as e:
-                        print(f"[LLM] WARNING: Failed to record cost: {e}")
-                    finally:
-                        db.close()
-            except ImportError:
-                # Cost tracking not available, skip
-                pass
-            except Exception as e:
-                # Don't fail the request if cost tracking fails
-                print(f"[LLM] WARNING: Cost tracking error: {e}")
+            self._record_openai_usage(response.usage)
+            if usage_out is not None and response.usage:
+                usage_out["prompt_tokens"] = response.usage.prompt_tokens
+                usage_out["completion_tokens"] = response.usage.completion_tokens
             
             print(f"[LLM] Response length: {len(content)}")
             return content
         except Exception as e:
             print(f"[LLM] ERROR calling OpenAI: {e}")
             raise
-            # --- OpenAI API --- #
-            # kwargs = {
-            #     "model": OPENAI_MODEL,
-            #     "messages": [
-            #         {"role": "user", "content": prompt}
-            #     ],
-            #     "temperature": temperature,
-            #     "timeout": timeout,
-            # }
-
-            # # Force JSON response if requested
-            # if json_mode:
-            #     kwargs["response_format"] = {"type": "json_object"}
-
-            # print(f"[LLM] Calling model {OPENAI_MODEL} with prompt length {len(prompt)}")
-            # response = client.chat.completions.create(**kwargs)
-
-            # # Extract content
-            # content = response.choices[0].message.content
-            # if not content:
-            #     print("[LLM] WARNING: Empty response from LLM")
-            #     raise ValueError("LLM returned empty response")
-            
-            # print(f"[LLM] Response length: {len(content)}")
-            # return content
+
+    async def _acall_openai(
+        self,
+        prompt: str,
+        temperature: float = 0.3,
+        json_mode: bool = False,
+        timeout: int = 600,
+    ) -> str:
+        """Async call to OpenAI LLM."""
+        if not client:
+            raise ValueError("OpenAI client not initialized. OPENAI_API_KEY not set.")
+
+        try:
+            kwargs = self._openai_kwargs(prompt, temperature, json_mode, timeout)
+            response = await get_llm_transport().aopenai_chat(**kwargs)
+            content = response.choices[0].message.content
+            if not content:
+                raise ValueError("LLM returned empty response")
+            self._record_openai_usage(response.usage)
+            return content
         except Exception as e:
-            print(f"[LLM] ERROR calling LLM: {e}")
-            print(f"[LLM] Error type: {type(e).__name__}")
-            import traceback
-            traceback.print_exc()
+            print(f"[LLM] ERROR calling OpenAI: {e}")
             raise
 
     def parse_json_response(self, response_text: str) -> Dict:
@@ -373,7 +465,10 @@ Return ONLY valid JSON:
 {{"classification": "semantic" or "structural" or "hybrid"}}"""
 
         try:
-            response = self.call(prompt, temperature=0.0, json_mode=True)
+            response = self.call(
+                prompt, temperature=0.0, json_mode=True,
+                cache_site="question_classification", cache_ttl=24 * 3600,
+            )
             result = self.parse_json_response(response)
             classification = result.get("classification", "hybrid").lower().strip()
             if classification in ("semantic", "structural", "hybrid"):
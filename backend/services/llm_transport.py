@@ -0,0 +1,305 @@
+"""
+LLM Transport - shared, pooled HTTP layer for Ollama and OpenAI calls.
+
+Both the backend LLMService and the ingestion llm_client send their
+requests through here so that:
+- connections are kept alive and reused (one httpx pool per process)
+- each provider has its own concurrency limit, shared across threads
+- transient failures (connect errors, timeouts, 429, 5xx) are retried
+  with jittered exponential backoff
+- callers can use either the sync or the async entry points, so
+  independent LLM calls can overlap
+"""
+
+import asyncio
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import httpx
+
+from config import (
+    OLLAMA_BASE_URL, OPENAI_API_KEY,
+    LLM_CONCURRENCY_OLLAMA, LLM_CONCURRENCY_OPENAI,
+    LLM_MAX_RETRIES, LLM_RETRY_BASE_DELAY,
+)
+
+try:
+    import openai
+    from openai import OpenAI, AsyncOpenAI
+    OPENAI_AVAILABLE = True
+except ImportError:
+    openai = None
+    OpenAI = None
+    AsyncOpenAI = None
+    OPENAI_AVAILABLE = False
+
+
+# Connect timeout for every request; read timeouts are per call
+CONNECT_TIMEOUT = 10.0
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def _backoff_delay(attempt: int) -> float:
+    """Full-jitter exponential backoff: uniform(0, base * 2^attempt), capped at 30s."""
+    return random.uniform(0, min(30.0, LLM_RETRY_BASE_DELAY * (2 ** attempt)))
+
+
+def _is_retryable(exc: Exception) -> bool:
+    """Whether an exception is worth retrying (transient network/server errors)."""
+    if isinstance(exc, httpx.HTTPStatusError):
+        return exc.response.status_code in RETRYABLE_STATUS_CODES
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if OPENAI_AVAILABLE and isinstance(exc, (
+        openai.APIConnectionError,
+        openai.APITimeoutError,
+        openai.RateLimitError,
+        openai.InternalServerError,
+    )):
+        return True
+    return False
+
+
+class LLMTransport:
+    """Process-wide pooled clients and per-provider concurrency limits."""
+
+    def __init__(self):
+        self._limits = {
+            "ollama": max(1, LLM_CONCURRENCY_OLLAMA),
+            "openai": max(1, LLM_CONCURRENCY_OPENAI),
+        }
+        self._sync_semaphores = {
+            provider: threading.BoundedSemaphore(limit)
+            for provider, limit in self._limits.items()
+        }
+        # asyncio clients and semaphores are bound to one event loop; keep a
+        # state dict per loop and drop it once that loop has closed
+        self._async_state: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+        pool_size = sum(self._limits.values())
+        self._http = httpx.Client(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+            ),
+            timeout=httpx.Timeout(600.0, connect=CONNECT_TIMEOUT),
+        )
+        self._openai = None
+
+    def concurrency_limit(self, provider: str) -> int:
+        """Concurrent requests allowed to ``provider`` (ollama or openai)."""
+        return self._limits.get((provider or "ollama").lower(), self._limits["ollama"])
+
+    # ------------------------------------------------------------------
+    # Client accessors
+    # ------------------------------------------------------------------
+
+    def openai_client(self):
+        """Shared sync OpenAI client on the pooled httpx transport (retries handled here)."""
+        if not OPENAI_AVAILABLE:
+            raise ImportError("OpenAI package not installed. Install with: pip install openai")
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not set in environment variables")
+        if self._openai is None:
+            with self._lock:
+                if self._openai is None:
+                    self._openai = OpenAI(
+                        api_key=OPENAI_API_KEY,
+                        http_client=self._http,
+                        max_retries=0,
+                    )
+        return self._openai
+
+    def _loop_state(self) -> Dict[str, Any]:
+        """Async clients/semaphores for the running event loop, created on first use."""
+        loop = asyncio.get_running_loop()
+        state = self._async_state.get(id(loop))
+        if state is None or state["loop"] is not loop:
+            with self._lock:
+                for key, stale in list(self._async_state.items()):
+                    if stale["loop"].is_closed():
+                        del self._async_state[key]
+            pool_size = sum(self._limits.values())
+            state = {
+                "loop": loop,
+                "http": httpx.AsyncClient(
+                    limits=httpx.Limits(
+                        max_connections=pool_size,
+                        max_keepalive_connections=pool_size,
+                    ),
+                    timeout=httpx.Timeout(600.0, connect=CONNECT_TIMEOUT),
+                ),
+                "semaphores": {p: asyncio.Semaphore(limit) for p, limit in self._limits.items()},
+                "openai": None,
+            }
+            self._async_state[id(loop)] = state
+        return state
+
+    def async_openai_client(self):
+        """Async OpenAI client bound to the running event loop."""
+        if not OPENAI_AVAILABLE:
+            raise ImportError("OpenAI package not installed. Install with: pip install openai")
+        if not OPENAI_API_KEY:
+            raise ValueError("OPENAI_API_KEY not set in environment variables")
+        state = self._loop_state()
+        if state["openai"] is None:
+            state["openai"] = AsyncOpenAI(
+                api_key=OPENAI_API_KEY,
+                http_client=state["http"],
+                max_retries=0,
+            )
+        return state["openai"]
+
+    # ------------------------------------------------------------------
+    # Retry wrappers
+    # ------------------------------------------------------------------
+
+    def run(self, provider: str, fn: Callable[[], Any], max_retries: Optional[int] = None) -> Any:
+        """
+        Run a sync request under the provider's concurrency limit, with retries.
+
+        Args:
+            provider: "ollama" or "openai"
+            fn: Zero-argument callable performing one request
+            max_retries: Retries after the first attempt (defaults to LLM_MAX_RETRIES)
+        """
+        retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        semaphore = self._sync_semaphores[provider]
+        for attempt in range(retries + 1):
+            try:
+                with semaphore:
+                    return fn()
+            except Exception as e:
+                if attempt >= retries or not _is_retryable(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                print(f"[LLMTransport] {provider} request failed ({type(e).__name__}: {e}); "
+                      f"retry {attempt + 1}/{retries} in {delay:.1f}s")
+                time.sleep(delay)
+
+    async def arun(self, provider: str, fn: Callable[[], Any], max_retries: Optional[int] = None) -> Any:
+        """Async counterpart of run(); ``fn`` returns an awaitable."""
+        retries = LLM_MAX_RETRIES if max_retries is None else max_retries
+        semaphore = self._loop_state()["semaphores"][provider]
+        for attempt in range(retries + 1):
+            try:
+                async with semaphore:
+                    return await fn()
+            except Exception as e:
+                if attempt >= retries or not _is_retryable(e):
+                    raise
+                delay = _backoff_delay(attempt)
+                print(f"[LLMTransport] {provider} request failed ({type(e).__name__}: {e}); "
+                      f"retry {attempt + 1}/{retries} in {delay:.1f}s")
+                await asyncio.sleep(delay)
+
+    # ------------------------------------------------------------------
+    # Ollama
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _ollama_payload(model_id: str, messages: List[Dict], temperature: float, json_mode: bool) -> Dict:
+        payload: Dict = {
+            "model": model_id,
+            "messages": messages,
+            "stream": False,
+            "options": {
+                "temperature": temperature,
+            },
+        }
+        if json_mode:
+            payload["format"] = "json"
+        return payload
+
+    @staticmethod
+    def _ollama_usage(data: Dict, usage_out: Optional[Dict]) -> None:
+        if usage_out is not None:
+            usage_out["prompt_tokens"] = data.get("prompt_eval_count")
+            usage_out["completion_tokens"] = data.get("eval_count")
+
+    def ollama_chat(
+        self,
+        model_id: str,
+        messages: List[Dict],
+        temperature: float,
+        json_mode: bool = False,
+        timeout: float = 600,
+        usage_out: Optional[Dict] = None,
+    ) -> str:
+        """
+        POST /api/chat and return the message content.
+
+        If ``usage_out`` is given it receives prompt_tokens / completion_tokens
+        from Ollama's prompt_eval_count / eval_count.
+        """
+        url = f"{OLLAMA_BASE_URL}/api/chat"
+        payload = self._ollama_payload(model_id, messages, temperature, json_mode)
+
+        def _request():
+            resp = self._http.post(url, json=payload, timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT))
+            resp.raise_for_status()
+            return resp.json()
+
+        data = self.run("ollama", _request)
+        self._ollama_usage(data, usage_out)
+        # Ollama chat response shape: { message: { role: "...", content: "..." }, ... }
+        return (data.get("message") or {}).get("content", "") or ""
+
+    async def aollama_chat(
+        self,
+        model_id: str,
+        messages: List[Dict],
+        temperature: float,
+        json_mode: bool = False,
+        timeout: float = 600,
+        usage_out: Optional[Dict] = None,
+    ) -> str:
+        """
+        Async POST /api/chat and return the message content.
+
+        If ``usage_out`` is given it receives prompt_tokens / completion_tokens
+        from Ollama's prompt_eval_count / eval_count.
+        """
+        url = f"{OLLAMA_BASE_URL}/api/chat"
+        payload = self._ollama_payload(model_id, messages, temperature, json_mode)
+        client = self._loop_state()["http"]
+
+        async def _request():
+            resp = await client.post(url, json=payload, timeout=httpx.Timeout(timeout, connect=CONNECT_TIMEOUT))
+            resp.raise_for_status()
+            return resp.json()
+
+        data = await self.arun("ollama", _request)
+        self._ollama_usage(data, usage_out)
+        return (data.get("message") or {}).get("content", "") or ""
+
+    # ------------------------------------------------------------------
+    # OpenAI
+    # ------------------------------------------------------------------
+
+    def openai_chat(self, **kwargs) -> Any:
+        """chat.completions.create() through the pooled client; returns the raw response."""
+        client = self.openai_client()
+        return self.run("openai", lambda: client.chat.completions.create(**kwargs))
+
+    async def aopenai_chat(self, **kwargs) -> Any:
+        """Async chat.completions.create(); returns the raw response."""
+        client = self.async_openai_client()
+        return await self.arun("openai", lambda: client.chat.completions.create(**kwargs))
+
+
+_transport: Optional[LLMTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_llm_transport() -> LLMTransport:
+    """Get or create the process-wide LLM transport (lazy initialization)."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = LLMTransport()
+    return _transport
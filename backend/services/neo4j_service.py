@@ -5,6 +5,8 @@ Neo4j Service - handles all database operations for the investigation console.
 from typing import Dict, List, Optional, Any, Set, Tuple
 from neo4j import GraphDatabase
 import base64
+import functools
+import inspect
 import math
 import random
 import json
@@ -166,6 +168,42 @@ def _infer_call_type(direction: Optional[str], duration: Optional[str]) -> Optio
     return None
 
 
+# Per-case write counter (one :CaseGraphVersion node per case, keyed by
+# case_key rather than case_id so case-scoped node scans never see it). Every
+# write path bumps it, and caches built from the graph (answer cache,
+# precomputed results) compare it with one indexed lookup. The epoch is
+# regenerated when the node is recreated (e.g. after clear_graph), so a
+# restarted counter never matches versions recorded before. A second
+# counter, names, is bumped only by writes that add, remove, rename or merge
+# named nodes (or their aliases) and versions the entity mention matcher.
+# ingestion/scripts/neo4j_client.py bumps the same node.
+_BUMP_CASE_VERSION = """
+MERGE (v:CaseGraphVersion {case_key: $case_id})
+ON CREATE SET v.epoch = randomUUID(), v.graph = 0, v.names = 0
+SET v.graph = v.graph + 1,
+    v.names = coalesce(v.names, 0) + CASE WHEN $names THEN 1 ELSE 0 END
+"""
+
+
+def _bumps_graph_version(method=None, *, names: bool = False):
+    """Decorator for write methods taking a ``case_id``: bump that case's
+    graph version (and, with ``names=True``, its entity names version) once
+    the write succeeded."""
+    if method is None:
+        return functools.partial(_bumps_graph_version, names=names)
+    signature = inspect.signature(method)
+
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        result = method(self, *args, **kwargs)
+        case_id = signature.bind(self, *args, **kwargs).arguments.get("case_id")
+        if case_id:
+            self.bump_case_graph_version(case_id, names=names)
+        return result
+
+    return wrapper
+
+
 def _dedup_comms_items(items):
     seen = set()
     out = []
@@ -205,6 +243,7 @@ class Neo4jService:
             )
             self._ensure_case_id_index()
             self._ensure_cellebrite_indexes()
+            self._ensure_case_version_constraint()
             # Track which cases have already been backfilled this process
             self._backfilled_keys: set = set()
             self._backfilled_refs: set = set()
@@ -281,6 +320,18 @@ class Neo4jService:
             # Stay resilient on boot — slow queries are better than a crashed backend.
             pass
 
+    def _ensure_case_version_constraint(self):
+        """Unique case_key on :CaseGraphVersion — backs the version lookup
+        and keeps concurrent first bumps from creating two nodes."""
+        try:
+            with self._driver.session() as session:
+                session.run(
+                    "CREATE CONSTRAINT case_graph_version_key IF NOT EXISTS "
+                    "FOR (v:CaseGraphVersion) REQUIRE v.case_key IS UNIQUE"
+                )
+        except Exception:
+            pass
+
     def close(self):
         if self._driver:
             self._driver.close()
@@ -2090,6 +2141,7 @@ class Neo4jService:
     # Fact and Insight Management
     # -------------------------------------------------------------------------
 
+    @_bumps_graph_version
     def pin_fact(self, node_key: str, fact_index: int, pinned: bool, case_id: str = None) -> Dict:
         """
         Toggle the pinned status of a verified fact.
@@ -2138,6 +2190,7 @@ class Neo4jService:
 
             return verified_facts
 
+    @_bumps_graph_version
     def verify_insight(
         self,
         node_key: str,
@@ -2550,6 +2603,7 @@ class Neo4jService:
         }
         await asyncio.sleep(0)  # Ensure event is flushed before generator ends
 
+    @_bumps_graph_version(names=True)
     def merge_entities(
         self,
         source_key: str,
@@ -2847,6 +2901,7 @@ class Neo4jService:
                 "relationships_updated": relationships_updated,
             }
             
+    @_bumps_graph_version(names=True)
     def bulk_merge_entities(
         self,
         target_key: str,
@@ -3050,6 +3105,7 @@ class Neo4jService:
                 "entities_merged": len(source_keys),
             }
 
+    @_bumps_graph_version(names=True)
     def delete_node(self, node_key: str, case_id: str = None) -> Dict[str, Any]:
         """
         Delete a node and all its relationships.
@@ -3369,6 +3425,7 @@ class Neo4jService:
             )
             return [dict(record) for record in result]
 
+    @_bumps_graph_version(names=True)
     def delete_document_and_exclusive_entities(
         self, doc_key: str, case_id: str
     ) -> Dict[str, Any]:
@@ -3480,6 +3537,7 @@ class Neo4jService:
     # Recycling Bin (Soft Delete)
     # -------------------------------------------------------------------------
 
+    @_bumps_graph_version(names=True)
     def soft_delete_entity(
         self, node_key: str, case_id: str, deleted_by: str, reason: str = "manual_delete"
     ) -> Dict[str, Any]:
@@ -3611,6 +3669,7 @@ class Neo4jService:
             )
             return [dict(r) for r in result]
 
+    @_bumps_graph_version(names=True)
     def restore_recycled_entity(self, recycle_key: str, case_id: str) -> Dict[str, Any]:
         """
         Restore an entity from the recycling bin back into the graph.
@@ -3763,6 +3822,7 @@ class Neo4jService:
                 "relationships_restored": restored_rels,
             }
 
+    @_bumps_graph_version(names=True)
     def permanently_delete_recycled(self, recycle_key: str, case_id: str) -> Dict[str, Any]:
         """
         Permanently delete a recycled entity (remove from recycle bin).
@@ -3908,6 +3968,7 @@ class Neo4jService:
     # Case Management
     # -------------------------------------------------------------------------
 
+    @_bumps_graph_version(names=True)
     def delete_case_data(self, case_id: str) -> Dict[str, Any]:
         """
         Delete all nodes and relationships belonging to a specific case.
@@ -4060,6 +4121,7 @@ class Neo4jService:
                 )
             return count
 
+    @_bumps_graph_version
     def bulk_append_notes_by_ref_id(self, case_id: str, notes_data: list) -> dict:
         """Append investigator notes to transactions matched by ref_id.
 
@@ -4997,6 +5059,7 @@ class Neo4jService:
                 for record in result
             ]
 
+    @_bumps_graph_version
     def update_transaction_category(self, node_key: str, category: str, case_id: str) -> Dict:
         """
         Set the financial_category on a transaction node.
@@ -5020,6 +5083,7 @@ class Neo4jService:
                 return {"success": False, "error": "Node not found"}
             return {"success": True, "key": record["key"], "category": category}
 
+    @_bumps_graph_version
     def update_transaction_from_to(
         self,
         node_key: str,
@@ -5133,6 +5197,7 @@ class Neo4jService:
 
         return result_categories
 
+    @_bumps_graph_version(names=True)
     def create_financial_category(self, name: str, color: str, case_id: str) -> Dict:
         """
         Create or update a custom FinancialCategory node for a case.
@@ -5157,6 +5222,7 @@ class Neo4jService:
                 return {"success": False, "error": "Failed to create category"}
             return {"success": True, "name": record["name"], "color": record["color"]}
 
+    @_bumps_graph_version
     def update_transaction_details(
         self,
         node_key: str,
@@ -5243,6 +5309,7 @@ class Neo4jService:
         return {"success": True, "updated": success_count, "total": len(node_keys)}
 
 
+    @_bumps_graph_version
     def update_entity_location(self, node_key: str, case_id: str, location_name: str, latitude: float, longitude: float) -> Dict:
         """Update the location properties of an entity node."""
         with self._driver.session() as session:
@@ -5270,6 +5337,7 @@ class Neo4jService:
                 "location": {"location_name": location_name, "latitude": latitude, "longitude": longitude},
             }
 
+    @_bumps_graph_version
     def remove_entity_location(self, node_key: str, case_id: str) -> Dict:
         """Remove location properties from an entity node (node stays in graph)."""
         with self._driver.session() as session:
@@ -5331,6 +5399,7 @@ class Neo4jService:
                 })
             return entities
 
+    @_bumps_graph_version
     def update_transaction_amount(self, node_key: str, case_id: str, new_amount: float, correction_reason: str) -> Dict:
         """Update a transaction amount, preserving the original value for audit trail."""
         with self._driver.session() as session:
@@ -5359,6 +5428,7 @@ class Neo4jService:
             }
 
 
+    @_bumps_graph_version
     def link_sub_transaction(self, parent_key: str, child_key: str, case_id: str) -> Dict:
         """Link a child transaction to a parent transaction."""
         with self._driver.session() as session:
@@ -5385,6 +5455,7 @@ class Neo4jService:
             )
             return {"success": True, "parent_key": parent_key, "child_key": child_key}
 
+    @_bumps_graph_version
     def unlink_sub_transaction(self, child_key: str, case_id: str) -> Dict:
         """Remove a child transaction from its parent group."""
         with self._driver.session() as session:
@@ -5449,6 +5520,7 @@ class Neo4jService:
                 children.append({k: record[k] for k in record.keys()})
             return children
 
+    @_bumps_graph_version
     def batch_update_entities(self, updates: list, case_id: str) -> int:
         """Batch update properties on multiple entity nodes.
 
@@ -5473,7 +5545,11 @@ class Neo4jService:
                 )
                 if result.single():
                     count += 1
-            return count
+        if any(u.get("property") == "name" for u in updates[:500]):
+            self.bump_case_graph_version(case_id, names=True)
+            from services.entity_mention_matcher import entity_mention_matcher
+            entity_mention_matcher.invalidate(case_id)
+        return count
 
     def get_entities_for_insights(self, case_id: str, max_entities: int = 10) -> list:
         """Get top entities with verified facts for insight generation."""
@@ -5512,8 +5588,10 @@ class Neo4jService:
                 })
             return entities
 
+    @_bumps_graph_version
     def save_entity_insights(self, node_key: str, case_id: str, new_insights: list) -> Dict:
-        """Append new insights to an entity's ai_insights array."""
+        """Append new insights to an entity's ai_insights array, skipping any
+        whose text the entity already has (re-runs do not duplicate them)."""
         with self._driver.session() as session:
             result = session.run(
                 "MATCH (n {key: $key, case_id: $case_id}) RETURN n.ai_insights AS ai_insights",
@@ -5523,13 +5601,25 @@ class Neo4jService:
             if not record:
                 raise ValueError(f"Node not found: {node_key}")
             existing = parse_json_field(record["ai_insights"]) or []
-            existing.extend(new_insights)
-            session.run(
-                "MATCH (n {key: $key, case_id: $case_id}) SET n.ai_insights = $insights",
-                key=node_key, case_id=case_id, insights=json.dumps(existing),
-            )
-            return {"success": True, "total_insights": len(existing)}
+            seen = {
+                str(i.get("text", "")).lower().strip() for i in existing if isinstance(i, dict)
+            }
+            added = []
+            for insight in new_insights:
+                text = str(insight.get("text", "")).lower().strip() if isinstance(insight, dict) else ""
+                if text and text in seen:
+                    continue
+                seen.add(text)
+                added.append(insight)
+            if added:
+                existing.extend(added)
+                session.run(
+                    "MATCH (n {key: $key, case_id: $case_id}) SET n.ai_insights = $insights",
+                    key=node_key, case_id=case_id, insights=json.dumps(existing),
+                )
+            return {"success": True, "added": len(added), "total_insights": len(existing)}
 
+    @_bumps_graph_version
     def reject_entity_insight(self, node_key: str, case_id: str, insight_index: int) -> Dict:
         """Remove an insight from the ai_insights array."""
         with self._driver.session() as session:
@@ -5596,6 +5686,87 @@ class Neo4jService:
             )
             return [dict(r) for r in result]
 
+    def get_entity_names(self, case_id: str) -> List[Dict]:
+        """
+        Return key, name and aliases of every named non-Document node in a case.
+
+        Used to build the in-process answer → node mention matcher.
+        """
+        with self._driver.session() as session:
+            result = session.run(
+                """
+                MATCH (n {case_id: $case_id})
+                WHERE NOT n:Document AND n.name IS NOT NULL AND n.key IS NOT NULL
+                RETURN n.key AS key, n.name AS name,
+                       coalesce(n.aliases, []) + coalesce(n.name_aliases, []) AS aliases
+                """,
+                case_id=case_id,
+            )
+            return [dict(r) for r in result]
+
+    def _case_version(self, case_id: str):
+        """The case's :CaseGraphVersion counters (created on first read, so
+        bumps that cannot name their case, i.e. raw Cypher loads, still reach it)."""
+        with self._driver.session() as session:
+            record = session.run(
+                "MATCH (v:CaseGraphVersion {case_key: $case_id}) "
+                "RETURN v.epoch AS epoch, v.graph AS graph, coalesce(v.names, 0) AS names",
+                case_id=case_id,
+            ).single()
+            if record is None:
+                record = session.run(
+                    "MERGE (v:CaseGraphVersion {case_key: $case_id}) "
+                    "ON CREATE SET v.epoch = randomUUID(), v.graph = 0, v.names = 0 "
+                    "RETURN v.epoch AS epoch, v.graph AS graph, coalesce(v.names, 0) AS names",
+                    case_id=case_id,
+                ).single()
+        return record
+
+    def get_entity_names_version(self, case_id: str) -> str:
+        """
+        Version of a case's node names and aliases: "<epoch>:<counter>",
+        bumped by every write that adds, removes, renames or merges named
+        nodes — in this service, the graph routes and ingestion. One indexed
+        lookup; used to invalidate caches built from get_entity_names()
+        across workers.
+        """
+        record = self._case_version(case_id)
+        return f"{record['epoch']}:{record['names']}"
+
+    def get_case_graph_version(self, case_id: str) -> str:
+        """
+        Version of a case's graph: "<epoch>:<counter>", where the counter is
+        bumped by every write to the case (see bump_case_graph_version). One
+        indexed lookup — used to invalidate cached answers and precomputed
+        results across workers and ingestion.
+        """
+        record = self._case_version(case_id)
+        return f"{record['epoch']}:{record['graph']}"
+
+    def bump_case_graph_version(self, case_id: Optional[str] = None, names: bool = False) -> None:
+        """
+        Mark a case's graph as changed (``names``: including its node names
+        or aliases). Write methods call this through _bumps_graph_version;
+        callers writing through run_cypher or their own sessions call it
+        directly. With no case_id (raw Cypher whose case is unknown) every
+        case's versions are bumped.
+
+        Never raises: a failed bump is logged, the write itself stands.
+        """
+        try:
+            with self._driver.session() as session:
+                if case_id:
+                    session.run(_BUMP_CASE_VERSION, case_id=case_id, names=names).consume()
+                else:
+                    session.run(
+                        "MATCH (v:CaseGraphVersion) SET v.graph = v.graph + 1, "
+                        "v.names = coalesce(v.names, 0) + CASE WHEN $names THEN 1 ELSE 0 END",
+                        names=names,
+                    ).consume()
+        except Exception as e:
+            logger.warning("Could not bump graph version of case %s: %s", case_id or "*", e)
+
+    @_bumps_graph_version
     def update_entity_location_full(
         self,
         node_key: str,
@@ -5631,6 +5802,7 @@ class Neo4jService:
             record = result.single()
             return dict(record) if record else {}
 
+    @_bumps_graph_version(names=True)
     def create_location_node(
         self,
         case_id: str,
@@ -5675,6 +5847,7 @@ class Neo4jService:
             record = result.single()
             return record["key"] if record else None
 
+    @_bumps_graph_version
     def ensure_located_at_relationship(
         self,
         source_key: str,
@@ -6096,6 +6269,7 @@ class Neo4jService:
                 "is_owner": bool(r["is_owner"]),
             } for r in rows]
 
+    @_bumps_graph_version(names=True)
     def merge_person_identities(
         self,
         case_id: str,
@@ -6182,6 +6356,7 @@ class Neo4jService:
             "aliases": list(deg["aliases"]) if deg and deg["aliases"] else [],
         }
 
+    @_bumps_graph_version(names=True)
     def delete_phone_report(self, case_id: str, report_key: str) -> dict:
         """
         Delete a PhoneReport node and every node tagged with the same
@@ -6245,6 +6420,7 @@ class Neo4jService:
                 "deleted_phone_report": report_count,
             }
 
+    @_bumps_graph_version(names=True)
     def update_phone_report_name_override(
         self,
         case_id: str,
@@ -13300,6 +13476,7 @@ class Neo4jService:
     # callout list without re-fetching every referenced event.
     # -----------------------------------------------------------------------
 
+    @_bumps_graph_version
     def upsert_cellebrite_callout(
         self,
         case_id: str,
@@ -13368,6 +13545,7 @@ class Neo4jService:
             )
             return [dict(rec["c"]) for rec in rs]
 
+    @_bumps_graph_version
     def delete_cellebrite_callout(self, case_id: str, event_node_key: str) -> bool:
         """Remove the callout for (case_id, event_node_key). Returns True if one existed."""
         with self._driver.session() as session:
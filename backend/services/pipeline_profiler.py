@@ -0,0 +1,371 @@
+"""
+Pipeline profiler — per-stage timing for ingestion and triage background jobs.
+
+Progress text says what a job is doing, not where its time goes. A
+PipelineProfiler is activated for the duration of a background task, and
+code anywhere under it (including ingestion/scripts, which loads this module
+the same way llm_client loads llm_transport) marks its stages:
+
+    with stage("llm:extract", chunk=3) as s:
+        ...
+        s.add(count=len(entities), bytes=len(text))
+
+Each span records wall-clock time, the thread's CPU time (time.thread_time),
+and the counts/bytes it was given. Stage names are "<kind>:<what>" — llm,
+embeddings, neo4j, geocoding, parse, … — so a summary grouped by kind answers
+"is this job stuck on the LLM or on Neo4j writes?".
+
+The profiler keeps:
+  - an exact per-stage summary (calls, wall, self wall, CPU, count, bytes,
+    plus the stages open right now), published to the task record as
+    metadata.profile at most every PUBLISH_SECS and when the job finishes;
+  - up to MAX_TRACE_EVENTS span events, saved when the job finishes as a
+    Chrome trace (chrome://tracing, Perfetto, speedscope) under
+    data/pipeline_traces/<task_id>.json.gz.
+
+With no active profiler, stage() costs a context-variable lookup. Worker
+threads don't inherit the active profiler: submit bind(fn) to a pool instead
+of fn.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import gzip
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+TRACE_DIR = BASE_DIR / "data" / "pipeline_traces"
+
+PUBLISH_SECS = 10          # max staleness of the summary on a running task
+MAX_TRACE_EVENTS = 50000   # span events kept per job; the summary stays exact past it
+MAX_TRACE_FILES = 200      # oldest saved traces are pruned beyond this
+
+_active: contextvars.ContextVar[Optional["PipelineProfiler"]] = \
+    contextvars.ContextVar("pipeline_profiler", default=None)
+_open_span: contextvars.ContextVar[Optional["Span"]] = \
+    contextvars.ContextVar("pipeline_profiler_span", default=None)
+
+
+class Span:
+    """One open stage. add() attaches counts/bytes; children on the same thread
+    are subtracted from its self time."""
+
+    __slots__ = ("name", "cat", "args", "start", "cpu_start", "tid",
+                 "count", "bytes", "child_wall", "parent")
+
+    def __init__(self, name: str, args: Dict[str, Any], parent: Optional["Span"]):
+        self.name = name
+        self.cat = name.split(":", 1)[0]
+        self.args = args
+        self.tid = threading.get_ident()
+        self.count = 0
+        self.bytes = 0
+        self.child_wall = 0.0
+        self.parent = parent
+        self.start = time.perf_counter()
+        self.cpu_start = time.thread_time()
+
+    def add(self, count: int = 0, bytes: int = 0) -> None:
+        self.count += count
+        self.bytes += bytes
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def add(self, count: int = 0, bytes: int = 0) -> None:
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class PipelineProfiler:
+    """Per-stage timing for one job; thread-safe."""
+
+    def __init__(
+        self,
+        name: str,
+        task_id: Optional[str] = None,
+        publish: Optional[Callable[[Dict[str, Any]], None]] = None,
+        publish_interval: float = PUBLISH_SECS,
+        max_events: int = MAX_TRACE_EVENTS,
+    ):
+        """
+        Args:
+            name: Job name (trace process name)
+            task_id: Background task the job runs as; names the saved trace
+            publish: Called with summary() while running and on finish()
+                (e.g. to store it on the task record)
+            publish_interval: Minimum seconds between publishes while running
+            max_events: Span events kept for the Chrome trace
+        """
+        self.name = name
+        self.task_id = task_id
+        self._publish = publish
+        self._publish_interval = publish_interval
+        self._max_events = max_events
+        self._lock = threading.Lock()
+        self._t0 = time.perf_counter()
+        self._started_at = time.time()
+        self._stats: Dict[str, List[float]] = {}  # name -> [calls, wall, self_wall, cpu, count, bytes]
+        self._events: List[tuple] = []
+        self._dropped = 0
+        self._open: Dict[int, Span] = {}
+        self._threads: Dict[int, str] = {}
+        self._last_publish = 0.0
+        self._finished_wall: Optional[float] = None
+
+    # ------------------------------------------------------------------
+    # Recording
+    # ------------------------------------------------------------------
+
+    def _track(self, span: Span) -> None:
+        with self._lock:
+            self._open[id(span)] = span
+            if span.tid not in self._threads:
+                self._threads[span.tid] = threading.current_thread().name
+
+    def _close_span(self, span: Span) -> None:
+        end = time.perf_counter()
+        wall = end - span.start
+        cpu = time.thread_time() - span.cpu_start
+        if span.parent is not None and span.parent.tid == span.tid:
+            span.parent.child_wall += wall
+        publish = False
+        with self._lock:
+            self._open.pop(id(span), None)
+            st = self._stats.get(span.name)
+            if st is None:
+                st = self._stats[span.name] = [0, 0.0, 0.0, 0.0, 0, 0]
+            st[0] += 1
+            st[1] += wall
+            st[2] += max(0.0, wall - span.child_wall)
+            st[3] += cpu
+            st[4] += span.count
+            st[5] += span.bytes
+            if len(self._events) < self._max_events:
+                self._events.append((span.name, span.cat, span.start - self._t0, wall, span.tid,
+                                     cpu, span.count, span.bytes, span.args))
+            else:
+                self._dropped += 1
+            if self._publish and end - self._last_publish >= self._publish_interval:
+                self._last_publish = end
+                publish = True
+        if publish:
+            self._do_publish()
+
+    @contextmanager
+    def stage(self, name: str, **args: Any) -> Iterator[Span]:
+        """Time a stage of this job on the calling thread."""
+        span = Span(name, args, _open_span.get())
+        self._track(span)
+        token = _open_span.set(span)
+        try:
+            yield span
+        finally:
+            _open_span.reset(token)
+            self._close_span(span)
+
+    @contextmanager
+    def activate(self) -> Iterator["PipelineProfiler"]:
+        """Make this the profiler stage() reports to on the calling thread."""
+        token = _active.set(self)
+        span_token = _open_span.set(None)
+        try:
+            yield self
+        finally:
+            _open_span.reset(span_token)
+            _active.reset(token)
+
+    # ------------------------------------------------------------------
+    # Reporting
+    # ------------------------------------------------------------------
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage totals (ms), slowest self time first, plus per-kind
+        totals and the stages still open."""
+        now = time.perf_counter()
+        with self._lock:
+            stats = {name: list(st) for name, st in self._stats.items()}
+            open_spans = [(s.name, now - s.start, self._threads.get(s.tid, str(s.tid)))
+                          for s in self._open.values()]
+            dropped = self._dropped
+        elapsed = self._finished_wall if self._finished_wall is not None else now - self._t0
+
+        stages = []
+        by_kind: Dict[str, Dict[str, float]] = {}
+        for name, (calls, wall, self_wall, cpu, count, nbytes) in stats.items():
+            stages.append({
+                "stage": name,
+                "calls": int(calls),
+                "wall_ms": round(wall * 1000, 1),
+                "self_ms": round(self_wall * 1000, 1),
+                "cpu_ms": round(cpu * 1000, 1),
+                "count": int(count),
+                "bytes": int(nbytes),
+            })
+            kind = by_kind.setdefault(name.split(":", 1)[0], {"self_ms": 0.0, "cpu_ms": 0.0})
+            kind["self_ms"] += self_wall * 1000
+            kind["cpu_ms"] += cpu * 1000
+        stages.sort(key=lambda s: s["self_ms"], reverse=True)
+
+        return {
+            "name": self.name,
+            "elapsed_ms": round(elapsed * 1000, 1),
+            "stages": stages,
+            "by_kind": {
+                kind: {k: round(v, 1) for k, v in totals.items()}
+                for kind, totals in sorted(by_kind.items(), key=lambda kv: -kv[1]["self_ms"])
+            },
+            "open": [
+                {"stage": name, "elapsed_ms": round(age * 1000, 1), "thread": thread}
+                for name, age, thread in sorted(open_spans, key=lambda o: -o[1])
+            ],
+            "finished": self._finished_wall is not None,
+            "trace_events_dropped": dropped,
+        }
+
+    def chrome_trace(self) -> Dict[str, Any]:
+        """Span events in Chrome trace event format (complete "X" events, µs)."""
+        pid = os.getpid()
+        with self._lock:
+            events = list(self._events)
+            threads = dict(self._threads)
+        tids = {tid: i + 1 for i, tid in enumerate(threads)}
+        trace: List[Dict[str, Any]] = [
+            {"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": self.name}},
+        ]
+        for tid, name in threads.items():
+            trace.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tids[tid], "args": {"name": name}})
+        for name, cat, start, wall, tid, cpu, count, nbytes, args in events:
+            event_args = {"cpu_ms": round(cpu * 1000, 3)}
+            if count:
+                event_args["count"] = count
+            if nbytes:
+                event_args["bytes"] = nbytes
+            event_args.update({k: v if isinstance(v, (int, float, bool)) or v is None else str(v)
+                               for k, v in args.items()})
+            trace.append({
+                "name": name,
+                "cat": cat,
+                "ph": "X",
+                "ts": round(start * 1e6, 1),
+                "dur": round(wall * 1e6, 1),
+                "pid": pid,
+                "tid": tids.get(tid, 0),
+                "args": event_args,
+            })
+        return {
+            "traceEvents": trace,
+            "displayTimeUnit": "ms",
+            "otherData": {"job": self.name, "task_id": self.task_id, "started_at": self._started_at},
+        }
+
+    def _do_publish(self) -> None:
+        try:
+            self._publish(self.summary())
+        except Exception as e:
+            print(f"[Profiler] Could not publish profile for {self.task_id or self.name}: {e}")
+
+    def finish(self) -> Dict[str, Any]:
+        """Publish the final summary and save the trace (when the job has a task_id)."""
+        if self._finished_wall is None:
+            self._finished_wall = time.perf_counter() - self._t0
+        if self._publish:
+            self._do_publish()
+        if self.task_id:
+            try:
+                save_trace(self.task_id, self.chrome_trace())
+            except OSError as e:
+                print(f"[Profiler] Could not save trace for {self.task_id}: {e}")
+        return self.summary()
+
+
+# ----------------------------------------------------------------------
+# Module-level API (reports to the active profiler, if any)
+# ----------------------------------------------------------------------
+
+def current() -> Optional[PipelineProfiler]:
+    return _active.get()
+
+
+@contextmanager
+def stage(name: str, **args: Any) -> Iterator[Any]:
+    """Time a stage of the active job; a no-op (yielding a span whose add() does
+    nothing) when no profiler is active."""
+    profiler = _active.get()
+    if profiler is None:
+        yield _NULL_SPAN
+        return
+    with profiler.stage(name, **args) as span:
+        yield span
+
+
+def bind(fn: Callable) -> Callable:
+    """Wrap fn so it reports to the caller's active profiler on whatever thread
+    runs it (for ThreadPoolExecutor.submit)."""
+    profiler = _active.get()
+    if profiler is None:
+        return fn
+
+    def bound(*args, **kwargs):
+        with profiler.activate():
+            return fn(*args, **kwargs)
+
+    return bound
+
+
+# ----------------------------------------------------------------------
+# Saved traces
+# ----------------------------------------------------------------------
+
+def _trace_path(task_id: str) -> Path:
+    safe = "".join(c for c in task_id if c.isalnum() or c in "-_")
+    return TRACE_DIR / f"{safe}.json.gz"
+
+
+def save_trace(task_id: str, trace: Dict[str, Any]) -> Path:
+    """Write a job's Chrome trace (gzipped) and prune the oldest beyond MAX_TRACE_FILES."""
+    TRACE_DIR.mkdir(parents=True, exist_ok=True)
+    path = _trace_path(task_id)
+    tmp = path.with_suffix(".tmp")
+    with gzip.open(tmp, "wt", encoding="utf-8", compresslevel=6) as f:
+        json.dump(trace, f, separators=(",", ":"))
+    os.replace(tmp, path)
+    saved = sorted(TRACE_DIR.glob("*.json.gz"), key=lambda p: p.stat().st_mtime)
+    for old in saved[:-MAX_TRACE_FILES]:
+        old.unlink(missing_ok=True)
+    return path
+
+
+def load_trace(task_id: str) -> Optional[Dict[str, Any]]:
+    """A saved Chrome trace, or None."""
+    path = _trace_path(task_id)
+    if not path.exists():
+        return None
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def delete_trace(task_id: str) -> None:
+    _trace_path(task_id).unlink(missing_ok=True)
+
+
+def task_profiler(task_id: str, name: str) -> PipelineProfiler:
+    """A profiler that publishes its summary to the background task's
+    metadata.profile."""
+    from services.background_task_storage import background_task_storage
+
+    return PipelineProfiler(
+        name,
+        task_id=task_id,
+        publish=lambda summary: background_task_storage.update_task(task_id, profile=summary),
+    )
@@ -16,17 +16,36 @@ Design constraints:
     clobber each other (cf. the JSON-storage lesson).
   - Route TEMPLATES only (e.g. /api/tickets/{ticket_id}), never raw paths, so
     cardinality stays bounded and IDs don't leak into analytics.
+
+Tail latency: averages hide the slow requests investigators complain about,
+so each request's latency also lands in a fixed log-scale histogram bucket
+per (day, route, method). Bucket i covers [MIN_MS·G^i, MIN_MS·G^(i+1)) with
+G = 2^(1/4), i.e. ~9% resolution from 0.1 ms to ~1 h in 100 buckets. Buckets
+are stored sparsely and merged with the same additive upsert in the same
+flush, so histograms from any number of workers/days/sources just add up;
+p50/p90/p99 are read off the merged counts (latency_percentiles).
+
+Slow samples (optional, TELEMETRY_SLOW_MS > 0): requests slower than the
+threshold keep a sample with their timing breakdown — time spent in spans
+that code under the request marked with span()/add_timing() (LLM calls,
+vector queries) and the unattributed rest. Only the SLOW_SAMPLES_PER_ROUTE
+slowest per (day, route) are kept.
 """
 
 from __future__ import annotations
 
+import contextvars
+import heapq
+import json
+import math
 import os
 import sqlite3
 import threading
 import time
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterator, List, Optional
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 DB_FILE = BASE_DIR / "data" / "telemetry.db"
@@ -43,6 +62,17 @@ READ_EXTRA = [Path(p) for p in
 FLUSH_SECS = 30          # max staleness of the on-disk aggregates
 FLUSH_MAX_KEYS = 500     # safety valve: flush early if the buffer grows big
 
+# Latency histogram: bucket i covers [MIN_MS * GROWTH**i, MIN_MS * GROWTH**(i+1))
+HIST_MIN_MS = 0.1
+HIST_GROWTH = 2 ** 0.25
+HIST_BUCKETS = 100       # top bucket starts at ~3.3e6 ms; slower requests clamp into it
+_LOG_GROWTH = math.log(HIST_GROWTH)
+
+# Slow-request samples: threshold in ms (0 disables) and how many to keep
+# per (day, route) — the slowest ones win
+SLOW_MS = float(os.environ.get("TELEMETRY_SLOW_MS", "1000"))
+SLOW_SAMPLES_PER_ROUTE = 20
+
 _SCHEMA = """
 CREATE TABLE IF NOT EXISTS route_traffic (
     day      TEXT NOT NULL,      -- UTC date, YYYY-MM-DD
@@ -53,12 +83,72 @@ CREATE TABLE IF NOT EXISTS route_traffic (
     total_ms REAL NOT NULL DEFAULT 0,
     PRIMARY KEY (day, route, method, status)
 );
+CREATE TABLE IF NOT EXISTS route_latency (
+    day      TEXT NOT NULL,
+    route    TEXT NOT NULL,
+    method   TEXT NOT NULL,
+    bucket   INTEGER NOT NULL,   -- log-scale bucket index, see bucket_bounds()
+    n        INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (day, route, method, bucket)
+);
+CREATE TABLE IF NOT EXISTS slow_requests (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    ts        TEXT NOT NULL,     -- UTC ISO timestamp
+    day       TEXT NOT NULL,
+    route     TEXT NOT NULL,
+    method    TEXT NOT NULL,
+    status    INTEGER NOT NULL,
+    ms        REAL NOT NULL,
+    breakdown TEXT NOT NULL      -- JSON: spans + unattributed_ms
+);
+CREATE INDEX IF NOT EXISTS idx_slow_requests_route ON slow_requests(route, day, ms);
 """
 
 _buf: Dict[tuple, List[float]] = {}   # (day, route, method, status) -> [n, total_ms]
+_hist: Dict[tuple, Dict[int, int]] = {}  # (day, route, method) -> {bucket: n}
+_slow: Dict[tuple, List[tuple]] = {}  # (day, route) -> min-heap of (ms, seq, sample)
+_slow_seq = 0
 _buf_lock = threading.Lock()
 _last_flush = 0.0
 
+# Per-request span totals ({name: [ms, count]}), set by the middleware
+_request_spans: contextvars.ContextVar[Optional[Dict[str, List[float]]]] = \
+    contextvars.ContextVar("telemetry_request_spans", default=None)
+
+
+def bucket_for(ms: float) -> int:
+    """Histogram bucket index for a latency."""
+    if ms <= HIST_MIN_MS:
+        return 0
+    return min(HIST_BUCKETS - 1, int(math.log(ms / HIST_MIN_MS) / _LOG_GROWTH))
+
+
+def bucket_bounds(bucket: int) -> tuple:
+    """[low, high) latency range in ms of a histogram bucket."""
+    return HIST_MIN_MS * HIST_GROWTH ** bucket, HIST_MIN_MS * HIST_GROWTH ** (bucket + 1)
+
+
+def add_timing(name: str, ms: float) -> None:
+    """Attribute `ms` of the current request's time to `name` (no-op outside a request)."""
+    spans = _request_spans.get()
+    if spans is not None:
+        slot = spans.setdefault(name, [0.0, 0])
+        slot[0] += ms
+        slot[1] += 1
+
+
+@contextmanager
+def span(name: str) -> Iterator[None]:
+    """Time a block as part of the current request's breakdown."""
+    if _request_spans.get() is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        add_timing(name, (time.perf_counter() - start) * 1000.0)
+
 
 def _connect() -> sqlite3.Connection:
     DB_FILE.parent.mkdir(parents=True, exist_ok=True)
@@ -78,15 +168,41 @@ def init_db() -> None:
         conn.close()
 
 
-def record(route: str, method: str, status: int, ms: float) -> None:
+def _breakdown(ms: float, spans: Optional[Dict[str, List[float]]]) -> Dict[str, Any]:
+    spans = spans or {}
+    attributed = sum(v[0] for v in spans.values())
+    return {
+        "spans": {name: {"ms": round(v[0], 2), "n": v[1]} for name, v in spans.items()},
+        # Concurrent spans (e.g. parallel LLM calls) can add up to more than the request
+        "unattributed_ms": round(max(0.0, ms - attributed), 2),
+    }
+
+
+def record(route: str, method: str, status: int, ms: float,
+           spans: Optional[Dict[str, List[float]]] = None) -> None:
     """Count one request (hot path: in-memory; flushed periodically)."""
-    day = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-    key = (day, route, method.upper(), int(status))
+    global _slow_seq
+    now = datetime.now(timezone.utc)
+    day = now.strftime("%Y-%m-%d")
+    method = method.upper()
+    key = (day, route, method, int(status))
     flush_now = False
     with _buf_lock:
         slot = _buf.setdefault(key, [0, 0.0])
         slot[0] += 1
         slot[1] += ms
+        hist = _hist.setdefault((day, route, method), {})
+        bucket = bucket_for(ms)
+        hist[bucket] = hist.get(bucket, 0) + 1
+        if SLOW_MS > 0 and ms >= SLOW_MS:
+            heap = _slow.setdefault((day, route), [])
+            _slow_seq += 1
+            sample = (now.isoformat(), day, route, method, int(status), ms,
+                      json.dumps(_breakdown(ms, spans)))
+            if len(heap) < SLOW_SAMPLES_PER_ROUTE:
+                heapq.heappush(heap, (ms, _slow_seq, sample))
+            elif ms > heap[0][0]:
+                heapq.heapreplace(heap, (ms, _slow_seq, sample))
         if (len(_buf) >= FLUSH_MAX_KEYS
                 or time.monotonic() - _last_flush >= FLUSH_SECS):
             flush_now = True
@@ -99,7 +215,11 @@ def flush() -> None:
     global _last_flush
     with _buf_lock:
         items = list(_buf.items())
+        hist = [(d, r, m, b, n) for (d, r, m), counts in _hist.items() for b, n in counts.items()]
+        slow = {key: [entry[2] for entry in heap] for key, heap in _slow.items()}
         _buf.clear()
+        _hist.clear()
+        _slow.clear()
         _last_flush = time.monotonic()
     if not items:
         return
@@ -114,6 +234,26 @@ def flush() -> None:
                                  total_ms = total_ms + excluded.total_ms""",
                 [(d, r, m, s, v[0], v[1]) for (d, r, m, s), v in items],
             )
+            conn.executemany(
+                """INSERT INTO route_latency (day, route, method, bucket, n)
+                   VALUES (?,?,?,?,?)
+                   ON CONFLICT(day, route, method, bucket)
+                   DO UPDATE SET n = n + excluded.n""",
+                hist,
+            )
+            for (day, route), samples in slow.items():
+                conn.executemany(
+                    """INSERT INTO slow_requests (ts, day, route, method, status, ms, breakdown)
+                       VALUES (?,?,?,?,?,?,?)""",
+                    samples,
+                )
+                # Keep only the slowest samples per (day, route), across workers
+                conn.execute(
+                    """DELETE FROM slow_requests WHERE day = ? AND route = ? AND id NOT IN (
+                           SELECT id FROM slow_requests WHERE day = ? AND route = ?
+                           ORDER BY ms DESC LIMIT ?)""",
+                    (day, route, day, route, SLOW_SAMPLES_PER_ROUTE),
+                )
             conn.commit()
         finally:
             conn.close()
@@ -121,24 +261,10 @@ def flush() -> None:
         pass  # telemetry must never take the app down
 
 
-def _agg(routes: Optional[List[str]], since_day: Optional[str],
-         until_day: Optional[str]) -> tuple:
-    """Sum (hits, 5xx errors, total ms) over our own DB plus any READ_EXTRA
-    DBs (read-only) — the same query against every telemetry source."""
-    flush()
-    q = "SELECT status, SUM(n) AS n, SUM(total_ms) AS ms FROM route_traffic WHERE 1=1"
-    args: List[Any] = []
-    if routes is not None:
-        q += f" AND route IN ({','.join('?' * len(routes))})"
-        args += list(routes)
-    if since_day:
-        q += " AND day >= ?"; args.append(since_day)
-    if until_day:
-        q += " AND day <= ?"; args.append(until_day)
-    q += " GROUP BY status"
-
-    hits = errors = 0
-    ms = 0.0
+def _query_sources(q: str, args: List[Any]) -> Iterator[List[sqlite3.Row]]:
+    """Run the same query against our own DB plus any READ_EXTRA DBs
+    (read-only), yielding each source's rows. Sources that can't answer
+    (missing file, older schema) are skipped."""
     for path in [DB_FILE, *READ_EXTRA]:
         try:
             if path == DB_FILE:
@@ -155,23 +281,135 @@ def _agg(routes: Optional[List[str]], since_day: Optional[str],
                 conn.close()
         except sqlite3.Error:
             continue
+        yield rows
+
+
+def _filters(routes: Optional[List[str]], since_day: Optional[str],
+             until_day: Optional[str]) -> tuple:
+    q = " WHERE 1=1"
+    args: List[Any] = []
+    if routes is not None:
+        q += f" AND route IN ({','.join('?' * len(routes))})"
+        args += list(routes)
+    if since_day:
+        q += " AND day >= ?"; args.append(since_day)
+    if until_day:
+        q += " AND day <= ?"; args.append(until_day)
+    return q, args
+
+
+def _agg(routes: Optional[List[str]], since_day: Optional[str],
+         until_day: Optional[str]) -> tuple:
+    """Sum (hits, 5xx errors, total ms) over our own DB plus any READ_EXTRA
+    DBs (read-only) — the same query against every telemetry source."""
+    flush()
+    where, args = _filters(routes, since_day, until_day)
+    q = f"SELECT status, SUM(n) AS n, SUM(total_ms) AS ms FROM route_traffic{where} GROUP BY status"
+
+    hits = errors = 0
+    ms = 0.0
+    for rows in _query_sources(q, args):
         hits += sum(r["n"] for r in rows)
         errors += sum(r["n"] for r in rows if r["status"] >= 500)
         ms += sum(r["ms"] for r in rows)
     return hits, errors, ms
 
 
+def percentiles(counts: Dict[int, int], qs=(0.5, 0.9, 0.99)) -> Dict[str, Optional[float]]:
+    """Percentiles from a merged histogram ({bucket: n}). Each is reported as
+    its bucket's geometric midpoint, so within ~9% of the true value."""
+    total = sum(counts.values())
+    out: Dict[str, Optional[float]] = {}
+    ordered = sorted(counts.items())
+    for q in qs:
+        name = f"p{q * 100:g}_ms"
+        if not total:
+            out[name] = None
+            continue
+        rank = max(1, math.ceil(q * total))
+        seen = 0
+        for bucket, n in ordered:
+            seen += n
+            if seen >= rank:
+                low, high = bucket_bounds(bucket)
+                out[name] = round(math.sqrt(low * high), 1)
+                break
+    return out
+
+
+def _histograms(routes: Optional[List[str]], since_day: Optional[str],
+                until_day: Optional[str], group_by: tuple) -> Dict[tuple, Dict[int, int]]:
+    """Merged latency histograms keyed by the `group_by` columns, across all sources."""
+    flush()
+    where, args = _filters(routes, since_day, until_day)
+    cols = "".join(f"{c}, " for c in group_by)
+    q = (f"SELECT {cols}bucket, SUM(n) AS n FROM route_latency{where} "
+         f"GROUP BY {cols}bucket")
+    merged: Dict[tuple, Dict[int, int]] = {}
+    for rows in _query_sources(q, args):
+        for r in rows:
+            counts = merged.setdefault(tuple(r[c] for c in group_by), {})
+            counts[r["bucket"]] = counts.get(r["bucket"], 0) + r["n"]
+    return merged
+
+
+def latency_percentiles(routes: Optional[List[str]] = None,
+                        since_day: Optional[str] = None,
+                        until_day: Optional[str] = None,
+                        group_by: str = "route") -> List[Dict[str, Any]]:
+    """p50/p90/p99 latency in [since_day, until_day] (inclusive UTC dates)
+    across all telemetry sources, one row per group. group_by is "route",
+    "day" or "route_day"; rows carry the group columns plus n and the
+    percentiles, slowest p99 first (by day for "day")."""
+    columns = {"route": ("route",), "day": ("day",), "route_day": ("route", "day")}[group_by]
+    merged = _histograms(routes, since_day, until_day, columns)
+    out = []
+    for key, counts in merged.items():
+        row: Dict[str, Any] = dict(zip(columns, key))
+        row["n"] = sum(counts.values())
+        row.update(percentiles(counts))
+        out.append(row)
+    if group_by == "day":
+        out.sort(key=lambda r: r["day"])
+    else:
+        out.sort(key=lambda r: (r["p99_ms"] or 0), reverse=True)
+    return out
+
+
+def slow_requests(route: Optional[str] = None, since_day: Optional[str] = None,
+                  until_day: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    """The slowest sampled requests (see TELEMETRY_SLOW_MS), optionally for one
+    route template, with their timing breakdown — slowest first."""
+    flush()
+    where, args = _filters([route] if route else None, since_day, until_day)
+    q = (f"SELECT ts, route, method, status, ms, breakdown FROM slow_requests{where} "
+         f"ORDER BY ms DESC LIMIT ?")
+    samples = []
+    for rows in _query_sources(q, args + [limit]):
+        for r in rows:
+            sample = dict(r)
+            sample["ms"] = round(sample["ms"], 1)
+            sample["breakdown"] = json.loads(sample["breakdown"])
+            samples.append(sample)
+    samples.sort(key=lambda s: s["ms"], reverse=True)
+    return samples[:limit]
+
+
 def route_stats(routes: List[str], since_day: Optional[str] = None,
                 until_day: Optional[str] = None) -> Dict[str, Any]:
     """Aggregate traffic for the given route templates in [since_day, until_day]
     (inclusive UTC dates), across all telemetry sources. Returns hits / errors
-    (5xx) / avg latency."""
+    (5xx) / avg latency / p50, p90, p99 latency (None before any histogram
+    data exists for the routes)."""
     if not routes:
-        return {"hits": 0, "errors": 0, "err_rate": 0.0, "avg_ms": None}
+        return {"hits": 0, "errors": 0, "err_rate": 0.0, "avg_ms": None,
+                "p50_ms": None, "p90_ms": None, "p99_ms": None}
     hits, errors, ms = _agg(routes, since_day, until_day)
+    merged = _histograms(routes, since_day, until_day, ()).get((), {})
     return {"hits": hits, "errors": errors,
             "err_rate": round(errors / hits, 4) if hits else 0.0,
-            "avg_ms": round(ms / hits, 1) if hits else None}
+            "avg_ms": round(ms / hits, 1) if hits else None,
+            **percentiles(merged)}
 
 
 def global_stats(since_day: Optional[str] = None,
@@ -191,13 +429,18 @@ def install(app) -> None:
     @app.middleware("http")
     async def _telemetry(request, call_next):
         start = time.monotonic()
-        response = await call_next(request)
+        spans: Dict[str, List[float]] = {}
+        token = _request_spans.set(spans)  # the handler's task/threadpool copies see this dict
+        try:
+            response = await call_next(request)
+        finally:
+            _request_spans.reset(token)
         try:
             route = request.scope.get("route")
             template = getattr(route, "path", None)
             if template:  # unmatched paths (404 scans etc.) are not recorded
                 record(template, request.method, response.status_code,
-                       (time.monotonic() - start) * 1000.0)
+                       (time.monotonic() - start) * 1000.0, spans)
         except Exception:
             pass  # never let telemetry break a request
         return response
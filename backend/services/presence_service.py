@@ -2,20 +2,80 @@
 Presence Service
 
 Tracks active workspace sessions and user presence for real-time collaboration.
+
+Each worker holds the sessions of its own websocket connections in memory
+(indexed by case) and a write-behind flusher persists what changed to
+data/presence.db at most every PRESENCE_FLUSH_SECS, one transaction per
+flush. Activity pings only touch memory. The shared SQLite table is how a
+worker sees users connected to the other workers: get_online_users merges
+this worker's sessions with the table's rows for the case (indexed lookup,
+O(sessions in the case)).
+
+Every persisted session carries the id of the worker that owns it. While a
+worker has sessions, each flush also refreshes its heartbeat in
+presence_workers; rows of a worker whose heartbeat is older than
+WORKER_TIMEOUT_SECS (it crashed or was killed without a clean shutdown) are
+ignored by readers and deleted by the next flush of any worker.
+
+This replaces data/workspace_sessions.json, which was rewritten in full on
+every ping, join and leave; that file is no longer read or written.
 """
 
-import json
-from pathlib import Path
-from typing import Dict, List, Optional, Set
+import atexit
+import os
+import sqlite3
+import threading
+import uuid
+from contextlib import contextmanager
 from datetime import datetime, timedelta
+from pathlib import Path
 from threading import Lock
-import uuid
+from typing import Dict, List, Optional, Set
 
-from services._json_file_lock import save_json_atomic
+from config import PRESENCE_FLUSH_SECS
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 STORAGE_DIR = BASE_DIR / "data"
-WORKSPACE_SESSIONS_FILE = STORAGE_DIR / "workspace_sessions.json"
+DB_FILE = STORAGE_DIR / "presence.db"
+
+# Persisted sessions not active for this long are ignored, then deleted
+SESSION_TIMEOUT_MINUTES = 30
+
+# A worker whose heartbeat is older than this is treated as gone, along with
+# its sessions (several flush intervals, so a busy worker is not dropped)
+WORKER_TIMEOUT_SECS = max(30.0, 6 * PRESENCE_FLUSH_SECS)
+
+# Bump when the schema changes; presence is transient, so the tables are
+# simply recreated
+_SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS presence_sessions (
+    session_id  TEXT PRIMARY KEY,
+    worker_id   TEXT NOT NULL,
+    case_id     TEXT NOT NULL,
+    user_id     TEXT,
+    username    TEXT,
+    ip_address  TEXT,
+    device_info TEXT,
+    started_at  TEXT,
+    last_active TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_presence_case ON presence_sessions(case_id, last_active);
+CREATE INDEX IF NOT EXISTS idx_presence_last_active ON presence_sessions(last_active);
+CREATE INDEX IF NOT EXISTS idx_presence_worker ON presence_sessions(worker_id);
+
+CREATE TABLE IF NOT EXISTS presence_workers (
+    worker_id    TEXT PRIMARY KEY,
+    heartbeat_at TEXT NOT NULL
+);
+"""
+
+_COLUMNS = ("session_id", "worker_id", "case_id", "user_id", "username", "ip_address", "device_info", "started_at", "last_active")
+_UPSERT = (
+    f"INSERT OR REPLACE INTO presence_sessions ({', '.join(_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_COLUMNS))})"
+)
 
 
 def ensure_storage_dir():
@@ -23,41 +83,124 @@ def ensure_storage_dir():
     STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_sessions() -> Dict:
-    """Load workspace sessions from JSON file."""
-    ensure_storage_dir()
-    if not WORKSPACE_SESSIONS_FILE.exists():
-        return {}
-    try:
-        with open(WORKSPACE_SESSIONS_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Error loading workspace sessions: {e}")
-        return {}
-
-
-def save_sessions(sessions: Dict):
-    """Save workspace sessions to JSON file."""
-    ensure_storage_dir()
-    # Locked, unique-temp atomic write (see _json_file_lock). Presence is
-    # the highest-write-frequency JSON store, so it was the most likely to
-    # hit the shared-`.tmp` rename race next.
-    try:
-        save_json_atomic(WORKSPACE_SESSIONS_FILE, sessions, default=str)
-    except IOError as e:
-        print(f"Error saving workspace sessions: {e}")
-        raise
-
-
 class PresenceService:
     """Service for tracking user presence in workspace sessions."""
-    
-    def __init__(self):
-        self._sessions: Dict[str, Dict] = load_sessions()
+
+    def __init__(self, db_file: Path = DB_FILE, flush_interval: float = PRESENCE_FLUSH_SECS):
+        self.db_file = Path(db_file)
+        self.flush_interval = flush_interval
+        self.worker_id = f"{os.getpid()}_{uuid.uuid4().hex[:8]}"
         self._active_sessions: Dict[str, Dict] = {}  # In-memory active sessions (session_id -> session_data)
+        self._by_case: Dict[str, Set[str]] = {}  # case_id -> session_ids on this worker
+        self._dirty: Set[str] = set()  # sessions created/updated since the last flush
+        self._removed: Set[str] = set()  # sessions ended since the last flush
         self._lock = Lock()
-        self._cleanup_interval = timedelta(minutes=5)  # Clean up stale sessions every 5 minutes
-    
+        self._flush_lock = Lock()
+        self._wake = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+        self._initialised = False
+
+    # ------------------------------------------------------------------
+    # Shared table
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        ensure_storage_dir()
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialised:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _SCHEMA_VERSION:
+                conn.executescript(
+                    "DROP TABLE IF EXISTS presence_sessions; DROP TABLE IF EXISTS presence_workers;"
+                )
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            conn.executescript(_SCHEMA)
+            self._initialised = True
+        return conn
+
+    @contextmanager
+    def _db(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def _ensure_flusher(self) -> None:
+        """Start the write-behind thread on first use (caller holds _lock)."""
+        if self._flusher is None or not self._flusher.is_alive():
+            self._flusher = threading.Thread(target=self._flush_loop, name="presence-flush", daemon=True)
+            self._flusher.start()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except Exception as e:
+                print(f"[Presence] Flush failed: {e}")
+
+    def flush(self) -> None:
+        """
+        Persist sessions changed since the last flush, refresh this worker's
+        heartbeat and drop timed-out rows.
+
+        A no-op (the database is not even opened) when this worker has no
+        sessions and nothing changed, e.g. in scripts importing the module.
+        """
+        with self._flush_lock:
+            with self._lock:
+                upserts = [
+                    tuple(self._active_sessions[sid].get(col) for col in _COLUMNS)
+                    for sid in self._dirty if sid in self._active_sessions
+                ]
+                removed = list(self._removed)
+                has_sessions = bool(self._active_sessions)
+                self._dirty.clear()
+                self._removed.clear()
+            if not (upserts or removed or has_sessions):
+                return
+            now = datetime.now()
+            cutoff = (now - timedelta(minutes=SESSION_TIMEOUT_MINUTES)).isoformat()
+            worker_cutoff = (now - timedelta(seconds=WORKER_TIMEOUT_SECS)).isoformat()
+            try:
+                with self._db() as conn:
+                    conn.execute("BEGIN IMMEDIATE")
+                    try:
+                        conn.executemany(_UPSERT, upserts)
+                        conn.executemany("DELETE FROM presence_sessions WHERE session_id = ?", [(sid,) for sid in removed])
+                        if has_sessions:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO presence_workers (worker_id, heartbeat_at) VALUES (?, ?)",
+                                (self.worker_id, now.isoformat()),
+                            )
+                        else:
+                            conn.execute("DELETE FROM presence_workers WHERE worker_id = ?", (self.worker_id,))
+                        conn.execute("DELETE FROM presence_sessions WHERE last_active < ?", (cutoff,))
+                        conn.execute(
+                            "DELETE FROM presence_sessions WHERE worker_id NOT IN "
+                            "(SELECT worker_id FROM presence_workers WHERE heartbeat_at >= ?)",
+                            (worker_cutoff,),
+                        )
+                        conn.execute("DELETE FROM presence_workers WHERE heartbeat_at < ?", (worker_cutoff,))
+                        conn.execute("COMMIT")
+                    except BaseException:
+                        conn.execute("ROLLBACK")
+                        raise
+            except BaseException:
+                # Retry these on the next flush
+                with self._lock:
+                    self._dirty.update(row[0] for row in upserts)
+                    self._removed.update(sid for sid in removed if sid not in self._active_sessions)
+                raise
+
+    # ------------------------------------------------------------------
+    # Sessions
+    # ------------------------------------------------------------------
+
     def create_session(
         self,
         case_id: str,
@@ -69,9 +212,10 @@ class PresenceService:
         """Create a new workspace session."""
         session_id = f"ws_{uuid.uuid4().hex[:16]}"
         now = datetime.now().isoformat()
-        
+
         session_data = {
             "session_id": session_id,
+            "worker_id": self.worker_id,
             "case_id": case_id,
             "user_id": user_id,
             "username": username,
@@ -80,79 +224,92 @@ class PresenceService:
             "started_at": now,
             "last_active": now
         }
-        
+
         with self._lock:
             self._active_sessions[session_id] = session_data
-            # Also persist to disk
-            if case_id not in self._sessions:
-                self._sessions[case_id] = {}
-            self._sessions[case_id][session_id] = session_data
-            save_sessions(self._sessions)
-        
+            self._by_case.setdefault(case_id, set()).add(session_id)
+            self._dirty.add(session_id)
+            self._ensure_flusher()
+
         return session_id
-    
+
     def update_session_activity(self, session_id: str):
-        """Update last active timestamp for a session."""
+        """Update last active timestamp for a session (persisted by the next flush)."""
         with self._lock:
-            if session_id in self._active_sessions:
-                self._active_sessions[session_id]["last_active"] = datetime.now().isoformat()
-                # Update in persisted sessions
-                session = self._active_sessions[session_id]
-                case_id = session.get("case_id")
-                if case_id and case_id in self._sessions:
-                    if session_id in self._sessions[case_id]:
-                        self._sessions[case_id][session_id]["last_active"] = self._active_sessions[session_id]["last_active"]
-                        save_sessions(self._sessions)
-    
+            session = self._active_sessions.get(session_id)
+            if session is not None:
+                session["last_active"] = datetime.now().isoformat()
+                self._dirty.add(session_id)
+
+    def _remove_locked(self, session_id: str) -> None:
+        session = self._active_sessions.pop(session_id, None)
+        if session is None:
+            return
+        case_sessions = self._by_case.get(session.get("case_id"))
+        if case_sessions is not None:
+            case_sessions.discard(session_id)
+            if not case_sessions:
+                del self._by_case[session["case_id"]]
+        self._dirty.discard(session_id)
+        self._removed.add(session_id)
+        self._ensure_flusher()
+
     def remove_session(self, session_id: str):
         """Remove a session (user left workspace)."""
         with self._lock:
-            if session_id in self._active_sessions:
-                session = self._active_sessions[session_id]
-                case_id = session.get("case_id")
-                del self._active_sessions[session_id]
-                
-                # Remove from persisted sessions
-                if case_id and case_id in self._sessions:
-                    if session_id in self._sessions[case_id]:
-                        del self._sessions[case_id][session_id]
-                        save_sessions(self._sessions)
-    
+            self._remove_locked(session_id)
+
     def get_online_users(self, case_id: str) -> List[Dict]:
-        """Get list of users currently online in a workspace."""
+        """Get list of users currently online in a workspace, across all workers."""
         with self._lock:
-            online_users = []
-            seen_users = set()
-            
-            # Check active sessions
-            for session in self._active_sessions.values():
-                if session.get("case_id") == case_id:
-                    user_id = session.get("user_id")
-                    username = session.get("username")
-                    if user_id and user_id not in seen_users:
-                        online_users.append({
-                            "user_id": user_id,
-                            "username": username
-                        })
-                        seen_users.add(user_id)
-            
-            return online_users
-    
-    def cleanup_stale_sessions(self, timeout_minutes: int = 30):
+            local = [dict(self._active_sessions[sid]) for sid in self._by_case.get(case_id, ())]
+            local_ids = {s["session_id"] for s in local}
+            removed = set(self._removed)
+
+        remote = []
+        now = datetime.now()
+        cutoff = (now - timedelta(minutes=SESSION_TIMEOUT_MINUTES)).isoformat()
+        worker_cutoff = (now - timedelta(seconds=WORKER_TIMEOUT_SECS)).isoformat()
+        try:
+            with self._db() as conn:
+                # Only sessions of workers that are still heartbeating
+                remote = conn.execute(
+                    "SELECT s.session_id, s.user_id, s.username FROM presence_sessions s "
+                    "JOIN presence_workers w ON w.worker_id = s.worker_id "
+                    "WHERE s.case_id = ? AND s.last_active >= ? AND w.heartbeat_at >= ?",
+                    (case_id, cutoff, worker_cutoff),
+                ).fetchall()
+        except sqlite3.Error as e:
+            print(f"[Presence] Could not read shared sessions: {e}")
+
+        online_users = []
+        seen_users = set()
+        sessions = [(s.get("user_id"), s.get("username")) for s in local]
+        sessions += [(user_id, username) for sid, user_id, username in remote
+                     if sid not in local_ids and sid not in removed]
+        for user_id, username in sessions:
+            if user_id and user_id not in seen_users:
+                online_users.append({
+                    "user_id": user_id,
+                    "username": username
+                })
+                seen_users.add(user_id)
+
+        return online_users
+
+    def cleanup_stale_sessions(self, timeout_minutes: int = SESSION_TIMEOUT_MINUTES):
         """Remove sessions that haven't been active for timeout_minutes."""
         cutoff = datetime.now() - timedelta(minutes=timeout_minutes)
         cutoff_iso = cutoff.isoformat()
-        
+
         with self._lock:
-            stale_sessions = []
-            for session_id, session in self._active_sessions.items():
-                last_active = session.get("last_active", "")
-                if last_active < cutoff_iso:
-                    stale_sessions.append(session_id)
-            
+            stale_sessions = [
+                session_id for session_id, session in self._active_sessions.items()
+                if session.get("last_active", "") < cutoff_iso
+            ]
             for session_id in stale_sessions:
-                self.remove_session(session_id)
-    
+                self._remove_locked(session_id)
+
     def get_session(self, session_id: str) -> Optional[Dict]:
         """Get session data by session_id."""
         with self._lock:
@@ -161,3 +318,6 @@ class PresenceService:
 
 # Singleton instance
 presence_service = PresenceService()
+
+# Persist the last joins/leaves on a clean shutdown
+atexit.register(lambda: presence_service.flush())
@@ -12,21 +12,34 @@ Handles:
 import json
 import sys
 import time
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Optional, Any
 
 from services.neo4j_service import neo4j_service
 from services.llm_service import llm_service
+from services.entity_mention_matcher import entity_mention_matcher
+from services.chunk_lexical_index import chunk_lexical_index, reciprocal_rank_fusion
+from services.token_budget import token_counter, pack_by_relevance, utilisation
+from services.answer_cache import answer_cache
+from services.case_precompute_service import case_precompute_service
+from services.retrieval_working_set import working_set_store, RetrievalWorkingSet
 from config import (
     VECTOR_SEARCH_ENABLED, VECTOR_SEARCH_TOP_K, VECTOR_SEARCH_CONFIDENCE_THRESHOLD,
     HYBRID_FILTERING_ENABLED,
     CHUNK_SEARCH_ENABLED, CHUNK_SEARCH_TOP_K,
+    LEXICAL_SEARCH_ENABLED, LEXICAL_SEARCH_TOP_K, RRF_K,
     ENTITY_SEARCH_ENABLED, ENTITY_SEARCH_TOP_K, GRAPH_TRAVERSAL_DEPTH,
-    QUESTION_CLASSIFICATION_ENABLED,
+    QUESTION_CLASSIFICATION_ENABLED, ENTITY_MATCHER_LLM_FALLBACK,
     RERANK_ENABLED, RERANK_METHOD, RERANK_TOP_CHUNKS, RERANK_TOP_ENTITIES, CONTEXT_TOKEN_BUDGET,
+    CONTEXT_WINDOW_FRACTION,
     EMBEDDING_PROVIDER, EMBEDDING_MODEL,
 )
 from utils.prompt_trace import log_section
 
+# Lexical chunk searches run here while the question is embedded and
+# the vector search runs
+_lexical_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="rag-lexical")
+
 # Try to import vector DB services (optional)
 try:
     from services.vector_db_service import vector_db_service
@@ -691,17 +704,28 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         doc_keys: Optional[List[str]] = None,
         confidence_threshold: Optional[float] = None,
         debug_log: Optional[Dict] = None,
+        query_embedding: Optional[List[float]] = None,
+        working_set: Optional[RetrievalWorkingSet] = None,
     ) -> List[Dict]:
         """
-        Retrieve relevant text chunks via vector search.
-        Falls back to document-level search if chunks collection is empty.
+        Retrieve relevant text chunks via hybrid vector + lexical search.
+
+        The per-case BM25 index (SQLite FTS5) is queried in parallel with the
+        vector search and the two rankings are fused by reciprocal rank
+        fusion, so exact identifiers (account/phone numbers, references)
+        are found even when they are semantically unremarkable.
 
         When doc_keys is provided, uses two-phase retrieval:
         Phase 1: Retrieve chunks scoped to the selected document(s)
         Phase 2: Fill remaining budget from case-wide search
 
+        With a conversation working set, vector search returns only ids and
+        distances for chunks earlier turns already fetched.
+
         Returns:
             List of result dicts with: id, text, metadata, distance
+            (plus rrf_score when lexical search is enabled; distance is None
+            for chunks found only lexically)
         """
         if not VECTOR_DB_AVAILABLE:
             if debug_log is not None:
@@ -709,9 +733,21 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
             return []
 
         try:
-            print("[RAG] Generating chunk embedding..."); sys.stdout.flush()
-            query_embedding = embedding_service.generate_embedding(question)
-            print("[RAG] Chunk embedding done"); sys.stdout.flush()
+            # Start lexical searches first; they overlap embedding + vector search
+            lexical_futures = {}
+            if LEXICAL_SEARCH_ENABLED and CHUNK_SEARCH_ENABLED and case_id:
+                if doc_keys:
+                    lexical_futures["doc"] = _lexical_executor.submit(
+                        self._search_lexical, case_id, question, doc_keys
+                    )
+                lexical_futures["case"] = _lexical_executor.submit(
+                    self._search_lexical, case_id, question, None
+                )
+
+            if query_embedding is None:
+                print("[RAG] Generating chunk embedding..."); sys.stdout.flush()
+                query_embedding = embedding_service.generate_embedding(question)
+                print("[RAG] Chunk embedding done"); sys.stdout.flush()
             # Enforce case_id isolation — never search without it
             if not case_id:
                 if debug_log is not None:
@@ -722,8 +758,10 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
 
             # Try chunk-level search first
             print("[RAG] Searching chunk vectors (ChromaDB)..."); sys.stdout.flush()
-            chunk_count = vector_db_service.count_chunks()
+            chunk_count = vector_db_service.cached_count("chunks")
             doc_scoped_count = 0
+            search_timings = []
+            known_ids = set(working_set.chunks) if working_set else None
 
             if CHUNK_SEARCH_ENABLED and chunk_count > 0:
                 # Phase 1: Document-scoped search (if doc_keys provided)
@@ -734,11 +772,21 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                     else:
                         doc_filter = {"$and": [{"case_id": case_id}, {"doc_key": {"$in": doc_keys}}]}
 
+                    doc_scoped_timing = {"scope": "doc"}
                     doc_scoped_results = vector_db_service.search_chunks(
                         query_embedding=query_embedding,
                         top_k=CHUNK_SEARCH_TOP_K,
                         filter_metadata=doc_filter,
+                        timings=doc_scoped_timing,
+                        known_ids=known_ids,
                     )
+                    if working_set:
+                        working_set.fill_chunks(doc_scoped_results)
+                    search_timings.append(doc_scoped_timing)
+                    if "doc" in lexical_futures:
+                        doc_scoped_results = self._fuse_chunk_rankings(
+                            doc_scoped_results, lexical_futures["doc"].result(), doc_scoped_timing
+                        )
                     # Mark as doc-scoped for downstream boosting
                     for r in doc_scoped_results:
                         r["_doc_scoped"] = True
@@ -748,11 +796,21 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
 
                 # Phase 2: Case-wide search
                 already_retrieved_ids = {r["id"] for r in doc_scoped_results}
+                case_wide_timing = {"scope": "case"}
                 case_wide_all = vector_db_service.search_chunks(
                     query_embedding=query_embedding,
                     top_k=CHUNK_SEARCH_TOP_K,
                     filter_metadata=vector_filter,
+                    timings=case_wide_timing,
+                    known_ids=known_ids,
                 )
+                if working_set:
+                    working_set.fill_chunks(case_wide_all)
+                search_timings.append(case_wide_timing)
+                if "case" in lexical_futures:
+                    case_wide_all = self._fuse_chunk_rankings(
+                        case_wide_all, lexical_futures["case"].result(), case_wide_timing
+                    )
                 case_wide_results = []
                 for r in case_wide_all:
                     if r["id"] not in already_retrieved_ids:
@@ -760,7 +818,9 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                         case_wide_results.append(r)
 
                 # Combine: doc-scoped first, then case-wide
-                all_results = doc_scoped_results + case_wide_results
+                all_results = [r for r in doc_scoped_results + case_wide_results if r.get("text") is not None]
+                if working_set:
+                    working_set.remember_chunks(all_results)
 
                 # Log when no chunks found for this case
                 if not all_results and chunk_count > 0:
@@ -771,13 +831,13 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                 all_results = []
                 source = "chunks"
 
-            # Apply confidence threshold
+            # Apply confidence threshold (lexical matches are kept regardless)
             filtered = []
             for r in all_results:
                 distance = r.get("distance")
                 if distance is not None and distance <= threshold:
                     filtered.append(r)
-                elif distance is None:
+                elif distance is None or r.get("_lexical_rank"):
                     filtered.append(r)
 
             print(f"[RAG] Chunk search ({source}): {len(all_results)} total, {len(filtered)} after threshold ({threshold})"
@@ -789,9 +849,12 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                     "source": source,
                     "chunks_in_db": chunk_count,
                     "top_k": CHUNK_SEARCH_TOP_K if source == "chunks" else VECTOR_SEARCH_TOP_K,
+                    "lexical_enabled": bool(lexical_futures),
                     "confidence_threshold": threshold,
                     "doc_keys": doc_keys or [],
                     "doc_scoped_count": doc_scoped_count,
+                    "search_timings": search_timings,
+                    "reused_from_conversation": len(known_ids & {r["id"] for r in all_results}) if known_ids else 0,
                     "total_results": len(all_results),
                     "filtered_results": len(filtered),
                     "results": [
@@ -799,6 +862,9 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                             "id": r["id"],
                             "doc_name": r.get("metadata", {}).get("doc_name", r.get("metadata", {}).get("filename", "Unknown")),
                             "distance": r.get("distance"),
+                            "rrf_score": r.get("rrf_score"),
+                            "vector_rank": r.get("_vector_rank"),
+                            "lexical_rank": r.get("_lexical_rank"),
                             "doc_scoped": r.get("_doc_scoped", False),
                             "text_preview": r.get("text", "")[:200] + "..." if len(r.get("text", "")) > 200 else r.get("text", ""),
                         }
@@ -816,16 +882,58 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                 debug_log["chunk_search"] = {"enabled": True, "error": str(e)}
             return []
 
+    def _search_lexical(
+        self,
+        case_id: str,
+        question: str,
+        doc_keys: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        """BM25 chunk search for one scope, timed (runs on the lexical executor)."""
+        start = time.perf_counter()
+        results = chunk_lexical_index.search(case_id, question, LEXICAL_SEARCH_TOP_K, doc_keys=doc_keys)
+        return {"results": results, "ms": round((time.perf_counter() - start) * 1000, 2)}
+
+    def _fuse_chunk_rankings(
+        self,
+        vector_results: List[Dict],
+        lexical: Dict[str, Any],
+        timing: Optional[Dict] = None,
+    ) -> List[Dict]:
+        """Reciprocal-rank-fuse vector and lexical chunk results (top CHUNK_SEARCH_TOP_K)."""
+        lexical_results = lexical["results"]
+        if timing is not None:
+            timing["lexical_ms"] = lexical["ms"]
+            timing["lexical_results"] = len(lexical_results)
+        if not lexical_results:
+            return vector_results
+        fused = reciprocal_rank_fusion(
+            {"vector": vector_results, "lexical": lexical_results},
+            k=RRF_K,
+            limit=CHUNK_SEARCH_TOP_K,
+        )
+        for r in fused:
+            r.setdefault("distance", None)
+        lexical_only = sum(1 for r in fused if not r.get("_vector_rank"))
+        print(f"[RAG] Lexical search: {len(lexical_results)} hits in {lexical['ms']}ms, "
+              f"{lexical_only} chunk(s) added beyond vector results")
+        return fused
+
     def _retrieve_entities(
         self,
         question: str,
         case_id: Optional[str] = None,
         top_k: Optional[int] = None,
         debug_log: Optional[Dict] = None,
+        query_embedding: Optional[List[float]] = None,
+        working_set: Optional[RetrievalWorkingSet] = None,
     ) -> List[Dict]:
         """
         Retrieve relevant entities via vector search, then enrich from Neo4j.
 
+        With a conversation working set, only entities no earlier turn
+        enriched are fetched from Neo4j; known ones are reused with fresh
+        distances.
+
         Returns:
             List of entity dicts from Neo4j with verified_facts, ai_insights, and distance scores.
         """
@@ -837,9 +945,10 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         top_k = top_k or ENTITY_SEARCH_TOP_K
 
         try:
-            print("[RAG] Generating entity embedding..."); sys.stdout.flush()
-            query_embedding = embedding_service.generate_embedding(question)
-            print("[RAG] Entity embedding done"); sys.stdout.flush()
+            if query_embedding is None:
+                print("[RAG] Generating entity embedding..."); sys.stdout.flush()
+                query_embedding = embedding_service.generate_embedding(question)
+                print("[RAG] Entity embedding done"); sys.stdout.flush()
 
             # Enforce case_id isolation — never search without it
             if not case_id:
@@ -849,10 +958,13 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
             vector_filter = {"case_id": case_id}
 
             print("[RAG] Searching entity vectors (ChromaDB)..."); sys.stdout.flush()
+            search_timing = {}
             entity_results = vector_db_service.search_entities(
                 query_embedding=query_embedding,
                 top_k=top_k,
                 filter_metadata=vector_filter,
+                timings=search_timing,
+                known_ids=set(working_set.entities) if working_set else None,
             )
             print(f"[RAG] Entity vector search done: {len(entity_results)} results"); sys.stdout.flush()
 
@@ -867,7 +979,19 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                     debug_log["entity_search"] = {"enabled": True, "vector_results": 0, "enriched_entities": 0}
                 return []
 
-            enriched_entities = self._get_entity_nodes_from_neo4j(entity_keys, case_id=case_id)
+            reused = 0
+            if working_set:
+                new_keys = [k for k in entity_keys if k not in working_set.entities]
+                if new_keys:
+                    for entity in self._get_entity_nodes_from_neo4j(new_keys, case_id=case_id):
+                        if entity.get("key"):
+                            working_set.entities[entity["key"]] = entity
+                enriched_entities = [
+                    dict(working_set.entities[k]) for k in entity_keys if k in working_set.entities
+                ]
+                reused = len(entity_keys) - len(new_keys)
+            else:
+                enriched_entities = self._get_entity_nodes_from_neo4j(entity_keys, case_id=case_id)
 
             # Attach distance scores from vector search
             distance_map = {r["id"]: r.get("distance", 1.0) for r in entity_results}
@@ -881,6 +1005,8 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                     "enabled": True,
                     "vector_results": len(entity_results),
                     "enriched_entities": len(enriched_entities),
+                    "reused_from_conversation": reused,
+                    "search_timing": search_timing,
                     "entity_keys": [e.get("key") for e in enriched_entities[:20]],
                 }
 
@@ -899,10 +1025,13 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         entity_keys: List[str],
         case_id: Optional[str] = None,
         debug_log: Optional[Dict] = None,
+        working_set: Optional[RetrievalWorkingSet] = None,
     ) -> Dict:
         """
         Traverse the graph from matched entities to pull connected context.
         Uses existing neo4j_service.get_context_for_nodes() for 1-hop neighbors.
+        With a conversation working set, only keys no earlier turn traversed
+        are queried.
 
         Returns:
             Dict with 'selected_entities' list (same format as get_context_for_nodes)
@@ -913,12 +1042,24 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         try:
             # Process in batches to avoid large Neo4j queries
             BATCH_SIZE = 10
+            fetch_keys = (
+                [k for k in entity_keys if k not in working_set.traversal] if working_set else entity_keys
+            )
             all_entities = []
-            for i in range(0, len(entity_keys), BATCH_SIZE):
-                batch = entity_keys[i:i + BATCH_SIZE]
+            for i in range(0, len(fetch_keys), BATCH_SIZE):
+                batch = fetch_keys[i:i + BATCH_SIZE]
                 print(f"[RAG] Graph traversal batch {i // BATCH_SIZE + 1}: {len(batch)} keys"); sys.stdout.flush()
                 batch_context = self.neo4j.get_context_for_nodes(batch, case_id)
                 all_entities.extend(batch_context.get("selected_entities", []))
+            if working_set:
+                for entity in all_entities:
+                    working_set.traversal[entity.get("key")] = entity
+                for key in fetch_keys:
+                    # Keys without connections: remember so they are not re-queried
+                    working_set.traversal.setdefault(key, None)
+                all_entities = [
+                    working_set.traversal[k] for k in entity_keys if working_set.traversal.get(k)
+                ]
             context = {"selected_entities": all_entities}
 
             if debug_log is not None:
@@ -926,6 +1067,7 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                     "input_keys": entity_keys[:20],
                     "depth": GRAPH_TRAVERSAL_DEPTH,
                     "entities_returned": len(all_entities),
+                    "reused_from_conversation": len(entity_keys) - len(fetch_keys),
                 }
 
             # Cap connections per entity to prevent memory explosion on hub nodes
@@ -948,6 +1090,137 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
     # NEW: Hybrid Context Builder
     # =====================
 
+    def _count_tokens(self, text: str, cache_id: Optional[str] = None) -> int:
+        """Tokens ``text`` occupies for the active model (cached by item id)."""
+        return token_counter.count(text, self.llm.provider, self.llm.model_id, cache_id=cache_id)
+
+    @staticmethod
+    def _chunk_relevances(chunks: List[Dict]) -> List[float]:
+        """Relevance in [0, 1] per chunk: normalised fused score, else 1 - distance."""
+        top_rrf = max((c.get("rrf_score") or 0.0 for c in chunks), default=0.0)
+        relevances = []
+        for chunk in chunks:
+            if chunk.get("rrf_score") is not None and top_rrf > 0:
+                relevances.append(chunk["rrf_score"] / top_rrf)
+            elif chunk.get("distance") is not None:
+                relevances.append(max(0.0, 1.0 - chunk["distance"]))
+            else:
+                relevances.append(0.5)
+        return relevances
+
+    @staticmethod
+    def _entity_relevance(entity: Dict) -> float:
+        d = entity.get("distance")
+        if d is None:
+            return 0.5
+        if entity.get("_doc_associated"):
+            d = max(0.0, d - 0.2)
+        return max(0.0, 1.0 - d)
+
+    @staticmethod
+    def _format_passage(number: int, chunk: Dict, distance: Optional[float] = None) -> str:
+        metadata = chunk.get("metadata", {})
+        doc_name = metadata.get("doc_name", metadata.get("filename", "Unknown"))
+        page_start = metadata.get("page_start")
+        page_end = metadata.get("page_end")
+        page_info = ""
+        if page_start and page_start != -1 and page_start != "-1":
+            page_start = int(page_start) if isinstance(page_start, str) else page_start
+            if page_end and page_end != -1 and page_end != "-1":
+                page_end = int(page_end) if isinstance(page_end, str) else page_end
+                if page_end != page_start:
+                    page_info = f" (pages {page_start}-{page_end})"
+                else:
+                    page_info = f" (page {page_start})"
+            else:
+                page_info = f" (page {page_start})"
+        if distance is None:
+            distance = chunk.get("distance")
+        doc_marker = " [SELECTED DOCUMENT]" if chunk.get("_doc_scoped") else ""
+        lines = [f"--- Passage {number}: {doc_name}{page_info}{doc_marker} ---"]
+        if distance is not None:
+            lines.append(f"Relevance: {1 - distance:.4f}")
+        lines.append(chunk.get("text", ""))
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _first_distance(working_set: Optional[RetrievalWorkingSet], chunk_id: Optional[str]) -> Optional[float]:
+        """Distance a chunk was first shown with in this conversation (keeps its header stable)."""
+        if working_set is None or not chunk_id or chunk_id not in working_set.chunks:
+            return None
+        return working_set.chunks[chunk_id].get("distance")
+
+    @staticmethod
+    def _format_entity(entity: Dict, question_words: set) -> str:
+        name = entity.get("name", "Unknown")
+        etype = entity.get("type", "Unknown")
+        lines = [f"[{etype}] {name} (key: {entity.get('key', '')})"]
+        if entity.get("summary"):
+            lines.append(f"  Summary: {entity['summary']}")
+
+        # Include verified facts with citations (sorted by relevance to question)
+        verified_facts = entity.get("verified_facts")
+        if verified_facts:
+            # Sort facts by relevance: keyword hits from question, then importance
+            def _fact_relevance(fact):
+                text = fact.get("text", "").lower()
+                keyword_hits = sum(1 for w in question_words if w in text) if question_words else 0
+                importance = fact.get("importance", 0) or 0
+                return (keyword_hits, importance)
+
+            sorted_facts = sorted(verified_facts, key=_fact_relevance, reverse=True)
+            lines.append("  Verified Facts:")
+            for fact in sorted_facts[:10]:  # Cap per entity to prevent context explosion
+                fact_text = fact.get("text", "")
+                source = fact.get("source_doc", "")
+                quote = fact.get("quote", "")
+                page = fact.get("page", "")
+                citation = []
+                if source:
+                    citation.append(source)
+                if page:
+                    citation.append(f"p.{page}")
+                citation_str = f" [{', '.join(citation)}]" if citation else ""
+                lines.append(f"    - {fact_text}{citation_str}")
+                if quote:
+                    lines.append(f'      Quote: "{quote}"')
+
+        # Include AI insights
+        ai_insights = entity.get("ai_insights")
+        if ai_insights:
+            lines.append("  AI Insights:")
+            for insight in ai_insights[:3]:  # Cap to prevent context explosion
+                insight_text = insight.get("text", "")
+                confidence = insight.get("confidence", "")
+                conf_str = f" (confidence: {confidence})" if confidence else ""
+                lines.append(f"    - {insight_text}{conf_str}")
+
+        lines.append("")
+        return "\n".join(lines)
+
+    @staticmethod
+    def _format_graph_entity(entity: Dict, retrieved_entity_keys: set) -> Optional[str]:
+        connections = entity.get("connections", [])
+        if not connections:
+            return None
+        connections = sorted(connections, key=lambda c: (
+            c.get("key") in retrieved_entity_keys,
+            bool(c.get("summary")),
+            c.get("name", ""),
+        ), reverse=True)
+        lines = [f"[{entity.get('type', '?')}] {entity.get('name', '?')}:"]
+        for conn in connections[:25]:
+            direction = "->" if conn.get("direction") == "outgoing" else "<-"
+            lines.append(
+                f"  {direction} [{conn.get('relationship', '?')}] "
+                f"{conn.get('name', '?')} ({conn.get('type', '?')})"
+            )
+            if conn.get("summary"):
+                lines.append(f"     Summary: {conn['summary'][:200]}")
+        lines.append("")
+        return "\n".join(lines)
+
     def _build_hybrid_context(
         self,
         chunk_results: List[Dict],
@@ -956,6 +1229,8 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         cypher_context: Optional[str] = None,
         question: str = "",
         model_context_window: Optional[int] = None,
+        debug_log: Optional[Dict] = None,
+        working_set: Optional[RetrievalWorkingSet] = None,
     ) -> str:
         """
         Build a structured context string with multiple sections:
@@ -964,144 +1239,126 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         - GRAPH CONNECTIONS (from graph traversal)
         - GRAPH QUERY RESULTS (from Cypher, if applicable)
 
-        Enforces a total character budget scaled to the model's context window
-        so the final context fits (approx 4 chars/token).
+        The budget is a share of the model's context window in real tokens
+        (tiktoken for OpenAI, calibrated estimate for Ollama). Cypher results
+        and section headers are always included; passages, entities and graph
+        connection blocks then compete for the rest by relevance per token.
+        Each section keeps its ranked order.
+
+        With a conversation working set, blocks sent in earlier turns come
+        first, in the order and wording they were first sent, and new blocks
+        follow — so consecutive turns share a long prompt prefix that
+        provider-side prompt caching can reuse.
         """
-        # Use 70% of the model's context window for context, leave 30% for
-        # system prompt, question, and generated answer.
+        provider, model_id = self.llm.provider, self.llm.model_id
+        # Leave the remainder of the window for system prompt, question and answer
         if model_context_window and model_context_window > 0:
-            MAX_CONTEXT_CHARS = int(model_context_window * 0.7 * 4)  # tokens -> chars
+            token_budget = int(model_context_window * CONTEXT_WINDOW_FRACTION)
         else:
-            MAX_CONTEXT_CHARS = 360000  # ~90k tokens, safe default for 128k models
-        print(f"[RAG] Context budget: {MAX_CONTEXT_CHARS:,} chars "
-              f"(model context window: {model_context_window or 'unknown'})")
-        total_chars = 0
-        sections = []
+            token_budget = 90000  # safe default for 128k models
 
-        # Section 1: Relevant Text Passages
-        if chunk_results:
-            lines = ["=== RELEVANT TEXT PASSAGES ===", ""]
-            for i, chunk in enumerate(chunk_results, 1):
-                metadata = chunk.get("metadata", {})
-                doc_name = metadata.get("doc_name", metadata.get("filename", "Unknown"))
-                page_start = metadata.get("page_start")
-                page_end = metadata.get("page_end")
-                page_info = ""
-                if page_start and page_start != -1 and page_start != "-1":
-                    page_start = int(page_start) if isinstance(page_start, str) else page_start
-                    if page_end and page_end != -1 and page_end != "-1":
-                        page_end = int(page_end) if isinstance(page_end, str) else page_end
-                        if page_end != page_start:
-                            page_info = f" (pages {page_start}-{page_end})"
-                        else:
-                            page_info = f" (page {page_start})"
-                    else:
-                        page_info = f" (page {page_start})"
-                distance = chunk.get("distance")
-                doc_marker = " [SELECTED DOCUMENT]" if chunk.get("_doc_scoped") else ""
-                lines.append(f"--- Passage {i}: {doc_name}{page_info}{doc_marker} ---")
-                if distance is not None:
-                    lines.append(f"Relevance: {1 - distance:.4f}")
-                lines.append(chunk.get("text", ""))
-                lines.append("")
-            section_text = "\n".join(lines)
-            total_chars += len(section_text)
-            sections.append(section_text)
-
-        # Section 2: Relevant Entities (with verified facts for citations)
-        if entity_results:
-            lines = ["=== RELEVANT ENTITIES ===", ""]
-            for entity in entity_results:
-                name = entity.get("name", "Unknown")
-                etype = entity.get("type", "Unknown")
-                lines.append(f"[{etype}] {name} (key: {entity.get('key', '')})")
-                if entity.get("summary"):
-                    lines.append(f"  Summary: {entity['summary']}")
-
-                # Include verified facts with citations (sorted by relevance to question)
-                verified_facts = entity.get("verified_facts")
-                if verified_facts:
-                    # Sort facts by relevance: keyword hits from question, then importance
-                    stop_words = {"the", "a", "an", "is", "are", "was", "were", "what", "who",
-                                  "where", "when", "how", "why", "do", "does", "did", "in", "of",
-                                  "to", "for", "and", "or", "on", "at", "by", "with"}
-                    question_words = set(question.lower().split()) - stop_words if question else set()
-
-                    def _fact_relevance(fact):
-                        text = fact.get("text", "").lower()
-                        keyword_hits = sum(1 for w in question_words if w in text) if question_words else 0
-                        importance = fact.get("importance", 0) or 0
-                        return (keyword_hits, importance)
-
-                    sorted_facts = sorted(verified_facts, key=_fact_relevance, reverse=True)
-                    lines.append("  Verified Facts:")
-                    for fact in sorted_facts[:10]:  # Cap per entity to prevent context explosion
-                        fact_text = fact.get("text", "")
-                        source = fact.get("source_doc", "")
-                        quote = fact.get("quote", "")
-                        page = fact.get("page", "")
-                        citation = []
-                        if source:
-                            citation.append(source)
-                        if page:
-                            citation.append(f"p.{page}")
-                        citation_str = f" [{', '.join(citation)}]" if citation else ""
-                        lines.append(f"    - {fact_text}{citation_str}")
-                        if quote:
-                            lines.append(f'      Quote: "{quote}"')
-
-                # Include AI insights
-                ai_insights = entity.get("ai_insights")
-                if ai_insights:
-                    lines.append("  AI Insights:")
-                    for insight in ai_insights[:3]:  # Cap to prevent context explosion
-                        insight_text = insight.get("text", "")
-                        confidence = insight.get("confidence", "")
-                        conf_str = f" (confidence: {confidence})" if confidence else ""
-                        lines.append(f"    - {insight_text}{conf_str}")
-
-                lines.append("")
-            section_text = "\n".join(lines)
-            total_chars += len(section_text)
-            sections.append(section_text)
-
-        # Section 3: Graph Connections (sorted by relevance, budget-capped)
+        stop_words = {"the", "a", "an", "is", "are", "was", "were", "what", "who",
+                      "where", "when", "how", "why", "do", "does", "did", "in", "of",
+                      "to", "for", "and", "or", "on", "at", "by", "with"}
+        question_words = set(question.lower().split()) - stop_words if question else set()
         retrieved_entity_keys = {e.get("key") for e in entity_results if e.get("key")}
-        graph_entities = graph_context.get("selected_entities", [])
-        if graph_entities and total_chars < MAX_CONTEXT_CHARS:
-            lines = ["=== GRAPH CONNECTIONS ===", ""]
-            graph_chars = 0
-            graph_budget = MAX_CONTEXT_CHARS - total_chars
-            truncated = 0
-            for entity in graph_entities:
-                connections = entity.get("connections", [])
-                if connections:
-                    connections = sorted(connections, key=lambda c: (
-                        c.get("key") in retrieved_entity_keys,
-                        bool(c.get("summary")),
-                        c.get("name", ""),
-                    ), reverse=True)
-                    entity_lines = [f"[{entity.get('type', '?')}] {entity.get('name', '?')}:"]
-                    for conn in connections[:25]:
-                        direction = "->" if conn.get("direction") == "outgoing" else "<-"
-                        entity_lines.append(
-                            f"  {direction} [{conn.get('relationship', '?')}] "
-                            f"{conn.get('name', '?')} ({conn.get('type', '?')})"
-                        )
-                        if conn.get("summary"):
-                            entity_lines.append(f"     Summary: {conn['summary'][:200]}")
-                    entity_lines.append("")
-                    entity_text = "\n".join(entity_lines)
-                    if graph_chars + len(entity_text) > graph_budget:
-                        truncated += 1
-                        continue
-                    lines.extend(entity_lines)
-                    graph_chars += len(entity_text)
-            if truncated > 0:
-                lines.append(f"[{truncated} more entities omitted due to context size limits]")
-            section_text = "\n".join(lines)
-            total_chars += len(section_text)
-            sections.append(section_text)
+        entity_relevance = {e.get("key"): self._entity_relevance(e) for e in entity_results if e.get("key")}
+
+        # Candidate blocks: (section, payload, text, tokens, relevance, tier).
+        # Passage headers carry their final number, so they are rendered with
+        # a placeholder and counted without it.
+        def _sent_text(section, item_id, render):
+            # Blocks already sent in this conversation are reused verbatim
+            if working_set is not None and item_id:
+                text = working_set.rendered.get((section, item_id))
+                if text is None:
+                    text = working_set.rendered[(section, item_id)] = render()
+                return text
+            return render()
+
+        candidates = []
+        for chunk, relevance in zip(chunk_results, self._chunk_relevances(chunk_results)):
+            text = self._format_passage(0, chunk)
+            tokens = (self._count_tokens(chunk.get("text", ""), cache_id=chunk.get("id"))
+                      + self._count_tokens(text[:text.index("\n")]) + 8)
+            candidates.append({
+                "section": "passages", "id": chunk.get("id"), "payload": chunk, "tokens": tokens,
+                "relevance": relevance, "tier": 0 if chunk.get("_doc_scoped") else 1,
+            })
+        for entity in entity_results:
+            text = _sent_text("entities", entity.get("key"),
+                              lambda: self._format_entity(entity, question_words))
+            candidates.append({
+                "section": "entities", "id": entity.get("key"), "text": text,
+                "tokens": self._count_tokens(text), "relevance": self._entity_relevance(entity),
+            })
+        for entity in graph_context.get("selected_entities", []):
+            text = _sent_text("graph", entity.get("key"),
+                              lambda: self._format_graph_entity(entity, retrieved_entity_keys))
+            if text is None:
+                continue
+            # Connection lists are supporting context: worth half their anchor
+            anchor = entity_relevance.get(entity.get("key"), 0.5)
+            candidates.append({
+                "section": "graph", "id": entity.get("key"), "text": text,
+                "tokens": self._count_tokens(text), "relevance": 0.5 * anchor,
+            })
+
+        headers = {
+            "passages": "=== RELEVANT TEXT PASSAGES ===\n",
+            "entities": "=== RELEVANT ENTITIES ===\n",
+            "graph": "=== GRAPH CONNECTIONS ===\n",
+        }
+        present = {c["section"] for c in candidates}
+        fixed_tokens = sum(self._count_tokens(headers[s]) + 4 for s in present)
+        fixed_tokens += 20 * len(present)  # "[N more ... omitted]" notices
+
+        if cypher_context:
+            cypher_header = "=== GRAPH QUERY RESULTS ===\n\n"
+            cypher_tokens = self._count_tokens(cypher_header + cypher_context)
+            if cypher_tokens > token_budget - fixed_tokens:
+                cypher_context = token_counter.truncate(
+                    cypher_context, max(0, token_budget - fixed_tokens - 20), provider, model_id,
+                ) + "\n[Graph query results truncated to fit model context window]"
+                cypher_tokens = self._count_tokens(cypher_header + cypher_context)
+            fixed_tokens += cypher_tokens
+
+        chosen, packed_tokens = pack_by_relevance(candidates, max(0, token_budget - fixed_tokens))
+
+        sections = []
+        section_stats = {}
+        for section in ("passages", "entities", "graph"):
+            members = [(i, c) for i, c in enumerate(candidates) if c["section"] == section]
+            if not members:
+                continue
+            kept = [c for i, c in members if i in chosen]
+            if working_set is not None:
+                # Previously sent blocks first, in first-sent order; new ones after
+                kept.sort(key=lambda c: (
+                    (0, working_set.sent_position(section, c["id"]))
+                    if working_set.sent_position(section, c["id"]) is not None else (1, 0)
+                ))
+                working_set.record_sent(section, [c["id"] for c in kept if c["id"]])
+            omitted = len(members) - len(kept)
+            section_stats[section] = {
+                "kept": len(kept),
+                "omitted": omitted,
+                "tokens": sum(c["tokens"] for c in kept),
+            }
+            if not kept and section != "graph":
+                continue
+            lines = [headers[section]]
+            if section == "passages":
+                lines += [
+                    self._format_passage(n, c["payload"], self._first_distance(working_set, c["id"]))
+                    for n, c in enumerate(kept, 1)
+                ]
+            else:
+                lines += [c["text"] for c in kept]
+            if omitted:
+                noun = {"passages": "passages", "entities": "entities", "graph": "entities"}[section]
+                lines.append(f"[{omitted} more {noun} omitted due to context size limits]")
+            sections.append("\n".join(lines))
 
         # Section 4: Cypher Query Results (if available)
         if cypher_context:
@@ -1111,11 +1368,30 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
             return "No relevant context found."
 
         context = "\n\n".join(sections)
-
-        # Final safety truncation — hard cap to prevent token overflow
-        if len(context) > MAX_CONTEXT_CHARS:
-            context = context[:MAX_CONTEXT_CHARS] + "\n\n[Context truncated to fit model context window]"
-            print(f"[RAG] WARNING: Context truncated from {len(context)} to {MAX_CONTEXT_CHARS} chars")
+        used_tokens = self._count_tokens(context)
+
+        # Safety net for estimator error; packing normally keeps well inside
+        if used_tokens > token_budget:
+            print(f"[RAG] WARNING: Context truncated from {used_tokens:,} to {token_budget:,} tokens")
+            context = token_counter.truncate(context, token_budget, provider, model_id) \
+                + "\n\n[Context truncated to fit model context window]"
+            used_tokens = token_budget
+
+        budget_info = {
+            "token_budget": token_budget,
+            "tokens_used": used_tokens,
+            "utilisation": utilisation(used_tokens, token_budget),
+            "fixed_tokens": fixed_tokens,
+            "packed_tokens": packed_tokens,
+            "sections": section_stats,
+            "token_counter": token_counter.counter_name(provider, model_id),
+            "model_context_window": model_context_window,
+        }
+        if debug_log is not None:
+            debug_log["context_budget"] = budget_info
+        print(f"[RAG] Context budget: {used_tokens:,}/{token_budget:,} tokens "
+              f"({budget_info['utilisation']:.0%}, {budget_info['token_counter']}, "
+              f"model context window: {model_context_window or 'unknown'})")
 
         return context
 
@@ -1161,7 +1437,11 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         token_budget: int,
         debug_log: Optional[Dict] = None,
     ) -> tuple:
-        """Fast re-ranking: sort by distance, apply top-k and token budget.
+        """Fast re-ranking: sort by fused rank or distance, apply top-k and token budget.
+
+        The budget is in model tokens (see services/token_budget.py); results
+        are packed by relevance per token rather than cut off at the first
+        one that does not fit.
 
         Document boost: doc-scoped chunks are placed FIRST (sorted by
         distance within their group), then case-wide chunks fill the
@@ -1173,9 +1453,16 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
         doc_scoped = [c for c in chunk_results if c.get("_doc_scoped")]
         case_wide = [c for c in chunk_results if not c.get("_doc_scoped")]
 
-        # Sort each group by distance independently
-        doc_scoped.sort(key=lambda r: r.get("distance", float("inf")))
-        case_wide.sort(key=lambda r: r.get("distance", float("inf")))
+        # Sort each group independently: by fused rank when lexical search
+        # contributed (rrf_score), otherwise by vector distance
+        def _chunk_rank_key(result):
+            if result.get("rrf_score") is not None:
+                return -result["rrf_score"]
+            d = result.get("distance")
+            return d if d is not None else float("inf")
+
+        doc_scoped.sort(key=_chunk_rank_key)
+        case_wide.sort(key=_chunk_rank_key)
 
         # Doc-scoped first, then case-wide to fill remaining slots
         sorted_chunks = (doc_scoped + case_wide)[:top_chunks]
@@ -1192,24 +1479,33 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
             key=_entity_effective_distance
         )[:top_entities]
 
-        # Apply token budget (approximate 1 token ~ 4 chars)
-        total_chars = 0
-        budget_chunks = []
-        for chunk in sorted_chunks:
-            chunk_len = len(chunk.get("text", ""))
-            if total_chars + chunk_len > token_budget:
-                break
-            budget_chunks.append(chunk)
-            total_chars += chunk_len
-
-        # Entities are smaller, include within remaining budget (with 20% overflow allowance)
-        budget_entities = []
-        for entity in sorted_entities:
-            entity_len = len(str(entity.get("summary", ""))) + len(str(entity.get("verified_facts", "")))
-            if total_chars + entity_len > token_budget * 1.2:
-                break
-            budget_entities.append(entity)
-            total_chars += entity_len
+        # Apply the token budget: pack chunks and entities by relevance per
+        # token (doc-scoped chunks first), keeping rank order in the output
+        chunk_relevance = self._chunk_relevances(sorted_chunks)
+        items = [
+            {
+                "tokens": self._count_tokens(chunk.get("text", ""), cache_id=chunk.get("id")),
+                "relevance": relevance,
+                "tier": 0 if chunk.get("_doc_scoped") else 1,
+            }
+            for chunk, relevance in zip(sorted_chunks, chunk_relevance)
+        ]
+        items += [
+            {
+                "tokens": self._count_tokens(
+                    str(entity.get("summary", "")) + str(entity.get("verified_facts", "")),
+                    cache_id=f"entity:{entity.get('key')}" if entity.get("key") else None,
+                ),
+                "relevance": max(0.0, 1.0 - _entity_effective_distance(entity)),
+            }
+            for entity in sorted_entities
+        ]
+        chosen, total_tokens = pack_by_relevance(items, token_budget)
+        budget_chunks = [c for i, c in enumerate(sorted_chunks) if i in chosen]
+        budget_entities = [
+            e for i, e in enumerate(sorted_entities, start=len(sorted_chunks)) if i in chosen
+        ]
+        total_chars = sum(len(c.get("text", "")) for c in budget_chunks)
 
         if debug_log is not None:
             debug_log["rerank"] = {
@@ -1219,10 +1515,15 @@ RELATIONSHIP PROPERTIES: (relationships have no custom properties, only use type
                 "output_chunks": len(budget_chunks),
                 "output_entities": len(budget_entities),
                 "total_chars": total_chars,
+                "total_tokens": total_tokens,
                 "token_budget": token_budget,
+                "utilisation": utilisation(total_tokens, token_budget),
+                "token_counter": token_counter.counter_name(self.llm.provider, self.llm.model_id),
             }
 
-        print(f"[RAG] Re-rank (score): chunks {len(chunk_results)}->{len(budget_chunks)}, entities {len(entity_results)}->{len(budget_entities)}, chars={total_chars}")
+        print(f"[RAG] Re-rank (score): chunks {len(chunk_results)}->{len(budget_chunks)}, "
+              f"entities {len(entity_results)}->{len(budget_entities)}, "
+              f"tokens={total_tokens:,}/{token_budget:,}")
         return budget_chunks, budget_entities
 
     def _rerank_by_llm(
@@ -1681,6 +1982,76 @@ Only include candidates with score >= 5."""
         confidence_threshold: Optional[float] = None,
         case_id: Optional[str] = None,
         view_context: Optional[Dict[str, Any]] = None,
+        conversation_id: Optional[str] = None,
+    ) -> Dict[str, Any]:
+        """
+        Answer a question, reusing a cached answer to a near-identical earlier
+        question on the same case when one exists (services/answer_cache.py).
+
+        ``conversation_id`` ties consecutive chat turns together so retrieval
+        reuses what earlier turns fetched (services/retrieval_working_set.py).
+        ``retrieval_ms`` in the result is this turn's retrieval time.
+
+        The question is embedded once up front; the embedding serves both the
+        cache lookup and chunk/entity retrieval. Cached results carry
+        ``cache_hit=True`` and ``cache_similarity``; the original answer,
+        citations, result graph and debug stages are returned unchanged.
+        """
+        query_embedding = None
+        scope = None
+        lookup_ms = None
+        if answer_cache.enabled and case_id and VECTOR_DB_AVAILABLE:
+            t_lookup = time.time()
+            try:
+                query_embedding = embedding_service.generate_embedding(question)
+            except Exception as e:
+                print(f"[RAG] Question embedding failed, skipping answer cache: {e}")
+            if query_embedding is not None:
+                scope = answer_cache.make_scope(
+                    self.llm.provider, self.llm.model_id,
+                    selected_keys, confidence_threshold, view_context,
+                )
+                cached = answer_cache.lookup(case_id, scope, query_embedding)
+                lookup_ms = int((time.time() - t_lookup) * 1000)
+                if cached:
+                    print(f"[RAG] Answer cache hit (similarity {cached['similarity']}) "
+                          f"for case {case_id}: {cached['question'][:80]!r}")
+                    result = cached["result"]
+                    debug_log = result.get("debug_log") or {}
+                    debug_log["answer_cache"] = {
+                        "hit": True,
+                        "similarity": cached["similarity"],
+                        "matched_question": cached["question"],
+                        "answered_at": cached["created_at"],
+                        "lookup_ms": lookup_ms,
+                    }
+                    result["debug_log"] = debug_log
+                    result["cache_hit"] = True
+                    result["cache_similarity"] = cached["similarity"]
+                    result["retrieval_ms"] = lookup_ms
+                    return result
+
+        result = self._run_answer_pipeline(
+            question, selected_keys, confidence_threshold, case_id, view_context,
+            query_embedding=query_embedding,
+            working_set=working_set_store.get(conversation_id, case_id),
+        )
+        result["cache_hit"] = False
+        result["cache_similarity"] = None
+        if scope is not None and result.get("answer"):
+            answer_cache.store(case_id, scope, question, query_embedding, result)
+            result["debug_log"]["answer_cache"] = {"hit": False, "lookup_ms": lookup_ms}
+        return result
+
+    def _run_answer_pipeline(
+        self,
+        question: str,
+        selected_keys: Optional[List[str]] = None,
+        confidence_threshold: Optional[float] = None,
+        case_id: Optional[str] = None,
+        view_context: Optional[Dict[str, Any]] = None,
+        query_embedding: Optional[List[float]] = None,
+        working_set: Optional[RetrievalWorkingSet] = None,
     ) -> Dict[str, Any]:
         """
         Answer a question using hybrid retrieval:
@@ -1698,6 +2069,9 @@ Only include candidates with score >= 5."""
             selected_keys: Optional list of selected node keys for focused context
             confidence_threshold: Optional confidence threshold for vector search
             case_id: Optional case ID for scoping search and graph traversal
+            query_embedding: Precomputed question embedding, reused by retrieval
+            working_set: Conversation working set; retrieval only fetches what
+                earlier turns did not
 
         Returns:
             Dict with answer and metadata including debug_log
@@ -1826,6 +2200,8 @@ Only include candidates with score >= 5."""
                 doc_keys=doc_keys if doc_keys else None,
                 confidence_threshold=confidence_threshold,
                 debug_log=debug_log,
+                query_embedding=query_embedding,
+                working_set=working_set,
             )
         chunk_search_info = debug_log.get("chunk_search") or {}
         doc_scoped_count = sum(1 for c in chunk_results if c.get("_doc_scoped"))
@@ -1857,7 +2233,10 @@ Only include candidates with score >= 5."""
         # ── Stage 2: Retrieve entities ───────────────────────────────────
         print("[RAG] Starting Stage 2: Entity retrieval..."); sys.stdout.flush()
         t2 = time.time()
-        entity_results = self._retrieve_entities(question, case_id, debug_log=debug_log)
+        entity_results = self._retrieve_entities(
+            question, case_id, debug_log=debug_log, query_embedding=query_embedding,
+            working_set=working_set,
+        )
         entity_search_info = debug_log.get("entity_search") or {}
         _add_stage(
             "Entity Retrieval", 2, t2,
@@ -1957,7 +2336,9 @@ Only include candidates with score >= 5."""
             traversal_keys = all_entity_keys
             print(f"[RAG] Starting Stage 4: Graph traversal ({len(traversal_keys)} entities)..."); sys.stdout.flush()
         t4 = time.time()
-        graph_context = self._traverse_graph(traversal_keys, case_id, debug_log=debug_log)
+        graph_context = self._traverse_graph(
+            traversal_keys, case_id, debug_log=debug_log, working_set=working_set,
+        )
         graph_traversal_info = debug_log.get("graph_traversal") or {}
         total_connections = 0
         connection_list = []
@@ -1984,6 +2365,16 @@ Only include candidates with score >= 5."""
             },
         )
 
+        # Retrieval = Cypher generation through graph traversal
+        retrieval_ms = sum(
+            st["duration_ms"] for st in debug_log["stages"]
+            if st["step"] in ("0b", "0c", 1, 2, "2b", 3, 4)
+        )
+        debug_log["retrieval_ms"] = retrieval_ms
+        if working_set is not None:
+            working_set.turns += 1
+            debug_log["working_set"] = working_set.stats()
+
         # ── Stage 5: Re-ranking ──────────────────────────────────────────
         t5 = time.time()
         chunk_results, entity_results = self._rerank_results(
@@ -2009,6 +2400,7 @@ Only include candidates with score >= 5."""
                 "output_chunks": rerank_info.get("output_chunks", len(chunk_results)),
                 "output_entities": rerank_info.get("output_entities", len(entity_results)),
                 "total_chars": rerank_info.get("total_chars"),
+                "total_tokens": rerank_info.get("total_tokens"),
             },
             details=stage5_details,
         )
@@ -2023,6 +2415,8 @@ Only include candidates with score >= 5."""
             chunk_results, entity_results, graph_context, cypher_context,
             question=question,
             model_context_window=model_ctx_window,
+            debug_log=debug_log,
+            working_set=working_set,
         )
 
         # Phase 6: prepend the view-context block so the LLM sees what the user sees.
@@ -2099,6 +2493,8 @@ Only include candidates with score >= 5."""
             },
             output={
                 "context_length_chars": len(context),
+                "context_tokens": (debug_log.get("context_budget") or {}).get("tokens_used"),
+                "budget_utilisation": (debug_log.get("context_budget") or {}).get("utilisation"),
                 "sections": context_sections,
             },
             details={
@@ -2252,6 +2648,7 @@ Only include candidates with score >= 5."""
             "document_summary": doc_summary_text or None,
             "view_context_used": view_context_used,
             "view_context_summary": view_context_summary,
+            "retrieval_ms": retrieval_ms,
         }
 
     # =====================
@@ -2263,13 +2660,46 @@ Only include candidates with score >= 5."""
         answer: str,
         graph_summary: Optional[Dict] = None,
         case_id: Optional[str] = None,
+        llm_fallback: Optional[bool] = None,
     ) -> List[str]:
         """
-        Generate a Cypher query from the answer to extract relevant nodes.
+        Find the graph nodes mentioned in an answer.
+
+        Scans the answer for the case's entity names and aliases with the
+        in-process matcher (milliseconds, no LLM call). If nothing matches and
+        the LLM fallback is enabled (ENTITY_MATCHER_LLM_FALLBACK, or
+        ``llm_fallback``), asks the LLM for a Cypher query instead.
         """
         if not answer or not answer.strip():
             return []
 
+        if case_id is not None:
+            start = time.perf_counter()
+            try:
+                node_keys = entity_mention_matcher.match(case_id, answer)
+                print(f"[RAG] Matched {len(node_keys)} node keys in answer "
+                      f"({(time.perf_counter() - start) * 1000:.1f}ms)")
+                if node_keys:
+                    return node_keys
+            except Exception as e:
+                print(f"[RAG] Entity matcher failed: {e}")
+
+            if llm_fallback is None:
+                llm_fallback = ENTITY_MATCHER_LLM_FALLBACK
+            if not llm_fallback:
+                return []
+
+        return self._extract_nodes_with_llm(answer, graph_summary, case_id)
+
+    def _extract_nodes_with_llm(
+        self,
+        answer: str,
+        graph_summary: Optional[Dict] = None,
+        case_id: Optional[str] = None,
+    ) -> List[str]:
+        """
+        Generate a Cypher query from the answer to extract relevant nodes.
+        """
         if graph_summary is None:
             if case_id is None:
                 return []
@@ -2301,7 +2731,7 @@ Return ONLY the Cypher query, nothing else. Do not include markdown code blocks.
 
         log_section(
             source_file=__file__,
-            source_func="extract_nodes_from_answer",
+            source_func="_extract_nodes_with_llm",
             title="Prompt: extract nodes from answer",
             content={
                 "answer_length": len(answer),
@@ -2368,7 +2798,13 @@ Return ONLY the Cypher query, nothing else. Do not include markdown code blocks.
         case_id: str,
         selected_keys: Optional[List[str]] = None,
     ) -> List[str]:
-        """Generate suggested questions based on current context."""
+        """
+        Suggested questions for the current context.
+
+        With a selection, questions are built around the selected entities.
+        Otherwise the case's precomputed questions (case_precompute_service)
+        are served, falling back to generic ones until the first run finishes.
+        """
         if selected_keys and len(selected_keys) > 0:
             node_context = self.neo4j.get_context_for_nodes(selected_keys, case_id)
             entities = node_context.get("selected_entities", [])
@@ -2383,6 +2819,10 @@ Return ONLY the Cypher query, nothing else. Do not include markdown code blocks.
                     "Summarize the relationships between these entities.",
                 ]
 
+        precomputed = case_precompute_service.get(case_id)
+        if precomputed and precomputed["suggested_questions"]:
+            return precomputed["suggested_questions"]
+
         return [
             "Summarize the key findings in this investigation.",
             "Who are the main suspects?",
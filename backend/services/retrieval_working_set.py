@@ -0,0 +1,138 @@
+"""
+Retrieval Working Set — reuse retrieval results across turns of one chat.
+
+Follow-up questions in a conversation mostly touch the chunks and entities
+the previous turns already pulled in. Each conversation (identified by the
+``conversation_id`` the chat panel sends) keeps a working set of:
+
+  - chunk text/metadata by chunk id — vector search then only returns ids
+    and distances, and only chunks not yet in the set are fetched;
+  - Neo4j-enriched entities by key — only new keys are enriched;
+  - graph traversal entries by key — only new keys are traversed;
+  - the context blocks already sent to the model, in the order they were
+    first sent — the next turn's context lists those first, rendered
+    identically, so the prompt prefix stays stable and provider-side prompt
+    caching (OpenAI automatic prefix caching, Ollama KV reuse) applies.
+
+Scores (distances) are always fresh; only the fetched payloads are reused.
+A working set is dropped when the case's graph or evidence version changes
+(same versions as the answer cache), after WORKING_SET_TTL of inactivity,
+or when it outgrows WORKING_SET_MAX_ITEMS. Working sets are per process: a
+turn served by another uvicorn worker simply starts a fresh set.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import CHAT_WORKING_SET_ENABLED, CHAT_WORKING_SET_TTL, CHAT_WORKING_SET_MAX
+
+WORKING_SET_MAX_ITEMS = 3000    # chunks + entities + traversal entries per conversation
+
+
+class RetrievalWorkingSet:
+    """Retrieval results accumulated over one conversation's turns."""
+
+    def __init__(self, conversation_id: str, case_id: str, versions: Tuple[str, str]):
+        self.conversation_id = conversation_id
+        self.case_id = case_id
+        self.versions = versions
+        self.chunks: Dict[str, Dict] = {}
+        self.entities: Dict[str, Dict] = {}
+        self.traversal: Dict[str, Dict] = {}
+        self.rendered: Dict[Tuple[str, str], str] = {}
+        self.sent_order: Dict[str, List[str]] = {"passages": [], "entities": [], "graph": []}
+        self._sent_index: Dict[str, Dict[str, int]] = {"passages": {}, "entities": {}, "graph": {}}
+        self.turns = 0
+        self.updated_at = time.time()
+
+    def size(self) -> int:
+        return len(self.chunks) + len(self.entities) + len(self.traversal)
+
+    def remember_chunks(self, results: List[Dict]) -> None:
+        for r in results:
+            if r.get("id") and r.get("text") is not None and r["id"] not in self.chunks:
+                self.chunks[r["id"]] = {
+                    "text": r["text"],
+                    "metadata": r.get("metadata") or {},
+                    "distance": r.get("distance"),
+                }
+
+    def fill_chunks(self, results: List[Dict]) -> None:
+        """Give id-only search results for known chunks their stored payload."""
+        for r in results:
+            known = self.chunks.get(r.get("id"))
+            if known is not None and r.get("text") is None:
+                r["text"] = known["text"]
+                r["metadata"] = known["metadata"]
+
+    def sent_position(self, section: str, item_id: str) -> Optional[int]:
+        return self._sent_index[section].get(item_id)
+
+    def record_sent(self, section: str, item_ids: List[str]) -> None:
+        index = self._sent_index[section]
+        for item_id in item_ids:
+            if item_id not in index:
+                index[item_id] = len(self.sent_order[section])
+                self.sent_order[section].append(item_id)
+
+    def stats(self) -> Dict:
+        return {
+            "turns": self.turns,
+            "chunks": len(self.chunks),
+            "entities": len(self.entities),
+            "traversal": len(self.traversal),
+            "sent_blocks": {s: len(ids) for s, ids in self.sent_order.items()},
+        }
+
+
+class WorkingSetStore:
+    """Bounded, in-process map of conversation id -> RetrievalWorkingSet."""
+
+    def __init__(self, max_conversations: int = CHAT_WORKING_SET_MAX, ttl: int = CHAT_WORKING_SET_TTL):
+        self.enabled = CHAT_WORKING_SET_ENABLED
+        self.max_conversations = max_conversations
+        self.ttl = ttl
+        self._sets: "OrderedDict[str, RetrievalWorkingSet]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, conversation_id: Optional[str], case_id: Optional[str]) -> Optional[RetrievalWorkingSet]:
+        """
+        The conversation's working set, started fresh when the case, its
+        graph/evidence version, or the TTL invalidates the previous one.
+        """
+        if not self.enabled or not conversation_id or not case_id:
+            return None
+        from services.answer_cache import answer_cache
+        try:
+            versions = answer_cache.case_versions(case_id)
+        except Exception as e:
+            print(f"[WorkingSet] Could not read case version for {case_id}: {e}")
+            return None
+
+        now = time.time()
+        with self._lock:
+            ws = self._sets.get(conversation_id)
+            if ws is not None and (
+                ws.case_id != case_id
+                or ws.versions != versions
+                or now - ws.updated_at > self.ttl
+                or ws.size() > WORKING_SET_MAX_ITEMS
+            ):
+                ws = None
+            if ws is None:
+                ws = RetrievalWorkingSet(conversation_id, case_id, versions)
+                self._sets[conversation_id] = ws
+            self._sets.move_to_end(conversation_id)
+            ws.updated_at = now
+            while len(self._sets) > self.max_conversations:
+                self._sets.popitem(last=False)
+            return ws
+
+    def drop(self, conversation_id: str) -> None:
+        with self._lock:
+            self._sets.pop(conversation_id, None)
+
+
+working_set_store = WorkingSetStore()
@@ -1,24 +1,59 @@
 """
 Snapshot Storage Service
 
-Handles persistent storage of snapshots in a JSON file.
+One directory per snapshot under data/snapshots/ plus a small _index.json of
+summaries (name, owner, case, counts), the same split chat_history_storage
+uses. Listing snapshots only reads the index.
+
+  data/snapshots/_index.json                       {snapshot_id: summary}
+  data/snapshots/<id>/snapshot.json                everything but the large sections
+  data/snapshots/<id>/<section>.<rev>.json.gz      subgraph, timeline, chat_history, ...
+
+The large sections are gzip-compressed and only read when asked for
+(``get(snapshot_id, sections=[...])`` / ``get_section``). Each save writes
+its sections under a fresh revision and then atomically replaces
+snapshot.json, which names the section files it uses, so a reader never
+sees a mix of two saves. Saving a snapshot therefore costs O(that
+snapshot), not O(all snapshots).
+
+The previous single-file store (data/snapshots.json, with data/snapshot_chunks/
+for snapshots too large to stringify) is imported the first time the
+storage is used and renamed to *.migrated.
 """
 
+import gzip
+import hashlib
 import json
 import os
-import copy
+import re
+import shutil
+import uuid
 from pathlib import Path
-from typing import Dict, Optional, List, Tuple
-from datetime import datetime
-from services.snapshot_chunk_storage import (
-    chunk_data, save_chunk, load_chunk, delete_chunks, reassemble_chunks
-)
-from services._json_file_lock import save_json_atomic
-
-# Storage file location
+from typing import Dict, Iterable, List, Optional
+
+from services._json_file_lock import file_lock
+from services._legacy_import import import_into_directory, retire
+
+# Storage location
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-STORAGE_DIR = BASE_DIR / "data"
-STORAGE_FILE = STORAGE_DIR / "snapshots.json"
+STORAGE_DIR = BASE_DIR / "data" / "snapshots"
+INDEX_FILE = STORAGE_DIR / "_index.json"
+LOCK_FILE = STORAGE_DIR / "_index.json.lock"
+SNAPSHOT_FILE = "snapshot.json"
+SNAPSHOT_LOCK = ".lock"
+
+# Legacy single-file store, imported into STORAGE_DIR on first use
+LEGACY_FILE = BASE_DIR / "data" / "snapshots.json"
+LEGACY_CHUNK_DIR = BASE_DIR / "data" / "snapshot_chunks"
+
+# Sections stored in their own compressed files and loaded on demand
+LAZY_SECTIONS = ("subgraph", "timeline", "chat_history", "citations", "overview", "work_state")
+COMPRESS_LEVEL = 6
+
+SUMMARY_FIELDS = ("id", "name", "notes", "timestamp", "created_at", "owner",
+                  "case_id", "case_version", "case_name", "ai_overview")
+
+_SAFE_ID = re.compile(r"[A-Za-z0-9][A-Za-z0-9_.-]{0,127}")
 
 
 def ensure_storage_dir():
@@ -26,507 +61,362 @@ def ensure_storage_dir():
     STORAGE_DIR.mkdir(parents=True, exist_ok=True)
 
 
-def load_snapshots() -> Dict:
-    """Load snapshots from the JSON file."""
-    ensure_storage_dir()
-    
-    if not STORAGE_FILE.exists():
-        return {}
-    
-    try:
-        with open(STORAGE_FILE, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    except (json.JSONDecodeError, IOError) as e:
-        print(f"Error loading snapshots: {e}")
-        return {}
-
-
-def save_snapshots(snapshots: Dict):
-    """Save snapshots to the JSON file."""
-    ensure_storage_dir()
-    
-    print(f"[SAVE_SNAPSHOTS] Saving {len(snapshots)} snapshots to disk")
-    # Log each snapshot's data before saving
-    for snap_id, snap_data in snapshots.items():
-        snap_nodes = len(snap_data.get("subgraph", {}).get("nodes", [])) if isinstance(snap_data.get("subgraph", {}).get("nodes"), list) else 0
-        snap_timeline = len(snap_data.get("timeline", [])) if isinstance(snap_data.get("timeline"), list) else 0
-        snap_citations = len(snap_data.get("citations", {})) if isinstance(snap_data.get("citations"), dict) else 0
-        snap_chat = len(snap_data.get("chat_history", [])) if isinstance(snap_data.get("chat_history"), list) else 0
-        print(f"[SAVE_SNAPSHOTS] Snapshot {snap_id}: nodes={snap_nodes}, timeline={snap_timeline}, citations={snap_citations}, chat={snap_chat}, chunked={snap_data.get('_chunked', False)}")
-    
+def _snapshot_dir(snapshot_id: str) -> Path:
+    """Directory for a snapshot. IDs that aren't filename-safe (restored
+    snapshots carry client-supplied IDs) map to a hash."""
+    if _SAFE_ID.fullmatch(snapshot_id):
+        return STORAGE_DIR / snapshot_id
+    return STORAGE_DIR / f"_h{hashlib.sha1(snapshot_id.encode('utf-8')).hexdigest()}"
+
+
+def _atomic_write(path: Path, obj) -> None:
+    """Write JSON via a per-writer temp file and rename (callers hold the
+    index lock where it matters)."""
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
     try:
-        # Instead of serializing the entire dictionary at once (which can corrupt nested data),
-        # verify each snapshot has its nested structures before saving
-        # We'll still serialize the whole dict for saving, but we've already validated each snapshot individually
-        # Before writing, verify each snapshot's data structure
-        for snap_id, snap_data in snapshots.items():
-            if 'subgraph' in snap_data:
-                subgraph = snap_data['subgraph']
-                if isinstance(subgraph, dict) and 'nodes' in subgraph:
-                    nodes = subgraph['nodes']
-                    nodes_count = len(nodes) if isinstance(nodes, list) else 0
-                    print(f"[SAVE_SNAPSHOTS] Before json.dump: {snap_id} has {nodes_count} nodes")
-                    if nodes_count > 0:
-                        # Verify first node structure
-                        first_node = nodes[0] if isinstance(nodes, list) and len(nodes) > 0 else None
-                        if first_node:
-                            print(f"[SAVE_SNAPSHOTS] First node keys: {list(first_node.keys())[:5] if isinstance(first_node, dict) else 'N/A'}")
-        
-        # Try to serialize to a string first to catch any issues
-        try:
-            test_json = json.dumps(snapshots, ensure_ascii=False)
-            print(f"[SAVE_SNAPSHOTS] Successfully serialized to JSON, length: {len(test_json)}")
-            # Parse it back to verify
-            test_parsed = json.loads(test_json)
-            print(f"[SAVE_SNAPSHOTS] Successfully parsed back, {len(test_parsed)} snapshots")
-            for snap_id, snap_data in test_parsed.items():
-                if 'subgraph' in snap_data:
-                    nodes = snap_data.get('subgraph', {}).get('nodes', [])
-                    nodes_count = len(nodes) if isinstance(nodes, list) else 0
-                    print(f"[SAVE_SNAPSHOTS] After json.loads: {snap_id} has {nodes_count} nodes")
-        except Exception as test_error:
-            print(f"[SAVE_SNAPSHOTS] ERROR during test serialization: {test_error}")
-            import traceback
-            traceback.print_exc()
-        
-        # Locked, unique-temp atomic write — serialises across uvicorn
-        # workers and avoids the shared-`.tmp` rename race. See
-        # services._json_file_lock.
-        save_json_atomic(STORAGE_FILE, snapshots)
-        print(f"[SAVE_SNAPSHOTS] Successfully saved snapshots to disk")
-        
-        # Verify what was actually written
-        try:
-            with open(STORAGE_FILE, 'r', encoding='utf-8') as f:
-                saved_data = json.load(f)
-            print(f"[SAVE_SNAPSHOTS] Verification: Read back {len(saved_data)} snapshots from disk")
-            for snap_id, snap_data in saved_data.items():
-                snap_nodes = len(snap_data.get("subgraph", {}).get("nodes", [])) if isinstance(snap_data.get("subgraph", {}).get("nodes"), list) else 0
-                snap_timeline = len(snap_data.get("timeline", [])) if isinstance(snap_data.get("timeline"), list) else 0
-                print(f"[SAVE_SNAPSHOTS] Verification: Snapshot {snap_id} on disk: nodes={snap_nodes}, timeline={snap_timeline}, chunked={snap_data.get('_chunked', False)}")
-        except Exception as verify_error:
-            print(f"[SAVE_SNAPSHOTS] WARNING: Could not verify saved data: {verify_error}")
-            
-    except IOError as e:
-        print(f"[SAVE_SNAPSHOTS] ERROR: IOError saving snapshots: {e}")
-        raise
-    except (ValueError, TypeError, OverflowError) as e:
-        print(f"[SAVE_SNAPSHOTS] ERROR: Serialization error: {e}")
-        # If serialization fails, try to identify which snapshot is causing the issue
-        for snapshot_id, snapshot_data in snapshots.items():
-            try:
-                json.dumps(snapshot_data, ensure_ascii=False)
-            except Exception as snapshot_error:
-                print(f"[SAVE_SNAPSHOTS]   Snapshot {snapshot_id} failed to serialize: {snapshot_error}")
-        raise
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(obj, f, ensure_ascii=False)
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+def _count(value) -> int:
+    return len(value) if isinstance(value, (list, dict)) else 0
+
+
+def _summarize(snapshot_id: str, snapshot: Dict) -> Dict:
+    subgraph = snapshot.get("subgraph") if isinstance(snapshot.get("subgraph"), dict) else {}
+    summary = {k: snapshot.get(k) for k in SUMMARY_FIELDS}
+    summary["id"] = snapshot.get("id") or snapshot_id
+    summary["node_count"] = _count(subgraph.get("nodes"))
+    summary["link_count"] = _count(subgraph.get("links"))
+    summary["timeline_count"] = _count(snapshot.get("timeline"))
+    summary["chat_count"] = _count(snapshot.get("chat_history"))
+    return summary
+
+
+def _read_json(path: Path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _read_section(path: Path):
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _load_legacy_chunks(snapshot_id: str, num_chunks: int) -> Dict:
+    """Reassemble a snapshot the old store split across data/snapshot_chunks/."""
+    chunks = []
+    for i in range(num_chunks):
+        path = LEGACY_CHUNK_DIR / f"{snapshot_id}_chunk_{i}.json"
+        if not path.exists():
+            raise ValueError(f"Missing chunk {i} for snapshot {snapshot_id}")
+        chunks.append(_read_json(path))
+    chunks.sort(key=lambda c: c.get("_chunk_index", 0))
+
+    result: Optional[Dict] = None
+    nodes, links, timeline, chat_history = [], [], [], []
+    overview: Dict = {}
+    for chunk in chunks:
+        chunk_type = chunk.get("_chunk_type")
+        if chunk_type == "subgraph_nodes":
+            if result is None:
+                result = {k: v for k, v in chunk.items() if not k.startswith("_") and k != "subgraph"}
+            subgraph = chunk.get("subgraph", {})
+            nodes.extend(subgraph.get("nodes", []))
+            if subgraph.get("links"):
+                links = subgraph["links"]
+        elif chunk_type == "timeline":
+            timeline.extend(chunk.get("timeline", []))
+        elif chunk_type == "overview":
+            overview = chunk.get("overview", {})
+        elif chunk_type == "overview_nodes":
+            part = chunk.get("overview", {})
+            overview.setdefault("nodes", []).extend(part.get("nodes", []))
+            overview.setdefault("nodeCount", part.get("nodeCount"))
+            overview.setdefault("linkCount", part.get("linkCount"))
+        elif chunk_type == "chat_history":
+            chat_history.extend(chunk.get("chat_history", []))
+    if result is None:
+        raise ValueError(f"No metadata found for snapshot {snapshot_id}")
+    result.update(subgraph={"nodes": nodes, "links": links}, timeline=timeline,
+                  overview=overview, chat_history=chat_history)
+    return result
 
 
 class SnapshotStorage:
-    """Service for managing snapshot storage."""
+    """Per-snapshot file storage with a summary index shared by all workers."""
 
     def __init__(self):
-        self._snapshots: Dict = {}
+        self._index: Dict[str, Dict] = {}
         self._mtime: float = -1.0
+        self._migrated = False
+
+    # ------------------------------------------------------------------
+    # Index
+    # ------------------------------------------------------------------
+
+    def reload(self):
+        """Re-read the summary index if another worker (or this one) has
+        rewritten it since the last read."""
+        if not self._migrated:
+            self._migrated = True
+            if LEGACY_FILE.exists():
+                self._import_legacy()
+        try:
+            current_mtime = INDEX_FILE.stat().st_mtime if INDEX_FILE.exists() else 0.0
+        except OSError:
+            current_mtime = 0.0
+        if current_mtime == self._mtime:
+            return
+        ensure_storage_dir()
+        with file_lock(LOCK_FILE):
+            self._index = self._load_index_locked()
+        self._mtime = current_mtime
+
+    def _load_index_locked(self) -> Dict[str, Dict]:
+        """Read the index, rebuilding it from the snapshot directories if it
+        is missing or unreadable."""
+        if INDEX_FILE.exists():
+            try:
+                index = _read_json(INDEX_FILE)
+                if isinstance(index, dict):
+                    return index
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading snapshot index, rebuilding: {e}")
+        if not STORAGE_DIR.exists():
+            return {}
+        index = {}
+        for path in STORAGE_DIR.glob(f"*/{SNAPSHOT_FILE}"):
+            try:
+                core = _read_json(path)
+                snapshot = self._load_sections(path.parent, core, None)
+            except (json.JSONDecodeError, IOError, ValueError) as e:
+                print(f"Skipping unreadable snapshot {path.parent.name}: {e}")
+                continue
+            index[snapshot.get("id") or path.parent.name] = _summarize(path.parent.name, snapshot)
+        if index:
+            print(f"[SNAPSHOTS] Rebuilt index of {len(index)} snapshots")
+            _atomic_write(INDEX_FILE, index)
+        return index
+
+    def _update_index_locked(self, snapshot_id: str, summary: Optional[Dict]) -> None:
+        index = self._load_index_locked()
+        if summary is None:
+            index.pop(snapshot_id, None)
+        else:
+            index[snapshot_id] = summary
+        ensure_storage_dir()
+        _atomic_write(INDEX_FILE, index)
+        self._index = index
+        try:
+            self._mtime = INDEX_FILE.stat().st_mtime
+        except OSError:
+            self._mtime = -1.0
+
+    def list_summaries(self, owner: Optional[str] = None, case_id: Optional[str] = None) -> List[Dict]:
+        """Summary dicts (no sections) for all snapshots, optionally filtered.
+
+        Each summary has id, name, notes, timestamp, created_at, owner,
+        case_id, case_version, case_name, ai_overview and node/link/
+        timeline/chat counts.
+        """
         self.reload()
+        return [
+            dict(s) for s in self._index.values()
+            if (owner is None or s.get("owner") == owner)
+            and (case_id is None or s.get("case_id") == case_id)
+        ]
 
-    def get_all(self) -> Dict:
-        """Get all snapshots."""
-        # Reload from disk to ensure we have the latest data
+    def get_summary(self, snapshot_id: str) -> Optional[Dict]:
+        """Summary dict for one snapshot, or None."""
         self.reload()
-        # Return a deep copy to prevent mutations from affecting stored data
-        return copy.deepcopy(self._snapshots)
-    
-    def get(self, snapshot_id: str) -> Optional[Dict]:
-        """Get a specific snapshot by ID. Reassembles chunks if needed."""
-        print(f"[SNAPSHOT GET] Getting snapshot {snapshot_id}")
-        # Reload from disk to ensure we have the latest data
+        summary = self._index.get(snapshot_id)
+        return dict(summary) if summary is not None else None
+
+    def resolve_key(self, snapshot_id: str) -> Optional[str]:
+        """Storage key for a snapshot given its key or its ``id`` field
+        (older snapshots could be stored under a different key)."""
+        self.reload()
+        if snapshot_id in self._index:
+            return snapshot_id
+        return next((key for key, s in self._index.items() if s.get("id") == snapshot_id), None)
+
+    def count(self) -> int:
         self.reload()
-        
-        snapshot = self._snapshots.get(snapshot_id)
-        if snapshot is None:
-            print(f"[SNAPSHOT GET] Snapshot {snapshot_id} not found")
-            return None
-        
-        print(f"[SNAPSHOT GET] Found snapshot, keys: {list(snapshot.keys())}")
-        print(f"[SNAPSHOT GET] Has subgraph: {'subgraph' in snapshot}, chunked: {snapshot.get('_chunked', False)}")
-        
-        # Check if this is a chunked snapshot
-        if snapshot.get("_chunked") and snapshot.get("_num_chunks"):
-            # Reassemble from chunks
+        return len(self._index)
+
+    # ------------------------------------------------------------------
+    # Snapshots
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _load_sections(directory: Path, core: Dict, sections: Optional[Iterable[str]]) -> Dict:
+        files = core.pop("_sections", {}) or {}
+        core.pop("_rev", None)
+        wanted = files.keys() if sections is None else [s for s in sections if s in files]
+        for name in wanted:
+            core[name] = _read_section(directory / files[name])
+        return core
+
+    def get(self, snapshot_id: str, sections: Optional[Iterable[str]] = None) -> Optional[Dict]:
+        """
+        Get a snapshot by ID.
+
+        Args:
+            snapshot_id: Snapshot ID
+            sections: Large sections to load (see LAZY_SECTIONS); None loads
+                all of them, [] just the small fields
+
+        Returns:
+            Snapshot dict, or None if not found
+        """
+        directory = _snapshot_dir(snapshot_id)
+        core_path = directory / SNAPSHOT_FILE
+        wanted = None if sections is None else list(sections)
+        # A concurrent save can replace the section files between reading
+        # snapshot.json and the sections; the second read sees the new ones.
+        for attempt in range(2):
+            if not core_path.exists():
+                return None
             try:
-                print(f"[SNAPSHOT GET] Reassembling {snapshot['_num_chunks']} chunks")
-                reassembled = reassemble_chunks(snapshot_id, snapshot["_num_chunks"])
-                print(f"[SNAPSHOT GET] Reassembled, keys: {list(reassembled.keys())}")
-                print(f"[SNAPSHOT GET] Reassembled has subgraph: {'subgraph' in reassembled}")
-                if 'subgraph' in reassembled:
-                    nodes = reassembled['subgraph'].get('nodes', [])
-                    print(f"[SNAPSHOT GET] Reassembled nodes count: {len(nodes) if isinstance(nodes, list) else 'N/A'}")
-                # Return a deep copy to prevent mutations from affecting stored data
-                result = copy.deepcopy(reassembled)
-                nodes = result.get('subgraph', {}).get('nodes', [])
-                nodes_count = len(nodes) if isinstance(nodes, list) else 'N/A'
-                print(f"[SNAPSHOT GET] After deepcopy, nodes count: {nodes_count}")
-                return result
-            except Exception as e:
-                print(f"[SNAPSHOT GET] Error reassembling chunks for snapshot {snapshot_id}: {e}")
-                import traceback
-                traceback.print_exc()
+                return self._load_sections(directory, _read_json(core_path), wanted)
+            except FileNotFoundError:
+                if attempt:
+                    raise
+            except (json.JSONDecodeError, IOError) as e:
+                print(f"Error loading snapshot {snapshot_id}: {e}")
                 raise
-        
-        # Not chunked, return a deep copy to prevent mutations from affecting stored data
-        if 'subgraph' in snapshot:
-            nodes = snapshot['subgraph'].get('nodes', [])
-            nodes_count = len(nodes) if isinstance(nodes, list) else 'N/A'
-            print(f"[SNAPSHOT GET] Before deepcopy, nodes count: {nodes_count}")
-        result = copy.deepcopy(snapshot)
-        if 'subgraph' in result:
-            nodes = result['subgraph'].get('nodes', [])
-            nodes_count = len(nodes) if isinstance(nodes, list) else 'N/A'
-            print(f"[SNAPSHOT GET] After deepcopy, nodes count: {nodes_count}")
-        print(f"[SNAPSHOT GET] Returning snapshot with keys: {list(result.keys())}")
-        return result
-    
-    def save(self, snapshot_id: str, snapshot_data: Dict):
-        """Save a snapshot. Automatically chunks if too large."""
-        print(f"[SNAPSHOT SAVE] Starting save for snapshot {snapshot_id}")
-        print(f"[SNAPSHOT SAVE] New snapshot has: nodes={len(snapshot_data.get('subgraph', {}).get('nodes', []))}, timeline={len(snapshot_data.get('timeline', []))}, citations={len(snapshot_data.get('citations', {}))}, chat={len(snapshot_data.get('chat_history', []))}")
-        
-        # Make a deep copy FIRST before reloading to ensure we have a clean copy
-        # This prevents any mutations that might happen during reload from affecting our data
-        snapshot_data_copy = copy.deepcopy(snapshot_data)
-        
-        # Serialize and deserialize the snapshot data to ensure complete isolation
-        # This removes any potential shared references that deepcopy might miss
-        try:
-            snapshot_json = json.dumps(snapshot_data_copy, ensure_ascii=False)
-            snapshot_data_copy = json.loads(snapshot_json)
-        except (ValueError, TypeError, OverflowError):
-            # If serialization fails, use the deep copy as-is
-            pass
-        
-        # Reload from disk to get the latest state of all snapshots
-        # This ensures we don't overwrite changes made to other snapshots
+        return None
+
+    def get_section(self, snapshot_id: str, section: str):
+        """Load one large section of a snapshot (None if absent)."""
+        snapshot = self.get(snapshot_id, sections=[section])
+        return snapshot.get(section) if snapshot is not None else None
+
+    def get_all(self) -> Dict:
+        """Get all snapshots with every section loaded.
+
+        Reads every snapshot file; use list_summaries() for listings.
+        """
         self.reload()
-        print(f"[SNAPSHOT SAVE] After reload, found {len(self._snapshots)} existing snapshots")
-        for existing_id, existing_data in self._snapshots.items():
-            if existing_id != snapshot_id:
-                existing_nodes = len(existing_data.get("subgraph", {}).get("nodes", [])) if isinstance(existing_data.get("subgraph", {}).get("nodes"), list) else 0
-                existing_timeline = len(existing_data.get("timeline", [])) if isinstance(existing_data.get("timeline"), list) else 0
-                print(f"[SNAPSHOT SAVE] Existing snapshot {existing_id}: nodes={existing_nodes}, timeline={existing_timeline}, chunked={existing_data.get('_chunked', False)}")
-        
-        # Store a backup of existing snapshots before modifying
-        # Serialize/deserialize to ensure complete isolation
-        existing_snapshots_backup = {}
-        try:
-            backup_json = json.dumps(self._snapshots, ensure_ascii=False)
-            existing_snapshots_backup = json.loads(backup_json)
-        except (ValueError, TypeError, OverflowError):
-            # Fallback to deep copy if serialization fails
-            existing_snapshots_backup = copy.deepcopy(self._snapshots)
-        
-        # Try to save normally first
-        try:
-            # Test if we can stringify it
-            test_json = json.dumps(snapshot_data_copy, ensure_ascii=False)
-            # If successful and not too large, save normally
-            if len(test_json.encode('utf-8')) < 50 * 1024 * 1024:  # 50MB threshold
-                # Only update the specific snapshot, preserving all others
-                # DON'T serialize existing snapshots - just use deepcopy to preserve them exactly as they are
-                # Serialization can corrupt nested data, so we avoid it for existing snapshots
-                updated_snapshots = {}
-                print(f"[SNAPSHOT SAVE] Processing {len(self._snapshots)} existing snapshots to preserve")
-                for existing_id, existing_data in self._snapshots.items():
-                    if existing_id == snapshot_id:
-                        # Skip the one we're updating - will add it separately
-                        print(f"[SNAPSHOT SAVE] Skipping {existing_id} (being updated)")
-                        continue
-                    
-                    # Skip corrupted snapshots that look like response objects
-                    if 'node_count' in existing_data and 'subgraph' not in existing_data:
-                        print(f"[SNAPSHOT SAVE] WARNING: Skipping corrupted snapshot {existing_id} (response object, not full data)")
-                        continue
-                    
-                    # Use deepcopy to preserve existing snapshots exactly as they are
-                    # This avoids any potential corruption from JSON serialization
-                    before_copy_nodes = len(existing_data.get("subgraph", {}).get("nodes", [])) if isinstance(existing_data.get("subgraph", {}).get("nodes"), list) else 0
-                    copied = copy.deepcopy(existing_data)
-                    after_copy_nodes = len(copied.get("subgraph", {}).get("nodes", [])) if isinstance(copied.get("subgraph", {}).get("nodes"), list) else 0
-                    if before_copy_nodes != after_copy_nodes:
-                        print(f"[SNAPSHOT SAVE] ERROR: Deepcopy lost data for {existing_id}! Before: {before_copy_nodes}, After: {after_copy_nodes}")
-                    updated_snapshots[existing_id] = copied
-                    print(f"[SNAPSHOT SAVE] Preserved existing snapshot {existing_id}: nodes={after_copy_nodes}")
-                
-                print(f"[SNAPSHOT SAVE] After processing existing snapshots, updated_snapshots has {len(updated_snapshots)} snapshots")
-                
-                # Verify snapshot_data_copy BEFORE serialization
-                print(f"[SNAPSHOT SAVE] snapshot_data_copy keys: {list(snapshot_data_copy.keys())}")
-                print(f"[SNAPSHOT SAVE] snapshot_data_copy has subgraph: {'subgraph' in snapshot_data_copy}")
-                if 'subgraph' in snapshot_data_copy:
-                    subgraph = snapshot_data_copy['subgraph']
-                    print(f"[SNAPSHOT SAVE] snapshot_data_copy.subgraph type: {type(subgraph)}, keys: {list(subgraph.keys()) if isinstance(subgraph, dict) else 'N/A'}")
-                    if isinstance(subgraph, dict) and 'nodes' in subgraph:
-                        print(f"[SNAPSHOT SAVE] snapshot_data_copy.subgraph.nodes count: {len(subgraph['nodes']) if isinstance(subgraph['nodes'], list) else 'N/A'}")
-                
-                # Serialize and deserialize the new snapshot data individually
-                try:
-                    new_snapshot_json = json.dumps(snapshot_data_copy, ensure_ascii=False)
-                    print(f"[SNAPSHOT SAVE] Serialized new snapshot, JSON length: {len(new_snapshot_json)}")
-                    new_snapshot_deserialized = json.loads(new_snapshot_json)
-                    print(f"[SNAPSHOT SAVE] Deserialized new snapshot, keys: {list(new_snapshot_deserialized.keys())}")
-                    # Verify the deserialized data has nested structures
-                    has_nodes = bool(new_snapshot_deserialized.get("subgraph", {}).get("nodes"))
-                    has_timeline = bool(new_snapshot_deserialized.get("timeline"))
-                    has_citations = bool(new_snapshot_deserialized.get("citations"))
-                    has_chat = bool(new_snapshot_deserialized.get("chat_history"))
-                    node_count = len(new_snapshot_deserialized.get("subgraph", {}).get("nodes", [])) if isinstance(new_snapshot_deserialized.get("subgraph", {}).get("nodes"), list) else 0
-                    print(f"[SNAPSHOT SAVE] New snapshot {snapshot_id} after serialization: nodes={node_count}, has_timeline={has_timeline}, citations={has_citations}, chat={has_chat}")
-                    updated_snapshots[snapshot_id] = new_snapshot_deserialized
-                except (ValueError, TypeError, OverflowError) as e:
-                    print(f"[SNAPSHOT SAVE] ERROR: Failed to serialize new snapshot, using deepcopy: {e}")
-                    import traceback
-                    traceback.print_exc()
-                    updated_snapshots[snapshot_id] = copy.deepcopy(snapshot_data_copy)
-                
-                # Verify that existing snapshots weren't corrupted
-                for existing_id, existing_data in existing_snapshots_backup.items():
-                    if existing_id != snapshot_id and existing_id in updated_snapshots:
-                        # Verify the existing snapshot still has its data
-                        existing_backup = existing_snapshots_backup[existing_id]
-                        existing_current = updated_snapshots[existing_id]
-                        
-                        # Check if key fields are still present (basic sanity check)
-                        backup_has_data = (
-                            existing_backup.get("name") and 
-                            (existing_backup.get("subgraph") or existing_backup.get("_chunked"))
-                        )
-                        current_has_data = (
-                            existing_current.get("name") and 
-                            (existing_current.get("subgraph") or existing_current.get("_chunked"))
-                        )
-                        
-                        # Also check if subgraph data was lost (nodes/links empty when they shouldn't be)
-                        backup_subgraph = existing_backup.get("subgraph", {})
-                        current_subgraph = existing_current.get("subgraph", {})
-                        backup_has_nodes = bool(backup_subgraph.get("nodes"))
-                        current_has_nodes = bool(current_subgraph.get("nodes"))
-                        backup_node_count = len(backup_subgraph.get("nodes", [])) if isinstance(backup_subgraph.get("nodes"), list) else 0
-                        current_node_count = len(current_subgraph.get("nodes", [])) if isinstance(current_subgraph.get("nodes"), list) else 0
-                        
-                        # Check timeline, citations, and chat_history
-                        backup_timeline = existing_backup.get("timeline", [])
-                        current_timeline = existing_current.get("timeline", [])
-                        backup_timeline_count = len(backup_timeline) if isinstance(backup_timeline, list) else 0
-                        current_timeline_count = len(current_timeline) if isinstance(current_timeline, list) else 0
-                        
-                        backup_citations = existing_backup.get("citations", {})
-                        current_citations = existing_current.get("citations", {})
-                        backup_citations_count = len(backup_citations) if isinstance(backup_citations, dict) else 0
-                        current_citations_count = len(current_citations) if isinstance(current_citations, dict) else 0
-                        
-                        backup_chat = existing_backup.get("chat_history", [])
-                        current_chat = existing_current.get("chat_history", [])
-                        backup_chat_count = len(backup_chat) if isinstance(backup_chat, list) else 0
-                        current_chat_count = len(current_chat) if isinstance(current_chat, list) else 0
-                        
-                        # Check if any nested data was lost
-                        data_lost = (
-                            (backup_has_data and not current_has_data) or 
-                            (backup_has_nodes and not current_has_nodes) or
-                            (backup_node_count > 0 and current_node_count == 0) or
-                            (backup_timeline_count > 0 and current_timeline_count == 0) or
-                            (backup_citations_count > 0 and current_citations_count == 0) or
-                            (backup_chat_count > 0 and current_chat_count == 0)
-                        )
-                        
-                        if data_lost:
-                            print(f"ERROR: Existing snapshot {existing_id} appears to have lost data during save!")
-                            print(f"  Backup: name={existing_backup.get('name')}, nodes={backup_node_count}, timeline={backup_timeline_count}, citations={backup_citations_count}, chat={backup_chat_count}, chunked={existing_backup.get('_chunked')}")
-                            print(f"  Current: name={existing_current.get('name')}, nodes={current_node_count}, timeline={current_timeline_count}, citations={current_citations_count}, chat={current_chat_count}, chunked={existing_current.get('_chunked')}")
-                            # Restore from backup - serialize/deserialize to ensure isolation
-                            try:
-                                restore_json = json.dumps(existing_backup, ensure_ascii=False)
-                                restored = json.loads(restore_json)
-                                # Verify restored data has the nested structures
-                                restored_nodes = len(restored.get("subgraph", {}).get("nodes", [])) if isinstance(restored.get("subgraph", {}).get("nodes"), list) else 0
-                                restored_timeline = len(restored.get("timeline", [])) if isinstance(restored.get("timeline"), list) else 0
-                                print(f"  Restored: nodes={restored_nodes}, timeline={restored_timeline}")
-                                updated_snapshots[existing_id] = restored
-                                print(f"  Restored snapshot {existing_id} from backup")
-                            except (ValueError, TypeError, OverflowError) as e:
-                                print(f"  Failed to restore via JSON, using deepcopy: {e}")
-                                updated_snapshots[existing_id] = copy.deepcopy(existing_backup)
-                # Verify before saving
-                print(f"[SNAPSHOT SAVE] About to save {len(updated_snapshots)} snapshots")
-                for snap_id, snap_data in updated_snapshots.items():
-                    snap_nodes = len(snap_data.get("subgraph", {}).get("nodes", [])) if isinstance(snap_data.get("subgraph", {}).get("nodes"), list) else 0
-                    snap_timeline = len(snap_data.get("timeline", [])) if isinstance(snap_data.get("timeline"), list) else 0
-                    has_subgraph_key = 'subgraph' in snap_data
-                    subgraph_type = type(snap_data.get("subgraph")).__name__ if 'subgraph' in snap_data else 'N/A'
-                    print(f"[SNAPSHOT SAVE] Snapshot {snap_id} before save: has_subgraph={has_subgraph_key}, subgraph_type={subgraph_type}, nodes={snap_nodes}, timeline={snap_timeline}")
-                    # Check if this looks like a response object (has node_count but no subgraph)
-                    if 'node_count' in snap_data and 'subgraph' not in snap_data:
-                        print(f"[SNAPSHOT SAVE] ERROR: Snapshot {snap_id} looks like a response object (has node_count but no subgraph)!")
-                        print(f"[SNAPSHOT SAVE]   Keys: {list(snap_data.keys())}")
-                
-                save_snapshots(updated_snapshots)
-                
-                # Verify IMMEDIATELY after saving by reading from disk
-                import time
-                time.sleep(0.1)  # Small delay to ensure file is written
+        snapshots = {}
+        for snapshot_id in list(self._index):
+            snapshot = self.get(snapshot_id)
+            if snapshot is not None:
+                snapshots[snapshot_id] = snapshot
+        return snapshots
+
+    def _write_snapshot(self, snapshot_id: str, snapshot_data: Dict) -> Dict:
+        """Write a snapshot's files and return its summary (index not touched)."""
+        directory = _snapshot_dir(snapshot_id)
+        directory.mkdir(parents=True, exist_ok=True)
+        # Serialises saves of the same snapshot, so the cleanup below can't
+        # remove files another save is about to point snapshot.json at
+        with file_lock(directory / SNAPSHOT_LOCK):
+            return self._write_snapshot_locked(directory, snapshot_id, snapshot_data)
+
+    @staticmethod
+    def _write_snapshot_locked(directory: Path, snapshot_id: str, snapshot_data: Dict) -> Dict:
+        rev = uuid.uuid4().hex[:12]
+        core = {k: v for k, v in snapshot_data.items() if k not in LAZY_SECTIONS}
+        core.setdefault("id", snapshot_id)
+        files = {}
+        for name in LAZY_SECTIONS:
+            if snapshot_data.get(name) is None:
+                continue
+            filename = f"{name}.{rev}.json.gz"
+            with gzip.open(directory / filename, "wt", encoding="utf-8", compresslevel=COMPRESS_LEVEL) as f:
+                json.dump(snapshot_data[name], f, ensure_ascii=False)
+            files[name] = filename
+        core["_sections"] = files
+        core["_rev"] = rev
+        _atomic_write(directory / SNAPSHOT_FILE, core)
+
+        # Drop the previous save's section files
+        keep = set(files.values()) | {SNAPSHOT_FILE, SNAPSHOT_LOCK}
+        for path in directory.iterdir():
+            if path.name not in keep and not path.name.endswith(".tmp"):
                 try:
-                    with open(STORAGE_FILE, 'r', encoding='utf-8') as f:
-                        verify_data = json.load(f)
-                    print(f"[SNAPSHOT SAVE] Immediate verification: Read {len(verify_data)} snapshots from disk")
-                    for snap_id, snap_data in verify_data.items():
-                        if snap_id in updated_snapshots:
-                            snap_nodes = len(snap_data.get("subgraph", {}).get("nodes", [])) if isinstance(snap_data.get("subgraph", {}).get("nodes"), list) else 0
-                            has_subgraph = 'subgraph' in snap_data
-                            print(f"[SNAPSHOT SAVE] Immediate verification: {snap_id}: has_subgraph={has_subgraph}, nodes={snap_nodes}")
-                except Exception as e:
-                    print(f"[SNAPSHOT SAVE] Could not verify immediately: {e}")
-                
-                print(f"[SNAPSHOT SAVE] Successfully saved snapshots")
+                    path.unlink()
+                except OSError:
+                    pass
+        return _summarize(snapshot_id, snapshot_data)
+
+    def save(self, snapshot_id: str, snapshot_data: Dict):
+        """Save (create or replace) a snapshot."""
+        self.reload()
+        summary = self._write_snapshot(snapshot_id, snapshot_data)
+        with file_lock(LOCK_FILE):
+            # A delete that ran after the write wins; don't index a snapshot
+            # whose files are gone
+            if not (_snapshot_dir(snapshot_id) / SNAPSHOT_FILE).exists():
+                print(f"[SNAPSHOTS] {snapshot_id} was deleted while saving; not indexed")
                 return
-        except (ValueError, TypeError, OverflowError) as e:
-            error_msg = str(e).lower()
-            if 'invalid string length' not in error_msg and 'string length' not in error_msg and 'overflow' not in error_msg:
-                # Different error, re-raise
-                raise
-        
-        # Too large or failed to stringify - use chunking
-        chunks, is_chunked = chunk_data(snapshot_data_copy)
-        
-        # DON'T serialize existing snapshots - just use deepcopy to preserve them exactly as they are
-        # Serialization can corrupt nested data, so we avoid it for existing snapshots
-        updated_snapshots = {}
-        for existing_id, existing_data in self._snapshots.items():
-            if existing_id == snapshot_id:
-                # Skip the one we're updating - will add it separately
-                continue
-            
-            # Skip corrupted snapshots that look like response objects
-            if 'node_count' in existing_data and 'subgraph' not in existing_data:
-                print(f"[SNAPSHOT SAVE] WARNING: Skipping corrupted snapshot {existing_id} (response object, not full data)")
-                continue
-            
-            # Use deepcopy to preserve existing snapshots exactly as they are
-            # This avoids any potential corruption from JSON serialization
-            updated_snapshots[existing_id] = copy.deepcopy(existing_data)
-        
-        if is_chunked:
-            # Save chunks to disk
-            for i, chunk_json in enumerate(chunks):
-                save_chunk(snapshot_id, i, chunk_json)
-            
-            # Save metadata in main storage pointing to chunks
-            chunk_metadata_raw = {
-                "id": snapshot_id,
-                "name": snapshot_data_copy.get("name"),
-                "notes": snapshot_data_copy.get("notes"),
-                "timestamp": snapshot_data_copy.get("timestamp"),
-                "created_at": snapshot_data_copy.get("created_at"),
-                "owner": snapshot_data_copy.get("owner"),
-                "case_id": snapshot_data_copy.get("case_id"),
-                "case_version": snapshot_data_copy.get("case_version"),
-                "case_name": snapshot_data_copy.get("case_name"),
-                "_chunked": True,
-                "_num_chunks": len(chunks),
-            }
-            # Serialize/deserialize metadata to ensure isolation
-            try:
-                metadata_json = json.dumps(chunk_metadata_raw, ensure_ascii=False)
-                chunk_metadata = json.loads(metadata_json)
-            except (ValueError, TypeError, OverflowError):
-                chunk_metadata = copy.deepcopy(chunk_metadata_raw)
-            updated_snapshots[snapshot_id] = chunk_metadata
-        else:
-            # Single chunk, save normally - serialize/deserialize one more time for safety
-            try:
-                new_snapshot_json = json.dumps(snapshot_data_copy, ensure_ascii=False)
-                updated_snapshots[snapshot_id] = json.loads(new_snapshot_json)
-            except (ValueError, TypeError, OverflowError):
-                # Fallback to deep copy if serialization fails
-                updated_snapshots[snapshot_id] = copy.deepcopy(snapshot_data_copy)
-        
-        # Verify that existing snapshots weren't corrupted
-        for existing_id, existing_data in existing_snapshots_backup.items():
-            if existing_id != snapshot_id and existing_id in updated_snapshots:
-                # Verify the existing snapshot still has its data
-                existing_backup = existing_snapshots_backup[existing_id]
-                existing_current = updated_snapshots[existing_id]
-                
-                # Check if key fields are still present
-                backup_has_data = (
-                    existing_backup.get("name") and 
-                    (existing_backup.get("subgraph") or existing_backup.get("_chunked"))
-                )
-                current_has_data = (
-                    existing_current.get("name") and 
-                    (existing_current.get("subgraph") or existing_current.get("_chunked"))
-                )
-                
-                # Also check if subgraph data was lost (nodes/links empty when they shouldn't be)
-                backup_subgraph = existing_backup.get("subgraph", {})
-                current_subgraph = existing_current.get("subgraph", {})
-                backup_has_nodes = bool(backup_subgraph.get("nodes"))
-                current_has_nodes = bool(current_subgraph.get("nodes"))
-                
-                if (backup_has_data and not current_has_data) or (backup_has_nodes and not current_has_nodes):
-                    print(f"ERROR: Existing snapshot {existing_id} appears to have lost data during save!")
-                    print(f"  Backup: name={existing_backup.get('name')}, has_subgraph={bool(existing_backup.get('subgraph'))}, has_nodes={backup_has_nodes}, chunked={existing_backup.get('_chunked')}")
-                    print(f"  Current: name={existing_current.get('name')}, has_subgraph={bool(existing_current.get('subgraph'))}, has_nodes={current_has_nodes}, chunked={existing_current.get('_chunked')}")
-                    # Restore from backup - serialize/deserialize to ensure isolation
-                    try:
-                        restore_json = json.dumps(existing_backup, ensure_ascii=False)
-                        updated_snapshots[existing_id] = json.loads(restore_json)
-                        print(f"  Restored snapshot {existing_id} from backup")
-                    except (ValueError, TypeError, OverflowError) as e:
-                        print(f"  Failed to restore via JSON, using deepcopy: {e}")
-                        updated_snapshots[existing_id] = copy.deepcopy(existing_backup)
-        
-        # Update in-memory cache after successful validation
-        self._snapshots = updated_snapshots
-        
-        save_snapshots(updated_snapshots)
-    
+            self._update_index_locked(snapshot_id, summary)
+        print(f"[SNAPSHOTS] Saved {snapshot_id}: nodes={summary['node_count']}, "
+              f"timeline={summary['timeline_count']}, chat={summary['chat_count']}")
+
     def delete(self, snapshot_id: str) -> bool:
         """Delete a snapshot. Returns True if deleted, False if not found."""
-        # Reload from disk first to ensure we have the latest data
         self.reload()
-        
-        if snapshot_id in self._snapshots:
-            snapshot = self._snapshots[snapshot_id]
-            # If chunked, delete chunks too
-            if snapshot.get("_chunked") and snapshot.get("_num_chunks"):
-                delete_chunks(snapshot_id, snapshot["_num_chunks"])
-            
-            del self._snapshots[snapshot_id]
-            # Make a deep copy of the entire dictionary before saving to prevent any reference issues
-            save_snapshots(copy.deepcopy(self._snapshots))
-            return True
-        return False
-    
-    def reload(self):
-        """Reload snapshots from disk only if the file has changed since last load.
+        directory = _snapshot_dir(snapshot_id)
+        with file_lock(LOCK_FILE):
+            index = self._load_index_locked()
+            existed = snapshot_id in index or (directory / SNAPSHOT_FILE).exists()
+            if not existed:
+                return False
+            # Under the snapshot's own lock, so a concurrent save's files are
+            # either all written before the delete or all after it. The lock
+            # file itself stays: a save waiting on it must not end up holding
+            # a lock on a file nobody else can see.
+            if directory.exists():
+                with file_lock(directory / SNAPSHOT_LOCK):
+                    for path in directory.iterdir():
+                        if path.name != SNAPSHOT_LOCK:
+                            if path.is_dir():
+                                shutil.rmtree(path, ignore_errors=True)
+                            else:
+                                path.unlink(missing_ok=True)
+            self._update_index_locked(snapshot_id, None)
+        return True
 
-        mtime-based cache: every `save_snapshots` writes atomically (tmp+rename),
-        which bumps mtime on the target file. Other workers (or this one between
-        writes) detect the bump and re-read; otherwise the in-memory copy is
-        authoritative. This is what eliminates the per-request disk reload.
-        """
-        try:
-            current_mtime = STORAGE_FILE.stat().st_mtime if STORAGE_FILE.exists() else 0.0
-        except OSError:
-            current_mtime = 0.0
-        if current_mtime == self._mtime:
-            return
-        self._snapshots = load_snapshots()
-        self._mtime = current_mtime
-        print(f"[RELOAD] Loaded {len(self._snapshots)} snapshots from disk (mtime={current_mtime})")
+    # ------------------------------------------------------------------
+    # Legacy import
+    # ------------------------------------------------------------------
 
+    def _import_legacy(self) -> None:
+        """One-shot import of data/snapshots.json and its chunk files (see
+        services._legacy_import)."""
+        ensure_storage_dir()
 
-# Singleton instance
-snapshot_storage = SnapshotStorage()
+        def write(legacy) -> int:
+            index = self._load_index_locked()
+            imported = 0
+            for snapshot_id, snapshot in (legacy.items() if isinstance(legacy, dict) else []):
+                if not isinstance(snapshot, dict) or snapshot_id in index:
+                    continue
+                # Response objects that older builds saved by mistake
+                if "node_count" in snapshot and "subgraph" not in snapshot:
+                    continue
+                try:
+                    if snapshot.get("_chunked") and snapshot.get("_num_chunks"):
+                        snapshot = _load_legacy_chunks(snapshot_id, snapshot["_num_chunks"])
+                    snapshot = {k: v for k, v in snapshot.items() if k not in ("_chunked", "_num_chunks")}
+                    index[snapshot_id] = self._write_snapshot(snapshot_id, snapshot)
+                    imported += 1
+                except (ValueError, TypeError, OSError) as e:
+                    print(f"[SNAPSHOTS] Could not import snapshot {snapshot_id}: {e}")
+            _atomic_write(INDEX_FILE, index)
+            if LEGACY_CHUNK_DIR.exists():
+                retire(LEGACY_CHUNK_DIR, "SNAPSHOTS")
+            return imported
 
+        import_into_directory(STORAGE_DIR, LOCK_FILE, "snapshots", LEGACY_FILE, write, "SNAPSHOTS")
 
 
+# Singleton instance
+snapshot_storage = SnapshotStorage()
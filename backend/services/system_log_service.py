@@ -7,16 +7,90 @@ Logs:
 - Case management (save, load, delete)
 - Document ingestion
 - User actions
+
+Entries are stored in data/system_logs.db (SQLite, WAL) with indexes on
+timestamp, type, user, success and case, so the log viewer's filtering,
+pagination and statistics run as indexed SQL instead of parsing a file.
+
+log() only enqueues: a background writer drains the queue and inserts
+entries in batches of up to SYSTEM_LOG_BATCH_SIZE, one transaction per batch,
+at most SYSTEM_LOG_FLUSH_SECS after they were logged. Entries count as
+pending until their transaction commits, and reads flush any pending entries
+first (waiting for a batch the writer already holds), so a request sees its
+own entries. A batch whose write fails is kept and retried ahead of the
+queue.
+
+Retention is by day: every entry carries its day, and whole days older than
+SYSTEM_LOG_RETENTION_DAYS are deleted (at most hourly, from the writer)
+instead of rewriting the log. data/system_logs.jsonl from earlier versions
+is imported once and renamed to system_logs.jsonl.migrated.
 """
 
+import atexit
 import json
-import os
-from datetime import datetime
+import queue
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any
 from enum import Enum
 from threading import Lock
 
+from config import (
+    SYSTEM_LOG_BATCH_SIZE,
+    SYSTEM_LOG_FLUSH_SECS,
+    SYSTEM_LOG_QUEUE_SIZE,
+    SYSTEM_LOG_RETENTION_DAYS,
+)
+from services._legacy_import import import_into_sqlite
+
+BASE_DIR = Path(__file__).resolve().parent.parent.parent
+STORAGE_DIR = BASE_DIR / "data"
+DB_FILE = STORAGE_DIR / "system_logs.db"
+LEGACY_FILE = STORAGE_DIR / "system_logs.jsonl"
+
+# How often the writer deletes days past retention
+RETENTION_CHECK_SECS = 3600
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS system_logs (
+    id        INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    day       TEXT NOT NULL,
+    type      TEXT NOT NULL,
+    origin    TEXT NOT NULL,
+    action    TEXT NOT NULL,
+    user      TEXT,
+    success   INTEGER NOT NULL,
+    error     TEXT,
+    case_id   TEXT,
+    details   TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_system_logs_timestamp ON system_logs(timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_logs_day ON system_logs(day);
+CREATE INDEX IF NOT EXISTS idx_system_logs_type ON system_logs(type, timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_logs_user ON system_logs(user, timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_logs_success ON system_logs(success, timestamp);
+CREATE INDEX IF NOT EXISTS idx_system_logs_case ON system_logs(case_id, timestamp);
+"""
+
+_INSERT = (
+    "INSERT INTO system_logs (timestamp, day, type, origin, action, user, success, error, case_id, details) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+_EMPTY_STATS = {
+    "total_logs": 0,
+    "by_type": {},
+    "by_origin": {},
+    "successful": 0,
+    "failed": 0,
+    "success_rate": 0.0,
+}
+
 # Log types
 class LogType(str, Enum):
     AI_ASSISTANT = "ai_assistant"
@@ -35,73 +109,232 @@ class LogOrigin(str, Enum):
     INGESTION = "ingestion"
     SYSTEM = "system"
 
+
+def _row_values(entry: Dict[str, Any]) -> tuple:
+    """Column values for a log entry dict."""
+    details = entry.get("details") or {}
+    timestamp = entry.get("timestamp") or datetime.now().isoformat()
+    case_id = details.get("case_id") if isinstance(details, dict) else None
+    return (
+        timestamp,
+        timestamp[:10],
+        entry.get("type") or "unknown",
+        entry.get("origin") or "unknown",
+        entry.get("action") or "",
+        entry.get("user"),
+        1 if entry.get("success") else 0,
+        entry.get("error"),
+        str(case_id) if case_id else None,
+        json.dumps(details, default=str),
+    )
+
+
+def _row_to_entry(row: sqlite3.Row) -> Dict[str, Any]:
+    return {
+        "timestamp": row["timestamp"],
+        "type": row["type"],
+        "origin": row["origin"],
+        "action": row["action"],
+        "user": row["user"],
+        "success": bool(row["success"]),
+        "error": row["error"],
+        "details": json.loads(row["details"]) if row["details"] else {},
+    }
+
+
+def _as_stored_time(value: datetime) -> str:
+    """Timestamps are stored as local naive ISO strings; convert aware datetimes to match."""
+    if value.tzinfo is not None:
+        value = value.astimezone().replace(tzinfo=None)
+    return value.isoformat()
+
+
+def _read_jsonl(path: Path) -> List[tuple]:
+    rows = []
+    with open(path, "r") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                continue  # Skip malformed lines from crashes
+            if isinstance(entry, dict):
+                rows.append(_row_values(entry))
+    return rows
+
+
 class SystemLogService:
     """Service for managing system logs."""
-    
-    def __init__(self, log_file: Optional[str] = None):
+
+    def __init__(
+        self,
+        db_file: Optional[Path] = None,
+        legacy_file: Optional[Path] = None,
+        retention_days: int = SYSTEM_LOG_RETENTION_DAYS,
+    ):
         """
         Initialize the log service.
-        
+
         Args:
-            log_file: Path to log file (defaults to data/system_logs.jsonl)
+            db_file: Path to the log database (defaults to data/system_logs.db)
+            legacy_file: JSONL log to import on first use (defaults to data/system_logs.jsonl)
+            retention_days: Days of logs to keep (0 keeps everything)
         """
-        if log_file is None:
-            # Default to data directory in project root
-            base_dir = Path(__file__).parent.parent.parent
-            log_dir = base_dir / "data"
-            log_dir.mkdir(exist_ok=True)
-            log_file = str(log_dir / "system_logs.jsonl")
-        
-        self.log_file = Path(log_file)
-        self.log_file.parent.mkdir(parents=True, exist_ok=True)
-        self._lock = Lock()
-        self._max_logs = 10000  # Keep last 10k logs
-        self._current_log_count = 0
-        
-        # Initialize log count
-        self._update_log_count()
-    
-    def _update_log_count(self):
-        """Update the current log count by reading the file."""
+        self.db_file = Path(db_file or DB_FILE)
+        self.legacy_file = Path(legacy_file or LEGACY_FILE)
+        self.retention_days = retention_days
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(maxsize=SYSTEM_LOG_QUEUE_SIZE)
+        self._lock = Lock()  # guards writer start-up and schema initialisation
+        self._flush_lock = Lock()  # held while entries are out of the queue but not committed
+        self._pending_lock = Lock()
+        self._pending = 0  # logged but not yet committed
+        self._retry: List[Dict[str, Any]] = []  # failed batch, written ahead of the queue
+        self._wakeup = threading.Event()
+        self._writer: Optional[threading.Thread] = None
+        self._initialised = False
+        self._last_retention = 0.0
+        self._dropped = 0
+
+    # ------------------------------------------------------------------
+    # Database
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    conn.executescript(_SCHEMA)
+                    self._migrate_legacy(conn)
+                    self._initialised = True
+        return conn
+
+    @contextmanager
+    def _read(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self):
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    def _migrate_legacy(self, conn: sqlite3.Connection) -> None:
+        """Import system_logs.jsonl once (see services._legacy_import)."""
+        def write(conn: sqlite3.Connection, rows: List[tuple]) -> int:
+            conn.executemany(_INSERT, rows)
+            return len(rows)
+
         try:
-            if self.log_file.exists():
-                # Count lines (approximate)
-                with open(self.log_file, 'r') as f:
-                    self._current_log_count = sum(1 for _ in f)
-            else:
-                self._current_log_count = 0
-        except Exception:
-            self._current_log_count = 0
-    
-    def _rotate_logs_if_needed(self):
-        """Rotate logs if we exceed max_logs."""
-        if self._current_log_count < self._max_logs:
+            import_into_sqlite(conn, "system_logs", self.legacy_file, write, "SystemLog", load=_read_jsonl)
+        except Exception as e:
+            print(f"[SystemLog] Error importing {self.legacy_file.name}: {e}")
+
+    # ------------------------------------------------------------------
+    # Writer
+    # ------------------------------------------------------------------
+
+    def _ensure_writer(self) -> None:
+        if self._writer is None or not self._writer.is_alive():
+            with self._lock:
+                if self._writer is None or not self._writer.is_alive():
+                    self._writer = threading.Thread(target=self._writer_loop, name="system-log-writer", daemon=True)
+                    self._writer.start()
+
+    def _writer_loop(self) -> None:
+        while True:
+            # Entries stay queued while the writer waits, so a read's flush()
+            # can write them itself instead of finding an empty queue
+            if not self._pending:
+                self._wakeup.wait(timeout=RETENTION_CHECK_SECS)
+            self._wakeup.clear()
+            if self._pending:
+                # Let a burst accumulate into one transaction
+                time.sleep(SYSTEM_LOG_FLUSH_SECS)
+            try:
+                self._drain()
+                self._apply_retention()
+            except Exception as e:
+                print(f"[SystemLog] Error writing logs: {e}")
+
+    def _add_pending(self, count: int) -> None:
+        with self._pending_lock:
+            self._pending += count
+
+    def _drain(self) -> None:
+        """Write any failed batch plus everything queued, SYSTEM_LOG_BATCH_SIZE
+        entries per transaction. A failed batch is kept for the next drain."""
+        with self._flush_lock:
+            while True:
+                batch = self._retry[:SYSTEM_LOG_BATCH_SIZE]
+                self._retry = self._retry[SYSTEM_LOG_BATCH_SIZE:]
+                while len(batch) < SYSTEM_LOG_BATCH_SIZE:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                if not batch:
+                    return
+                try:
+                    with self._write() as conn:
+                        conn.executemany(_INSERT, [_row_values(entry) for entry in batch])
+                except BaseException:
+                    self._retry = batch + self._retry
+                    overflow = len(self._retry) - SYSTEM_LOG_QUEUE_SIZE
+                    if overflow > 0:
+                        # Keep the newest entries if the database stays unwritable
+                        del self._retry[:overflow]
+                        self._dropped += overflow
+                        self._add_pending(-overflow)
+                        print(f"[SystemLog] Write retry buffer full, dropped {self._dropped} entries")
+                    raise
+                self._add_pending(-len(batch))
+                if len(batch) < SYSTEM_LOG_BATCH_SIZE:
+                    return
+
+    def _apply_retention(self, force: bool = False) -> int:
+        """Delete whole days older than the retention window. Returns rows removed."""
+        if self.retention_days <= 0:
+            return 0
+        now = time.monotonic()
+        if not force and now - self._last_retention < RETENTION_CHECK_SECS:
+            return 0
+        self._last_retention = now
+        cutoff = (datetime.now() - timedelta(days=self.retention_days)).date().isoformat()
+        with self._write() as conn:
+            removed = conn.execute("DELETE FROM system_logs WHERE day < ?", (cutoff,)).rowcount
+        if removed:
+            print(f"[SystemLog] Retention removed {removed} entries before {cutoff}")
+        return removed
+
+    def flush(self) -> None:
+        """Write every pending entry now (including a batch the writer is in
+        the middle of, by waiting for it)."""
+        if not self._pending:
             return
-        
         try:
-            # Read all logs
-            logs = []
-            if self.log_file.exists():
-                with open(self.log_file, 'r') as f:
-                    for line in f:
-                        if line.strip():
-                            try:
-                                logs.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                continue  # Skip malformed lines from crashes
-            
-            # Keep only the most recent logs
-            if len(logs) > self._max_logs:
-                logs = logs[-self._max_logs:]
-                self._current_log_count = len(logs)
-                
-                # Write back
-                with open(self.log_file, 'w') as f:
-                    for log in logs:
-                        f.write(json.dumps(log) + '\n')
+            self._drain()
         except Exception as e:
-            print(f"[SystemLog] Error rotating logs: {e}")
-    
+            print(f"[SystemLog] Error writing logs: {e}")
+
     def log(
         self,
         log_type: LogType,
@@ -113,8 +346,8 @@ class SystemLogService:
         error: Optional[str] = None,
     ) -> None:
         """
-        Log a system event.
-        
+        Log a system event (queued; written by the background writer).
+
         Args:
             log_type: Type of log (AI_ASSISTANT, GRAPH_OPERATION, etc.)
             origin: Where the action originated (FRONTEND, BACKEND, etc.)
@@ -134,18 +367,66 @@ class SystemLogService:
             "error": error,
             "details": details or {},
         }
-        
-        with self._lock:
-            try:
-                # Append to log file (JSONL format)
-                with open(self.log_file, 'a') as f:
-                    f.write(json.dumps(log_entry) + '\n')
-                
-                self._current_log_count += 1
-                self._rotate_logs_if_needed()
-            except Exception as e:
-                print(f"[SystemLog] Error writing log: {e}")
-    
+
+        # Counted before it is queued, so the writer never sees it uncounted
+        self._add_pending(1)
+        try:
+            self._queue.put_nowait(log_entry)
+            self._wakeup.set()
+        except queue.Full:
+            self._add_pending(-1)
+            self._dropped += 1
+            if self._dropped == 1 or self._dropped % 1000 == 0:
+                print(f"[SystemLog] Log queue full, dropped {self._dropped} entries")
+        self._ensure_writer()
+
+    # ------------------------------------------------------------------
+    # Queries
+    # ------------------------------------------------------------------
+
+    def _where(
+        self,
+        log_types: Optional[List[LogType]] = None,
+        origins: Optional[List[LogOrigin]] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        user: Optional[str] = None,
+        success_only: Optional[bool] = None,
+        case_id: Optional[str] = None,
+        search: Optional[str] = None,
+    ) -> tuple:
+        """WHERE clause and parameters for the viewer's filters."""
+        clauses, params = [], []
+        if log_types:
+            clauses.append(f"type IN ({', '.join('?' * len(log_types))})")
+            params.extend(LogType(t).value for t in log_types)
+        if origins:
+            clauses.append(f"origin IN ({', '.join('?' * len(origins))})")
+            params.extend(LogOrigin(o).value for o in origins)
+        if start_time:
+            clauses.append("timestamp >= ?")
+            params.append(_as_stored_time(start_time))
+        if end_time:
+            clauses.append("timestamp <= ?")
+            params.append(_as_stored_time(end_time))
+        if user:
+            clauses.append("user = ?")
+            params.append(user)
+        if success_only is not None:
+            clauses.append("success = ?")
+            params.append(1 if success_only else 0)
+        if case_id:
+            clauses.append("case_id = ?")
+            params.append(case_id)
+        if search:
+            pattern = "%" + search.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            clauses.append(
+                "(action LIKE ? ESCAPE '\\' OR user LIKE ? ESCAPE '\\' "
+                "OR error LIKE ? ESCAPE '\\' OR details LIKE ? ESCAPE '\\')"
+            )
+            params.extend([pattern] * 4)
+        return (" WHERE " + " AND ".join(clauses)) if clauses else "", params
+
     def get_logs(
         self,
         log_type: Optional[LogType] = None,
@@ -159,10 +440,11 @@ class SystemLogService:
         user: Optional[str] = None,
         success_only: Optional[bool] = None,
         case_id: Optional[str] = None,
+        search: Optional[str] = None,
     ) -> Dict[str, Any]:
         """
-        Retrieve logs with filtering.
-        
+        Retrieve logs with filtering, newest first.
+
         Args:
             log_type: Filter by log type
             origin: Filter by origin
@@ -172,148 +454,95 @@ class SystemLogService:
             offset: Offset for pagination
             user: Filter by user
             success_only: Filter by success status (True/False/None for all)
-        
+            case_id: Filter by the case_id in the log details
+            search: Substring match on action, user, error and details
+
         Returns:
             Dict with 'logs' list and 'total' count
         """
-        if not self.log_file.exists():
-            return {"logs": [], "total": 0}
-        
-        logs = []
-        total = 0
-        
+        self.flush()
+        where, params = self._where(
+            log_types=log_types or ([log_type] if log_type else None),
+            origins=origins or ([origin] if origin else None),
+            start_time=start_time,
+            end_time=end_time,
+            user=user,
+            success_only=success_only,
+            case_id=case_id,
+            search=search,
+        )
+
         try:
-            with open(self.log_file, 'r') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    
-                    try:
-                        log = json.loads(line)
-                        
-                        # Apply filters
-                        # Support both single and multiple log types
-                        if log_types:
-                            if log.get("type") not in [lt.value for lt in log_types]:
-                                continue
-                        elif log_type and log.get("type") != log_type.value:
-                            continue
-                        
-                        # Support both single and multiple origins
-                        if origins:
-                            if log.get("origin") not in [o.value for o in origins]:
-                                continue
-                        elif origin and log.get("origin") != origin.value:
-                            continue
-                        if user and log.get("user") != user:
-                            continue
-                        if success_only is not None and log.get("success") != success_only:
-                            continue
-                        if case_id:
-                            log_case_id = log.get("details", {}).get("case_id", "")
-                            if log_case_id != case_id:
-                                continue
-                        
-                        # Time filters
-                        if start_time or end_time:
-                            log_time = datetime.fromisoformat(log.get("timestamp", ""))
-                            if start_time and log_time < start_time:
-                                continue
-                            if end_time and log_time > end_time:
-                                continue
-                        
-                        logs.append(log)
-                        total += 1
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Sort by timestamp (newest first)
-            logs.sort(key=lambda x: x.get("timestamp", ""), reverse=True)
-            
-            # Apply pagination
-            paginated_logs = logs[offset:offset + limit]
-            
+            with self._read() as conn:
+                conn.execute("BEGIN")
+                total = conn.execute(f"SELECT COUNT(*) FROM system_logs{where}", params).fetchone()[0]
+                rows = conn.execute(
+                    f"SELECT * FROM system_logs{where} ORDER BY timestamp DESC, id DESC LIMIT ? OFFSET ?",
+                    params + [limit, offset],
+                ).fetchall()
+                conn.execute("COMMIT")
+
             return {
-                "logs": paginated_logs,
+                "logs": [_row_to_entry(row) for row in rows],
                 "total": total,
                 "limit": limit,
                 "offset": offset,
             }
         except Exception as e:
             print(f"[SystemLog] Error reading logs: {e}")
-            return {"logs": [], "total": 0}
-    
-    def get_log_statistics(self) -> Dict[str, Any]:
-        """Get statistics about logs."""
-        if not self.log_file.exists():
-            return {
-                "total_logs": 0,
-                "by_type": {},
-                "by_origin": {},
-                "success_rate": 0.0,
-            }
-        
-        stats = {
-            "total_logs": 0,
-            "by_type": {},
-            "by_origin": {},
-            "successful": 0,
-            "failed": 0,
-        }
-        
+            return {"logs": [], "total": 0, "limit": limit, "offset": offset}
+
+    def get_log_statistics(self, **filters) -> Dict[str, Any]:
+        """
+        Get statistics about logs, optionally restricted by the get_logs filters
+        (log_types, origins, start_time, end_time, user, success_only, case_id, search).
+        """
+        self.flush()
+        where, params = self._where(**filters)
+
         try:
-            with open(self.log_file, 'r') as f:
-                for line in f:
-                    if not line.strip():
-                        continue
-                    
-                    try:
-                        log = json.loads(line)
-                        stats["total_logs"] += 1
-                        
-                        # Count by type
-                        log_type = log.get("type", "unknown")
-                        stats["by_type"][log_type] = stats["by_type"].get(log_type, 0) + 1
-                        
-                        # Count by origin
-                        origin = log.get("origin", "unknown")
-                        stats["by_origin"][origin] = stats["by_origin"].get(origin, 0) + 1
-                        
-                        # Count success/failure
-                        if log.get("success"):
-                            stats["successful"] += 1
-                        else:
-                            stats["failed"] += 1
-                    except json.JSONDecodeError:
-                        continue
-            
-            # Calculate success rate
+            # One scan grouped by (type, origin); the per-type/origin totals are folded here
+            with self._read() as conn:
+                groups = conn.execute(
+                    f"SELECT type, origin, COUNT(*), SUM(success) FROM system_logs{where} GROUP BY type, origin",
+                    params,
+                ).fetchall()
+
+            stats = dict(_EMPTY_STATS, by_type={}, by_origin={})
+            for log_type, origin, count, successful in groups:
+                stats["by_type"][log_type] = stats["by_type"].get(log_type, 0) + count
+                stats["by_origin"][origin] = stats["by_origin"].get(origin, 0) + count
+                stats["total_logs"] += count
+                stats["successful"] += successful
+            stats["failed"] = stats["total_logs"] - stats["successful"]
             if stats["total_logs"] > 0:
                 stats["success_rate"] = stats["successful"] / stats["total_logs"]
-            else:
-                stats["success_rate"] = 0.0
-            
             return stats
         except Exception as e:
             print(f"[SystemLog] Error calculating statistics: {e}")
-            return {
-                "total_logs": 0,
-                "by_type": {},
-                "by_origin": {},
-                "success_rate": 0.0,
-            }
-    
+            return dict(_EMPTY_STATS, by_type={}, by_origin={})
+
     def clear_logs(self) -> None:
         """Clear all logs."""
-        with self._lock:
-            try:
-                if self.log_file.exists():
-                    self.log_file.unlink()
-                self._current_log_count = 0
-            except Exception as e:
-                print(f"[SystemLog] Error clearing logs: {e}")
+        try:
+            with self._flush_lock:
+                discarded = len(self._retry)
+                self._retry = []
+                while True:
+                    try:
+                        self._queue.get_nowait()
+                        discarded += 1
+                    except queue.Empty:
+                        break
+                self._add_pending(-discarded)
+                with self._write() as conn:
+                    conn.execute("DELETE FROM system_logs")
+        except Exception as e:
+            print(f"[SystemLog] Error clearing logs: {e}")
 
 
 # Global instance
 system_log_service = SystemLogService()
 
+# Write whatever is still queued on a clean shutdown
+atexit.register(lambda: system_log_service.flush())
@@ -23,9 +23,9 @@ Shape on disk (data/testing-feedback.json):
       }
     }
 
-Single small file under an exclusive lock + atomic replace — same pattern as
-snapshot_storage. This is an internal QA tool, not user data, so a flat file
-is the right weight.
+Single small file under an exclusive lock + atomic replace (services._json_file_lock).
+This is an internal QA tool, not user data, so a flat file is the right
+weight.
 """
 
 from pathlib import Path
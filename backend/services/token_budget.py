@@ -0,0 +1,229 @@
+"""
+Token Budget — model-accurate token counting and relevance-per-token packing.
+
+RAG context assembly used to approximate tokens as ``len(text) / 4`` and
+then hard-truncate the finished context. That wastes much of the window for
+some text (prose) and overflows for other text (numbers, IDs, non-English).
+
+  - OpenAI models are counted exactly with tiktoken (encoding picked from the
+    model id, o200k_base for unknown ids).
+  - Ollama models (and OpenAI when tiktoken or its encoding files are
+    unavailable) use an estimator: text is split into word/digit/punctuation
+    units the way BPE tokenizers tend to split it, and units are scaled by a
+    per-model tokens-per-unit ratio. The ratio is calibrated from the
+    ``prompt_eval_count`` Ollama reports for real prompts.
+  - Counts for retrieval items are cached by item id (chunk id / entity key),
+    so a chunk is tokenized once per process, not once per question.
+  - pack_by_relevance() fills a budget greedily by relevance per token, so a
+    long, marginal passage no longer crowds out several short, relevant ones.
+"""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Sequence, Set, Tuple
+
+from config import TOKEN_COUNT_CACHE_SIZE
+
+DEFAULT_ENCODING = "o200k_base"
+DEFAULT_TOKENS_PER_UNIT = 1.15      # conservative for llama/qwen tokenizers on English text
+CALIBRATION_ALPHA = 0.2             # EMA weight of each new observation
+MIN_CALIBRATION_UNITS = 200         # ignore tiny prompts (template overhead dominates)
+TOKENS_PER_UNIT_BOUNDS = (0.6, 3.0)  # reject observations outside this (e.g. KV-cache reuse)
+
+# Pieces BPE vocabularies rarely merge across: short letter runs, up to three
+# digits, single punctuation marks
+_UNIT = re.compile(r"[^\W\d_]{1,6}|\d{1,3}|[^\w\s]")
+
+
+def count_units(text: str) -> int:
+    """Tokenizer-independent size of ``text`` used by the estimator."""
+    return len(_UNIT.findall(text)) if text else 0
+
+
+class TokenCounter:
+    """Counts tokens for the active provider/model, with a per-item cache."""
+
+    def __init__(self, cache_size: int = TOKEN_COUNT_CACHE_SIZE):
+        self.cache_size = cache_size
+        self._cache: "OrderedDict[Tuple[str, str, int], int]" = OrderedDict()
+        self._encodings: Dict[str, Any] = {}
+        self._ratios: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    # ------------------------------------------------------------------
+    # Tokenizer selection
+    # ------------------------------------------------------------------
+
+    def _encoding(self, model_id: str):
+        """tiktoken encoding for an OpenAI model, or None if unavailable."""
+        try:
+            import tiktoken
+        except ImportError:
+            return None
+        try:
+            name = tiktoken.encoding_name_for_model(model_id)
+        except KeyError:
+            name = DEFAULT_ENCODING
+        if name not in self._encodings:
+            with self._lock:
+                if name not in self._encodings:
+                    try:
+                        self._encodings[name] = tiktoken.get_encoding(name)
+                    except Exception as e:
+                        # Encoding files are downloaded on first use; offline
+                        # installs fall back to the estimator
+                        print(f"[TokenBudget] tiktoken encoding {name} unavailable, estimating: {e}")
+                        self._encodings[name] = None
+        return self._encodings[name]
+
+    def counter_name(self, provider: str, model_id: str) -> str:
+        """Identifies how counts are produced, e.g. "tiktoken:o200k_base"."""
+        if (provider or "").lower() == "openai":
+            encoding = self._encoding(model_id)
+            if encoding is not None:
+                return f"tiktoken:{encoding.name}"
+        return f"estimate:{(provider or '').lower()}:{model_id}"
+
+    def is_exact(self, provider: str, model_id: str) -> bool:
+        return self.counter_name(provider, model_id).startswith("tiktoken:")
+
+    # ------------------------------------------------------------------
+    # Estimator calibration
+    # ------------------------------------------------------------------
+
+    def tokens_per_unit(self, model_id: str) -> float:
+        return self._ratios.get(model_id, DEFAULT_TOKENS_PER_UNIT)
+
+    def observe(self, model_id: str, prompt_text: str, prompt_tokens: Optional[int]) -> None:
+        """
+        Calibrate the estimator from a prompt and the token count the model reported.
+
+        Called after Ollama chat calls with the rendered messages and the
+        response's ``prompt_eval_count``.
+        """
+        if not prompt_tokens or not prompt_text:
+            return
+        units = count_units(prompt_text)
+        if units < MIN_CALIBRATION_UNITS:
+            return
+        observed = prompt_tokens / units
+        low, high = TOKENS_PER_UNIT_BOUNDS
+        if not low <= observed <= high:
+            return
+        with self._lock:
+            current = self._ratios.get(model_id)
+            self._ratios[model_id] = (
+                observed if current is None
+                else current + CALIBRATION_ALPHA * (observed - current)
+            )
+
+    # ------------------------------------------------------------------
+    # Counting
+    # ------------------------------------------------------------------
+
+    def _base_count(self, text: str, encoding) -> int:
+        if encoding is not None:
+            return len(encoding.encode(text, disallowed_special=()))
+        return count_units(text)
+
+    def count(
+        self,
+        text: str,
+        provider: str,
+        model_id: str,
+        cache_id: Optional[str] = None,
+    ) -> int:
+        """
+        Tokens ``text`` occupies for this model.
+
+        Args:
+            cache_id: Stable id of the item (chunk id, entity key). When given,
+                the tokenizer runs once per (counter, id, length) per process.
+        """
+        if not text:
+            return 0
+        encoding = self._encoding(model_id) if (provider or "").lower() == "openai" else None
+        if cache_id is None:
+            base = self._base_count(text, encoding)
+        else:
+            key = (encoding.name if encoding is not None else "units", cache_id, len(text))
+            with self._lock:
+                base = self._cache.get(key)
+                if base is not None:
+                    self._cache.move_to_end(key)
+                    self.hits += 1
+            if base is None:
+                base = self._base_count(text, encoding)
+                with self._lock:
+                    self.misses += 1
+                    self._cache[key] = base
+                    while len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        if encoding is not None:
+            return base
+        return math.ceil(base * self.tokens_per_unit(model_id))
+
+    def truncate(self, text: str, max_tokens: int, provider: str, model_id: str) -> str:
+        """Cut ``text`` to at most ``max_tokens`` tokens."""
+        if max_tokens <= 0:
+            return ""
+        encoding = self._encoding(model_id) if (provider or "").lower() == "openai" else None
+        if encoding is not None:
+            tokens = encoding.encode(text, disallowed_special=())
+            return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+        total = self.count(text, provider, model_id)
+        if total <= max_tokens:
+            return text
+        # Units are roughly uniform in length; shrink until it fits
+        cut = int(len(text) * max_tokens / total)
+        while cut > 0 and self.count(text[:cut], provider, model_id) > max_tokens:
+            cut = int(cut * 0.95)
+        return text[:cut]
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "cached_items": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "calibrated_models": {m: round(r, 4) for m, r in self._ratios.items()},
+        }
+
+
+def pack_by_relevance(items: Sequence[Dict], budget: int) -> Tuple[Set[int], int]:
+    """
+    Choose items to fit ``budget`` tokens, best relevance per token first.
+
+    Each item is a dict with ``tokens`` and ``relevance``, and optionally
+    ``tier`` (lower tiers are packed first regardless of density — used for
+    chunks of an explicitly selected document).
+
+    Returns:
+        (indices of chosen items, tokens used)
+    """
+    order = sorted(
+        range(len(items)),
+        key=lambda i: (
+            items[i].get("tier", 1),
+            -(items[i]["relevance"] / max(1, items[i]["tokens"])),
+            i,
+        ),
+    )
+    chosen: Set[int] = set()
+    used = 0
+    for i in order:
+        tokens = items[i]["tokens"]
+        if used + tokens <= budget:
+            chosen.add(i)
+            used += tokens
+    return chosen, used
+
+
+def utilisation(used: int, budget: int) -> float:
+    return round(used / budget, 4) if budget else 0.0
+
+
+token_counter = TokenCounter()
@@ -19,6 +19,7 @@ from typing import Callable, Dict, List, Optional
 from neo4j import GraphDatabase
 
 from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD, VIRUSTOTAL_API_KEY
+from services.pipeline_profiler import stage
 from services.triage.hash_lookup_service import hash_lookup_service
 
 logger = logging.getLogger(__name__)
@@ -150,7 +151,8 @@ class TriageClassifierService:
 
         # Step 1: Get unique unclassified hashes
         _log("Fetching unique unclassified hashes from Neo4j...")
-        unique_hashes = self._get_unclassified_hashes(driver, triage_case_id)
+        with stage("neo4j:unclassified_hashes"):
+            unique_hashes = self._get_unclassified_hashes(driver, triage_case_id)
         total_unique = len(unique_hashes)
         _log(f"Found {total_unique:,} unique unclassified hashes")
 
@@ -171,7 +173,9 @@ class TriageClassifierService:
         else:
             # Step 2: CIRCL Hashlookup (NSRL) bulk
             _log(f"Starting CIRCL Hashlookup for {total_unique:,} hashes...")
-            circl_results = hash_lookup_service.lookup_circl_bulk(unique_hashes)
+            with stage("classify:nsrl") as s:
+                circl_results = hash_lookup_service.lookup_circl_bulk(unique_hashes)
+                s.add(count=total_unique)
             known_good_hashes = {
                 h for h, r in circl_results.items() if r.get("classification") == "known_good"
             }
@@ -198,7 +202,9 @@ class TriageClassifierService:
                 _log(f"Starting VirusTotal lookup for {len(remaining):,} remaining hashes...")
                 vt_batch = []
                 for idx, h in enumerate(remaining):
-                    vt_result = hash_lookup_service.lookup_virustotal(h)
+                    with stage("classify:virustotal") as s:
+                        vt_result = hash_lookup_service.lookup_virustotal(h)
+                        s.add(count=1)
                     if vt_result and vt_result.get("classification") in ("known_bad", "suspicious"):
                         classification = vt_result["classification"]
                         vt_batch.append({
@@ -224,7 +230,9 @@ class TriageClassifierService:
 
             # Step 4: Custom hash sets
             _log("Checking custom hash sets...")
-            custom_results = hash_lookup_service.lookup_custom_bulk(unique_hashes)
+            with stage("classify:custom_hash_sets") as s:
+                custom_results = hash_lookup_service.lookup_custom_bulk(unique_hashes)
+                s.add(count=total_unique)
             if custom_results:
                 custom_batch = [
                     {
@@ -262,7 +270,8 @@ class TriageClassifierService:
 
         # Step 5: Path-based classification
         _log("Running path-based heuristics...")
-        path_stats = self._classify_paths(driver, triage_case_id, os_detected, _log, _progress)
+        with stage("classify:paths"):
+            path_stats = self._classify_paths(driver, triage_case_id, os_detected, _log, _progress)
         stats["system_files"] = path_stats["system_files"]
         stats["user_files"] = path_stats["user_files"]
         stats["user_accounts"] = path_stats["user_accounts"]
@@ -297,7 +306,8 @@ class TriageClassifierService:
 
         # Process in sub-batches of 500
         batch_size = 500
-        with driver.session() as session:
+        with stage("neo4j:hash_classify") as s, driver.session() as session:
+            s.add(count=len(batch))
             for i in range(0, len(batch), batch_size):
                 sub = batch[i : i + batch_size]
                 session.run(_BATCH_CLASSIFY_CYPHER, batch=sub, case_id=triage_case_id)
@@ -402,7 +412,8 @@ class TriageClassifierService:
 
     def _batch_path_update(self, driver, triage_case_id: str, batch: List[Dict]):
         """Batch update path classification on TriageFile nodes."""
-        with driver.session() as session:
+        with stage("neo4j:path_classify") as s, driver.session() as session:
+            s.add(count=len(batch))
             session.run(_BATCH_PATH_CLASSIFY_CYPHER, batch=batch, case_id=triage_case_id)
 
     def get_classification_stats(self, triage_case_id: str) -> Dict:
@@ -17,6 +17,7 @@ from uuid import uuid4
 from neo4j import GraphDatabase
 
 from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from services.pipeline_profiler import bind, stage
 from services.triage_processors.base_processor import BaseTriageProcessor, ProcessingResult
 
 logger = logging.getLogger(__name__)
@@ -165,7 +166,9 @@ class ProcessorRegistry:
 
         # 1. Get matching files
         _log(f"Querying files matching filter for processor '{processor_name}'...")
-        files = self._get_matching_files(driver, triage_case_id, file_filter)
+        with stage("neo4j:match_files") as s:
+            files = self._get_matching_files(driver, triage_case_id, file_filter)
+            s.add(count=len(files))
         total = len(files)
         _log(f"Found {total:,} matching files")
 
@@ -179,11 +182,13 @@ class ProcessorRegistry:
 
         def _process_one(file_data):
             try:
-                return processor.process_file(
-                    file_path=file_data["original_path"],
-                    file_info=file_data,
-                    config=config,
-                )
+                with stage(f"parse:{processor_name}") as s:
+                    s.add(count=1, bytes=file_data.get("size") or 0)
+                    return processor.process_file(
+                        file_path=file_data["original_path"],
+                        file_info=file_data,
+                        config=config,
+                    )
             except Exception as e:
                 return [ProcessingResult(
                     source_path=file_data["original_path"],
@@ -192,8 +197,9 @@ class ProcessorRegistry:
                 )]
 
         completed = 0
+        process_one = bind(_process_one)
         with ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = {executor.submit(_process_one, f): f for f in files}
+            futures = {executor.submit(process_one, f): f for f in files}
             for future in as_completed(futures):
                 results = future.result()
                 for result in results:
@@ -287,7 +293,8 @@ class ProcessorRegistry:
         if not batch:
             return
         # Use simpler creation without MATCH for better performance
-        with driver.session() as session:
+        with stage("neo4j:artifacts") as s, driver.session() as session:
+            s.add(count=len(batch))
             session.run(
                 """
                 UNWIND $batch AS art
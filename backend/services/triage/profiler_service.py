@@ -18,6 +18,7 @@ from typing import Callable, Dict, List, Optional
 from neo4j import GraphDatabase
 
 from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from services.pipeline_profiler import stage
 
 logger = logging.getLogger(__name__)
 
@@ -192,37 +193,44 @@ class TriageProfilerService:
 
         # 1. Overview
         _log("Computing overview statistics...")
-        overview = self._get_overview(driver, triage_case_id)
+        with stage("neo4j:profile_overview"):
+            overview = self._get_overview(driver, triage_case_id)
         _progress("overview", 1, 6)
 
         # 2. Classification breakdown
         _log("Computing classification breakdown...")
-        classification = self._get_classification(driver, triage_case_id)
+        with stage("neo4j:profile_classification"):
+            classification = self._get_classification(driver, triage_case_id)
         _progress("classification", 2, 6)
 
         # 3. File type breakdown
         _log("Computing file type breakdown...")
-        by_category = self._get_category_breakdown(driver, triage_case_id)
+        with stage("neo4j:profile_categories"):
+            by_category = self._get_category_breakdown(driver, triage_case_id)
         _progress("categories", 3, 6)
 
         # 4. Activity timeline
         _log("Computing activity timeline...")
-        timeline = self._get_timeline(driver, triage_case_id)
+        with stage("neo4j:profile_timeline"):
+            timeline = self._get_timeline(driver, triage_case_id)
         _progress("timeline", 4, 6)
 
         # 5. User profiles
         _log("Computing user profiles...")
-        user_profiles = self._get_user_profiles(driver, triage_case_id)
+        with stage("neo4j:profile_users"):
+            user_profiles = self._get_user_profiles(driver, triage_case_id)
         _progress("users", 5, 6)
 
         # 6. High-value artifacts
         _log("Detecting high-value artifacts...")
-        artifacts = self._detect_artifacts(driver, triage_case_id)
+        with stage("neo4j:profile_artifacts"):
+            artifacts = self._detect_artifacts(driver, triage_case_id)
         _progress("artifacts", 6, 6)
 
         # 7. Extension mismatches
         _log("Checking extension mismatches...")
-        mismatches = self._get_mismatches(driver, triage_case_id)
+        with stage("neo4j:profile_mismatches"):
+            mismatches = self._get_mismatches(driver, triage_case_id)
 
         _log("Profile generation complete")
 
@@ -28,6 +28,7 @@ from config import (
     TRIAGE_SCAN_BATCH_SIZE,
     TRIAGE_SCAN_WORKERS,
 )
+from services.pipeline_profiler import bind, stage
 
 logger = logging.getLogger(__name__)
 
@@ -258,8 +259,11 @@ def _extract_file_record(
     name = os.path.basename(entry_path)
     ext = os.path.splitext(name)[1].lower() if "." in name else ""
 
-    sha256, md5 = _hash_file(entry_path)
-    mime_type, magic_type, mismatch = _detect_mime(entry_path, ext)
+    with stage("hash:file") as s:
+        sha256, md5 = _hash_file(entry_path)
+        s.add(count=1, bytes=stat.st_size)
+    with stage("parse:mime"):
+        mime_type, magic_type, mismatch = _detect_mime(entry_path, ext)
 
     # Category: prefer magic-based, fall back to extension
     category = _categorise_mime(mime_type) or _categorise_ext(ext)
@@ -316,8 +320,9 @@ def _write_batch(driver, batch: List[Dict]) -> int:
     """Write a batch of file records to Neo4j. Returns count written."""
     if not batch:
         return 0
-    with driver.session() as session:
+    with stage("neo4j:scan_batch") as s, driver.session() as session:
         session.run(_BATCH_INSERT_CYPHER, batch=batch)
+        s.add(count=len(batch))
     return len(batch)
 
 
@@ -400,6 +405,7 @@ class TriageScannerService:
         last_cursor = scan_cursor
 
         # Walk using os.walk for simplicity and reliability
+        extract = bind(_extract_file_record)
         for dirpath, dirnames, filenames in os.walk(root, followlinks=False):
             # Resumability: skip directories before cursor
             rel_dir = os.path.relpath(dirpath, root)
@@ -412,9 +418,7 @@ class TriageScannerService:
             # Parallel extraction with ThreadPoolExecutor
             with ThreadPoolExecutor(max_workers=TRIAGE_SCAN_WORKERS) as executor:
                 futures = {
-                    executor.submit(
-                        _extract_file_record, fp, root, triage_case_id
-                    ): fp
+                    executor.submit(extract, fp, root, triage_case_id): fp
                     for fp in file_paths
                 }
                 for future in as_completed(futures):
@@ -26,10 +26,24 @@ from services.triage.processor_registry import processor_registry
 from services.triage.triage_advisor import triage_advisor
 from services.triage.template_service import template_service
 from services.triage.ingest_bridge import ingest_bridge
+from services.pipeline_profiler import task_profiler
 
 logger = logging.getLogger(__name__)
 
 
+def _profiled(task_id: str, stage_name: str, job):
+    """Wrap a background job so it runs as one profiled stage of its task
+    (see services.pipeline_profiler); the profile lands on the task record."""
+    def run():
+        profiler = task_profiler(task_id, f"{stage_name} {task_id}")
+        try:
+            with profiler.activate(), profiler.stage(stage_name):
+                job()
+        finally:
+            profiler.finish()
+    return run
+
+
 class TriageService:
     """Orchestrates triage cases and their processing stages."""
 
@@ -207,7 +221,7 @@ class TriageService:
                 )
 
         thread = threading.Thread(
-            target=_run_scan,
+            target=_profiled(task_id, "triage:scan", _run_scan),
             daemon=False,
             name=f"triage-scan-{case_id[:8]}",
         )
@@ -319,7 +333,7 @@ class TriageService:
                 )
 
         thread = threading.Thread(
-            target=_run_classification,
+            target=_profiled(task_id, "triage:classify", _run_classification),
             daemon=False,
             name=f"triage-classify-{case_id[:8]}",
         )
@@ -441,7 +455,7 @@ class TriageService:
                 )
 
         thread = threading.Thread(
-            target=_run_profile,
+            target=_profiled(task_id, "triage:profile", _run_profile),
             daemon=False,
             name=f"triage-profile-{case_id[:8]}",
         )
@@ -597,7 +611,7 @@ class TriageService:
                 )
 
         thread = threading.Thread(
-            target=_run_stage,
+            target=_profiled(task_id, "triage:process", _run_stage),
             daemon=False,
             name=f"triage-process-{stage_id[:8]}",
         )
@@ -751,7 +765,7 @@ class TriageService:
                 )
 
         thread = threading.Thread(
-            target=_run_ingest,
+            target=_profiled(task_id, "triage:ingest", _run_ingest),
             daemon=False,
             name=f"triage-ingest-{case_id[:8]}",
         )
@@ -4,10 +4,58 @@ Vector DB Service for semantic document search.
 Handles storage and retrieval of document embeddings using ChromaDB.
 """
 
-from typing import List, Dict, Optional
+import threading
+import time
+from typing import Any, List, Dict, Optional, Sequence
 from pathlib import Path
 
-from config import BASE_DIR, CHROMADB_PATH
+import numpy as np
+
+from config import BASE_DIR, CHROMADB_PATH, VECTOR_DB_UPSERT_BATCH_SIZE
+from services._json_file_lock import file_lock
+from services.chunk_lexical_index import chunk_lexical_index
+from services.platform_telemetry import add_timing
+
+# Maximum stored document length for entity embeddings
+ENTITY_TEXT_MAX_CHARS = 10000
+
+# Collection metadata flag: every stored vector has unit L2 norm. Vectors
+# from Ollama's /api/embeddings were stored unnormalised before
+# EmbeddingService normalised them; collections without the flag are
+# rescaled once at startup.
+NORMALISED_FLAG = "l2_normalised"
+NORMALISE_BATCH_SIZE = 1000
+NORM_TOLERANCE = 1e-3  # vectors are stored as float32
+
+
+def normalise_stored_vectors(collection, batch_size: int = NORMALISE_BATCH_SIZE) -> int:
+    """
+    Rescale the collection's stored vectors that are not unit length.
+
+    Only the embeddings are rewritten (documents and metadata are kept).
+    Rescaling keeps each vector's direction, so no re-embedding is needed.
+
+    Returns:
+        Number of vectors rewritten
+    """
+    updated = 0
+    offset = 0
+    while True:
+        page = collection.get(limit=batch_size, offset=offset, include=["embeddings"])
+        ids = page["ids"]
+        if not ids:
+            return updated
+        fix_ids, fixed = [], []
+        for item_id, vector in zip(ids, page["embeddings"]):
+            arr = np.asarray(vector, dtype=np.float64)
+            norm = np.linalg.norm(arr)
+            if norm > 0 and abs(norm - 1.0) > NORM_TOLERANCE:
+                fix_ids.append(item_id)
+                fixed.append((arr / norm).tolist())
+        if fix_ids:
+            collection.update(ids=fix_ids, embeddings=fixed)
+            updated += len(fix_ids)
+        offset += len(ids)
 
 
 class VectorDBService:
@@ -63,6 +111,13 @@ class VectorDBService:
         self._chunks_healthy = True
         self._entities_healthy = True
 
+        # Cached collection dimension / size, keyed by collection name.
+        # Populated by _validate_collection() at startup and refreshed on
+        # write, so the search hot path never needs count()/peek() round
+        # trips against ChromaDB's SQLite store.
+        self._dims: Dict[str, Optional[int]] = {"chunks": None, "entities": None}
+        self._counts: Dict[str, int] = {"chunks": 0, "entities": 0}
+
         # Run startup health checks
         self._chunks_healthy = self._validate_collection("chunks", self.chunk_collection)
         self._entities_healthy = self._validate_collection("entities", self.entity_collection)
@@ -70,6 +125,13 @@ class VectorDBService:
         # Clean up legacy documents collection if it exists
         self._delete_legacy_documents_collection()
 
+        # Rescale vectors stored before embeddings were normalised
+        self._normalise_lock_file = db_path / "normalise.lock"
+        self._normaliser = threading.Thread(
+            target=self._normalise_collections, name="vector-db-normalise", daemon=True,
+        )
+        self._normaliser.start()
+
     def _validate_collection(self, name: str, collection) -> bool:
         """
         Validate that a collection's HNSW index is healthy.
@@ -78,6 +140,7 @@ class VectorDBService:
         """
         try:
             count = collection.count()
+            self._counts[name] = count
             if count == 0:
                 return True
 
@@ -90,6 +153,7 @@ class VectorDBService:
 
             # Attempt a minimal query to exercise the HNSW index
             sample_embedding = peeked["embeddings"][0]
+            self._dims[name] = len(sample_embedding)
             collection.query(query_embeddings=[sample_embedding], n_results=1)
             return True
         except Exception as e:
@@ -97,6 +161,28 @@ class VectorDBService:
             print(f"[VectorDB] Run 'python backend/scripts/repair_chromadb.py' to rebuild.")
             return False
 
+    def _normalise_collections(self) -> None:
+        """One-shot backfill: rescale each collection's stored vectors to unit
+        length, then mark it with NORMALISED_FLAG. Serialised across workers
+        by a lock file; a worker that waited finds the flag already set."""
+        for name in ("chunks", "entities"):
+            try:
+                if (self.client.get_collection(name).metadata or {}).get(NORMALISED_FLAG):
+                    continue
+                with file_lock(self._normalise_lock_file):
+                    collection = self.client.get_collection(name)
+                    metadata = collection.metadata or {}
+                    if metadata.get(NORMALISED_FLAG):
+                        continue
+                    started = time.time()
+                    updated = normalise_stored_vectors(collection)
+                    collection.modify(metadata={**metadata, NORMALISED_FLAG: True})
+                    if updated:
+                        print(f"[VectorDB] Normalised {updated} stored vectors in '{name}' "
+                              f"in {time.time() - started:.1f}s")
+            except Exception as e:
+                print(f"[VectorDB] Warning: Could not normalise '{name}' vectors (retried next start): {e}")
+
     def _delete_legacy_documents_collection(self):
         """Delete the legacy 'documents' collection if it exists."""
         try:
@@ -107,29 +193,265 @@ class VectorDBService:
         except Exception as e:
             print(f"[VectorDB] Warning: Could not delete legacy documents collection: {e}")
 
-    def _check_dimension(self, collection, collection_name: str, query_embedding: List[float]) -> bool:
+    def _refresh_stats(self, name: str, collection) -> None:
         """
-        Check that query_embedding dimension matches collection's stored dimension.
+        Re-read count and dimension for a collection from ChromaDB.
 
-        Returns True if dimensions match (or collection is empty), False on mismatch.
+        Only called when the cache says the collection is empty, which covers
+        vectors written by another process (e.g. a separate ingestion worker)
+        since startup.
         """
         try:
-            if collection.count() == 0:
-                return True
-            sample = collection.peek(1)
-            if sample and sample.get("embeddings") and len(sample["embeddings"]) > 0:
-                expected = len(sample["embeddings"][0])
-                actual = len(query_embedding)
-                if expected != actual:
-                    print(
-                        f"[VectorDB] Dimension mismatch in '{collection_name}': "
-                        f"collection has {expected}d, query has {actual}d. "
-                        f"Run 'python backend/scripts/repair_chromadb.py' to fix."
+            count = collection.count()
+            self._counts[name] = count
+            if count == 0:
+                # An emptied collection may be refilled with a different model
+                self._dims[name] = None
+            elif self._dims.get(name) is None:
+                sample = collection.peek(1)
+                embeddings = sample.get("embeddings") if sample else None
+                if embeddings is not None and len(embeddings) > 0:
+                    self._dims[name] = len(embeddings[0])
+        except Exception as e:
+            print(f"[VectorDB] Warning: Could not refresh stats for '{name}': {e}")
+
+    def _record_write(self, name: str, dim: int, written: int) -> None:
+        """Update the cached dimension / size after a successful upsert."""
+        if self._dims.get(name) is None:
+            self._dims[name] = dim
+        # Upserts may overwrite existing ids, so this is a lower bound on the
+        # true size. It only needs to be non-zero for search to proceed;
+        # count_chunks() / count_entities() still return the exact figure.
+        self._counts[name] = max(self._counts.get(name, 0), written)
+
+    def _record_delete(self, name: str) -> None:
+        """Force the next search to re-read the collection size after a delete."""
+        self._counts[name] = 0
+
+    def _check_write_dimension(self, name: str, embedding_dim: int) -> None:
+        """Raise if a new embedding doesn't match the collection's cached dimension."""
+        expected = self._dims.get(name)
+        if expected is not None and expected != embedding_dim:
+            label = "entity" if name == "entities" else "chunk"
+            raise ValueError(
+                f"Embedding dimension mismatch: {label} collection has {expected} dims, "
+                f"new embedding has {embedding_dim} dims. "
+                f"Delete data/chromadb/ and re-ingest with consistent embedding model."
+            )
+
+    def _check_dimension(self, collection_name: str, query_embedding: List[float]) -> bool:
+        """
+        Check that query_embedding dimension matches collection's cached dimension.
+
+        Returns True if dimensions match (or the dimension is not yet known), False on mismatch.
+        """
+        expected = self._dims.get(collection_name)
+        actual = len(query_embedding)
+        if expected is not None and expected != actual:
+            print(
+                f"[VectorDB] Dimension mismatch in '{collection_name}': "
+                f"collection has {expected}d, query has {actual}d. "
+                f"Run 'python backend/scripts/repair_chromadb.py' to fix."
+            )
+            return False
+        return True
+
+    def cached_count(self, collection_name: str) -> int:
+        """
+        Return the cached size of a collection without a ChromaDB round trip.
+
+        Args:
+            collection_name: One of 'entities', 'chunks'
+        """
+        if self._counts.get(collection_name, 0) == 0:
+            col = {
+                "entities": self.entity_collection,
+                "chunks": self.chunk_collection,
+            }[collection_name]
+            self._refresh_stats(collection_name, col)
+        return self._counts.get(collection_name, 0)
+
+    def _query(
+        self,
+        collection,
+        collection_name: str,
+        query_embedding: List[float],
+        top_k: int,
+        filter_metadata: Optional[Dict],
+        timings: Optional[Dict],
+        known_ids: Optional[set] = None,
+    ) -> List[Dict]:
+        """
+        Shared search path for entities and chunks.
+
+        In steady state this is a single collection.query() call. ChromaDB
+        clamps n_results to the number of matching items itself, so no
+        count() is needed up front.
+
+        With ``known_ids`` (ids whose text/metadata the caller already holds)
+        the query returns ids and distances only, and documents/metadatas
+        are fetched just for the ids not in the set; known results come back
+        with text and metadata of None.
+        """
+        t_start = time.perf_counter()
+
+        if not self._check_dimension(collection_name, query_embedding):
+            return []
+        if self.cached_count(collection_name) == 0:
+            return []
+
+        where = filter_metadata if filter_metadata else None
+        t_query = time.perf_counter()
+        if known_ids:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=top_k,
+                where=where,
+                include=["distances"],
+            )
+            ids = results["ids"][0] if results["ids"] else []
+            missing = [i for i in ids if i not in known_ids]
+            payload = {}
+            if missing:
+                fetched = collection.get(ids=missing, include=["documents", "metadatas"])
+                for j, item_id in enumerate(fetched["ids"]):
+                    payload[item_id] = (
+                        fetched["documents"][j],
+                        fetched["metadatas"][j] if fetched["metadatas"] else {},
                     )
-                    return False
-            return True
+            results["documents"] = [[payload.get(i, (None, None))[0] for i in ids]]
+            results["metadatas"] = [[payload.get(i, (None, None))[1] for i in ids]]
+        else:
+            results = collection.query(
+                query_embeddings=[query_embedding],
+                n_results=top_k,
+                where=where
+            )
+        t_done = time.perf_counter()
+        add_timing("vector_db", (t_done - t_query) * 1000)
+
+        formatted = []
+        if results["ids"] and len(results["ids"][0]) > 0:
+            for i in range(len(results["ids"][0])):
+                formatted.append({
+                    "id": results["ids"][0][i],
+                    "text": results["documents"][0][i],
+                    "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
+                    "distance": results["distances"][0][i] if "distances" in results and results["distances"] else None
+                })
+
+        if timings is not None:
+            timings["overhead_ms"] = round((t_query - t_start) * 1000, 2)
+            timings["query_ms"] = round((t_done - t_query) * 1000, 2)
+            timings["format_ms"] = round((time.perf_counter() - t_done) * 1000, 2)
+            timings["results"] = len(formatted)
+            if known_ids:
+                timings["reused"] = sum(1 for r in formatted if r["text"] is None)
+
+        return formatted
+
+    @staticmethod
+    def _clean_metadata(metadata: Dict) -> Dict:
+        """Filter out None values - ChromaDB only accepts str, int, float, bool."""
+        cleaned_metadata = {}
+        for k, v in metadata.items():
+            if v is None:
+                cleaned_metadata[k] = ""
+            elif isinstance(v, (str, int, float, bool)):
+                cleaned_metadata[k] = v
+            else:
+                cleaned_metadata[k] = str(v)
+        return cleaned_metadata
+
+    @classmethod
+    def _clean_metadata_bulk(
+        cls,
+        metadatas: Optional[Sequence[Optional[Dict]]],
+        id_field: str,
+        ids: Sequence[str],
+    ) -> List[Dict]:
+        """
+        Clean a whole batch of metadata dicts in one pass.
+
+        Stamps each record with its id under ``id_field`` (as add_chunk /
+        add_entity do) without mutating the caller's dicts.
+        """
+        if metadatas is None:
+            return [{id_field: record_id} for record_id in ids]
+        if len(metadatas) != len(ids):
+            raise ValueError(
+                f"metadatas has {len(metadatas)} entries but ids has {len(ids)}"
+            )
+        return [
+            cls._clean_metadata({**(meta or {}), id_field: record_id})
+            for meta, record_id in zip(metadatas, ids)
+        ]
+
+    def _upsert_batch_size(self, batch_size: Optional[int]) -> int:
+        """Resolve the upsert batch size, capped at ChromaDB's own limit."""
+        size = batch_size or VECTOR_DB_UPSERT_BATCH_SIZE
+        try:
+            size = min(size, self.client.get_max_batch_size())
         except Exception:
-            return True  # If we can't check, let the query proceed
+            pass
+        return max(1, size)
+
+    def _upsert_bulk(
+        self,
+        collection,
+        collection_name: str,
+        id_field: str,
+        ids: Sequence[str],
+        embeddings: Any,
+        documents: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Dict]]],
+        batch_size: Optional[int],
+    ) -> Dict[str, Any]:
+        """
+        Shared bulk upsert path for chunks and entities.
+
+        Returns:
+            Dict with: written, batches, elapsed_ms, vectors_per_sec
+        """
+        t_start = time.perf_counter()
+        ids = list(ids)
+        if not ids:
+            return {"written": 0, "batches": 0, "elapsed_ms": 0.0, "vectors_per_sec": 0.0}
+
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        if vectors.ndim != 2 or vectors.shape[0] != len(ids):
+            raise ValueError(
+                f"embeddings must be a 2-D array with one row per id "
+                f"(got shape {vectors.shape} for {len(ids)} ids)"
+            )
+        if len(documents) != len(ids):
+            raise ValueError(
+                f"documents has {len(documents)} entries but ids has {len(ids)}"
+            )
+        self._check_write_dimension(collection_name, vectors.shape[1])
+
+        cleaned = self._clean_metadata_bulk(metadatas, id_field, ids)
+        size = self._upsert_batch_size(batch_size)
+
+        batches = 0
+        for start in range(0, len(ids), size):
+            end = start + size
+            collection.upsert(
+                ids=ids[start:end],
+                embeddings=vectors[start:end],
+                documents=list(documents[start:end]),
+                metadatas=cleaned[start:end],
+            )
+            batches += 1
+        self._record_write(collection_name, vectors.shape[1], len(ids))
+
+        elapsed = time.perf_counter() - t_start
+        return {
+            "written": len(ids),
+            "batches": batches,
+            "elapsed_ms": round(elapsed * 1000, 2),
+            "vectors_per_sec": round(len(ids) / elapsed, 1) if elapsed > 0 else 0.0,
+        }
 
     # =====================
     # Entity Methods
@@ -152,33 +474,14 @@ class VectorDBService:
             metadata: Optional metadata (entity_type, name, etc.)
         """
         # Check dimension consistency with existing embeddings
-        if self.entity_collection.count() > 0:
-            sample = self.entity_collection.peek(1)
-            if sample and sample.get("embeddings") is not None and len(sample["embeddings"]) > 0:
-                expected = len(sample["embeddings"][0])
-                actual = len(embedding)
-                if expected != actual:
-                    raise ValueError(
-                        f"Embedding dimension mismatch: entity collection has {expected} dims, "
-                        f"new embedding has {actual} dims. "
-                        f"Delete data/chromadb/ and re-ingest with consistent embedding model."
-                    )
+        self._check_write_dimension("entities", len(embedding))
 
         metadata = metadata or {}
         metadata["entity_key"] = entity_key
-
-        # Filter out None values - ChromaDB only accepts str, int, float, bool
-        cleaned_metadata = {}
-        for k, v in metadata.items():
-            if v is None:
-                cleaned_metadata[k] = ""
-            elif isinstance(v, (str, int, float, bool)):
-                cleaned_metadata[k] = v
-            else:
-                cleaned_metadata[k] = str(v)
+        cleaned_metadata = self._clean_metadata(metadata)
 
         # Truncate text to avoid storage issues
-        text_truncated = text[:10000] if len(text) > 10000 else text
+        text_truncated = text[:ENTITY_TEXT_MAX_CHARS] if len(text) > ENTITY_TEXT_MAX_CHARS else text
 
         self.entity_collection.upsert(
             ids=[entity_key],
@@ -186,12 +489,45 @@ class VectorDBService:
             documents=[text_truncated],
             metadatas=[cleaned_metadata]
         )
+        self._record_write("entities", len(embedding), 1)
+
+    def add_entities_bulk(
+        self,
+        entity_keys: Sequence[str],
+        embeddings: Any,
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Dict]]] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add or update many entity embeddings in batched upserts.
+
+        Args:
+            entity_keys: Unique entity keys, one per row
+            embeddings: (n, dim) array-like of vectors (stored as float32)
+            texts: Entity text content, one per row (truncated like add_entity)
+            metadatas: Optional per-row metadata (entity_type, name, case_id, etc.)
+            batch_size: Vectors per upsert (defaults to VECTOR_DB_UPSERT_BATCH_SIZE)
+
+        Returns:
+            Dict with: written, batches, elapsed_ms, vectors_per_sec
+        """
+        documents = [
+            t[:ENTITY_TEXT_MAX_CHARS] if len(t) > ENTITY_TEXT_MAX_CHARS else t
+            for t in texts
+        ]
+        return self._upsert_bulk(
+            self.entity_collection, "entities", "entity_key",
+            entity_keys, embeddings, documents, metadatas, batch_size,
+        )
 
     def search_entities(
         self,
         query_embedding: List[float],
         top_k: int = 50,
-        filter_metadata: Optional[Dict] = None
+        filter_metadata: Optional[Dict] = None,
+        timings: Optional[Dict] = None,
+        known_ids: Optional[set] = None,
     ) -> List[Dict]:
         """
         Search for similar entities.
@@ -200,6 +536,8 @@ class VectorDBService:
             query_embedding: Query vector embedding
             top_k: Number of results to return
             filter_metadata: Optional metadata filters (e.g., {"entity_type": "Person"})
+            timings: Optional dict filled with per-call overhead/query timings (ms)
+            known_ids: Ids the caller already holds; only distances are returned for them
 
         Returns:
             List of dicts with: id (entity_key), text, metadata, distance
@@ -208,35 +546,11 @@ class VectorDBService:
             print("[VectorDB] Entity collection is unhealthy — skipping search. Run repair_chromadb.py.")
             return []
 
-        if not self._check_dimension(self.entity_collection, "entities", query_embedding):
-            return []
-
-        where = filter_metadata if filter_metadata else None
-
-        # Clamp n_results to collection size
-        count = self.entity_collection.count()
-        if count == 0:
-            return []
-        n_results = min(top_k, count)
-
         try:
-            results = self.entity_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=where
+            return self._query(
+                self.entity_collection, "entities", query_embedding,
+                top_k, filter_metadata, timings, known_ids,
             )
-
-            formatted = []
-            if results["ids"] and len(results["ids"][0]) > 0:
-                for i in range(len(results["ids"][0])):
-                    formatted.append({
-                        "id": results["ids"][0][i],
-                        "text": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                        "distance": results["distances"][0][i] if "distances" in results and results["distances"] else None
-                    })
-
-            return formatted
         except Exception as e:
             print(f"[VectorDB] Entity search error: {e}")
             return []
@@ -245,6 +559,7 @@ class VectorDBService:
         """Delete an entity embedding."""
         try:
             self.entity_collection.delete(ids=[entity_key])
+            self._record_delete("entities")
         except Exception as e:
             print(f"[VectorDB] Entity delete error: {e}")
 
@@ -266,7 +581,9 @@ class VectorDBService:
     def count_entities(self) -> int:
         """Get the total number of entities in the collection."""
         try:
-            return self.entity_collection.count()
+            count = self.entity_collection.count()
+            self._counts["entities"] = count
+            return count
         except Exception as e:
             print(f"[VectorDB] Entity count error: {e}")
             return 0
@@ -292,30 +609,11 @@ class VectorDBService:
             metadata: Metadata including doc_id, doc_name, case_id, chunk_index, etc.
         """
         # Check dimension consistency with existing embeddings
-        if self.chunk_collection.count() > 0:
-            sample = self.chunk_collection.peek(1)
-            if sample and sample.get("embeddings") is not None and len(sample["embeddings"]) > 0:
-                expected = len(sample["embeddings"][0])
-                actual = len(embedding)
-                if expected != actual:
-                    raise ValueError(
-                        f"Embedding dimension mismatch: chunk collection has {expected} dims, "
-                        f"new embedding has {actual} dims. "
-                        f"Delete data/chromadb/ and re-ingest with consistent embedding model."
-                    )
+        self._check_write_dimension("chunks", len(embedding))
 
         metadata = metadata or {}
         metadata["chunk_id"] = chunk_id
-
-        # Filter out None values - ChromaDB only accepts str, int, float, bool
-        cleaned_metadata = {}
-        for k, v in metadata.items():
-            if v is None:
-                cleaned_metadata[k] = ""
-            elif isinstance(v, (str, int, float, bool)):
-                cleaned_metadata[k] = v
-            else:
-                cleaned_metadata[k] = str(v)
+        cleaned_metadata = self._clean_metadata(metadata)
 
         self.chunk_collection.upsert(
             ids=[chunk_id],
@@ -323,12 +621,58 @@ class VectorDBService:
             documents=[text],
             metadatas=[cleaned_metadata]
         )
+        self._record_write("chunks", len(embedding), 1)
+        chunk_lexical_index.add_chunks([chunk_id], [text], [cleaned_metadata])
+
+    def add_chunks_bulk(
+        self,
+        chunk_ids: Sequence[str],
+        embeddings: Any,
+        texts: Sequence[str],
+        metadatas: Optional[Sequence[Optional[Dict]]] = None,
+        batch_size: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Add or update many chunk embeddings in batched upserts.
+
+        Args:
+            chunk_ids: Unique chunk identifiers, one per row
+            embeddings: (n, dim) array-like of vectors (stored as float32)
+            texts: Chunk text content, one per row
+            metadatas: Optional per-row metadata (doc_id, doc_name, case_id, chunk_index, etc.)
+            batch_size: Vectors per upsert (defaults to VECTOR_DB_UPSERT_BATCH_SIZE)
+
+        Returns:
+            Dict with: written, batches, elapsed_ms, vectors_per_sec
+        """
+        result = self._upsert_bulk(
+            self.chunk_collection, "chunks", "chunk_id",
+            chunk_ids, embeddings, texts, metadatas, batch_size,
+        )
+        # Keep the per-case BM25 index in step with the vector store
+        chunk_lexical_index.add_chunks(
+            chunk_ids, texts,
+            [dict(m or {}, chunk_id=cid) for cid, m in zip(chunk_ids, metadatas or [None] * len(chunk_ids))],
+        )
+        return result
+
+    def _delete_lexical(self, ids: Optional[List[str]], metadatas: Optional[List[Dict]]) -> None:
+        """Mirror a chunk delete into the per-case BM25 indexes."""
+        by_case: Dict[str, List[str]] = {}
+        for chunk_id, metadata in zip(ids or [], metadatas or []):
+            case_id = (metadata or {}).get("case_id")
+            if case_id:
+                by_case.setdefault(str(case_id), []).append(chunk_id)
+        for case_id, case_chunk_ids in by_case.items():
+            chunk_lexical_index.delete_chunks(case_id, case_chunk_ids)
 
     def search_chunks(
         self,
         query_embedding: List[float],
         top_k: int = 50,
-        filter_metadata: Optional[Dict] = None
+        filter_metadata: Optional[Dict] = None,
+        timings: Optional[Dict] = None,
+        known_ids: Optional[set] = None,
     ) -> List[Dict]:
         """
         Search for similar chunks.
@@ -337,6 +681,8 @@ class VectorDBService:
             query_embedding: Query vector embedding
             top_k: Number of results to return
             filter_metadata: Optional metadata filters (e.g., {"case_id": "case_123"})
+            timings: Optional dict filled with per-call overhead/query timings (ms)
+            known_ids: Ids the caller already holds; only distances are returned for them
 
         Returns:
             List of dicts with: id (chunk_id), text, metadata, distance
@@ -345,35 +691,11 @@ class VectorDBService:
             print("[VectorDB] Chunks collection is unhealthy — skipping search. Run repair_chromadb.py.")
             return []
 
-        if not self._check_dimension(self.chunk_collection, "chunks", query_embedding):
-            return []
-
-        where = filter_metadata if filter_metadata else None
-
-        # Clamp n_results to collection size
-        count = self.chunk_collection.count()
-        if count == 0:
-            return []
-        n_results = min(top_k, count)
-
         try:
-            results = self.chunk_collection.query(
-                query_embeddings=[query_embedding],
-                n_results=n_results,
-                where=where
+            return self._query(
+                self.chunk_collection, "chunks", query_embedding,
+                top_k, filter_metadata, timings, known_ids,
             )
-
-            formatted = []
-            if results["ids"] and len(results["ids"][0]) > 0:
-                for i in range(len(results["ids"][0])):
-                    formatted.append({
-                        "id": results["ids"][0][i],
-                        "text": results["documents"][0][i],
-                        "metadata": results["metadatas"][0][i] if results["metadatas"] else {},
-                        "distance": results["distances"][0][i] if "distances" in results and results["distances"] else None
-                    })
-
-            return formatted
         except Exception as e:
             print(f"[VectorDB] Chunk search error: {e}")
             return []
@@ -381,7 +703,9 @@ class VectorDBService:
     def count_chunks(self) -> int:
         """Get the total number of chunks in the collection."""
         try:
-            return self.chunk_collection.count()
+            count = self.chunk_collection.count()
+            self._counts["chunks"] = count
+            return count
         except Exception as e:
             print(f"[VectorDB] Chunk count error: {e}")
             return 0
@@ -389,16 +713,64 @@ class VectorDBService:
     def delete_chunks_by_doc(self, doc_id: str) -> None:
         """Delete all chunks belonging to a document."""
         try:
-            results = self.chunk_collection.get(where={"doc_id": doc_id})
+            results = self.chunk_collection.get(where={"doc_id": doc_id}, include=["metadatas"])
             if results and results["ids"]:
                 self.chunk_collection.delete(ids=results["ids"])
+                self._record_delete("chunks")
+                self._delete_lexical(results["ids"], results["metadatas"])
         except Exception as e:
             print(f"[VectorDB] Delete chunks error: {e}")
 
+    def get_chunk_vectors(self, chunk_ids: Sequence[str]) -> Dict[str, Dict]:
+        """
+        Stored embedding, text and metadata of chunks by id (missing ids omitted).
+
+        Used by incremental re-ingestion to move unchanged chunks to a new
+        index without re-embedding them.
+        """
+        if not chunk_ids:
+            return {}
+        try:
+            results = self.chunk_collection.get(
+                ids=list(chunk_ids), include=["embeddings", "documents", "metadatas"]
+            )
+        except Exception as e:
+            print(f"[VectorDB] Chunk vector fetch error: {e}")
+            return {}
+        embeddings = results.get("embeddings")
+        if embeddings is None:
+            embeddings = [None] * len(results["ids"])
+        return {
+            chunk_id: {"embedding": embedding, "text": text, "metadata": metadata or {}}
+            for chunk_id, embedding, text, metadata in zip(
+                results["ids"], embeddings, results.get("documents") or [], results.get("metadatas") or []
+            )
+            if embedding is not None
+        }
+
+    def delete_chunks(self, chunk_ids: Sequence[str]) -> int:
+        """Delete chunk embeddings by id. Returns the number that existed."""
+        if not chunk_ids:
+            return 0
+        try:
+            existing = self.chunk_collection.get(ids=list(chunk_ids), include=["metadatas"])
+            if not existing["ids"]:
+                return 0
+            self.chunk_collection.delete(ids=existing["ids"])
+            self._record_delete("chunks")
+            self._delete_lexical(existing["ids"], existing["metadatas"])
+            return len(existing["ids"])
+        except Exception as e:
+            print(f"[VectorDB] Chunk delete error: {e}")
+            return 0
+
     def delete_chunk(self, chunk_id: str) -> None:
         """Delete a single chunk embedding."""
         try:
+            existing = self.chunk_collection.get(ids=[chunk_id], include=["metadatas"])
             self.chunk_collection.delete(ids=[chunk_id])
+            self._record_delete("chunks")
+            self._delete_lexical(existing["ids"], existing["metadatas"])
         except Exception as e:
             print(f"[VectorDB] Chunk delete error: {e}")
 
@@ -408,10 +780,12 @@ class VectorDBService:
 
     def delete_chunks_by_case(self, case_id: str) -> int:
         """Delete all chunk embeddings for a case. Returns count deleted."""
+        chunk_lexical_index.delete_case(case_id)
         try:
-            results = self.chunk_collection.get(where={"case_id": case_id})
+            results = self.chunk_collection.get(where={"case_id": case_id}, include=[])
             if results and results["ids"]:
                 self.chunk_collection.delete(ids=results["ids"])
+                self._record_delete("chunks")
                 return len(results["ids"])
             return 0
         except Exception as e:
@@ -424,6 +798,7 @@ class VectorDBService:
             results = self.entity_collection.get(where={"case_id": case_id})
             if results and results["ids"]:
                 self.entity_collection.delete(ids=results["ids"])
+                self._record_delete("entities")
                 return len(results["ids"])
             return 0
         except Exception as e:
@@ -473,7 +848,11 @@ class VectorDBService:
                 "entities": self.entity_collection,
                 "chunks": self.chunk_collection,
             }[collection_name]
+            existing = col.get(ids=ids, include=["metadatas"]) if collection_name == "chunks" else None
             col.delete(ids=ids)
+            self._record_delete(collection_name)
+            if existing:
+                self._delete_lexical(existing["ids"], existing["metadatas"])
             return len(ids)
         except Exception as e:
             print(f"[VectorDB] delete_by_ids error: {e}")
@@ -7,21 +7,41 @@ Handles workspace-specific business logic for case workspaces including:
 - Task management
 - Deadline tracking
 - Pinned evidence
+
+Storage: data/workspace.db (SQLite, WAL), shared by all workers.
+
+  - ``workspace_items`` holds every workspace record (contexts, witnesses,
+    theories, tasks, deadline configs, pins, notes, findings), one row per
+    record keyed by (case_id, kind, item_id). Reads are index seeks on the
+    case, and a save writes only the record it changes.
+  - ``workspace_timeline`` is the investigation-timeline view of those
+    records: each save/delete replaces the changed record's events in the
+    same transaction, so get_investigation_timeline reads the case's events
+    from the (case_id, date) index instead of rebuilding them from every
+    store. Events from other stores (snapshots, evidence, system logs) are
+    merged in from their own per-case indexed queries.
+
+The previous per-kind JSON files (witnesses.json, theories.json, ...) are
+imported the first time the database is opened and renamed to
+``<name>.migrated``.
 """
 
 import json
-from pathlib import Path
-from typing import Dict, List, Optional, Any
-from datetime import datetime
+import sqlite3
 import uuid
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from threading import Lock
+from typing import Callable, Dict, List, Optional, Any
 
-from services._json_file_lock import save_json_atomic
+from services._legacy_import import import_into_sqlite, read_json
 
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
 STORAGE_DIR = BASE_DIR / "data"
+DB_FILE = STORAGE_DIR / "workspace.db"
 
-# Storage files
-WORKSPACE_SESSIONS_FILE = STORAGE_DIR / "workspace_sessions.json"
+# Legacy storage files, imported into DB_FILE on first open
 CASE_CONTEXTS_FILE = STORAGE_DIR / "case_contexts.json"
 WITNESSES_FILE = STORAGE_DIR / "witnesses.json"
 THEORIES_FILE = STORAGE_DIR / "theories.json"
@@ -31,6 +51,58 @@ PINNED_ITEMS_FILE = STORAGE_DIR / "pinned_items.json"
 NOTES_FILE = STORAGE_DIR / "investigative_notes.json"
 FINDINGS_FILE = STORAGE_DIR / "findings.json"
 
+# kind -> (legacy file, id field). Contexts and deadline configs are one
+# record per case (item_id ""); the other files map case_id -> {id: record}.
+_LEGACY_FILES = {
+    "context": (CASE_CONTEXTS_FILE, None),
+    "witness": (WITNESSES_FILE, "witness_id"),
+    "theory": (THEORIES_FILE, "theory_id"),
+    "task": (TASKS_FILE, "task_id"),
+    "deadlines": (CASE_DEADLINES_FILE, None),
+    "pin": (PINNED_ITEMS_FILE, "pin_id"),
+    "note": (NOTES_FILE, "note_id"),
+    "finding": (FINDINGS_FILE, "finding_id"),
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS workspace_items (
+    case_id    TEXT NOT NULL,
+    kind       TEXT NOT NULL,
+    item_id    TEXT NOT NULL,
+    created_at TEXT NOT NULL DEFAULT '',
+    data       TEXT NOT NULL,
+    PRIMARY KEY (case_id, kind, item_id)
+);
+CREATE INDEX IF NOT EXISTS idx_workspace_items_created ON workspace_items(case_id, kind, created_at);
+
+CREATE TABLE IF NOT EXISTS workspace_timeline (
+    case_id TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    seq     INTEGER NOT NULL,
+    date    TEXT NOT NULL,
+    rank    INTEGER NOT NULL,
+    event   TEXT NOT NULL,
+    PRIMARY KEY (case_id, kind, item_id, seq)
+);
+CREATE INDEX IF NOT EXISTS idx_workspace_timeline_date ON workspace_timeline(case_id, date, rank);
+"""
+
+# Bump when the timeline event builders change; the view is rebuilt on open
+_TIMELINE_VERSION = 1
+
+# Timeline section order: events with the same date keep this order
+_RANK_WITNESS = 1
+_RANK_TASK = 2
+_RANK_THEORY = 3
+_RANK_SNAPSHOT = 4
+_RANK_EVIDENCE = 5
+_RANK_PIN = 6
+_RANK_NOTE = 7
+_RANK_DOCUMENT = 8
+_RANK_DEADLINE = 9
+_RANK_SYSTEM = 10
+
 
 def ensure_storage_dir():
     """Ensure the storage directory exists."""
@@ -50,182 +122,495 @@ def load_json_file(file_path: Path, default: Any = None) -> Any:
         return default if default is not None else {}
 
 
-def save_json_file(file_path: Path, data: Any):
-    """Save data to JSON file atomically.
+def _read_legacy_file(file_path: Path) -> Dict:
+    """Legacy files map case_id -> data; anything else is left unimported."""
+    data = read_json(file_path)
+    if not isinstance(data, dict):
+        raise ValueError("unexpected format")
+    return data
 
-    Single write choke point for all workspace stores (contexts, witnesses,
-    theories, tasks, deadlines, notes, findings, pinned items). Locked +
-    unique-temp atomic write serialises across uvicorn workers and avoids
-    the shared-`.tmp` rename race. See services._json_file_lock.
-    """
-    ensure_storage_dir()
-    try:
-        save_json_atomic(file_path, data, default=str)
-    except IOError as e:
-        print(f"Error saving {file_path}: {e}")
-        raise
+
+# ----------------------------------------------------------------------
+# Investigation timeline events per workspace record
+# ----------------------------------------------------------------------
+
+def _witness_events(case_id: str, witness: Dict) -> List[Dict]:
+    """Witness creation and interview dates."""
+    events = []
+    created_at = witness.get("created_at") or witness.get("added_at")
+    if created_at:
+        events.append({
+            "id": f"witness_{witness.get('witness_id')}",
+            "type": "witness_created",
+            "thread": "Witnesses",
+            "date": created_at,
+            "title": f"Witness Added: {witness.get('name', 'Unknown')}",
+            "description": f"Witness {witness.get('name', 'Unknown')} added to case",
+            "metadata": {"witness_id": witness.get("witness_id")},
+        })
+
+    # Witness interview dates (from interviews array)
+    interviews = witness.get("interviews", [])
+    if isinstance(interviews, list):
+        for idx, interview in enumerate(interviews):
+            interview_date = interview.get("interview_date") or interview.get("date") or interview.get("scheduled_date")
+            if interview_date:
+                interview_id = interview.get("interview_id") or f"interview_{idx}"
+                # Use hash to ensure uniqueness
+                interview_hash = hash(f"{witness.get('witness_id')}_{interview_id}_{interview_date}") % 10000
+                events.append({
+                    "id": f"witness_interview_{witness.get('witness_id')}_{interview_id}_{interview_hash}",
+                    "type": "witness_interview",
+                    "thread": "Witnesses",
+                    "date": interview_date,
+                    "title": f"Interview: {witness.get('name', 'Unknown')}",
+                    "description": interview.get("notes") or interview.get("summary") or f"Interview with {witness.get('name', 'Unknown')}",
+                    "metadata": {
+                        "witness_id": witness.get("witness_id"),
+                        "witness_name": witness.get("name"),
+                        "interview_id": interview_id,
+                        "interviewer": interview.get("interviewer"),
+                    },
+                })
+
+    # Also check for direct interview_date field on witness (legacy)
+    interview_date = witness.get("interview_date") or witness.get("interviewed_at")
+    if interview_date and not any(e.get("type") == "witness_interview" for e in events):
+        events.append({
+            "id": f"witness_interview_{witness.get('witness_id')}_legacy",
+            "type": "witness_interview",
+            "thread": "Witnesses",
+            "date": interview_date,
+            "title": f"Interview: {witness.get('name', 'Unknown')}",
+            "description": f"Interview conducted with {witness.get('name', 'Unknown')}",
+            "metadata": {"witness_id": witness.get("witness_id"), "name": witness.get("name")},
+        })
+    return events
+
+
+def _task_events(case_id: str, task: Dict) -> List[Dict]:
+    """Task creation, due date and latest status change."""
+    events = []
+    created_at = task.get("created_at")
+    if created_at:
+        events.append({
+            "id": f"task_created_{task.get('task_id')}",
+            "type": "task_created",
+            "thread": "Tasks",
+            "date": created_at,
+            "title": f"Task Created: {task.get('title', 'Untitled')}",
+            "description": task.get("description", ""),
+            "metadata": {"task_id": task.get("task_id"), "priority": task.get("priority")},
+        })
+
+    due_date = task.get("due_date")
+    if due_date:
+        events.append({
+            "id": f"task_due_{task.get('task_id')}",
+            "type": "task_due",
+            "thread": "Tasks",
+            "date": due_date,
+            "title": f"Task Due: {task.get('title', 'Untitled')}",
+            "description": f"Due date for task: {task.get('title', 'Untitled')}",
+            "metadata": {"task_id": task.get("task_id"), "priority": task.get("priority")},
+        })
+
+    status = task.get("status")
+    status_text = task.get("status_text")
+    if status or status_text:
+        updated_at = task.get("updated_at")
+        if updated_at and updated_at != created_at:
+            # Use a hash of the status to ensure uniqueness if multiple status changes happen at same time
+            status_hash = hash(f"{status}_{status_text}_{updated_at}") % 10000
+            events.append({
+                "id": f"task_status_{task.get('task_id')}_{updated_at}_{status_hash}",
+                "type": "task_status_change",
+                "thread": "Tasks",
+                "date": updated_at,
+                "title": f"Task Status: {status_text or status}",
+                "description": f"Task '{task.get('title', 'Untitled')}' status changed",
+                "metadata": {"task_id": task.get("task_id"), "status": status, "status_text": status_text},
+            })
+    return events
+
+
+def _theory_events(case_id: str, theory: Dict) -> List[Dict]:
+    """Theory creation (attorney-only theories stay off the shared timeline)."""
+    created_at = theory.get("created_at")
+    if not created_at or theory.get("privilege_level") == "ATTORNEY_ONLY":
+        return []
+    return [{
+        "id": f"theory_{theory.get('theory_id')}",
+        "type": "theory_created",
+        "thread": "Theories",
+        "date": created_at,
+        "title": f"Theory Created: {theory.get('title', 'Untitled')}",
+        "description": theory.get("hypothesis", ""),
+        "metadata": {"theory_id": theory.get("theory_id"), "confidence": theory.get("confidence_score")},
+    }]
+
+
+def _pin_events(case_id: str, pinned: Dict) -> List[Dict]:
+    """Evidence pinning date."""
+    pinned_at = pinned.get("pinned_at") or pinned.get("created_at")
+    if not pinned_at:
+        return []
+    item_type = pinned.get("item_type", "unknown")
+    item_id = pinned.get("item_id", "")
+    return [{
+        "id": f"pinned_{pinned.get('pin_id')}",
+        "type": "evidence_pinned",
+        "thread": "Pinned Items",
+        "date": pinned_at,
+        "title": f"Item Pinned: {item_type}",
+        "description": f"{item_type} pinned to case",
+        "metadata": {"pin_id": pinned.get("pin_id"), "item_type": item_type, "item_id": item_id},
+    }]
+
+
+def _note_events(case_id: str, note: Dict) -> List[Dict]:
+    """Investigative note creation and latest update."""
+    events = []
+    created_at = note.get("created_at")
+    if created_at:
+        events.append({
+            "id": f"note_created_{note.get('note_id')}",
+            "type": "note_created",
+            "thread": "Notes",
+            "date": created_at,
+            "title": f"Note Created: {note.get('title', 'Untitled')}",
+            "description": note.get("content", "")[:100] + "..." if len(note.get("content", "")) > 100 else note.get("content", ""),
+            "metadata": {"note_id": note.get("note_id")},
+        })
+
+    updated_at = note.get("updated_at")
+    if updated_at and updated_at != created_at:
+        # Use hash to ensure uniqueness if multiple updates at same time
+        update_hash = hash(f"{note.get('note_id')}_{updated_at}") % 10000
+        events.append({
+            "id": f"note_updated_{note.get('note_id')}_{updated_at}_{update_hash}",
+            "type": "note_updated",
+            "thread": "Notes",
+            "date": updated_at,
+            "title": f"Note Updated: {note.get('title', 'Untitled')}",
+            "description": f"Note '{note.get('title', 'Untitled')}' was updated",
+            "metadata": {"note_id": note.get("note_id")},
+        })
+    return events
+
+
+def _deadline_events(case_id: str, deadline_config: Dict) -> List[Dict]:
+    """Trial date and individual case deadlines."""
+    events = []
+    trial_date = deadline_config.get("trial_date")
+    if trial_date:
+        events.append({
+            "id": f"deadline_trial_{case_id}",
+            "type": "trial_date",
+            "thread": "Deadlines",
+            "date": trial_date,
+            "title": f"Trial Date: {deadline_config.get('court', 'Unknown Court')}",
+            "description": f"Trial scheduled at {deadline_config.get('court', 'Unknown Court')}",
+            "metadata": {"court": deadline_config.get("court"), "judge": deadline_config.get("judge")},
+        })
+
+    for idx, deadline in enumerate(deadline_config.get("deadlines", [])):
+        due_date = deadline.get("due_date")
+        if due_date:
+            deadline_id = deadline.get("deadline_id") or f"deadline_{idx}_{due_date}"
+            events.append({
+                "id": f"deadline_{deadline_id}",
+                "type": "deadline",
+                "thread": "Deadlines",
+                "date": due_date,
+                "title": f"Deadline: {deadline.get('title', 'Untitled')}",
+                "description": deadline.get("title", ""),
+                "metadata": {"deadline_id": deadline.get("deadline_id"), "urgency": deadline.get("urgency")},
+            })
+    return events
+
+
+# kind -> (timeline section rank, event builder); kinds not listed have no events
+_TIMELINE_BUILDERS: Dict[str, tuple] = {
+    "witness": (_RANK_WITNESS, _witness_events),
+    "task": (_RANK_TASK, _task_events),
+    "theory": (_RANK_THEORY, _theory_events),
+    "pin": (_RANK_PIN, _pin_events),
+    "note": (_RANK_NOTE, _note_events),
+    "deadlines": (_RANK_DEADLINE, _deadline_events),
+}
 
 
 class WorkspaceService:
     """Service for managing workspace data."""
-    
-    def __init__(self):
-        self._case_contexts = load_json_file(CASE_CONTEXTS_FILE, {})
-        self._witnesses = load_json_file(WITNESSES_FILE, {})
-        self._theories = load_json_file(THEORIES_FILE, {})
-        self._tasks = load_json_file(TASKS_FILE, {})
-        self._deadlines = load_json_file(CASE_DEADLINES_FILE, {})
-        self._pinned_items = load_json_file(PINNED_ITEMS_FILE, {})
-        self._notes = load_json_file(NOTES_FILE, {})
-        self._findings = load_json_file(FINDINGS_FILE, {})
+
+    def __init__(self, db_file: Path = DB_FILE, import_legacy: bool = True):
+        self.db_file = Path(db_file)
+        self._import_legacy = import_legacy
+        self._lock = Lock()
+        self._initialised = False
+
+    # ------------------------------------------------------------------
+    # Storage
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_file.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(self.db_file, timeout=30.0, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA busy_timeout=30000")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        if not self._initialised:
+            with self._lock:
+                if not self._initialised:
+                    conn.executescript(_SCHEMA)
+                    if self._import_legacy:
+                        self._migrate_legacy_files(conn)
+                    if conn.execute("PRAGMA user_version").fetchone()[0] < _TIMELINE_VERSION:
+                        self._rebuild_timeline(conn)
+                    self._initialised = True
+        return conn
+
+    @contextmanager
+    def _read(self):
+        conn = self._connect()
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    @contextmanager
+    def _write(self):
+        """Connection inside a ``BEGIN IMMEDIATE`` transaction, committed on
+        successful exit and rolled back on error."""
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except BaseException:
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _refresh_timeline(conn: sqlite3.Connection, case_id: str, kind: str, item_id: str, record: Optional[Dict]):
+        """Replace one record's events in the timeline view (caller holds a transaction)."""
+        if kind not in _TIMELINE_BUILDERS:
+            return
+        conn.execute(
+            "DELETE FROM workspace_timeline WHERE case_id = ? AND kind = ? AND item_id = ?",
+            (case_id, kind, item_id),
+        )
+        if record is None:
+            return
+        rank, build = _TIMELINE_BUILDERS[kind]
+        conn.executemany(
+            "INSERT INTO workspace_timeline (case_id, kind, item_id, seq, date, rank, event) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            [
+                (case_id, kind, item_id, seq, str(event["date"]), rank, json.dumps(event, default=str))
+                for seq, event in enumerate(build(case_id, record))
+            ],
+        )
+
+    def _put(self, conn: sqlite3.Connection, case_id: str, kind: str, item_id: str, record: Dict, replace: bool = True) -> bool:
+        """Insert or update one record and its timeline events (caller holds a transaction).
+
+        An update keeps the row's position, so listings stay in insertion order.
+        With replace=False an existing record is left untouched.
+        """
+        created_at = str(record.get("created_at") or record.get("pinned_at") or "")
+        conflict = "DO UPDATE SET created_at = excluded.created_at, data = excluded.data" if replace else "DO NOTHING"
+        cursor = conn.execute(
+            "INSERT INTO workspace_items (case_id, kind, item_id, created_at, data) VALUES (?, ?, ?, ?, ?) "
+            f"ON CONFLICT (case_id, kind, item_id) {conflict}",
+            (case_id, kind, item_id, created_at, json.dumps(record, default=str)),
+        )
+        if cursor.rowcount == 0:
+            return False
+        self._refresh_timeline(conn, case_id, kind, item_id, record)
+        return True
+
+    def _delete(self, case_id: str, kind: str, item_id: str) -> bool:
+        with self._write() as conn:
+            deleted = conn.execute(
+                "DELETE FROM workspace_items WHERE case_id = ? AND kind = ? AND item_id = ?",
+                (case_id, kind, item_id),
+            ).rowcount
+            if deleted:
+                self._refresh_timeline(conn, case_id, kind, item_id, None)
+        return bool(deleted)
+
+    def _save(self, case_id: str, kind: str, item_id: str, record: Dict) -> None:
+        with self._write() as conn:
+            self._put(conn, case_id, kind, item_id, record)
+
+    def _get(self, case_id: str, kind: str, item_id: str = "") -> Optional[Dict]:
+        with self._read() as conn:
+            row = conn.execute(
+                "SELECT data FROM workspace_items WHERE case_id = ? AND kind = ? AND item_id = ?",
+                (case_id, kind, item_id),
+            ).fetchone()
+        return json.loads(row["data"]) if row else None
+
+    def _list(self, case_id: str, kind: str, newest_first: bool = False) -> List[Dict]:
+        """A case's records of one kind, in insertion order or newest first."""
+        order = "created_at DESC, rowid" if newest_first else "rowid"
+        with self._read() as conn:
+            rows = conn.execute(
+                f"SELECT data FROM workspace_items WHERE case_id = ? AND kind = ? ORDER BY {order}",
+                (case_id, kind),
+            ).fetchall()
+        return [json.loads(row["data"]) for row in rows]
+
+    def _migrate_legacy_files(self, conn: sqlite3.Connection) -> None:
+        """One-shot import of the per-kind JSON files (see
+        services._legacy_import). Records already in the database win."""
+        for kind, (path, id_field) in _LEGACY_FILES.items():
+            def write(conn: sqlite3.Connection, data: Dict, kind=kind, id_field=id_field) -> int:
+                imported = 0
+                for case_id, value in data.items():
+                    if not isinstance(value, dict):
+                        continue
+                    if id_field is None:
+                        imported += self._put(conn, case_id, kind, "", value, replace=False)
+                    else:
+                        for item_id, record in value.items():
+                            if isinstance(record, dict):
+                                imported += self._put(conn, case_id, kind, item_id, record, replace=False)
+                return imported
+
+            import_into_sqlite(conn, f"workspace:{kind}", path, write, "Workspace", load=_read_legacy_file)
+
+    def _rebuild_timeline(self, conn: sqlite3.Connection) -> None:
+        """Recompute the whole timeline view (after a builder change)."""
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM workspace_timeline")
+            rows = conn.execute(
+                "SELECT case_id, kind, item_id, data FROM workspace_items ORDER BY rowid"
+            ).fetchall()
+            for row in rows:
+                self._refresh_timeline(conn, row["case_id"], row["kind"], row["item_id"], json.loads(row["data"]))
+            conn.execute(f"PRAGMA user_version = {_TIMELINE_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
 
     def reload(self):
-        """Reload all data from disk."""
-        self._case_contexts = load_json_file(CASE_CONTEXTS_FILE, {})
-        self._witnesses = load_json_file(WITNESSES_FILE, {})
-        self._theories = load_json_file(THEORIES_FILE, {})
-        self._tasks = load_json_file(TASKS_FILE, {})
-        self._deadlines = load_json_file(CASE_DEADLINES_FILE, {})
-        self._pinned_items = load_json_file(PINNED_ITEMS_FILE, {})
-        self._notes = load_json_file(NOTES_FILE, {})
-        self._findings = load_json_file(FINDINGS_FILE, {})
-    
+        """No-op: every read goes to the shared database (kept for callers)."""
+
     # Case Context Methods
     def get_case_context(self, case_id: str) -> Optional[Dict]:
         """Get case context for a case."""
-        return self._case_contexts.get(case_id)
-    
+        return self._get(case_id, "context")
+
     def save_case_context(self, case_id: str, context: Dict):
         """Save case context."""
-        self._case_contexts[case_id] = {
+        self._save(case_id, "context", "", {
             **context,
             "updated_at": datetime.now().isoformat()
-        }
-        save_json_file(CASE_CONTEXTS_FILE, self._case_contexts)
-    
+        })
+
     # Witness Methods
     def get_witnesses(self, case_id: str) -> List[Dict]:
         """Get all witnesses for a case."""
-        case_witnesses = self._witnesses.get(case_id, {})
-        return list(case_witnesses.values())
-    
+        return self._list(case_id, "witness")
+
     def get_witness(self, case_id: str, witness_id: str) -> Optional[Dict]:
         """Get a specific witness."""
-        case_witnesses = self._witnesses.get(case_id, {})
-        return case_witnesses.get(witness_id)
-    
+        return self._get(case_id, "witness", witness_id)
+
     def save_witness(self, case_id: str, witness: Dict) -> str:
         """Save a witness, returning witness_id."""
-        if case_id not in self._witnesses:
-            self._witnesses[case_id] = {}
-        
         witness_id = witness.get("witness_id") or f"witness_{uuid.uuid4().hex[:12]}"
         witness["witness_id"] = witness_id
         witness["case_id"] = case_id
         witness["updated_at"] = datetime.now().isoformat()
-        
+
         if "created_at" not in witness:
             witness["created_at"] = datetime.now().isoformat()
-        
-        self._witnesses[case_id][witness_id] = witness
-        save_json_file(WITNESSES_FILE, self._witnesses)
+
+        self._save(case_id, "witness", witness_id, witness)
         return witness_id
-    
+
     def delete_witness(self, case_id: str, witness_id: str) -> bool:
         """Delete a witness."""
-        if case_id in self._witnesses and witness_id in self._witnesses[case_id]:
-            del self._witnesses[case_id][witness_id]
-            save_json_file(WITNESSES_FILE, self._witnesses)
-            return True
-        return False
-    
+        return self._delete(case_id, "witness", witness_id)
+
     # Theory Methods
     def get_theories(self, case_id: str, user_role: Optional[str] = None) -> List[Dict]:
         """Get all theories for a case, filtered by privilege if user_role provided."""
-        case_theories = self._theories.get(case_id, {})
-        theories = list(case_theories.values())
-        
+        theories = self._list(case_id, "theory", newest_first=True)
+
         # Filter by privilege level if user is not attorney
         if user_role != "attorney":
             theories = [
                 t for t in theories
                 if t.get("privilege_level") != "ATTORNEY_ONLY"
             ]
-        
-        return sorted(theories, key=lambda t: t.get("created_at", ""), reverse=True)
-    
+
+        return theories
+
     def get_theory(self, case_id: str, theory_id: str) -> Optional[Dict]:
         """Get a specific theory."""
-        case_theories = self._theories.get(case_id, {})
-        return case_theories.get(theory_id)
-    
+        return self._get(case_id, "theory", theory_id)
+
     def save_theory(self, case_id: str, theory: Dict) -> str:
         """Save a theory, returning theory_id."""
-        if case_id not in self._theories:
-            self._theories[case_id] = {}
-        
         theory_id = theory.get("theory_id") or f"theory_{uuid.uuid4().hex[:12]}"
         theory["theory_id"] = theory_id
         theory["case_id"] = case_id
         theory["updated_at"] = datetime.now().isoformat()
-        
+
         if "created_at" not in theory:
             theory["created_at"] = datetime.now().isoformat()
-        
-        self._theories[case_id][theory_id] = theory
-        save_json_file(THEORIES_FILE, self._theories)
+
+        self._save(case_id, "theory", theory_id, theory)
         return theory_id
-    
+
     def delete_theory(self, case_id: str, theory_id: str) -> bool:
         """Delete a theory."""
-        if case_id in self._theories and theory_id in self._theories[case_id]:
-            del self._theories[case_id][theory_id]
-            save_json_file(THEORIES_FILE, self._theories)
-            return True
-        return False
-    
+        return self._delete(case_id, "theory", theory_id)
+
     # Task Methods
     def get_tasks(self, case_id: str) -> List[Dict]:
         """Get all tasks for a case."""
-        case_tasks = self._tasks.get(case_id, {})
         return sorted(
-            list(case_tasks.values()),
+            self._list(case_id, "task"),
             key=lambda t: (
                 {"URGENT": 0, "HIGH": 1, "STANDARD": 2}.get(t.get("priority", "STANDARD"), 2),
                 t.get("due_date", "")
             )
         )
-    
+
     def get_task(self, case_id: str, task_id: str) -> Optional[Dict]:
         """Get a specific task."""
-        case_tasks = self._tasks.get(case_id, {})
-        return case_tasks.get(task_id)
-    
+        return self._get(case_id, "task", task_id)
+
     def save_task(self, case_id: str, task: Dict) -> str:
         """Save a task, returning task_id."""
-        if case_id not in self._tasks:
-            self._tasks[case_id] = {}
-        
         task_id = task.get("task_id") or f"task_{uuid.uuid4().hex[:12]}"
         task["task_id"] = task_id
         task["case_id"] = case_id
         task["updated_at"] = datetime.now().isoformat()
-        
+
         if "created_at" not in task:
             task["created_at"] = datetime.now().isoformat()
-        
-        self._tasks[case_id][task_id] = task
-        save_json_file(TASKS_FILE, self._tasks)
+
+        self._save(case_id, "task", task_id, task)
         return task_id
-    
+
     def delete_task(self, case_id: str, task_id: str) -> bool:
         """Delete a task."""
-        if case_id in self._tasks and task_id in self._tasks[case_id]:
-            del self._tasks[case_id][task_id]
-            save_json_file(TASKS_FILE, self._tasks)
-            return True
-        return False
-    
+        return self._delete(case_id, "task", task_id)
+
     # Deadline Methods
     def get_deadlines(self, case_id: str) -> List[Dict]:
         """Get all deadlines for a case (legacy method - returns deadline items from config)."""
@@ -233,11 +618,11 @@ class WorkspaceService:
         if not config:
             return []
         return config.get("deadlines", [])
-    
+
     def get_deadline_config(self, case_id: str) -> Optional[Dict]:
         """Get deadline configuration for a case."""
-        return self._deadlines.get(case_id)
-    
+        return self._get(case_id, "deadlines")
+
     def save_deadline_config(self, case_id: str, config: Dict):
         """Save deadline configuration for a case."""
         # Ensure deadlines list has IDs
@@ -245,51 +630,46 @@ class WorkspaceService:
             for deadline in config.get("deadlines", []):
                 if "deadline_id" not in deadline:
                     deadline["deadline_id"] = f"deadline_{uuid.uuid4().hex[:12]}"
-        
-        self._deadlines[case_id] = {
+
+        self._save(case_id, "deadlines", "", {
             **config,
             "case_id": case_id,
             "updated_at": datetime.now().isoformat()
-        }
-        save_json_file(CASE_DEADLINES_FILE, self._deadlines)
-    
+        })
+
     def save_deadline(self, case_id: str, deadline: Dict) -> str:
         """Save a deadline (legacy method - updates deadline config)."""
         config = self.get_deadline_config(case_id) or {}
         deadlines = config.get("deadlines", [])
-        
+
         deadline_id = deadline.get("deadline_id") or f"deadline_{uuid.uuid4().hex[:12]}"
         deadline["deadline_id"] = deadline_id
-        
+
         # Update or add deadline
         existing_idx = next((i for i, d in enumerate(deadlines) if d.get("deadline_id") == deadline_id), None)
         if existing_idx is not None:
             deadlines[existing_idx] = deadline
         else:
             deadlines.append(deadline)
-        
+
         config["deadlines"] = deadlines
         self.save_deadline_config(case_id, config)
         return deadline_id
-    
+
     # Pinned Items Methods
     def get_pinned_items(self, case_id: str, user_id: Optional[str] = None) -> List[Dict]:
         """Get pinned items for a case, optionally filtered by user."""
-        case_pinned = self._pinned_items.get(case_id, {})
-        items = list(case_pinned.values())
-        
+        items = self._list(case_id, "pin", newest_first=True)
+
         if user_id:
             items = [item for item in items if item.get("user_id") == user_id]
-        
-        return sorted(items, key=lambda i: i.get("pinned_at", ""), reverse=True)
-    
+
+        return items
+
     def pin_item(self, case_id: str, item_type: str, item_id: str, user_id: str, annotations_count: int = 0) -> str:
         """Pin an item, returning pin_id."""
-        if case_id not in self._pinned_items:
-            self._pinned_items[case_id] = {}
-        
         pin_id = f"pin_{uuid.uuid4().hex[:12]}"
-        self._pinned_items[case_id][pin_id] = {
+        self._save(case_id, "pin", pin_id, {
             "pin_id": pin_id,
             "case_id": case_id,
             "item_type": item_type,
@@ -297,53 +677,60 @@ class WorkspaceService:
             "user_id": user_id,
             "annotations_count": annotations_count,
             "pinned_at": datetime.now().isoformat()
-        }
-        save_json_file(PINNED_ITEMS_FILE, self._pinned_items)
+        })
         return pin_id
-    
+
     def unpin_item(self, case_id: str, pin_id: str) -> bool:
         """Unpin an item."""
-        if case_id in self._pinned_items and pin_id in self._pinned_items[case_id]:
-            del self._pinned_items[case_id][pin_id]
-            save_json_file(PINNED_ITEMS_FILE, self._pinned_items)
-            return True
-        return False
-    
+        return self._delete(case_id, "pin", pin_id)
+
     # Investigative Notes Methods
     def get_notes(self, case_id: str) -> List[Dict]:
         """Get all investigative notes for a case."""
-        case_notes = self._notes.get(case_id, {})
-        return sorted(list(case_notes.values()), key=lambda n: n.get("created_at", ""), reverse=True)
-    
+        return self._list(case_id, "note", newest_first=True)
+
     def get_note(self, case_id: str, note_id: str) -> Optional[Dict]:
         """Get a specific note."""
-        case_notes = self._notes.get(case_id, {})
-        return case_notes.get(note_id)
-    
+        return self._get(case_id, "note", note_id)
+
     def save_note(self, case_id: str, note: Dict) -> str:
         """Save a note, returning note_id."""
-        if case_id not in self._notes:
-            self._notes[case_id] = {}
-        
         note_id = note.get("note_id") or f"note_{uuid.uuid4().hex[:12]}"
         note["note_id"] = note_id
         note["case_id"] = case_id
         note["updated_at"] = datetime.now().isoformat()
-        
+
         if "created_at" not in note:
             note["created_at"] = datetime.now().isoformat()
-        
-        self._notes[case_id][note_id] = note
-        save_json_file(NOTES_FILE, self._notes)
+
+        self._save(case_id, "note", note_id, note)
         return note_id
-    
+
     def delete_note(self, case_id: str, note_id: str) -> bool:
         """Delete a note."""
-        if case_id in self._notes and note_id in self._notes[case_id]:
-            del self._notes[case_id][note_id]
-            save_json_file(NOTES_FILE, self._notes)
-            return True
-        return False
+        return self._delete(case_id, "note", note_id)
+
+    def _update_note_links(
+        self,
+        case_id: str,
+        note_id: str,
+        update: Callable[[set], None],
+    ) -> Optional[Dict]:
+        """Read-modify-write a note's linked_entity_ids in one transaction."""
+        with self._write() as conn:
+            row = conn.execute(
+                "SELECT data FROM workspace_items WHERE case_id = ? AND kind = 'note' AND item_id = ?",
+                (case_id, note_id),
+            ).fetchone()
+            if not row:
+                return None
+            note = json.loads(row["data"])
+            existing = set(note.get("linked_entity_ids") or [])
+            update(existing)
+            note["linked_entity_ids"] = sorted(existing)
+            note["updated_at"] = datetime.now().isoformat()
+            self._put(conn, case_id, "note", note_id, note)
+        return note
 
     def link_profiles_to_note(
         self,
@@ -357,18 +744,9 @@ class WorkspaceService:
         same name we use on evidence records carries through here.
         Returns the updated note, or None if the note doesn't exist.
         """
-        case_notes = self._notes.get(case_id, {})
-        note = case_notes.get(note_id)
-        if not note:
-            return None
-        existing = set(note.get("linked_entity_ids") or [])
-        for pid in profile_ids or []:
-            if pid:
-                existing.add(pid)
-        note["linked_entity_ids"] = sorted(existing)
-        note["updated_at"] = datetime.now().isoformat()
-        save_json_file(NOTES_FILE, self._notes)
-        return note
+        return self._update_note_links(
+            case_id, note_id, lambda existing: existing.update(pid for pid in profile_ids or [] if pid)
+        )
 
     def unlink_profiles_from_note(
         self,
@@ -377,51 +755,35 @@ class WorkspaceService:
         profile_ids: List[str],
     ) -> Optional[Dict]:
         """Remove one or more profile ids from a note's linked set."""
-        case_notes = self._notes.get(case_id, {})
-        note = case_notes.get(note_id)
-        if not note:
-            return None
-        existing = set(note.get("linked_entity_ids") or [])
-        for pid in profile_ids or []:
-            existing.discard(pid)
-        note["linked_entity_ids"] = sorted(existing)
-        note["updated_at"] = datetime.now().isoformat()
-        save_json_file(NOTES_FILE, self._notes)
-        return note
-    
+        return self._update_note_links(
+            case_id, note_id, lambda existing: existing.difference_update(profile_ids or [])
+        )
+
     # Findings Methods
 
     def get_findings(self, case_id: str) -> List[Dict]:
         """Get all findings for a case."""
-        case_findings = self._findings.get(case_id, {})
-        return sorted(case_findings.values(), key=lambda f: f.get("created_at", ""), reverse=True)
+        return self._list(case_id, "finding", newest_first=True)
 
     def save_finding(self, case_id: str, finding: Dict) -> str:
         """Save a finding, returning finding_id."""
-        if case_id not in self._findings:
-            self._findings[case_id] = {}
         finding_id = finding.get("finding_id") or f"finding_{uuid.uuid4().hex[:12]}"
         finding["finding_id"] = finding_id
         finding["case_id"] = case_id
         finding["updated_at"] = datetime.now().isoformat()
         if "created_at" not in finding:
             finding["created_at"] = datetime.now().isoformat()
-        self._findings[case_id][finding_id] = finding
-        save_json_file(FINDINGS_FILE, self._findings)
+        self._save(case_id, "finding", finding_id, finding)
         return finding_id
 
     def delete_finding(self, case_id: str, finding_id: str) -> bool:
         """Delete a finding."""
-        if case_id in self._findings and finding_id in self._findings[case_id]:
-            del self._findings[case_id][finding_id]
-            save_json_file(FINDINGS_FILE, self._findings)
-            return True
-        return False
+        return self._delete(case_id, "finding", finding_id)
 
     def get_investigation_timeline(self, case_id: str) -> List[Dict]:
         """
         Aggregate all timeline events for a case investigation.
-        
+
         Returns a list of timeline events from various sources:
         - Witness creation
         - Task creation, due dates, status changes
@@ -432,138 +794,33 @@ class WorkspaceService:
         - Case deadlines
         - Document uploads
         - System logs for case operations
+
+        Workspace records' events come precomputed from the timeline view;
+        snapshots, evidence and system logs are read per case from their
+        own stores.
         """
         from services.system_log_service import system_log_service, LogType
         from services.evidence_storage import evidence_storage
         from services.snapshot_storage import snapshot_storage
-        from datetime import datetime
-        
-        events = []
-        
-        # 1. Witness creation dates and interviews
-        witnesses = self.get_witnesses(case_id)
-        for witness in witnesses:
-            created_at = witness.get("created_at") or witness.get("added_at")
-            if created_at:
-                events.append({
-                    "id": f"witness_{witness.get('witness_id')}",
-                    "type": "witness_created",
-                    "thread": "Witnesses",
-                    "date": created_at,
-                    "title": f"Witness Added: {witness.get('name', 'Unknown')}",
-                    "description": f"Witness {witness.get('name', 'Unknown')} added to case",
-                    "metadata": {"witness_id": witness.get("witness_id")},
-                })
-            
-            # Witness interview dates (from interviews array)
-            interviews = witness.get("interviews", [])
-            if isinstance(interviews, list):
-                for idx, interview in enumerate(interviews):
-                    interview_date = interview.get("interview_date") or interview.get("date") or interview.get("scheduled_date")
-                    if interview_date:
-                        interview_id = interview.get("interview_id") or f"interview_{idx}"
-                        # Use hash to ensure uniqueness
-                        interview_hash = hash(f"{witness.get('witness_id')}_{interview_id}_{interview_date}") % 10000
-                        events.append({
-                            "id": f"witness_interview_{witness.get('witness_id')}_{interview_id}_{interview_hash}",
-                            "type": "witness_interview",
-                            "thread": "Witnesses",
-                            "date": interview_date,
-                            "title": f"Interview: {witness.get('name', 'Unknown')}",
-                            "description": interview.get("notes") or interview.get("summary") or f"Interview with {witness.get('name', 'Unknown')}",
-                            "metadata": {
-                                "witness_id": witness.get("witness_id"),
-                                "witness_name": witness.get("name"),
-                                "interview_id": interview_id,
-                                "interviewer": interview.get("interviewer"),
-                            },
-                        })
-            
-            # Also check for direct interview_date field on witness (legacy)
-            interview_date = witness.get("interview_date") or witness.get("interviewed_at")
-            if interview_date and not any(e.get("type") == "witness_interview" and e.get("metadata", {}).get("witness_id") == witness.get("witness_id") for e in events):
-                events.append({
-                    "id": f"witness_interview_{witness.get('witness_id')}_legacy",
-                    "type": "witness_interview",
-                    "thread": "Witnesses",
-                    "date": interview_date,
-                    "title": f"Interview: {witness.get('name', 'Unknown')}",
-                    "description": f"Interview conducted with {witness.get('name', 'Unknown')}",
-                    "metadata": {"witness_id": witness.get("witness_id"), "name": witness.get("name")},
-                })
-        
-        # 2. Task events (creation, due dates, status changes)
-        tasks = self.get_tasks(case_id)
-        for task in tasks:
-            # Task creation
-            created_at = task.get("created_at")
-            if created_at:
-                events.append({
-                    "id": f"task_created_{task.get('task_id')}",
-                    "type": "task_created",
-                    "thread": "Tasks",
-                    "date": created_at,
-                    "title": f"Task Created: {task.get('title', 'Untitled')}",
-                    "description": task.get("description", ""),
-                    "metadata": {"task_id": task.get("task_id"), "priority": task.get("priority")},
-                })
-            
-            # Task due date
-            due_date = task.get("due_date")
-            if due_date:
-                events.append({
-                    "id": f"task_due_{task.get('task_id')}",
-                    "type": "task_due",
-                    "thread": "Tasks",
-                    "date": due_date,
-                    "title": f"Task Due: {task.get('title', 'Untitled')}",
-                    "description": f"Due date for task: {task.get('title', 'Untitled')}",
-                    "metadata": {"task_id": task.get("task_id"), "priority": task.get("priority")},
-                })
-            
-            # Task status changes (if we track history)
-            status = task.get("status")
-            status_text = task.get("status_text")
-            if status or status_text:
-                updated_at = task.get("updated_at")
-                if updated_at and updated_at != created_at:
-                    # Use a hash of the status to ensure uniqueness if multiple status changes happen at same time
-                    status_hash = hash(f"{status}_{status_text}_{updated_at}") % 10000
-                    events.append({
-                        "id": f"task_status_{task.get('task_id')}_{updated_at}_{status_hash}",
-                        "type": "task_status_change",
-                        "thread": "Tasks",
-                        "date": updated_at,
-                        "title": f"Task Status: {status_text or status}",
-                        "description": f"Task '{task.get('title', 'Untitled')}' status changed",
-                        "metadata": {"task_id": task.get("task_id"), "status": status, "status_text": status_text},
-                    })
-        
-        # 3. Theory creation dates
-        theories = self.get_theories(case_id)
-        for theory in theories:
-            created_at = theory.get("created_at")
-            if created_at:
-                events.append({
-                    "id": f"theory_{theory.get('theory_id')}",
-                    "type": "theory_created",
-                    "thread": "Theories",
-                    "date": created_at,
-                    "title": f"Theory Created: {theory.get('title', 'Untitled')}",
-                    "description": theory.get("hypothesis", ""),
-                    "metadata": {"theory_id": theory.get("theory_id"), "confidence": theory.get("confidence_score")},
-                })
-        
-        # 4. Snapshot creation dates
-        all_snapshots = snapshot_storage.get_all()
-        for snapshot_id, snapshot in all_snapshots.items():
-            # Filter by case_id if provided
-            if case_id and snapshot.get("case_id") != case_id:
-                continue
-            
+
+        # (date, section rank, event): witnesses, tasks, theories, pins,
+        # notes and deadlines from the view, already in date order
+        with self._read() as conn:
+            rows = conn.execute(
+                "SELECT date, rank, event FROM workspace_timeline WHERE case_id = ? ORDER BY date, rank, rowid",
+                (case_id,),
+            ).fetchall()
+        entries = [(row["date"], row["rank"], json.loads(row["event"])) for row in rows]
+
+        def add(rank: int, event: Dict):
+            entries.append((str(event["date"]), rank, event))
+
+        # Snapshot creation dates
+        for snapshot in snapshot_storage.list_summaries(case_id=case_id or None):
+            snapshot_id = snapshot["id"]
             created_at = snapshot.get("created_at") or snapshot.get("timestamp")
             if created_at:
-                events.append({
+                add(_RANK_SNAPSHOT, {
                     "id": f"snapshot_{snapshot_id}",
                     "type": "snapshot_created",
                     "thread": "Snapshots",
@@ -572,14 +829,13 @@ class WorkspaceService:
                     "description": snapshot.get("notes", "") or snapshot.get("description", ""),
                     "metadata": {"snapshot_id": snapshot_id},
                 })
-        
-        # 5. Evidence processing dates
-        evidence_files = evidence_storage.list_files(case_id=case_id)
-        for evidence in evidence_files:
-            # Evidence upload
+
+        # Evidence uploads and processing, plus case documents (uploaded via
+        # Quick Actions) on their own thread
+        for evidence in evidence_storage.list_files(case_id=case_id):
             uploaded_at = evidence.get("uploaded_at") or evidence.get("created_at")
             if uploaded_at:
-                events.append({
+                add(_RANK_EVIDENCE, {
                     "id": f"evidence_upload_{evidence.get('id')}",
                     "type": "evidence_uploaded",
                     "thread": "Evidence",
@@ -588,12 +844,11 @@ class WorkspaceService:
                     "description": f"File uploaded: {evidence.get('original_filename', 'Unknown')}",
                     "metadata": {"evidence_id": evidence.get("id"), "filename": evidence.get("original_filename")},
                 })
-            
-            # Evidence processing
+
             if evidence.get("status") == "processed":
                 processed_at = evidence.get("processed_at")
                 if processed_at:
-                    events.append({
+                    add(_RANK_EVIDENCE, {
                         "id": f"evidence_processed_{evidence.get('id')}",
                         "type": "evidence_processed",
                         "thread": "Evidence",
@@ -602,63 +857,10 @@ class WorkspaceService:
                         "description": f"Processing completed for {evidence.get('original_filename', 'Unknown')}",
                         "metadata": {"evidence_id": evidence.get("id"), "filename": evidence.get("original_filename")},
                     })
-        
-        # 6. Evidence pinning dates
-        pinned_items = self.get_pinned_items(case_id)
-        for pinned in pinned_items:
-            pinned_at = pinned.get("pinned_at") or pinned.get("created_at")
-            if pinned_at:
-                item_type = pinned.get("item_type", "unknown")
-                item_id = pinned.get("item_id", "")
-                events.append({
-                    "id": f"pinned_{pinned.get('pin_id')}",
-                    "type": "evidence_pinned",
-                    "thread": "Pinned Items",
-                    "date": pinned_at,
-                    "title": f"Item Pinned: {item_type}",
-                    "description": f"{item_type} pinned to case",
-                    "metadata": {"pin_id": pinned.get("pin_id"), "item_type": item_type, "item_id": item_id},
-                })
-        
-        # 7. Investigative Notes creation/update dates
-        notes = self.get_notes(case_id)
-        for note in notes:
-            created_at = note.get("created_at")
-            if created_at:
-                events.append({
-                    "id": f"note_created_{note.get('note_id')}",
-                    "type": "note_created",
-                    "thread": "Notes",
-                    "date": created_at,
-                    "title": f"Note Created: {note.get('title', 'Untitled')}",
-                    "description": note.get("content", "")[:100] + "..." if len(note.get("content", "")) > 100 else note.get("content", ""),
-                    "metadata": {"note_id": note.get("note_id")},
-                })
-            
-            # Note updates
-            updated_at = note.get("updated_at")
-            if updated_at and updated_at != created_at:
-                # Use hash to ensure uniqueness if multiple updates at same time
-                update_hash = hash(f"{note.get('note_id')}_{updated_at}") % 10000
-                events.append({
-                    "id": f"note_updated_{note.get('note_id')}_{updated_at}_{update_hash}",
-                    "type": "note_updated",
-                    "thread": "Notes",
-                    "date": updated_at,
-                    "title": f"Note Updated: {note.get('title', 'Untitled')}",
-                    "description": f"Note '{note.get('title', 'Untitled')}' was updated",
-                    "metadata": {"note_id": note.get("note_id")},
-                })
-        
-        # 8. Documents (case documents uploaded via Quick Actions)
-        # Documents are stored in evidence_storage but marked as case documents
-        # We already handle evidence upload above, but we can add a specific thread for case documents
-        for evidence in evidence_files:
-            # Check if it's a case document (uploaded via Quick Actions)
+
             if evidence.get("is_case_document") or evidence.get("upload_method") == "quick_action":
-                uploaded_at = evidence.get("uploaded_at") or evidence.get("created_at")
                 if uploaded_at:
-                    events.append({
+                    add(_RANK_DOCUMENT, {
                         "id": f"document_upload_{evidence.get('id')}",
                         "type": "document_uploaded",
                         "thread": "Documents",
@@ -667,44 +869,12 @@ class WorkspaceService:
                         "description": f"Case document uploaded: {evidence.get('original_filename', 'Unknown')}",
                         "metadata": {"evidence_id": evidence.get("id"), "filename": evidence.get("original_filename")},
                     })
-        
-        # 9. Case deadlines
-        deadline_config = self.get_deadline_config(case_id)
-        if deadline_config:
-            # Trial date
-            trial_date = deadline_config.get("trial_date")
-            if trial_date:
-                events.append({
-                    "id": f"deadline_trial_{case_id}",
-                    "type": "trial_date",
-                    "thread": "Deadlines",
-                    "date": trial_date,
-                    "title": f"Trial Date: {deadline_config.get('court', 'Unknown Court')}",
-                    "description": f"Trial scheduled at {deadline_config.get('court', 'Unknown Court')}",
-                    "metadata": {"court": deadline_config.get("court"), "judge": deadline_config.get("judge")},
-                })
-            
-            # Individual deadlines
-            deadline_items = deadline_config.get("deadlines", [])
-            for idx, deadline in enumerate(deadline_items):
-                due_date = deadline.get("due_date")
-                if due_date:
-                    deadline_id = deadline.get("deadline_id") or f"deadline_{idx}_{due_date}"
-                    events.append({
-                        "id": f"deadline_{deadline_id}",
-                        "type": "deadline",
-                        "thread": "Deadlines",
-                        "date": due_date,
-                        "title": f"Deadline: {deadline.get('title', 'Untitled')}",
-                        "description": deadline.get("title", ""),
-                        "metadata": {"deadline_id": deadline.get("deadline_id"), "urgency": deadline.get("urgency")},
-                    })
-        
-        # 10. System logs for case operations (excluding audit log)
+
+        # System logs for case operations (excluding audit log)
         try:
-            from datetime import datetime as dt
             system_logs = system_log_service.get_logs(
                 log_types=[LogType.CASE_OPERATION, LogType.CASE_MANAGEMENT],
+                case_id=case_id,
                 limit=500
             )
             log_index = 0
@@ -714,7 +884,7 @@ class WorkspaceService:
                     timestamp = log.get("timestamp")
                     if timestamp:
                         log_index += 1
-                        events.append({
+                        add(_RANK_SYSTEM, {
                             "id": f"log_{log_index}_{timestamp}_{hash(str(details)) % 10000}",
                             "type": "system_action",
                             "thread": "System Actions",
@@ -729,11 +899,11 @@ class WorkspaceService:
                         })
         except Exception as e:
             print(f"[Investigation Timeline] Error loading system logs: {e}")
-        
-        # Sort all events by date
-        events.sort(key=lambda x: x.get("date", ""))
-        
-        return events
+
+        # Sort all events by date (stable: same-date events keep section order)
+        entries.sort(key=lambda entry: (entry[0], entry[1]))
+
+        return [event for _, _, event in entries]
 
     def get_theory_timeline(self, case_id: str, theory_id: str) -> List[Dict]:
         """
@@ -895,8 +1065,8 @@ class WorkspaceService:
         
         # 5. Attached snapshots (creation dates)
         if attached_snapshot_ids:
-            all_snapshots = snapshot_storage.get_all()
-            for snapshot_id, snapshot in all_snapshots.items():
+            for snapshot in snapshot_storage.list_summaries():
+                snapshot_id = snapshot["id"]
                 if snapshot_id in attached_snapshot_ids:
                     created_at = snapshot.get("created_at") or snapshot.get("timestamp")
                     if created_at:
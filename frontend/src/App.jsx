@@ -1578,7 +1578,7 @@ function AppInner() {
   }, [selectedNodesDetails, loadNodeDetails, loadGraph]);
 
   // Auto-save chat history after significant queries
-  const handleAutoSaveChat = useCallback(async (messages) => {
+  const handleAutoSaveChat = useCallback(async (messages, conversationId = null) => {
     if (!currentCaseId || !messages || messages.length === 0) {
       return; // Don't save if no case or no messages
     }
@@ -1595,6 +1595,7 @@ function AppInner() {
         snapshot_id: null, // Not associated with a snapshot yet
         case_id: currentCaseId,
         case_version: currentCaseVersion,
+        conversation_id: conversationId,
       });
       
       console.log('Chat history auto-saved');
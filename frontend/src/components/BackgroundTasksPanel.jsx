@@ -55,6 +55,45 @@ const formatAge = (ms) => {
   return `${Math.round(ms / 86_400_000)}d ago`;
 };
 
+// Most recent tasks shown in the panel
+const TASK_LIMIT = 50;
+
+const sortTasks = (list) =>
+  [...list]
+    .sort((a, b) => (b.created_at || '').localeCompare(a.created_at || ''))
+    .slice(0, TASK_LIMIT);
+
+// Apply one `delta` from the task stream (the fields a single backend
+// update_task call set) — mirrors _apply_changes in background_task_storage.
+const MAX_FILES_PER_TASK = 100;
+const applyTaskChanges = (task, changes) => {
+  const next = { ...task, progress: { ...(task.progress || {}) } };
+  if (changes.status !== undefined) next.status = changes.status;
+  ['total', 'completed', 'failed'].forEach((key) => {
+    if (changes[`progress_${key}`] !== undefined) next.progress[key] = changes[`progress_${key}`];
+  });
+  if (changes.file_status) {
+    const files = [...(task.files || [])];
+    const idx = files.findIndex(f => f.file_id === changes.file_status.file_id);
+    if (idx >= 0) {
+      files[idx] = { ...files[idx], ...changes.file_status };
+    } else {
+      files.push(changes.file_status);
+    }
+    next.files = files.slice(-MAX_FILES_PER_TASK);
+  }
+  ['error', 'started_at', 'completed_at', 'updated_at'].forEach((key) => {
+    if (changes[key] !== undefined) next[key] = changes[key];
+  });
+  if (changes.stages !== undefined) {
+    next.metadata = { ...(task.metadata || {}), stages: changes.stages };
+  }
+  if (changes.profile !== undefined) {
+    next.metadata = { ...(next.metadata || task.metadata || {}), profile: changes.profile };
+  }
+  return next;
+};
+
 /**
  * BackgroundTasksPanel Component
  *
@@ -65,47 +104,70 @@ export default function BackgroundTasksPanel({ isOpen, onClose, authUsername, on
   const [loading, setLoading] = useState(false);
   const completedTaskIdsRef = useRef(new Set());
 
+  // Tasks the panel has seen completed; reaching 'completed' for a new id
+  // fires documents-refresh so graph and other views update
+  const noteCompleted = useCallback((list, announce) => {
+    const newlyCompleted = list.filter(
+      t => t.status === 'completed' && !completedTaskIdsRef.current.has(t.id)
+    );
+    newlyCompleted.forEach(t => completedTaskIdsRef.current.add(t.id));
+    if (announce && newlyCompleted.length > 0) {
+      window.dispatchEvent(new Event('documents-refresh'));
+    }
+  }, []);
+
   const loadTasks = useCallback(async () => {
     try {
       // Don't pass owner parameter - let backend default to current_user
       // This ensures tasks are filtered by the authenticated user's session
-      const data = await backgroundTasksAPI.list(null, null, null, 50);
+      const data = await backgroundTasksAPI.list(null, null, null, TASK_LIMIT);
       const newTasks = data.tasks || [];
-
-      // Detect newly completed tasks and dispatch refresh event
-      const newlyCompleted = newTasks.filter(
-        t => t.status === 'completed' && !completedTaskIdsRef.current.has(t.id)
-      );
-      if (newlyCompleted.length > 0) {
-        newlyCompleted.forEach(t => completedTaskIdsRef.current.add(t.id));
-        // Dispatch documents-refresh so graph and other views update
-        window.dispatchEvent(new Event('documents-refresh'));
-      }
-
-      // Also track already-completed tasks on first load
-      newTasks.forEach(t => {
-        if (t.status === 'completed') {
-          completedTaskIdsRef.current.add(t.id);
-        }
-      });
-
+      noteCompleted(newTasks, true);
       setTasks(newTasks);
     } catch (err) {
       console.error('Failed to load background tasks:', err);
     }
-  }, []);
+  }, [noteCompleted]);
 
   useEffect(() => {
-    if (isOpen) {
+    if (!isOpen) return undefined;
+
+    // Live updates are pushed over the task stream (SSE); polling every
+    // 10s is only the fallback if the stream can't be held open.
+    let interval = null;
+    let ready = false;
+    const startPolling = () => {
+      if (interval) return;
       loadTasks();
-      // Poll every 10 seconds while panel is open (was 3s). FileInfoViewer
-      // already runs up to three /api/background-tasks polls; the original
-      // 3s cadence stacked to ~1.3 req/sec which contributed to client-side
-      // TCP timeouts on slower networks.
-      const interval = setInterval(loadTasks, 10000);
-      return () => clearInterval(interval);
-    }
-  }, [isOpen, loadTasks]);
+      interval = setInterval(loadTasks, 10000);
+    };
+
+    const cancel = backgroundTasksAPI.stream({}, {
+      onSnapshot: (task) => {
+        noteCompleted([task], ready);
+        setTasks(prev => sortTasks([task, ...prev.filter(t => t.id !== task.id)]));
+      },
+      onDelta: ({ task_id: taskId, changes }) => {
+        if (changes.status) noteCompleted([{ id: taskId, status: changes.status }], ready);
+        setTasks(prev => prev.map(t => (t.id === taskId ? applyTaskChanges(t, changes) : t)));
+      },
+      onDeleted: ({ task_id: taskId }) => {
+        setTasks(prev => prev.filter(t => t.id !== taskId));
+      },
+      onReady: () => {
+        ready = true;
+      },
+      onError: (err) => {
+        console.error('Background task stream failed, falling back to polling:', err);
+        startPolling();
+      },
+    });
+
+    return () => {
+      cancel();
+      if (interval) clearInterval(interval);
+    };
+  }, [isOpen, loadTasks, noteCompleted]);
 
   const handleDeleteTask = async (taskId, e) => {
     e.stopPropagation();
@@ -428,6 +490,45 @@ function TaskCard({ task, getStatusIcon, getStatusColor, formatDate, getProgress
         ) : null;
       })()}
 
+      {/* Where the time went (per-stage profile from the pipeline profiler) */}
+      {task.metadata?.profile?.by_kind && (() => {
+        const profile = task.metadata.profile;
+        const kinds = Object.entries(profile.by_kind).slice(0, 4);
+        // Innermost (most recently opened) stage still running
+        const open = (profile.open || [])[(profile.open || []).length - 1];
+        const formatMs = (ms) => (ms >= 60000 ? `${(ms / 60000).toFixed(1)}m` : `${(ms / 1000).toFixed(1)}s`);
+        const downloadTrace = async () => {
+          try {
+            const blob = await backgroundTasksAPI.trace(task.id);
+            const url = URL.createObjectURL(blob);
+            const a = document.createElement('a');
+            a.href = url;
+            a.download = `trace-${task.id}.json`;
+            a.click();
+            URL.revokeObjectURL(url);
+          } catch (err) {
+            console.error('Failed to download trace:', err);
+          }
+        };
+        return kinds.length > 0 ? (
+          <div className="mb-3 text-xs text-light-600">
+            <div className="flex flex-wrap gap-x-3 gap-y-1">
+              {kinds.map(([kind, totals]) => (
+                <span key={kind}>{kind} {formatMs(totals.self_ms)}</span>
+              ))}
+              {profile.finished && (
+                <button onClick={downloadTrace} className="text-owl-blue-600 hover:underline">
+                  Download trace
+                </button>
+              )}
+            </div>
+            {task.status === 'running' && open && (
+              <div className="mt-1">In {open.stage} for {formatMs(open.elapsed_ms)}</div>
+            )}
+          </div>
+        ) : null;
+      })()}
+
       {/* Error Message */}
       {task.error && (
         <div className="mb-3 p-2 bg-red-50 border border-red-200 rounded text-sm text-red-700">
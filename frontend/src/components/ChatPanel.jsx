@@ -330,6 +330,9 @@ export default function ChatPanel({
   const [savingNote, setSavingNote] = useState(false);
   const [noteSavedId, setNoteSavedId] = useState(null); // msg.id of recently saved note for feedback
   const messagesEndRef = useRef(null);
+  // Identifies this conversation to the backend so follow-up turns reuse
+  // earlier retrieval; a loaded chat starts a new conversation
+  const conversationIdRef = useRef(`conv_${Date.now()}_${Math.random().toString(36).slice(2, 10)}`);
   const inputRef = useRef(null);
 
   // Custom ReactMarkdown URL transform: allow doc:// protocol through
@@ -493,6 +496,7 @@ export default function ChatPanel({
         confidenceThreshold,
         currentCaseId,
         viewContextPayload,
+        conversationIdRef.current,
       );
 
       // Debug log is now stored in system logs, no need to download
@@ -563,7 +567,7 @@ export default function ChatPanel({
         
         if (isSignificant && onAutoSave && currentCaseId) {
           // Auto-save chat history
-          onAutoSave(newMessages);
+          onAutoSave(newMessages, conversationIdRef.current);
           setLastAutoSaveCount(newMessages.length);
         }
         
@@ -1157,6 +1161,7 @@ export default function ChatPanel({
         isOpen={showChatHistory}
         onClose={() => setShowChatHistory(false)}
         onLoadChat={(chatMessages) => {
+          conversationIdRef.current = `conv_${Date.now()}_${Math.random().toString(36).slice(2, 10)}`;
           setMessages(chatMessages);
           onMessagesChange?.(chatMessages);
           setLastAutoSaveCount(chatMessages.length);
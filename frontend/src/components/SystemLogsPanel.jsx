@@ -58,30 +58,32 @@ export default function SystemLogsPanel({ isOpen, onClose }) {
   const [showFilters, setShowFilters] = useState(true);
   const [viewMode, setViewMode] = useState('list'); // 'list' or 'timeline'
 
+  // Remove empty filters and convert arrays to comma-separated strings for API
+  const cleanFilters = useCallback((params) => {
+    const cleanedParams = {};
+    Object.keys(params).forEach(key => {
+      const value = params[key];
+      if (value === '' || value === null || (Array.isArray(value) && value.length === 0)) {
+        return; // Skip empty values
+      }
+      // Convert arrays to comma-separated strings for API
+      if (Array.isArray(value)) {
+        cleanedParams[key] = value.join(',');
+      } else {
+        cleanedParams[key] = value;
+      }
+    });
+    return cleanedParams;
+  }, []);
+
   const loadLogs = useCallback(async () => {
     setLoading(true);
     try {
-      const params = {
+      const result = await systemLogsAPI.getLogs(cleanFilters({
         ...filters,
         limit,
         offset,
-      };
-      
-      // Remove empty filters and convert arrays to comma-separated strings for API
-      const cleanedParams = {};
-      Object.keys(params).forEach(key => {
-        const value = params[key];
-        if (value === '' || value === null || (Array.isArray(value) && value.length === 0)) {
-          return; // Skip empty values
-        }
-        // Convert arrays to comma-separated strings for API
-        if (Array.isArray(value)) {
-          cleanedParams[key] = value.join(',');
-        } else {
-          cleanedParams[key] = value;
-        }
-      });
-      const result = await systemLogsAPI.getLogs(cleanedParams);
+      }));
       
       setLogs(result.logs || []);
       setTotal(result.total || 0);
@@ -90,16 +92,17 @@ export default function SystemLogsPanel({ isOpen, onClose }) {
     } finally {
       setLoading(false);
     }
-  }, [filters, limit, offset]);
+  }, [filters, limit, offset, cleanFilters]);
 
+  // Statistics are aggregated server-side for the current filters
   const loadStatistics = useCallback(async () => {
     try {
-      const stats = await systemLogsAPI.getStatistics();
+      const stats = await systemLogsAPI.getStatistics(cleanFilters(filters));
       setStatistics(stats);
     } catch (err) {
       console.error('Failed to load statistics:', err);
     }
-  }, []);
+  }, [filters, cleanFilters]);
 
   useEffect(() => {
     if (isOpen) {
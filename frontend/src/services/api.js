@@ -876,7 +876,7 @@ export const chatAPI = {
   /**
    * Send a question to the AI
    */
-  ask: (question, selectedKeys = null, model, provider, confidenceThreshold = null, caseId = null, viewContext = null) =>
+  ask: (question, selectedKeys = null, model, provider, confidenceThreshold = null, caseId = null, viewContext = null, conversationId = null) =>
     fetchAPI('/chat', {
       method: 'POST',
       body: JSON.stringify({
@@ -887,6 +887,7 @@ export const chatAPI = {
         confidence_threshold: confidenceThreshold,
         case_id: caseId,
         view_context: viewContext,
+        conversation_id: conversationId,
       }),
       timeout: 600000, // 10 minutes for AI queries (large models may take time)
     }),
@@ -2060,6 +2061,28 @@ export const backgroundTasksAPI = {
    */
   get: (taskId) => fetchAPI(`/background-tasks/${encodeURIComponent(taskId)}`),
 
+  /**
+   * Download a finished task's per-stage timing trace (Chrome trace JSON, open
+   * in chrome://tracing or ui.perfetto.dev)
+   */
+  trace: async (taskId) => {
+    const token = localStorage.getItem('authToken');
+    const headers = {};
+    if (token) {
+      headers['Authorization'] = `Bearer ${token}`;
+    }
+    const response = await fetch(`${API_BASE}/background-tasks/${encodeURIComponent(taskId)}/trace`, {
+      method: 'GET',
+      headers,
+      credentials: 'include',
+    });
+    if (!response.ok) {
+      const error = await response.json().catch(() => ({ detail: 'Failed to download trace' }));
+      throw new Error(error.detail || `HTTP ${response.status}`);
+    }
+    return await response.blob();
+  },
+
   /**
    * Delete a task
    */
@@ -2077,6 +2100,124 @@ export const backgroundTasksAPI = {
     fetchAPI(`/background-tasks/${encodeURIComponent(taskId)}/mark-failed`, {
       method: 'POST',
     }),
+
+  /**
+   * Subscribe to live task updates via Server-Sent Events. Streams the
+   * current user's tasks (optionally one case's), or a single task when
+   * taskId is given. Replaces polling list().
+   *
+   * @param {Object} options
+   * @param {string} [options.taskId] - Stream just this task (ends with onEnd)
+   * @param {string} [options.caseId] - Only this case's tasks
+   * @param {Object} callbacks - onSnapshot(task), onDelta({task_id, seq, changes}),
+   *   onDeleted({task_id}), onReady({tasks}) once the initial snapshots are in,
+   *   onEnd(data), onError(error)
+   * @returns {Function} Cancel function
+   */
+  stream: ({ taskId = null, caseId = null } = {}, callbacks = {}) => {
+    const { onSnapshot, onDelta, onDeleted, onReady, onEnd, onError } = callbacks;
+    const abortController = new AbortController();
+    const token = localStorage.getItem('authToken');
+
+    const params = new URLSearchParams();
+    if (caseId) params.append('case_id', caseId);
+    const qs = params.toString();
+    const url = taskId
+      ? `${API_BASE}/background-tasks/${encodeURIComponent(taskId)}/stream`
+      : `${API_BASE}/background-tasks/stream${qs ? `?${qs}` : ''}`;
+
+    const dispatchEvent = (eventType, eventData) => {
+      try {
+        const data = JSON.parse(eventData);
+        switch (eventType) {
+          case 'snapshot':
+            onSnapshot?.(data);
+            break;
+          case 'delta':
+            onDelta?.(data);
+            break;
+          case 'deleted':
+            onDeleted?.(data);
+            break;
+          case 'ready':
+            onReady?.(data);
+            break;
+          case 'end':
+            onEnd?.(data);
+            break;
+          case 'error':
+            onError?.(new Error(data.message || 'Task stream failed'));
+            break;
+        }
+      } catch (parseError) {
+        console.error('Failed to parse SSE data:', parseError);
+      }
+    };
+
+    (async () => {
+      try {
+        const response = await fetch(url, {
+          method: 'GET',
+          headers: {
+            ...(token ? { Authorization: `Bearer ${token}` } : {}),
+          },
+          credentials: 'include',
+          signal: abortController.signal,
+        });
+
+        if (!response.ok) {
+          const error = await response.json().catch(() => ({ detail: 'Unknown error' }));
+          throw new Error(error.detail || `HTTP ${response.status}`);
+        }
+
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        // Keep these outside the loop: an SSE event may span network chunks
+        let currentEvent = null;
+        let currentData = '';
+
+        while (true) {
+          const { done, value } = await reader.read();
+          buffer += decoder.decode(value, { stream: !done });
+
+          const lines = buffer.split('\n');
+          buffer = lines.pop() || '';
+
+          for (const line of lines) {
+            if (line.startsWith('event: ')) {
+              currentEvent = line.slice(7).trim();
+            } else if (line.startsWith('data: ')) {
+              currentData = line.slice(6);
+            } else if (line === '') {
+              if (currentEvent && currentData) {
+                dispatchEvent(currentEvent, currentData);
+              }
+              currentEvent = null;
+              currentData = '';
+            }
+            // `id:` lines and `: keep-alive` comments need no handling
+          }
+
+          if (done) {
+            if (!taskId) {
+              // The user's task stream only ends if the connection dropped
+              onError?.(new Error('Task stream closed'));
+            }
+            break;
+          }
+        }
+      } catch (err) {
+        if (err.name !== 'AbortError') {
+          onError?.(err);
+        }
+      }
+    })();
+
+    return () => {
+      abortController.abort();
+    };
+  },
 };
 
 /**
@@ -2125,6 +2266,8 @@ export const systemLogsAPI = {
    * @param {number} [filters.offset=0] - Offset for pagination
    * @param {string} [filters.user] - Filter by user
    * @param {boolean} [filters.success_only] - Filter by success status
+   * @param {string} [filters.case_id] - Filter by case ID
+   * @param {string} [filters.search] - Text search over action, user, error and details
    */
   getLogs: (filters = {}) => {
     const params = new URLSearchParams();
@@ -2137,9 +2280,18 @@ export const systemLogsAPI = {
   },
 
   /**
-   * Get log statistics
+   * Get log statistics, optionally for the same filters as getLogs (limit/offset ignored)
    */
-  getStatistics: () => fetchAPI('/system-logs/statistics'),
+  getStatistics: (filters = {}) => {
+    const params = new URLSearchParams();
+    Object.entries(filters).forEach(([key, value]) => {
+      if (value !== null && value !== undefined && value !== '' && key !== 'limit' && key !== 'offset') {
+        params.append(key, value.toString());
+      }
+    });
+    const qs = params.toString();
+    return fetchAPI(`/system-logs/statistics${qs ? `?${qs}` : ''}`);
+  },
 
   /**
    * Clear all logs
@@ -13,7 +13,7 @@ from typing import Dict, Optional, Callable
 
 from audio_processor import load_whisper_model, transcribe_audio, WHISPER_AVAILABLE
 from ingestion import ingest_document
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 from config import WHISPER_MODEL_SIZE, AUDIO_LANGUAGE
 
 
@@ -81,12 +81,13 @@ def ingest_audio_file(
 
         log_progress(f"Using Whisper model: {whisper_model_size or WHISPER_MODEL_SIZE}, language: {transcribe_lang or 'auto-detect'}", log_callback)
 
-        transcription = transcribe_audio(
-            audio_path=path,
-            model=model,
-            language=transcribe_lang if transcribe_lang else "en",
-            task="transcribe",
-        )
+        with profile_stage("transcription:audio"):
+            transcription = transcribe_audio(
+                audio_path=path,
+                model=model,
+                language=transcribe_lang if transcribe_lang else "en",
+                task="transcribe",
+            )
     except Exception as e:
         log_error(f"Failed to transcribe audio: {e}", log_callback)
         return {"status": "error", "reason": str(e), "file": str(path)}
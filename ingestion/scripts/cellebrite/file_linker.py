@@ -13,7 +13,7 @@ processed results can be linked back to the parent Neo4j entity.
 import hashlib
 import uuid as uuid_mod
 from pathlib import Path
-from typing import Dict, List, Optional, Callable, Set, Tuple
+from typing import Dict, List, Optional, Callable, Set
 
 from .models import TaggedFile, ParsedModel
 
@@ -277,98 +277,69 @@ class CellebriteFileLinker:
         2026-05-22 case-43f1afb1 had 188k C5 rows for 93k actual files
         for exactly this reason.
 
-        Uses evidence_storage._file_locked so the reload-mutate-save
-        cycle survives multi-worker concurrency (see project memory
-        [[multi-worker-json-storage]]).
+        Uses evidence_storage.upsert_by_hash: one transaction per batch
+        and one indexed (case_id, sha256) lookup per file, so registration
+        cost no longer grows with the size of the whole evidence store.
         """
         from datetime import datetime
 
-        records = []
         now = datetime.now().isoformat()
+        entries = []
+        for item in batch:
+            sha256 = item["sha256"]
+            resolved_path = item["resolved_path"]
+            category = item["category"]
+            model_id = item.get("model_id")
+
+            cellebrite_fields = {
+                "cellebrite_report_key": self.report_key,
+                "cellebrite_file_id": item["file_id"],
+                "cellebrite_model_id": model_id,
+                "cellebrite_category": category,
+                "source_type": "cellebrite",
+                "capture_time": item.get("capture_time"),
+                "creation_time": item.get("creation_time"),
+                "modify_time": item.get("modify_time"),
+                "access_time": item.get("access_time"),
+                "latitude": item.get("latitude"),
+                "longitude": item.get("longitude"),
+                "gps_altitude": item.get("gps_altitude"),
+                "camera_make": item.get("camera_make"),
+                "camera_model": item.get("camera_model"),
+                "image_width": item.get("image_width"),
+                "image_height": item.get("image_height"),
+                "orientation": item.get("orientation"),
+                "exif_software": item.get("exif_software"),
+                "has_geotag": (
+                    item.get("latitude") is not None
+                    and item.get("longitude") is not None
+                ),
+            }
+            cellebrite_fields = {k: v for k, v in cellebrite_fields.items() if v is not None}
 
-        with evidence_storage._file_locked() as fresh:
-            # Build a (case_id, sha256) -> existing_id lookup once for the
-            # whole batch — avoids re-scanning the full records dict for
-            # every file in the batch.
-            sha_to_existing: Dict[Tuple[str, str], str] = {}
-            for ev_id, rec in fresh.items():
-                sha = rec.get("sha256")
-                cid = rec.get("case_id")
-                if sha and cid:
-                    sha_to_existing.setdefault((cid, sha), ev_id)
-
-            for item in batch:
-                sha256 = item["sha256"]
-                resolved_path = item["resolved_path"]
-                category = item["category"]
-                model_id = item.get("model_id")
-
-                cellebrite_fields = {
-                    "cellebrite_report_key": self.report_key,
-                    "cellebrite_file_id": item["file_id"],
-                    "cellebrite_model_id": model_id,
-                    "cellebrite_category": category,
-                    "source_type": "cellebrite",
-                    "capture_time": item.get("capture_time"),
-                    "creation_time": item.get("creation_time"),
-                    "modify_time": item.get("modify_time"),
-                    "access_time": item.get("access_time"),
-                    "latitude": item.get("latitude"),
-                    "longitude": item.get("longitude"),
-                    "gps_altitude": item.get("gps_altitude"),
-                    "camera_make": item.get("camera_make"),
-                    "camera_model": item.get("camera_model"),
-                    "image_width": item.get("image_width"),
-                    "image_height": item.get("image_height"),
-                    "orientation": item.get("orientation"),
-                    "exif_software": item.get("exif_software"),
-                    "has_geotag": (
-                        item.get("latitude") is not None
-                        and item.get("longitude") is not None
-                    ),
-                }
-                cellebrite_fields = {k: v for k, v in cellebrite_fields.items() if v is not None}
-
-                existing_id = sha_to_existing.get((self.case_id, sha256))
-                if existing_id and existing_id in fresh:
-                    # Patch missing cellebrite_* metadata onto the existing
-                    # row without disturbing user-set fields (is_relevant,
-                    # status, processed_at). Only overwrites the
-                    # cellebrite_* keys + the file timestamps / geotag
-                    # which are authoritative from the XML.
-                    fresh[existing_id].update(cellebrite_fields)
-                    records.append(fresh[existing_id])
-                    continue
+            record = {
+                "case_id": self.case_id,
+                "owner": owner,
+                "original_filename": resolved_path.name,
+                "stored_path": str(resolved_path),
+                "size": item["file_info"]["size"],
+                "sha256": sha256,
+                "status": "unprocessed",
+                "is_duplicate": False,
+                "duplicate_of": None,
+                "is_relevant": False,
+                "created_at": now,
+                "processed_at": None,
+                "last_error": None,
+                **cellebrite_fields,
+            }
+            # An existing row for this content in the case only gets the
+            # cellebrite_* keys + file timestamps / geotag (authoritative
+            # from the XML); user-set fields (is_relevant, status,
+            # processed_at) are left alone.
+            entries.append((record, cellebrite_fields))
 
-                evidence_id = f"ev_{sha256[:16]}"
-                suffix = 1
-                while evidence_id in fresh:
-                    evidence_id = f"ev_{sha256[:12]}_{suffix}"
-                    suffix += 1
-
-                record = {
-                    "id": evidence_id,
-                    "case_id": self.case_id,
-                    "owner": owner,
-                    "original_filename": resolved_path.name,
-                    "stored_path": str(resolved_path),
-                    "size": item["file_info"]["size"],
-                    "sha256": sha256,
-                    "status": "unprocessed",
-                    "is_duplicate": False,
-                    "duplicate_of": None,
-                    "is_relevant": False,
-                    "created_at": now,
-                    "processed_at": None,
-                    "last_error": None,
-                    **cellebrite_fields,
-                }
-
-                fresh[evidence_id] = record
-                sha_to_existing[(self.case_id, sha256)] = evidence_id
-                records.append(record)
-
-        return records
+        return evidence_storage.upsert_by_hash(self.case_id, entries)
 
     def build_model_file_map(self, models: List[ParsedModel]) -> Dict[str, List[str]]:
         """
@@ -25,6 +25,7 @@ from .parser import CellebriteXMLParser, SUPPORTED_MODEL_TYPES, SKIPPED_MODEL_TY
 from .neo4j_writer import CellebriteNeo4jWriter
 from .file_linker import CellebriteFileLinker
 from .models import ParsedModel
+from logging_utils import profile_stage
 
 
 # Maps Cellebrite XML modelType → list of writer stat keys that count it.
@@ -293,7 +294,8 @@ def ingest_cellebrite_report(
     _log("Step 2/9: Parsing report header...")
 
     parser = CellebriteXMLParser(xml_path, log_callback=log_callback)
-    report = parser.parse_header()
+    with profile_stage("parse:header"):
+        report = parser.parse_header()
 
     # ------------------------------------------------------------------
     # Owning device identity (resolved in 3 tiers):
@@ -366,7 +368,9 @@ def ingest_cellebrite_report(
     # ------------------------------------------------------------------
     _log("Step 3/9: Building file index from tagged files...")
 
-    tagged_files = parser.parse_tagged_files()
+    with profile_stage("parse:tagged_files") as span:
+        tagged_files = parser.parse_tagged_files()
+        span.add(count=len(tagged_files))
 
     # ------------------------------------------------------------------
     # Step 4: Build file linker
@@ -430,10 +434,12 @@ def ingest_cellebrite_report(
     _log("Step 6/9: Identifying phone owner (first pass)...")
 
     all_models: List[ParsedModel] = []
-    for batch in parser.stream_models(batch_size=500):
-        for model in batch:
-            writer.collect_phone_owner_info([model])
-            all_models.append(model)
+    with profile_stage("parse:models") as span:
+        for batch in parser.stream_models(batch_size=500):
+            for model in batch:
+                writer.collect_phone_owner_info([model])
+                all_models.append(model)
+        span.add(count=len(all_models))
     _log(f"Collected {len(all_models)} models for processing")
 
     # Tier 2 of the owning-identity resolution (see the precondition note
@@ -478,7 +484,8 @@ def ingest_cellebrite_report(
     # ------------------------------------------------------------------
     _log("Step 7/9: Mapping file references...")
 
-    model_file_map = file_linker.build_model_file_map(all_models)
+    with profile_stage("parse:file_map"):
+        model_file_map = file_linker.build_model_file_map(all_models)
     _log(f"Found {sum(len(v) for v in model_file_map.values())} file references across {len(model_file_map)} models")
 
     # Make the attachment mapping available to the writer so that message/email/call
@@ -496,15 +503,17 @@ def ingest_cellebrite_report(
     _emit_progress(phase="writing", total=total_models, completed=0, failed=0)
 
     batch_size = 200
-    # Throttle: send the heartbeat at most once every ~2 seconds so we
-    # don't beat up background_tasks.json with rapid-fire writes during
-    # the hot loop. The UI poll is on a 10s cadence anyway.
-    HEARTBEAT_MIN_INTERVAL_S = 2.0
+    # Throttle: send the heartbeat at most twice a second. A progress
+    # update is a single journal append in background_task_storage, so
+    # this only bounds the call rate from the hot loop.
+    HEARTBEAT_MIN_INTERVAL_S = 0.5
     last_heartbeat = time.time()
 
     for i in range(0, total_models, batch_size):
         batch = all_models[i:i + batch_size]
-        writer.write_batch(batch)
+        with profile_stage("neo4j:write_models") as span:
+            writer.write_batch(batch)
+            span.add(count=len(batch))
 
         processed = min(i + batch_size, total_models)
         if processed % 1000 == 0 or processed == total_models:
@@ -530,7 +539,8 @@ def ingest_cellebrite_report(
     _emit_progress(phase="finalising_sim", total=total_models, completed=total_models,
                    failed=sum(writer.write_errors.values()))
     try:
-        writer.finalise_sim_card()
+        with profile_stage("neo4j:finalise_sim"):
+            writer.finalise_sim_card()
     except Exception as e:
         _log(f"WARNING: SIMCard finalisation failed: {e}")
 
@@ -542,7 +552,8 @@ def ingest_cellebrite_report(
     # primary name off any bare-number/JID placeholder. Fixes the conflation
     # where the first sighting's name won and the rest were discarded.
     try:
-        writer.finalise_person_identities()
+        with profile_stage("neo4j:finalise_identities"):
+            writer.finalise_person_identities()
     except Exception as e:
         _log(f"WARNING: Person identity finalisation failed: {e}")
 
@@ -556,7 +567,8 @@ def ingest_cellebrite_report(
     # preserved) so the Comms Center badges them as the owner. Runs after the
     # identity finalisation so it isn't overwritten.
     try:
-        writer.flag_owner_app_identities()
+        with profile_stage("neo4j:flag_owner_identities"):
+            writer.flag_owner_app_identities()
     except Exception as e:
         _log(f"WARNING: Owner app-identity flagging failed: {e}")
 
@@ -576,7 +588,8 @@ def ingest_cellebrite_report(
                    failed=sum(writer.write_errors.values()))
     _log("Step 8.35: Harvesting photo geotags from tagged files...")
     try:
-        geo_expected, geo_created = writer.harvest_photo_geotags(tagged_files)
+        with profile_stage("geocoding:harvest_geotags"):
+            geo_expected, geo_created = writer.harvest_photo_geotags(tagged_files)
         _log(f"Geotag harvest: {geo_created}/{geo_expected} photo locations persisted")
         if geo_created != geo_expected:
             _log(f"WARNING: GEOTAG PARITY MISMATCH — {geo_expected} geotagged photos "
@@ -594,7 +607,8 @@ def ingest_cellebrite_report(
     # provenance. Runs before Step 8.4 so the CONTAINS sweep links them too.
     _log("Step 8.36: Harvesting coordinates from all models (WiFi/search/...)...")
     try:
-        harvested = writer.harvest_all_coordinates(all_models)
+        with profile_stage("geocoding:harvest_coordinates"):
+            harvested = writer.harvest_all_coordinates(all_models)
         _log(f"Coordinate harvest: {harvested} extra location points materialised")
     except Exception as e:
         _log(f"WARNING: Coordinate harvest failed: {e}")
@@ -606,7 +620,8 @@ def ingest_cellebrite_report(
     _emit_progress(phase="linking_contains", total=total_models, completed=total_models,
                    failed=sum(writer.write_errors.values()))
     try:
-        writer.link_all_to_report()
+        with profile_stage("neo4j:link_contains"):
+            writer.link_all_to_report()
     except Exception as e:
         _log(f"WARNING: CONTAINS linking failed: {e}")
 
@@ -617,7 +632,8 @@ def ingest_cellebrite_report(
     _emit_progress(phase="geotag_backfill", total=total_models, completed=total_models,
                    failed=sum(writer.write_errors.values()))
     try:
-        backfill_stats = _backfill_nearest_location(db, case_id, report_key, log_callback=log_callback)
+        with profile_stage("geocoding:backfill"):
+            backfill_stats = _backfill_nearest_location(db, case_id, report_key, log_callback=log_callback)
         _log(
             f"Backfill: "
             f"{backfill_stats['calls_tagged']} calls, "
@@ -643,11 +659,13 @@ def ingest_cellebrite_report(
         _emit_progress(phase="registering_media", total=total_models,
                        completed=total_models,
                        failed=sum(writer.write_errors.values()))
-        media_registered = file_linker.register_media_files(
-            evidence_storage=evidence_storage,
-            owner=owner,
-            model_file_map=model_file_map,
-        )
+        with profile_stage("evidence:register_media") as span:
+            media_registered = file_linker.register_media_files(
+                evidence_storage=evidence_storage,
+                owner=owner,
+                model_file_map=model_file_map,
+            )
+            span.add(count=media_registered)
     elif _skip_media:
         _log("Step 9/9: Skipping media registration (CELLEBRITE_SKIP_MEDIA_REGISTRATION=1; "
              "graph fully ingested, media-linking deferred)")
@@ -781,6 +799,8 @@ def ingest_cellebrite_report(
         f"  Phone owner: {stats['phone_owner']}"
     )
 
+    # The writer goes through run_query; mark the case's graph as changed once
+    db.bump_case_version(case_id, names=True)
     db.close()
     return stats
 
@@ -2,7 +2,9 @@
 Configuration module - loads environment variables and defines constants.
 """
 
+import importlib.util
 import os
+import sys
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -34,6 +36,29 @@ OPENAI_MODEL = os.getenv("OPENAI_MODEL", "gpt-4o")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 OLLAMA_BASE_URL = os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL") or "qwen2.5:7b"
+
+# Shared LLM transport and response cache (backend/services/llm_transport.py,
+# llm_response_cache.py): their settings are defined once in backend/config.py
+# and re-exported here, since those modules import them from whichever
+# "config" is on the path
+def _load_backend_config():
+    spec = importlib.util.spec_from_file_location("_backend_config", BASE_DIR / "backend" / "config.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+_backend_config = sys.modules.get("_backend_config") or _load_backend_config()
+sys.modules["_backend_config"] = _backend_config
+
+LLM_CONCURRENCY_OLLAMA = _backend_config.LLM_CONCURRENCY_OLLAMA
+LLM_CONCURRENCY_OPENAI = _backend_config.LLM_CONCURRENCY_OPENAI
+LLM_MAX_RETRIES = _backend_config.LLM_MAX_RETRIES
+LLM_RETRY_BASE_DELAY = _backend_config.LLM_RETRY_BASE_DELAY
+LLM_CACHE_ENABLED = _backend_config.LLM_CACHE_ENABLED
+LLM_CACHE_MAX_MB = _backend_config.LLM_CACHE_MAX_MB
+LLM_CACHE_DEFAULT_TTL = _backend_config.LLM_CACHE_DEFAULT_TTL
+
 # ---------------------------------------------------------------------------
 # Parallel Processing Configuration
 # ---------------------------------------------------------------------------
@@ -41,6 +66,15 @@ OLLAMA_MODEL = os.getenv("OLLAMA_MODEL") or "qwen2.5:7b"
 # Maximum number of files to process in parallel during ingestion
 MAX_INGESTION_WORKERS = int(os.getenv("MAX_INGESTION_WORKERS", "4"))
 
+# Chunks of one document whose LLM extraction runs concurrently; entity
+# resolution and graph writes stay sequential in chunk order.
+# 0 = the provider's LLM concurrency limit, 1 = fully sequential
+CHUNK_EXTRACTION_WORKERS = int(os.getenv("CHUNK_EXTRACTION_WORKERS", "0"))
+
+# Re-ingesting a document only extracts and embeds chunks whose content hash
+# changed; chunks that disappeared have their vectors and citations retired
+INCREMENTAL_REINGEST = os.getenv("INCREMENTAL_REINGEST", "true").lower() == "true"
+
 # ---------------------------------------------------------------------------
 # Image Processing Configuration
 # ---------------------------------------------------------------------------
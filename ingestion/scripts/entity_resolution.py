@@ -5,14 +5,17 @@ Provides functions for:
 - Key normalisation
 - Exact key matching
 - Fuzzy matching with LLM disambiguation
+- Batched resolution of a chunk's entities against an in-memory case index
 """
 
 import re
-from typing import Optional, Dict, Tuple, Callable
+from typing import Optional, Dict, List, Set, Tuple, Callable
 
 from neo4j_client import Neo4jClient
-from llm_client import disambiguate_entity
-from logging_utils import log_progress, log_error
+from llm_client import disambiguate_entity, disambiguate_entities_batch
+from logging_utils import log_progress, log_error, log_warning
+
+FUZZY_MATCH_LIMIT = 5
 
 
 def normalise_key(raw: Optional[str]) -> str:
@@ -135,6 +138,49 @@ def resolve_entity(
     return candidate_key, False
 
 
+def fact_chunk_hashes(fact: Dict) -> List[str]:
+    """Content hashes of the chunks citing a verified fact (legacy single
+    ``chunk_hash`` stamps included); empty for facts ingested unhashed."""
+    hashes = fact.get("chunk_hashes")
+    if isinstance(hashes, list):
+        return [h for h in hashes if isinstance(h, str)]
+    if isinstance(fact.get("chunk_hash"), str):
+        return [fact["chunk_hash"]]
+    return []
+
+
+def dedupe_verified_facts(existing_facts: List[Dict], new_facts: List[Dict]) -> List[Dict]:
+    """
+    Append new facts whose text is not already present.
+
+    A duplicate from the same source document still adds its chunk hashes
+    to the kept fact, so the fact is only retired on re-ingestion once no
+    chunk of that document cites it any more.
+    """
+    merged = list(existing_facts)
+    by_text: Dict[str, int] = {}
+    for position, fact in enumerate(merged):
+        by_text.setdefault(fact.get("text", "").lower().strip(), position)
+    for fact in new_facts:
+        fact_text = fact.get("text", "").lower().strip()
+        if not fact_text:
+            continue
+        if fact_text not in by_text:
+            by_text[fact_text] = len(merged)
+            merged.append(fact)
+            continue
+        kept = merged[by_text[fact_text]]
+        kept_hashes = fact_chunk_hashes(kept)
+        # Unhashed facts predate incremental re-ingestion and are never retired
+        if kept_hashes and kept.get("source_doc") == fact.get("source_doc"):
+            hashes = sorted(set(kept_hashes) | set(fact_chunk_hashes(fact)))
+            if hashes != kept_hashes:
+                kept = {k: v for k, v in kept.items() if k != "chunk_hash"}
+                kept["chunk_hashes"] = hashes
+                merged[by_text[fact_text]] = kept
+    return merged
+
+
 def merge_entity_data(
     existing_entity: Dict,
     new_verified_facts: list,
@@ -183,14 +229,8 @@ def merge_entity_data(
         enriched_insight["source_doc"] = doc_name
         enriched_new_insights.append(enriched_insight)
     
-    # Merge facts - dedupe by text
-    existing_fact_texts = {f.get("text", "").lower().strip() for f in existing_facts}
-    merged_facts = list(existing_facts)
-    for fact in enriched_new_facts:
-        fact_text = fact.get("text", "").lower().strip()
-        if fact_text and fact_text not in existing_fact_texts:
-            merged_facts.append(fact)
-            existing_fact_texts.add(fact_text)
+    # Merge facts - dedupe by text, keeping every chunk that cites a fact
+    merged_facts = dedupe_verified_facts(existing_facts, enriched_new_facts)
     
     # Merge insights - dedupe by text
     existing_insight_texts = {i.get("text", "").lower().strip() for i in existing_insights}
@@ -205,3 +245,242 @@ def merge_entity_data(
         "verified_facts": merged_facts,
         "ai_insights": merged_insights,
     }
+
+
+def _sanitise_type(entity_type: Optional[str]) -> Optional[str]:
+    """Entity type as Neo4j stores it as a label (see Neo4jClient.create_entity)."""
+    if not entity_type:
+        return None
+    sanitised = re.sub(r"[^a-zA-Z0-9_]", "_", entity_type.strip())
+    sanitised = re.sub(r"_+", "_", sanitised).strip("_")
+    return sanitised or None
+
+
+class CaseEntityIndex:
+    """
+    In-memory key/name/alias index of a case's entities for one ingest.
+
+    Loaded once per document with a single query and updated as entities are
+    created, so resolution does not hit Neo4j per extracted entity. Documents
+    of a case are ingested concurrently, so keys missing from the index are
+    looked up again (``refresh``, one query per chunk) before being treated
+    as new: another document may have created them since the load. Fuzzy
+    candidates follow fuzzy_search_entities: any word of the candidate name
+    contained in an existing name (aliases are searched too), restricted to
+    the same type.
+    """
+
+    def __init__(self, rows: Optional[List[Dict]] = None):
+        self._entities: Dict[str, Dict] = {}
+        self._by_type: Dict[Optional[str], Set[str]] = {}
+        for row in rows or []:
+            self.add(row.get("key"), row.get("name"), row.get("type"), row.get("aliases"))
+
+    @classmethod
+    def load(cls, db: Neo4jClient, case_id: str) -> "CaseEntityIndex":
+        return cls(db.get_entity_name_index(case_id))
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entities
+
+    def __len__(self) -> int:
+        return len(self._entities)
+
+    def keys(self) -> List[str]:
+        return list(self._entities)
+
+    def refresh(self, db: Neo4jClient, case_id: str, keys: List[str]) -> None:
+        """Add entities created since the load (e.g. by another document of
+        the case) for any of ``keys`` the index does not know, in one query."""
+        missing = sorted({k for k in keys if k and k not in self._entities})
+        for row in db.find_entities_by_keys(missing, case_id) if missing else []:
+            self.add(row.get("key"), row.get("name"), row.get("type"))
+
+    def add(
+        self,
+        key: Optional[str],
+        name: Optional[str],
+        entity_type: Optional[str],
+        aliases: Optional[List[str]] = None,
+    ) -> None:
+        """Record an entity (call after creating it in Neo4j)."""
+        if not key:
+            return
+        names = [n.lower() for n in [name] + list(aliases or []) if isinstance(n, str) and n.strip()]
+        entity_type = _sanitise_type(entity_type)
+        self._entities[key] = {"key": key, "name": name, "type": entity_type, "names": names}
+        self._by_type.setdefault(entity_type, set()).add(key)
+
+    def fuzzy_candidates(
+        self,
+        name: str,
+        entity_type: Optional[str] = None,
+        limit: int = FUZZY_MATCH_LIMIT,
+    ) -> List[Dict]:
+        """
+        Existing entities whose name or an alias contains a word of ``name``.
+
+        Best first: exact name/alias match, then most words matched, then
+        closest name length.
+        """
+        terms = [t for t in name.lower().split() if t]
+        if not terms:
+            return []
+        name_lower = name.lower().strip()
+        sanitised = _sanitise_type(entity_type)
+        keys = self._by_type.get(sanitised, set()) if sanitised else self._entities.keys()
+
+        scored = []
+        for key in keys:
+            entity = self._entities[key]
+            best = None
+            for candidate_name in entity["names"]:
+                matched = sum(1 for t in terms if t in candidate_name)
+                if not matched:
+                    continue
+                score = (
+                    candidate_name.strip() == name_lower,
+                    matched,
+                    -abs(len(candidate_name) - len(name_lower)),
+                )
+                if best is None or score > best:
+                    best = score
+            if best is not None:
+                scored.append((best, key))
+        scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+        return [
+            {"key": key, "name": self._entities[key]["name"], "type": self._entities[key]["type"]}
+            for _, key in scored[:limit]
+        ]
+
+
+def resolve_entities_batch(
+    candidates: List[Dict],
+    index: CaseEntityIndex,
+    db: Neo4jClient,
+    case_id: str,
+    profile_name: Optional[str] = None,
+    log_callback: Optional[Callable[[str], None]] = None,
+) -> List[Tuple[str, bool]]:
+    """
+    Resolve all candidate entities of a chunk at once.
+
+    Same outcome rules as resolve_entity, but exact and fuzzy matching run
+    against ``index`` and every candidate that still needs a decision goes
+    to the LLM in a single batched disambiguation prompt. If that call fails,
+    resolution falls back to the per-pair prompts resolve_entity uses.
+
+    A key repeated within the batch resolves like its first occurrence, as
+    existing from the second occurrence on — matching the sequential
+    behaviour where the first occurrence has been created or matched by
+    then. The caller must add new entities to ``index`` as it creates them.
+    Keys the index does not know are first looked up in Neo4j in one query,
+    so entities created by a concurrently ingested document are matched.
+
+    Args:
+        candidates: Dicts with key, name, type, facts (in chunk order)
+        index: The case's entity index for this ingest
+        db: Neo4j client (only used for the ambiguous candidates' details)
+        case_id: The case ID to scope to
+
+    Returns:
+        One (resolved_key, is_existing) tuple per candidate, in order
+    """
+    results: List[Optional[Tuple[str, bool]]] = [None] * len(candidates)
+    ambiguous: List[Tuple[int, List[Dict]]] = []
+    first_occurrence: Dict[str, int] = {}
+    repeats: List[Tuple[int, int]] = []
+
+    index.refresh(db, case_id, [cand["key"] for cand in candidates])
+
+    for i, cand in enumerate(candidates):
+        key = cand["key"]
+        if key in index:
+            log_progress(f"Exact match found for '{key}'", log_callback, prefix="    → ")
+            results[i] = (key, True)
+            continue
+        if key in first_occurrence:
+            repeats.append((i, first_occurrence[key]))
+            continue
+        first_occurrence[key] = i
+        options = [o for o in index.fuzzy_candidates(cand["name"], cand.get("type")) if o["key"] != key]
+        if not options:
+            log_progress(f"No matches found for '{cand['name']}', creating new entity", log_callback, prefix="    → ")
+            results[i] = (key, False)
+            continue
+        ambiguous.append((i, options))
+
+    if ambiguous:
+        _disambiguate_batch(candidates, ambiguous, results, db, case_id, profile_name, log_callback)
+
+    for i, first in repeats:
+        results[i] = (results[first][0], True)
+    return results
+
+
+def _disambiguate_batch(
+    candidates: List[Dict],
+    ambiguous: List[Tuple[int, List[Dict]]],
+    results: List[Optional[Tuple[str, bool]]],
+    db: Neo4jClient,
+    case_id: str,
+    profile_name: Optional[str],
+    log_callback: Optional[Callable[[str], None]],
+) -> None:
+    """Fill ``results`` for the ambiguous candidates with one LLM call."""
+
+    log_progress(
+        f"{len(ambiguous)} entit{'y' if len(ambiguous) == 1 else 'ies'} with fuzzy matches, "
+        f"disambiguating in one batch...",
+        log_callback, prefix="    → ",
+    )
+    details = {
+        e["key"]: e
+        for e in db.find_entities_by_keys(
+            sorted({o["key"] for _, options in ambiguous for o in options}), case_id
+        )
+    }
+    items = []
+    for i, options in ambiguous:
+        cand = candidates[i]
+        items.append({
+            "key": cand["key"],
+            "name": cand["name"],
+            "type": cand.get("type"),
+            "facts": cand.get("facts", ""),
+            "options": [details.get(o["key"], o) for o in options],
+        })
+
+    try:
+        decisions = disambiguate_entities_batch(items, profile_name=profile_name, log_callback=log_callback)
+    except Exception as e:
+        log_warning(f"Batched disambiguation failed ({e}), falling back to per-entity prompts", log_callback, prefix="    → ")
+        decisions = None
+
+    for item_index, (i, options) in enumerate(ambiguous):
+        cand = candidates[i]
+        if decisions is not None:
+            matched_key = decisions.get(item_index)
+        else:
+            matched_key = None
+            for option in items[item_index]["options"]:
+                try:
+                    if disambiguate_entity(
+                        candidate_key=cand["key"],
+                        candidate_name=cand["name"],
+                        candidate_type=cand.get("type"),
+                        candidate_facts=cand.get("facts", ""),
+                        existing_entity=option,
+                        profile_name=profile_name,
+                        log_callback=log_callback,
+                    ):
+                        matched_key = option.get("key")
+                        break
+                except Exception as e:
+                    log_error(f"Disambiguation error for {option.get('name')}: {e}", log_callback, prefix="    → ")
+        if matched_key:
+            log_progress(f"LLM confirmed match: '{cand['name']}' = '{matched_key}'", log_callback, prefix="    → ")
+            results[i] = (matched_key, True)
+        else:
+            log_progress(f"No confirmed matches, creating new entity for '{cand['name']}'", log_callback, prefix="    → ")
+            results[i] = (cand["key"], False)
@@ -6,7 +6,7 @@ from typing import Dict, Optional, Callable
 from openpyxl import load_workbook
 
 from ingestion import ingest_document
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 
 
 def extract_text_from_excel(path: Path) -> str:
@@ -78,10 +78,12 @@ def ingest_excel_file(
 
     try:
         if extension == ".csv":
-            text = extract_text_from_csv(path)
+            with profile_stage("parse:csv"):
+                text = extract_text_from_csv(path)
             source_type = "csv"
         elif extension in (".xls", ".xlsx"):
-            text = extract_text_from_excel(path)
+            with profile_stage("parse:excel"):
+                text = extract_text_from_excel(path)
             source_type = "excel"
         else:
             return {"status": "error", "reason": f"Unsupported file extension: {extension}", "file": str(path)}
@@ -16,7 +16,7 @@ from audio_processor import (
     parse_sri_file,
     parse_rtf_file,
 )
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 
 # Image processor (optional — only needed when folders contain images)
 try:
@@ -608,28 +608,33 @@ def process_folder_with_profile(
         if not files:
             continue
         
-        if role == "audio":
-            # Use OpenAI Whisper API (default, no model loading needed)
-            audio_results = process_audio_files(files, rule, None, log_callback)
-            file_results.update(audio_results)
+        # Stage kind per role, so the job profile separates transcription
+        # and vision time from plain file parsing
+        stage_kind = {"audio": "transcription", "image": "vision", "video": "vision"}.get(role, "parse")
+        with profile_stage(f"{stage_kind}:{role}") as span:
+            span.add(count=len(files))
+            if role == "audio":
+                # Use OpenAI Whisper API (default, no model loading needed)
+                audio_results = process_audio_files(files, rule, None, log_callback)
+                file_results.update(audio_results)
         
-        elif role == "metadata":
-            metadata_results = process_metadata_files(files, rule, log_callback)
-            file_results["metadata"].update(metadata_results)
+            elif role == "metadata":
+                metadata_results = process_metadata_files(files, rule, log_callback)
+                file_results["metadata"].update(metadata_results)
         
-        elif role == "interpretation":
-            interpretation_results = process_interpretation_files(files, rule, log_callback)
-            file_results.update(interpretation_results)
-            if "participants" in interpretation_results:
-                file_results["participants"] = interpretation_results["participants"]
-
-        elif role == "image":
-            image_results = process_image_files(files, rule, log_callback)
-            file_results.update(image_results)
-
-        elif role == "video":
-            video_results = process_video_files(files, rule, log_callback)
-            file_results.update(video_results)
+            elif role == "interpretation":
+                interpretation_results = process_interpretation_files(files, rule, log_callback)
+                file_results.update(interpretation_results)
+                if "participants" in interpretation_results:
+                    file_results["participants"] = interpretation_results["participants"]
+
+            elif role == "image":
+                image_results = process_image_files(files, rule, log_callback)
+                file_results.update(image_results)
+
+            elif role == "video":
+                video_results = process_video_files(files, rule, log_callback)
+                file_results.update(video_results)
     
     # Prepare structured text for ingestion
     structured_text = prepare_structured_text(folder_name, file_results, output_format)
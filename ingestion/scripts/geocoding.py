@@ -14,6 +14,8 @@ from urllib.parse import quote
 import urllib.request
 import urllib.error
 
+from logging_utils import profile_stage
+
 # Cache file location (relative to this script)
 CACHE_DIR = Path(__file__).parent.parent / "data"
 CACHE_FILE = CACHE_DIR / "geocoding_cache.json"
@@ -203,7 +205,8 @@ def geocode_with_cache(location: str) -> Optional[Dict]:
         return cached
     
     # Not in cache - geocode
-    result = geocode_location(location)
+    with profile_stage("geocoding:lookup"):
+        result = geocode_location(location)
     
     # Store in cache (including None for failed lookups to avoid retrying)
     cache[cache_key] = result
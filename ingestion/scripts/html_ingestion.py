@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Dict, Optional, Callable
 
 from ingestion import ingest_document
-from logging_utils import log_progress, log_warning
+from logging_utils import log_progress, log_warning, profile_stage
 
 
 def extract_text_from_html(path: Path) -> str:
@@ -96,7 +96,8 @@ def ingest_html_file(
 
     log_progress(f"Reading HTML file: {path}", log_callback)
 
-    text = extract_text_from_html(path)
+    with profile_stage("parse:html"):
+        text = extract_text_from_html(path)
 
     if not text.strip():
         log_warning(f"HTML file is empty or contains no text content, skipping: {path}", log_callback)
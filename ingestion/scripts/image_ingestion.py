@@ -10,7 +10,7 @@ from typing import Dict, Optional, Callable
 
 from image_processor import process_image
 from ingestion import ingest_document
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 
 
 IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".gif", ".bmp", ".webp", ".tiff", ".tif"}
@@ -50,12 +50,13 @@ def ingest_image_file(
     log_progress(f"Processing image file: {path}", log_callback)
 
     try:
-        result = process_image(
-            image_path=path,
-            provider=image_provider,
-            log_callback=log_callback,
-            doc_name=doc_name,
-        )
+        with profile_stage("vision:image"):
+            result = process_image(
+                image_path=path,
+                provider=image_provider,
+                log_callback=log_callback,
+                doc_name=doc_name,
+            )
     except Exception as e:
         log_error(f"Failed to process image: {e}", log_callback)
         return {"status": "error", "reason": str(e), "file": str(path)}
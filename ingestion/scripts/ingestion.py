@@ -11,11 +11,16 @@ This is the main logic that:
 """
 
 from typing import Dict, List, Optional, Callable
+import hashlib
 import json
 import sys
+import time
 import importlib.util
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
+import numpy as np
+
 # Import profile_loader from the same directory (ingestion/scripts)
 # IMPORTANT: This must happen BEFORE any sys.path manipulation that adds backend/
 # Use importlib to explicitly load from the correct path to avoid conflicts
@@ -33,11 +38,19 @@ from llm_client import (
     generate_entity_summary,
     update_entity_notes,
     call_llm,
+    EXTRACTION_CACHE_TTL,
+    get_llm_transport,
+)
+from entity_resolution import (
+    normalise_key,
+    merge_entity_data,
+    dedupe_verified_facts,
+    CaseEntityIndex,
+    resolve_entities_batch,
 )
-from entity_resolution import normalise_key, resolve_entity, merge_entity_data
 from chunking import chunk_document
 from geocoding import get_location_properties
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage, profile_bind
 
 
 # Import vector DB and embedding services from backend
@@ -107,6 +120,24 @@ def build_entity_embedding_text(
     return "\n".join(parts)
 
 
+def _profile_embedding_config(profile_name: Optional[str]) -> tuple:
+    """
+    Resolve (embedding_provider, embedding_model) from the profile's LLM config.
+
+    Returns (None, None) when the profile has no provider, meaning the
+    default embedding service from config should be used.
+    """
+    llm_config = get_llm_config(profile_name)
+    if llm_config and llm_config.get("provider"):
+        embedding_provider = llm_config.get("provider").lower()
+        if embedding_provider == "openai":
+            return embedding_provider, "text-embedding-3-small"
+        if embedding_provider == "ollama":
+            return embedding_provider, "qwen3-embedding:4b"
+        return embedding_provider, None
+    return None, None
+
+
 def store_entity_embedding(
     entity_key: str,
     name: str,
@@ -133,92 +164,122 @@ def store_entity_embedding(
     Returns:
         True if embedding was stored successfully, False otherwise
     """
-    if not VECTOR_DB_AVAILABLE or not EmbeddingService:
-        return False
-    
-    try:
-        # Build embedding text
+    stored = store_entity_embeddings_bulk(
+        [{
+            "entity_key": entity_key,
+            "name": name,
+            "entity_type": entity_type,
+            "summary": summary,
+            "verified_facts": verified_facts,
+            "ai_insights": ai_insights,
+        }],
+        log_callback=log_callback,
+        profile_name=profile_name,
+        case_id=case_id,
+    )
+    return stored == 1
+
+
+def store_entity_embeddings_bulk(
+    entities: List[Dict],
+    log_callback: Optional[Callable[[str], None]] = None,
+    profile_name: Optional[str] = None,
+    case_id: Optional[str] = None,
+) -> int:
+    """
+    Generate and store embeddings for many entities with one batched upsert.
+
+    Args:
+        entities: Dicts with entity_key, name, entity_type and optional
+            summary, verified_facts, ai_insights (the store_entity_embedding args)
+        log_callback: Optional callback for logging
+        profile_name: Profile whose LLM provider selects the embedding model
+        case_id: Case to stamp on each entity's metadata
+
+    Returns:
+        Number of entity embeddings stored
+    """
+    if not VECTOR_DB_AVAILABLE or not EmbeddingService or not vector_db_service:
+        return 0
+    if not entities:
+        return 0
+
+    # Build embedding text, deduplicating by key (last write wins, as with
+    # sequential upserts)
+    pending: Dict[str, Dict] = {}
+    for ent in entities:
+        entity_key = ent["entity_key"]
         embedding_text = build_entity_embedding_text(
-            name=name,
-            entity_type=entity_type,
-            summary=summary,
-            verified_facts=verified_facts,
-            ai_insights=ai_insights,
+            name=ent["name"],
+            entity_type=ent["entity_type"],
+            summary=ent.get("summary"),
+            verified_facts=ent.get("verified_facts"),
+            ai_insights=ent.get("ai_insights"),
         )
-        
         if not embedding_text.strip():
             log_warning(f"Skipping entity embedding for {entity_key}: no text content", log_callback)
-            return False
-        
-        # Determine embedding provider from profile's LLM config
-        embedding_provider = None
-        embedding_model = None
-        llm_config = get_llm_config(profile_name)
-        if llm_config and llm_config.get("provider"):
-            embedding_provider = llm_config.get("provider").lower()
-            if embedding_provider == "openai":
-                embedding_model = "text-embedding-3-small"
-            elif embedding_provider == "ollama":
-                embedding_model = "qwen3-embedding:4b"
-        
-        # Create embedding service instance based on profile's LLM config
-        profile_embedding_service = None
-        if embedding_provider:
-            try:
-                profile_embedding_service = EmbeddingService(
-                    provider=embedding_provider,
-                    model=embedding_model
-                )
-            except ValueError as e:
-                # Handle missing API key or configuration errors
-                error_msg = str(e)
-                if "OPENAI_API_KEY" in error_msg:
-                    log_warning(
-                        f"Entity embedding: Cannot use OpenAI embedding - OPENAI_API_KEY not set. "
-                        f"Please set OPENAI_API_KEY in your .env file or switch to Ollama provider in the profile.",
-                        log_callback
-                    )
-                else:
-                    log_warning(f"Entity embedding: Configuration error - {error_msg}", log_callback)
-                return False
-            except Exception as e:
-                log_warning(f"Entity embedding: Failed to initialize embedding service - {e}", log_callback)
-                return False
-        else:
-            # Fall back to default embedding service
-            try:
-                profile_embedding_service = EmbeddingService()
-            except Exception as e:
-                log_warning(f"Entity embedding: Failed to initialize default embedding service - {e}", log_callback)
-                return False
-        
-        if not profile_embedding_service:
-            return False
-        
-        # Generate embedding
-        embedding = profile_embedding_service.generate_embedding(embedding_text)
-        
-        # Store in vector DB
+            continue
+        pending[entity_key] = {
+            "text": embedding_text,
+            "name": ent["name"],
+            "entity_type": ent["entity_type"],
+        }
+
+    if not pending:
+        return 0
+
+    # Create embedding service instance based on profile's LLM config
+    embedding_provider, embedding_model = _profile_embedding_config(profile_name)
+    profile_embedding_service = _create_embedding_service(
+        embedding_provider, embedding_model, log_callback
+    )
+    if not profile_embedding_service:
+        return 0
+
+    # Embed every pending entity in one batched call; rows stay aligned with
+    # `pending` and any that failed come back as NaN
+    vectors = profile_embedding_service.generate_embeddings_batch(
+        [item["text"] for item in pending.values()]
+    )
+    keys: List[str] = []
+    texts: List[str] = []
+    embeddings = []
+    metadatas: List[Dict] = []
+    for (entity_key, item), vector in zip(pending.items(), vectors):
+        if np.isnan(vector).any():
+            log_warning(f"Entity embedding failed for {entity_key}", log_callback)
+            continue
         entity_metadata = {
-            "name": name,
-            "entity_type": entity_type,
+            "name": item["name"],
+            "entity_type": item["entity_type"],
         }
         if case_id:
             entity_metadata["case_id"] = case_id
+        keys.append(entity_key)
+        texts.append(item["text"])
+        embeddings.append(vector)
+        metadatas.append(entity_metadata)
+
+    if not keys:
+        return 0
 
-        vector_db_service.add_entity(
-            entity_key=entity_key,
-            text=embedding_text,
-            embedding=embedding,
-            metadata=entity_metadata,
+    try:
+        result = vector_db_service.add_entities_bulk(
+            entity_keys=keys,
+            embeddings=embeddings,
+            texts=texts,
+            metadatas=metadatas,
         )
-        
-        log_progress(f"Entity embedding stored: {entity_key}", log_callback)
-        
-        return True
     except Exception as e:
-        log_warning(f"Entity embedding failed for {entity_key}: {e}", log_callback)
-        return False
+        log_warning(f"Entity embedding upsert failed for {len(keys)} entities: {e}", log_callback)
+        return 0
+
+    log_progress(
+        f"Entity embeddings stored: {result['written']} "
+        f"({result['vectors_per_sec']:.0f} vectors/sec)",
+        log_callback,
+    )
+    return result["written"]
 
 
 def _create_embedding_service(
@@ -282,16 +343,7 @@ def merge_verified_facts(existing_facts: List[Dict], new_facts: List[Dict], doc_
         enriched_new_facts.append(enriched_fact)
     
     # Simple merge - combine and dedupe by text
-    existing_texts = {f.get("text", "").lower().strip() for f in existing_facts}
-    
-    merged = list(existing_facts)
-    for fact in enriched_new_facts:
-        fact_text = fact.get("text", "").lower().strip()
-        if fact_text and fact_text not in existing_texts:
-            merged.append(fact)
-            existing_texts.add(fact_text)
-    
-    return merged
+    return dedupe_verified_facts(existing_facts, enriched_new_facts)
 
 
 def merge_ai_insights(existing_insights: List[Dict], new_insights: List[Dict], doc_name: str) -> List[Dict]:
@@ -329,6 +381,46 @@ def merge_ai_insights(existing_insights: List[Dict], new_insights: List[Dict], d
     return merged
 
 
+def extract_chunk(
+    chunk_text: str,
+    doc_name: str,
+    chunk_index: int,
+    existing_keys: List[str],
+    page_start: Optional[int] = None,
+    page_end: Optional[int] = None,
+    log_callback: Optional[Callable[[str], None]] = None,
+    profile_name: Optional[str] = None,
+) -> Optional[Dict]:
+    """
+    Run the LLM extraction for one chunk (no database access).
+
+    Safe to call from worker threads; ingest_document runs several at once
+    and feeds the results to process_chunk in chunk order.
+
+    Returns:
+        The extraction dict ('entities', 'relationships'), or None if it failed
+    """
+    chunk_num = chunk_index + 1
+    try:
+        log_progress(f"  [6.{chunk_num}.1] Entity extraction: Calling LLM to extract entities and relationships from chunk...", log_callback)
+        with profile_stage("extract:chunk", chunk=chunk_index) as span:
+            span.add(bytes=len(chunk_text))
+            extraction = extract_entities_and_relationships(
+                text=chunk_text,
+                doc_name=doc_name,
+                existing_entity_keys=existing_keys,
+                page_start=page_start,
+                page_end=page_end,
+                profile_name=profile_name,
+                log_callback=log_callback,
+            )
+        log_progress(f"  [6.{chunk_num}.1] Entity extraction: LLM extraction completed", log_callback)
+        return extraction
+    except Exception as e:
+        log_error(f"  [6.{chunk_num}.1] Entity extraction: FAILED - {e}", log_callback)
+        return None
+
+
 def process_chunk(
     chunk_text: str,
     doc_name: str,
@@ -341,6 +433,9 @@ def process_chunk(
     page_end: Optional[int] = None,
     log_callback: Optional[Callable[[str], None]] = None,
     profile_name: Optional[str] = None,
+    extraction: Optional[Dict] = None,
+    entity_index: Optional[CaseEntityIndex] = None,
+    chunk_hash: Optional[str] = None,
 ) -> Dict:
     """
     Process a single text chunk: extract and resolve entities.
@@ -356,9 +451,16 @@ def process_chunk(
         page_start: First page this chunk covers (for citations)
         page_end: Last page this chunk covers (for citations)
         profile_name: Name of the profile to use (e.g., 'fraud', 'generic')
+        extraction: Result of extract_chunk() if already run; the LLM
+            extraction is skipped and only resolution and writes happen here
+        entity_index: The case's in-memory entity index for this ingest
+            (loaded from Neo4j if not given); new entities are added to it
+        chunk_hash: Content hash of the chunk, stamped on its verified facts
+            so they can be retired if the chunk disappears on re-ingestion
 
     Returns:
         Dict with 'entities_processed' and 'relationships_processed' counts
+        ('extraction_failed' is set if the LLM extraction failed)
 
     Raises:
         ValueError: If case_id is not provided
@@ -376,40 +478,47 @@ def process_chunk(
 
     # Extract entities and relationships from chunk with page context
     chunk_num = chunk_index + 1
-    try:
-        log_progress(f"  [6.{chunk_num}.1] Entity extraction: Calling LLM to extract entities and relationships from chunk...", log_callback)
-        extraction = extract_entities_and_relationships(
-            text=chunk_text,
+    if extraction is None:
+        extraction = extract_chunk(
+            chunk_text=chunk_text,
             doc_name=doc_name,
-            existing_entity_keys=existing_keys,
+            chunk_index=chunk_index,
+            existing_keys=existing_keys,
             page_start=page_start,
             page_end=page_end,
-            profile_name=profile_name,
             log_callback=log_callback,
+            profile_name=profile_name,
         )
-        log_progress(f"  [6.{chunk_num}.1] Entity extraction: LLM extraction completed", log_callback)
-    except Exception as e:
-        log_error(f"  [6.{chunk_num}.1] Entity extraction: FAILED - {e}", log_callback)
-        return {"entities_processed": 0, "relationships_processed": 0}
+    if extraction is None:
+        return {"entities_processed": 0, "relationships_processed": 0, "extraction_failed": True}
 
     entities = extraction.get("entities", [])
     relationships = extraction.get("relationships", [])
 
+    if chunk_hash:
+        for ent in entities:
+            for fact in ent.get("verified_facts") or []:
+                if isinstance(fact, dict):
+                    fact["chunk_hashes"] = [chunk_hash]
+
     log_progress(f"  [6.{chunk_num}.1] Entity extraction: Extracted {len(entities)} entities, {len(relationships)} relationships", log_callback)
 
     entities_processed = 0
     relationships_processed = 0
 
-    # Process each entity
+    # Entity embeddings are collected here and written in one batched
+    # upsert once every entity in the chunk has been resolved
+    pending_embeddings: List[Dict] = []
+
+    if entity_index is None:
+        entity_index = CaseEntityIndex.load(db, case_id)
+
+    # Validate and normalise every entity, then resolve them all at once
+    # against the in-memory index (one batched LLM call for ambiguous ones)
+    candidates = []
     for ent in entities:
         raw_key = ent.get("key", "") or ent.get("name", "")
         name = ent.get("name", raw_key)
-        entity_type = ent.get("type", "Other")
-        
-        # Get the new structured data
-        verified_facts = ent.get("verified_facts", [])
-        ai_insights = ent.get("ai_insights", [])
-        
 
         if not raw_key or not name:
             log_warning(f"Skipping entity with missing key/name: {ent}", log_callback, prefix="  ")
@@ -422,28 +531,49 @@ def process_chunk(
             log_warning(f"Skipping entity with empty normalised key: {raw_key}", log_callback, prefix="  ")
             continue
 
-        entity_num = entities.index(ent) + 1 if ent in entities else 0
-        log_progress(f"  [6.{chunk_index + 1}.2] Entity resolution: Resolving entity {entity_num}/{len(entities)}: {name} ({entity_type})", log_callback)
-
-        # Resolve: find existing or create new
         facts_str = "\n".join(
-            fact.get("text", "") for fact in verified_facts if fact.get("text")
+            fact.get("text", "") for fact in ent.get("verified_facts", []) if fact.get("text")
         )
-        resolved_key, is_existing = resolve_entity(
-            candidate_key=key,
-            candidate_name=name,
-            candidate_type=entity_type,
-            candidate_facts=facts_str,
+        candidates.append({
+            "ent": ent,
+            "key": key,
+            "name": name,
+            "type": ent.get("type", "Other"),
+            "facts": facts_str,
+        })
+
+    log_progress(f"  [6.{chunk_index + 1}.2] Entity resolution: Resolving {len(candidates)} entities", log_callback)
+    with profile_stage("resolve:entities") as span:
+        span.add(count=len(candidates))
+        resolutions = resolve_entities_batch(
+            candidates,
+            index=entity_index,
             db=db,
             case_id=case_id,
             profile_name=profile_name,
             log_callback=log_callback,
         )
 
+    # Graph writes for the chunk are queued and committed together at the end
+    batch = db.write_batch(case_id)
+
+    # Process each entity
+    for entity_num, (cand, (resolved_key, is_existing)) in enumerate(zip(candidates, resolutions), start=1):
+        ent = cand["ent"]
+        key = cand["key"]
+        name = cand["name"]
+        entity_type = cand["type"]
+
+        # Get the new structured data
+        verified_facts = ent.get("verified_facts", [])
+        ai_insights = ent.get("ai_insights", [])
+
+        log_progress(f"  [6.{chunk_index + 1}.2] Entity resolution: Entity {entity_num}/{len(candidates)}: {name} ({entity_type})", log_callback)
+
         if is_existing:
             log_progress(f"  [6.{chunk_index + 1}.2] Entity resolution: Entity '{name}' matched existing entity (key: {resolved_key})", log_callback)
             # Update existing entity
-            existing = db.find_entity_by_key(resolved_key, case_id)
+            existing = batch.find_entity_by_key(resolved_key, case_id)
             if existing:
                 # Merge verified facts and AI insights
                 merged = merge_entity_data(
@@ -487,7 +617,7 @@ def process_chunk(
                 extra_props["ai_insights"] = json.dumps(merged_insights)
 
                 # Update in database
-                db.update_entity(
+                batch.update_entity(
                     key=resolved_key,
                     case_id=case_id,
                     summary=new_summary,
@@ -497,17 +627,14 @@ def process_chunk(
                 log_progress(f"Updated existing entity: {resolved_key}", log_callback, prefix="    ")
                 
                 # Update entity embedding (summary/facts changed)
-                store_entity_embedding(
-                    entity_key=resolved_key,
-                    name=existing.get("name", name),
-                    entity_type=existing.get("type", entity_type),
-                    summary=new_summary,
-                    verified_facts=merged_facts,
-                    ai_insights=merged_insights,
-                    log_callback=log_callback,
-                    profile_name=profile_name,
-                    case_id=case_id,
-                )
+                pending_embeddings.append({
+                    "entity_key": resolved_key,
+                    "name": existing.get("name", name),
+                    "entity_type": existing.get("type", entity_type),
+                    "summary": new_summary,
+                    "verified_facts": merged_facts,
+                    "ai_insights": merged_insights,
+                })
         else:
             # Create new entity
             log_progress(f"  [6.{chunk_index + 1}.3] Entity creation: Creating new entity '{name}' (key: {key})", log_callback)
@@ -554,7 +681,7 @@ def process_chunk(
             extra_props["verified_facts"] = json.dumps(enriched_facts)
             extra_props["ai_insights"] = json.dumps(enriched_insights)
 
-            db.create_entity(
+            batch.create_entity(
                 key=key,
                 entity_type=entity_type,
                 name=name,
@@ -567,30 +694,44 @@ def process_chunk(
                 extra_props=extra_props,
             )
 
-            # Add to existing keys for subsequent chunks
+            # Add to existing keys and the resolution index for subsequent entities/chunks
             existing_keys.append(key)
+            entity_index.add(key, name, entity_type)
 
             log_progress(f"Created new entity: {key}", log_callback, prefix="    ")
             
             # Store entity embedding
-            store_entity_embedding(
-                entity_key=key,
-                name=name,
-                entity_type=entity_type,
-                summary=initial_summary,
-                verified_facts=enriched_facts,
-                ai_insights=enriched_insights,
-                log_callback=log_callback,
-                profile_name=profile_name,
-                case_id=case_id,
-            )
+            pending_embeddings.append({
+                "entity_key": key,
+                "name": name,
+                "entity_type": entity_type,
+                "summary": initial_summary,
+                "verified_facts": enriched_facts,
+                "ai_insights": enriched_insights,
+            })
 
         # Link entity to document
         doc_key = normalise_key(doc_name)
-        db.link_entity_to_document(resolved_key if is_existing else key, doc_key, case_id)
+        batch.link_entity_to_document(resolved_key if is_existing else key, doc_key, case_id)
 
         entities_processed += 1
 
+    if pending_embeddings:
+        store_entity_embeddings_bulk(
+            pending_embeddings,
+            log_callback=log_callback,
+            profile_name=profile_name,
+            case_id=case_id,
+        )
+
+    # Endpoints created since the index was loaded (by another document of
+    # the case being ingested concurrently) are picked up in one lookup
+    entity_index.refresh(
+        db,
+        case_id,
+        [normalise_key(rel.get(end, "")) for rel in relationships for end in ("from_key", "to_key")],
+    )
+
     # Process relationships
     for rel in relationships:
         from_key = normalise_key(rel.get("from_key", ""))
@@ -602,9 +743,10 @@ def process_chunk(
             log_warning(f"Skipping relationship with missing keys: {rel}", log_callback, prefix="  ")
             continue
 
-        # Validate that both entities exist in this case
-        from_exists = db.find_entity_by_key(from_key, case_id) is not None
-        to_exists = db.find_entity_by_key(to_key, case_id) is not None
+        # Validate that both entities exist in this case (the index holds
+        # everything loaded at the start, created since, or just refreshed)
+        from_exists = from_key in entity_index
+        to_exists = to_key in entity_index
 
         if not from_exists:
             log_warning(f"Skipping relationship: source entity '{from_key}' not found", log_callback, prefix="  ")
@@ -614,7 +756,7 @@ def process_chunk(
             log_warning(f"Skipping relationship: target entity '{to_key}' not found", log_callback, prefix="  ")
             continue
 
-        db.create_relationship(
+        batch.create_relationship(
             from_key=from_key,
             to_key=to_key,
             rel_type=rel_type,
@@ -626,12 +768,39 @@ def process_chunk(
         log_progress(f"Created relationship: {from_key} -[{rel_type}]-> {to_key}", log_callback, prefix="    ")
         relationships_processed += 1
 
+    with profile_stage("neo4j:write") as span:
+        write_stats = batch.commit()
+        span.add(count=write_stats["statements"])
+    log_progress(
+        f"  [6.{chunk_num}.4] Graph writes: {write_stats['entities_created']} created, "
+        f"{write_stats['entities_merged']} merged into entities created concurrently, "
+        f"{write_stats['entities_updated']} updated, {write_stats['links']} document links, "
+        f"{write_stats['relationships']} relationships in {write_stats['statements']} statement(s), one transaction",
+        log_callback,
+    )
+
     return {
         "entities_processed": entities_processed,
         "relationships_processed": relationships_processed,
     }
 
 
+def chunk_content_hash(chunk_text: str) -> str:
+    """Stable content hash of a chunk, used to skip unchanged chunks on re-ingestion."""
+    return hashlib.sha256(chunk_text.encode("utf-8")).hexdigest()
+
+
+def _chunk_extraction_workers(profile_name: Optional[str], total_chunks: int) -> int:
+    """Concurrent chunk extractions for a document (1 = sequential)."""
+    from config import CHUNK_EXTRACTION_WORKERS
+    workers = CHUNK_EXTRACTION_WORKERS
+    if workers <= 0:
+        llm_config = get_llm_config(profile_name)
+        provider = (llm_config or {}).get("provider") or "ollama"
+        workers = get_llm_transport().concurrency_limit(provider)
+    return max(1, min(workers, total_chunks))
+
+
 def ingest_document(
     text: str,
     doc_name: str,
@@ -661,6 +830,7 @@ def ingest_document(
     """
     if not case_id:
         raise ValueError("case_id is required for document ingestion")
+    doc_start = time.monotonic()
     log_progress(f"{'='*60}", log_callback)
     log_progress(f"Ingesting document: {doc_name}", log_callback)
     log_progress(f"{'='*60}", log_callback)
@@ -687,17 +857,7 @@ def ingest_document(
         log_progress(f"[Configuration] LLM Server: {OLLAMA_BASE_URL}", log_callback)
     
     # Determine embedding provider and model from profile's LLM config
-    embedding_provider = None
-    embedding_model = None
-    
-    if llm_config and llm_config.get("provider"):
-        # Match embedding provider to LLM provider from profile
-        embedding_provider = llm_config.get("provider").lower()
-        # Use default embedding models based on provider
-        if embedding_provider == "openai":
-            embedding_model = "text-embedding-3-small"
-        elif embedding_provider == "ollama":
-            embedding_model = "qwen3-embedding:4b"  # Default Ollama embedding model
+    embedding_provider, embedding_model = _profile_embedding_config(profile_name)
     
     # Log Embedding configuration
     if VECTOR_DB_AVAILABLE and EmbeddingService:
@@ -728,93 +888,265 @@ def ingest_document(
         metadata["source_type"] = metadata.get("source_type", "unknown")
 
         log_progress(f"[Step 3] Document node: Creating/updating document node (key: {doc_key})", log_callback)
-        doc_id = db.ensure_document(
-            doc_key=doc_key,
-            doc_name=doc_name,
-            case_id=case_id,
-            metadata=metadata,
-        )
+        with profile_stage("neo4j:document"):
+            doc_id = db.ensure_document(
+                doc_key=doc_key,
+                doc_name=doc_name,
+                case_id=case_id,
+                metadata=metadata,
+            )
         log_progress(f"[Step 3] Document node: Created/updated successfully (ID: {doc_id})", log_callback)
 
-        # Get existing entity keys for context (scoped to this case)
+        # Get existing entities for context and resolution (scoped to this case)
         log_progress(f"[Step 4] Graph context: Loading existing entities from graph", log_callback)
-        existing_keys = db.get_all_entity_keys(case_id)
+        with profile_stage("neo4j:load_context") as span:
+            entity_index = CaseEntityIndex.load(db, case_id)
+            existing_keys = entity_index.keys()
+            span.add(count=len(existing_keys))
         existing_count = len(existing_keys)
         log_progress(f"[Step 4] Graph context: Found {existing_count} existing entities in graph", log_callback)
 
         # Chunk the document
         log_progress(f"[Step 5] Document chunking: Splitting document into chunks", log_callback)
-        chunks = chunk_document(text, doc_name)
+        with profile_stage("parse:chunking") as span:
+            chunks = chunk_document(text, doc_name)
+            span.add(count=len(chunks), bytes=len(text))
         total_chunks = len(chunks)
         log_progress(f"[Step 5] Document chunking: Document split into {total_chunks} chunks", log_callback)
 
-        # Process each chunk
-        log_progress(f"[Step 6] Chunk processing: Starting to process {total_chunks} chunks", log_callback)
+        # Incremental re-ingestion: chunks whose content was already ingested
+        # for this document (by hash) skip extraction and embedding; chunks
+        # that disappeared have their vectors and citations retired
+        from config import INCREMENTAL_REINGEST
+        for chunk_info in chunks:
+            chunk_info["content_hash"] = chunk_content_hash(chunk_info["text"])
+        previous_hashes = db.get_document_chunk_hashes(doc_key, case_id) if INCREMENTAL_REINGEST else []
+        previous_index: Dict[str, int] = {}
+        for old_idx, chunk_hash in enumerate(previous_hashes):
+            if chunk_hash:
+                previous_index.setdefault(chunk_hash, old_idx)
+        pending = [c for c in chunks if c["content_hash"] not in previous_index]
+        removed_hashes = sorted(set(previous_index) - {c["content_hash"] for c in chunks})
+        document_unchanged = bool(previous_hashes) and previous_hashes == [c["content_hash"] for c in chunks]
+        incremental = {
+            "chunks_reused": total_chunks - len(pending),
+            "chunks_new": len(pending),
+            "chunks_removed": len(removed_hashes),
+            "citations_retired": 0,
+        }
+        if previous_hashes:
+            log_progress(
+                f"[Step 5] Incremental re-ingestion: {incremental['chunks_reused']} unchanged chunk(s) reused, "
+                f"{incremental['chunks_new']} new/changed, {incremental['chunks_removed']} removed",
+                log_callback,
+            )
+
+        # Process each chunk. LLM extraction for up to `workers` chunks runs
+        # concurrently; resolution and graph writes (process_chunk) stay on
+        # this thread, in chunk order, so key collisions resolve exactly as
+        # in a sequential run. Chunk i+workers is submitted only after chunk
+        # i is written, so every chunk's existing-key context is the same
+        # from run to run.
+        workers = _chunk_extraction_workers(profile_name, max(1, len(pending)))
+        log_progress(f"[Step 6] Chunk processing: Starting to process {len(pending)} of {total_chunks} chunks ({workers} concurrent extraction(s))", log_callback)
         total_entities = 0
         total_relationships = 0
-
-        for chunk_info in chunks:
-            chunk_idx = chunk_info["chunk_index"]
-            chunk_num = chunk_idx + 1
-            log_progress(f"[Step 6.{chunk_num}] Processing chunk {chunk_num}/{total_chunks}...", log_callback)
-            
-            result = process_chunk(
+        step6_start = time.monotonic()
+        write_seconds = 0.0
+        wait_seconds = 0.0
+        failed_hashes = set()
+
+        def submit(executor, chunk_info):
+            return executor.submit(
+                profile_bind(extract_chunk),
                 chunk_text=chunk_info["text"],
                 doc_name=doc_name,
                 chunk_index=chunk_info["chunk_index"],
-                total_chunks=chunk_info["total_chunks"],
-                db=db,
-                existing_keys=existing_keys,
-                case_id=case_id,
+                existing_keys=list(existing_keys),
                 page_start=chunk_info.get("page_start"),
                 page_end=chunk_info.get("page_end"),
                 log_callback=log_callback,
                 profile_name=profile_name,
             )
 
-            chunk_entities = result["entities_processed"]
-            chunk_relationships = result["relationships_processed"]
-            
-            log_progress(f"[Step 6.{chunk_num}] Chunk {chunk_num} complete: {chunk_entities} entities, {chunk_relationships} relationships", log_callback)
-                
-            total_entities += chunk_entities
-            total_relationships += chunk_relationships
-        
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="chunk-extract") if workers > 1 else None
+        try:
+            in_flight = {}
+            if executor:
+                for chunk_info in pending[:workers]:
+                    in_flight[chunk_info["chunk_index"]] = submit(executor, chunk_info)
+
+            for position, chunk_info in enumerate(pending):
+                chunk_idx = chunk_info["chunk_index"]
+                chunk_num = chunk_idx + 1
+                log_progress(f"[Step 6.{chunk_num}] Processing chunk {chunk_num}/{total_chunks}...", log_callback)
+
+                extraction = None
+                if executor:
+                    wait_start = time.monotonic()
+                    extraction = in_flight.pop(chunk_idx).result()
+                    wait_seconds += time.monotonic() - wait_start
+                    if extraction is None:
+                        # Extraction failed; skip the chunk as the sequential path does
+                        failed_hashes.add(chunk_info["content_hash"])
+                        extraction = {"entities": [], "relationships": []}
+
+                write_start = time.monotonic()
+                with profile_stage("chunk:process", chunk=chunk_idx):
+                    result = process_chunk(
+                        chunk_text=chunk_info["text"],
+                        doc_name=doc_name,
+                        chunk_index=chunk_info["chunk_index"],
+                        total_chunks=chunk_info["total_chunks"],
+                        db=db,
+                        existing_keys=existing_keys,
+                        case_id=case_id,
+                        page_start=chunk_info.get("page_start"),
+                        page_end=chunk_info.get("page_end"),
+                        log_callback=log_callback,
+                        profile_name=profile_name,
+                        extraction=extraction,
+                        entity_index=entity_index,
+                        chunk_hash=chunk_info["content_hash"],
+                    )
+                if result.get("extraction_failed"):
+                    failed_hashes.add(chunk_info["content_hash"])
+                if executor:
+                    write_seconds += time.monotonic() - write_start
+                    next_position = position + workers
+                    if next_position < len(pending):
+                        next_info = pending[next_position]
+                        in_flight[next_info["chunk_index"]] = submit(executor, next_info)
+
+                chunk_entities = result["entities_processed"]
+                chunk_relationships = result["relationships_processed"]
+
+                log_progress(f"[Step 6.{chunk_num}] Chunk {chunk_num} complete: {chunk_entities} entities, {chunk_relationships} relationships", log_callback)
+
+                total_entities += chunk_entities
+                total_relationships += chunk_relationships
+        finally:
+            if executor:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+        step6_seconds = time.monotonic() - step6_start
+        throughput = {
+            "extraction_workers": workers,
+            "chunk_stage_seconds": round(step6_seconds, 2),
+            "chunks_per_minute": round(len(pending) * 60 / step6_seconds, 2) if step6_seconds else None,
+            "chars_per_second": round(sum(len(c["text"]) for c in pending) / step6_seconds, 1) if step6_seconds else None,
+        }
+        if executor:
+            # Time the writer spent blocked on extraction vs. resolving/writing
+            throughput["writer_wait_seconds"] = round(wait_seconds, 2)
+            throughput["writer_busy_seconds"] = round(write_seconds, 2)
+
         log_progress(f"[Step 6] Chunk processing: All chunks processed. Total: {total_entities} entities, {total_relationships} relationships", log_callback)
+        log_progress(
+            f"[Step 6] Chunk processing: {len(pending)} chunks in {throughput['chunk_stage_seconds']}s "
+            f"({throughput['chunks_per_minute']} chunks/min, {throughput['chars_per_second']} chars/sec, "
+            f"{workers} extraction worker(s))",
+            log_callback,
+        )
 
-        # Step 6b: Generate and store chunk-level embeddings
+        # Retire citations from chunks that are no longer in the document
+        if removed_hashes:
+            try:
+                incremental["citations_retired"] = db.retire_chunk_citations(doc_key, doc_name, case_id, removed_hashes)
+                log_progress(f"[Step 6] Incremental re-ingestion: Retired {incremental['citations_retired']} fact(s) cited from removed chunks", log_callback)
+            except Exception as e:
+                log_warning(f"[Step 6] Incremental re-ingestion: Failed to retire citations - {e}", log_callback)
+
+        # Step 6b: Generate and store chunk-level embeddings. New/changed chunks
+        # are embedded; unchanged chunks keep their stored vector, copied if
+        # the chunk moved to another index. Old index 0 holds the document
+        # embedding (Step 7), so a chunk moved from there is re-embedded.
         chunks_embedded = 0
-        log_progress(f"[Step 6b] Chunk embeddings: Generating embeddings for {total_chunks} chunks", log_callback)
+        log_progress(f"[Step 6b] Chunk embeddings: Generating embeddings for {len(pending)} of {total_chunks} chunks", log_callback)
         if VECTOR_DB_AVAILABLE and EmbeddingService and vector_db_service:
             try:
                 chunk_embedding_service = _create_embedding_service(
                     embedding_provider, embedding_model, log_callback
                 )
                 if chunk_embedding_service:
+                    def chunk_id_for(index: int) -> str:
+                        return f"{doc_id}_chunk_{index}"
+
+                    same_layout = len(previous_hashes) == total_chunks
+                    reused_ids = {
+                        c["chunk_index"]: chunk_id_for(previous_index[c["content_hash"]])
+                        for c in chunks if c["content_hash"] in previous_index
+                    }
+                    stored = vector_db_service.get_chunk_vectors(sorted(set(reused_ids.values())))
+
+                    to_embed: List[Dict] = list(pending)
+                    copies: List[tuple] = []  # (chunk_info, stored vector)
+                    kept_ids = set()
                     for chunk_info in chunks:
                         chunk_idx = chunk_info["chunk_index"]
-                        chunk_text = chunk_info["text"]
-                        chunk_id = f"{doc_id}_chunk_{chunk_idx}"
-                        try:
-                            chunk_embedding = chunk_embedding_service.generate_embedding(chunk_text)
-                            vector_db_service.add_chunk(
-                                chunk_id=chunk_id,
-                                text=chunk_text,
-                                embedding=chunk_embedding,
-                                metadata={
-                                    "doc_id": doc_id,
-                                    "doc_name": doc_name,
-                                    "doc_key": doc_key,
-                                    "case_id": case_id,
-                                    "chunk_index": chunk_idx,
-                                    "total_chunks": total_chunks,
-                                    "page_start": chunk_info.get("page_start") if chunk_info.get("page_start") is not None else -1,
-                                    "page_end": chunk_info.get("page_end") if chunk_info.get("page_end") is not None else -1,
-                                }
+                        old_id = reused_ids.get(chunk_idx)
+                        if old_id is None:
+                            continue
+                        if old_id not in stored or old_id == chunk_id_for(0) and chunk_idx != 0:
+                            to_embed.append(chunk_info)
+                        elif old_id == chunk_id_for(chunk_idx) and same_layout:
+                            kept_ids.add(old_id)
+                        else:
+                            copies.append((chunk_info, stored[old_id]["embedding"]))
+                    to_embed.sort(key=lambda c: c["chunk_index"])
+
+                    chunk_vectors_all = chunk_embedding_service.generate_embeddings_batch(
+                        [chunk_info["text"] for chunk_info in to_embed]
+                    ) if to_embed else []
+                    chunk_ids: List[str] = []
+                    chunk_texts: List[str] = []
+                    chunk_vectors = []
+                    chunk_metadatas: List[Dict] = []
+                    for chunk_info, chunk_vector in list(zip(to_embed, chunk_vectors_all)) + copies:
+                        chunk_idx = chunk_info["chunk_index"]
+                        if np.isnan(np.asarray(chunk_vector, dtype=float)).any():
+                            log_warning(f"[Step 6b] Chunk embedding failed for chunk {chunk_idx}", log_callback)
+                            continue
+                        chunk_ids.append(chunk_id_for(chunk_idx))
+                        chunk_texts.append(chunk_info["text"])
+                        chunk_vectors.append(chunk_vector)
+                        chunk_metadatas.append({
+                            "doc_id": doc_id,
+                            "doc_name": doc_name,
+                            "doc_key": doc_key,
+                            "case_id": case_id,
+                            "chunk_index": chunk_idx,
+                            "total_chunks": total_chunks,
+                            "page_start": chunk_info.get("page_start") if chunk_info.get("page_start") is not None else -1,
+                            "page_end": chunk_info.get("page_end") if chunk_info.get("page_end") is not None else -1,
+                            "content_hash": chunk_info["content_hash"],
+                        })
+                    if chunk_ids:
+                        with profile_stage("vector_db:upsert") as span:
+                            span.add(count=len(chunk_ids))
+                            upsert = vector_db_service.add_chunks_bulk(
+                                chunk_ids=chunk_ids,
+                                embeddings=chunk_vectors,
+                                texts=chunk_texts,
+                                metadatas=chunk_metadatas,
                             )
-                            chunks_embedded += 1
-                        except Exception as e:
-                            log_warning(f"[Step 6b] Chunk embedding failed for chunk {chunk_idx}: {e}", log_callback)
+                        log_progress(
+                            f"[Step 6b] Chunk embeddings: Upserted {upsert['written']} vectors in "
+                            f"{upsert['batches']} batch(es) ({upsert['vectors_per_sec']:.0f} vectors/sec, "
+                            f"{len(copies)} reused without re-embedding)",
+                            log_callback,
+                        )
+                    chunks_embedded = len(chunk_ids) + len(kept_ids)
+
+                    # Vectors left under ids that no longer hold a current chunk
+                    current_ids = set(chunk_ids) | kept_ids
+                    stale_ids = [
+                        chunk_id_for(i) for i in range(len(previous_hashes))
+                        if chunk_id_for(i) not in current_ids
+                    ]
+                    if stale_ids:
+                        retired = vector_db_service.delete_chunks(stale_ids)
+                        log_progress(f"[Step 6b] Chunk embeddings: Retired {retired} stale chunk vector(s)", log_callback)
                     log_progress(f"[Step 6b] Chunk embeddings: {chunks_embedded}/{total_chunks} chunks embedded successfully", log_callback)
                 else:
                     log_progress(f"[Step 6b] Chunk embeddings: Skipped (embedding service not available)", log_callback)
@@ -823,10 +1155,21 @@ def ingest_document(
         else:
             log_progress(f"[Step 6b] Chunk embeddings: Skipped (Vector DB not available)", log_callback)
 
+        # Record what this document was ingested with; chunks whose extraction
+        # failed are left out so the next re-ingest retries them
+        db.update_document(doc_key, case_id, {
+            "chunk_hashes": json.dumps([
+                None if c["content_hash"] in failed_hashes else c["content_hash"] for c in chunks
+            ]),
+        })
+
         # Generate and store document embedding (after all chunks processed)
         embedding_stored = False
         log_progress(f"[Step 7] Document embedding: Starting embedding generation", log_callback)
-        if VECTOR_DB_AVAILABLE and text and text.strip() and EmbeddingService:
+        if document_unchanged:
+            embedding_stored = True
+            log_progress(f"[Step 7] Document embedding: Skipped (document unchanged since last ingestion)", log_callback)
+        elif VECTOR_DB_AVAILABLE and text and text.strip() and EmbeddingService:
             try:
                 # Create embedding service instance using shared helper
                 profile_embedding_service = _create_embedding_service(
@@ -882,11 +1225,14 @@ def ingest_document(
         # Generate document summary after all chunks are processed
         doc_summary = None
         log_progress(f"[Step 8] Document summary: Generating summary for document", log_callback)
-        try:
-            # Generate a concise summary of the document content
-            summary_text = text[:15000] if len(text) > 15000 else text  # Use first 15000 chars for summary generation
+        if document_unchanged:
+            log_progress(f"[Step 8] Document summary: Skipped (document unchanged since last ingestion)", log_callback)
+        else:
+            try:
+                # Generate a concise summary of the document content
+                summary_text = text[:15000] if len(text) > 15000 else text  # Use first 15000 chars for summary generation
 
-            summary_prompt = f"""Analyze the following document and provide a comprehensive summary covering:
+                summary_prompt = f"""Analyze the following document and provide a comprehensive summary covering:
 
 1. **Overview**: What this document is about (1-2 sentences)
 2. **Key Entities**: Names of people, companies, banks, or organizations mentioned and their roles
@@ -900,47 +1246,49 @@ Content:
 
 Provide a detailed summary (4-8 sentences) that captures all significant facts an investigator would need:"""
             
-            # Get LLM config from profile
-            llm_config = get_llm_config(profile_name)
-            llm_provider = llm_config.get("provider") if llm_config else None
-            llm_model_id = llm_config.get("model_id") if llm_config else None
+                # Get LLM config from profile
+                llm_config = get_llm_config(profile_name)
+                llm_provider = llm_config.get("provider") if llm_config else None
+                llm_model_id = llm_config.get("model_id") if llm_config else None
             
-            doc_summary = call_llm(
-                prompt=summary_prompt,
-                temperature=0.3,
-                log_callback=log_callback,
-                llm_provider=llm_provider,
-                llm_model_id=llm_model_id,
-            )
+                doc_summary = call_llm(
+                    prompt=summary_prompt,
+                    temperature=0.3,
+                    log_callback=log_callback,
+                    llm_provider=llm_provider,
+                    llm_model_id=llm_model_id,
+                    cache_site="ingestion.doc_summary",
+                    cache_ttl=EXTRACTION_CACHE_TTL,
+                )
             
-            # Store summary on Document node
-            if doc_summary and doc_summary.strip():
-                doc_summary = doc_summary.strip()
-                db.update_document(doc_key, case_id, {"summary": doc_summary})
-                log_progress(f"[Step 8] Document summary: Summary generated and stored in Neo4j successfully", log_callback)
+                # Store summary on Document node
+                if doc_summary and doc_summary.strip():
+                    doc_summary = doc_summary.strip()
+                    db.update_document(doc_key, case_id, {"summary": doc_summary})
+                    log_progress(f"[Step 8] Document summary: Summary generated and stored in Neo4j successfully", log_callback)
                 
-                # Also store summary in chunk metadata if embedding was stored
-                if embedding_stored and VECTOR_DB_AVAILABLE and vector_db_service:
-                    try:
-                        log_progress(f"[Step 8] Document summary: Storing summary in chunk metadata", log_callback)
-                        chunk_id = f"{doc_id}_chunk_0"
-                        chunk_results = vector_db_service.chunk_collection.get(ids=[chunk_id])
-                        if chunk_results and chunk_results.get("ids"):
-                            existing_metadata = chunk_results.get("metadatas", [{}])[0] or {}
-                            updated_metadata = dict(existing_metadata)
-                            updated_metadata["summary"] = doc_summary
-                            vector_db_service.chunk_collection.update(
-                                ids=[chunk_id],
-                                metadatas=[updated_metadata]
-                            )
-                        log_progress(f"[Step 8] Document summary: Summary stored in chunk metadata successfully", log_callback)
-                    except Exception as e:
-                        log_warning(f"[Step 8] Document summary: Failed to store summary in chunk metadata - {e}", log_callback)
-            else:
-                log_warning(f"[Step 8] Document summary: LLM returned empty summary", log_callback)
-        except Exception as e:
-            # Don't fail ingestion if summary generation fails
-            log_warning(f"[Step 8] Document summary: FAILED - {e}", log_callback)
+                    # Also store summary in chunk metadata if embedding was stored
+                    if embedding_stored and VECTOR_DB_AVAILABLE and vector_db_service:
+                        try:
+                            log_progress(f"[Step 8] Document summary: Storing summary in chunk metadata", log_callback)
+                            chunk_id = f"{doc_id}_chunk_0"
+                            chunk_results = vector_db_service.chunk_collection.get(ids=[chunk_id])
+                            if chunk_results and chunk_results.get("ids"):
+                                existing_metadata = chunk_results.get("metadatas", [{}])[0] or {}
+                                updated_metadata = dict(existing_metadata)
+                                updated_metadata["summary"] = doc_summary
+                                vector_db_service.chunk_collection.update(
+                                    ids=[chunk_id],
+                                    metadatas=[updated_metadata]
+                                )
+                            log_progress(f"[Step 8] Document summary: Summary stored in chunk metadata successfully", log_callback)
+                        except Exception as e:
+                            log_warning(f"[Step 8] Document summary: Failed to store summary in chunk metadata - {e}", log_callback)
+                else:
+                    log_warning(f"[Step 8] Document summary: LLM returned empty summary", log_callback)
+            except Exception as e:
+                # Don't fail ingestion if summary generation fails
+                log_warning(f"[Step 8] Document summary: FAILED - {e}", log_callback)
 
     log_progress(f"{'='*60}", log_callback)
     log_progress(f"[Final] Ingestion complete: {doc_name}", log_callback)
@@ -951,6 +1299,12 @@ Provide a detailed summary (4-8 sentences) that captures all significant facts a
     else:
         log_progress(f"[Final] Summary: Document embedding: Not stored", log_callback)
     log_progress(f"[Final] Summary: Chunk embeddings: {chunks_embedded}/{len(chunks)} stored", log_callback)
+    log_progress(
+        f"[Final] Summary: Chunks reused: {incremental['chunks_reused']}, new/changed: {incremental['chunks_new']}, "
+        f"removed: {incremental['chunks_removed']}",
+        log_callback,
+    )
+    log_progress(f"[Final] Summary: Document processed in {round(time.monotonic() - doc_start, 2)}s", log_callback)
     log_progress(f"{'='*60}", log_callback)
 
     return {
@@ -961,4 +1315,6 @@ Provide a detailed summary (4-8 sentences) that captures all significant facts a
         "entities_processed": total_entities,
         "relationships_processed": total_relationships,
         "embedding_stored": embedding_stored,
+        "incremental": incremental,
+        "throughput": {**throughput, "document_seconds": round(time.monotonic() - doc_start, 2)},
     }
@@ -7,13 +7,16 @@ Provides functions for:
 - Summary generation/updates
 """
 
-from typing import Dict, Optional, Callable
+from typing import Any, Dict, List, Optional, Callable
 import json
-import requests
 import os
+import sys
+import importlib
 import importlib.util
 from pathlib import Path
 
+import httpx
+
 # Import profile_loader from the same directory (ingestion/scripts)
 # IMPORTANT: This must happen BEFORE any sys.path manipulation that adds backend/
 # Use importlib to explicitly load from the correct path to avoid conflicts
@@ -38,15 +41,56 @@ get_ingestion_config = _profile_loader_module.get_ingestion_config
 get_llm_config = _profile_loader_module.get_llm_config
 
 from config import OPENAI_MODEL, OLLAMA_BASE_URL, OLLAMA_MODEL, OPENAI_API_KEY
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
+
+# Shared pooled LLM transport and response cache live in the backend services
+# package. Inside the backend process reuse its instances (one pool, shared
+# limits); when run standalone, load the modules by path like profile_loader.
+_backend_dir = Path(__file__).resolve().parent.parent.parent / "backend"
+if str(_backend_dir) not in sys.path:
+    sys.path.append(str(_backend_dir))
+
+
+def _load_backend_service(name: str):
+    try:
+        return importlib.import_module(f"services.{name}")
+    except ImportError:
+        spec = importlib.util.spec_from_file_location(
+            f"ingestion_{name}", _backend_dir / "services" / f"{name}.py"
+        )
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+
+_llm_transport_module = _load_backend_service("llm_transport")
+get_llm_transport = _llm_transport_module.get_llm_transport
+OPENAI_AVAILABLE = _llm_transport_module.OPENAI_AVAILABLE
+_llm_response_cache_module = _load_backend_service("llm_response_cache")
+llm_response_cache = _llm_response_cache_module.llm_response_cache
+response_validator = _llm_response_cache_module.response_validator
+
+# Response cache TTL for chunk extraction: re-ingesting an unchanged document
+# replays the earlier extraction instead of paying for it again
+EXTRACTION_CACHE_TTL = 30 * 24 * 3600
+
+
+def _resolve_provider_model(
+    llm_provider: Optional[str],
+    llm_model_id: Optional[str],
+) -> tuple:
+    """Resolve (provider, model_id), falling back to config defaults."""
+    provider = (llm_provider or "ollama").lower()
+    model_id = llm_model_id
+    
+    # Set default model if not provided
+    if not model_id:
+        if provider == "openai":
+            model_id = OPENAI_MODEL or "gpt-4o"
+        else:  # ollama
+            model_id = OLLAMA_MODEL or "qwen2.5:7b"
+    return provider, model_id
 
-# Try to import OpenAI client
-try:
-    from openai import OpenAI
-    OPENAI_AVAILABLE = True
-except ImportError:
-    OPENAI_AVAILABLE = False
-    OpenAI = None
 
 def call_llm(
     prompt: str,
@@ -58,10 +102,17 @@ def call_llm(
     llm_provider: Optional[str] = None,  # "ollama" or "openai"
     llm_model_id: Optional[str] = None,  # Model ID to use (overrides default)
     doc_name: Optional[str] = None,  # Document name for cost tracking
+    cache_site: Optional[str] = None,  # Opt into the LLM response cache under this name
+    cache_ttl: Optional[int] = None,  # Max age (seconds) of a cached response for this site
+    validate: Optional[Callable[[str], Any]] = None,  # Response must pass this to be cached
 ) -> str:
     """
     Call the LLM endpoint (Ollama or OpenAI).
 
+    Requests go through the shared pooled transport, so concurrent callers
+    (e.g. parallel file ingestion) reuse connections and respect the
+    per-provider concurrency limits.
+
     Args:
         prompt: The prompt to send
         temperature: Sampling temperature (lower = more deterministic)
@@ -71,98 +122,141 @@ def call_llm(
         log_callback: Optional callback for logging progress
         llm_provider: LLM provider to use ("ollama" or "openai"). If None, uses default from config.
         llm_model_id: Model ID to use. If None, uses default for the provider.
+        cache_site: If set, identical earlier requests are answered from the
+            response cache (see backend/services/llm_response_cache.py)
+        cache_ttl: Max age in seconds of a cached response (defaults to LLM_CACHE_DEFAULT_TTL)
+        validate: Only responses for which this returns truthy (without
+            raising) are cached or replayed. json_mode calls default to
+            requiring a parseable JSON object.
 
     Returns:
         The model's response text
     """
     # Determine provider and model
-    provider = (llm_provider or "ollama").lower()
-    model_id = llm_model_id
-    
-    # Set default model if not provided
-    if not model_id:
-        if provider == "openai":
-            model_id = OPENAI_MODEL or "gpt-4o"
-        else:  # ollama
-            model_id = OLLAMA_MODEL or "qwen2.5:7b"
+    provider, model_id = _resolve_provider_model(llm_provider, llm_model_id)
     
     log_progress(f"[LLM] Using provider: {provider}, model: {model_id}", log_callback, prefix="")
     
-    if provider == "openai":
-        return _call_openai(
-            prompt=prompt,
-            model_id=model_id,
-            temperature=temperature,
-            json_mode=json_mode,
-            timeout=timeout,
-            system_context=system_context,
-            log_callback=log_callback,
-            doc_name=doc_name,
+    cache_key = None
+    cacheable = response_validator(validate, json_mode)
+    if cache_site and llm_response_cache.enabled:
+        cache_key, cached = llm_response_cache.lookup(
+            cache_site, provider, model_id, temperature, json_mode,
+            system_context, prompt, ttl=cache_ttl, validate=cacheable,
         )
-    else:  # ollama
-        return _call_ollama(
-            prompt=prompt,
-            model_id=model_id,
-            temperature=temperature,
-            json_mode=json_mode,
-            timeout=timeout,
-            system_context=system_context,
-            log_callback=log_callback,
+        if cached is not None:
+            log_progress(f"[LLM] Cache hit ({cache_site})", log_callback, prefix="")
+            return cached
+    
+    usage: Dict[str, int] = {}
+    with profile_stage("llm:call", provider=provider, model=model_id) as span:
+        span.add(count=1, bytes=len(prompt))
+        if provider == "openai":
+            result = _call_openai(
+                prompt=prompt,
+                model_id=model_id,
+                temperature=temperature,
+                json_mode=json_mode,
+                timeout=timeout,
+                system_context=system_context,
+                log_callback=log_callback,
+                doc_name=doc_name,
+                usage_out=usage,
+            )
+        else:  # ollama
+            result = _call_ollama(
+                prompt=prompt,
+                model_id=model_id,
+                temperature=temperature,
+                json_mode=json_mode,
+                timeout=timeout,
+                system_context=system_context,
+                log_callback=log_callback,
+            )
+    
+    if cache_key and (cacheable is None or cacheable(result)):
+        llm_response_cache.put(
+            cache_key, result, cache_site, provider, model_id,
+            prompt_tokens=usage.get("prompt_tokens"),
+            completion_tokens=usage.get("completion_tokens"),
         )
+    return result
 
 
-def _call_ollama(
+async def call_llm_async(
     prompt: str,
-    model_id: str,
-    temperature: float,
-    json_mode: bool,
-    timeout: int,
-    system_context: Optional[str],
-    log_callback: Optional[Callable[[str], None]],
+    temperature: float = 1,
+    json_mode: bool = False,
+    timeout: int = 600,
+    system_context: Optional[str] = "",
+    log_callback: Optional[Callable[[str], None]] = None,
+    llm_provider: Optional[str] = None,
+    llm_model_id: Optional[str] = None,
+    doc_name: Optional[str] = None,
 ) -> str:
-    """Call Ollama LLM endpoint."""
-    url = f"{OLLAMA_BASE_URL}/api/chat"
+    """
+    Async variant of call_llm() for issuing overlapping requests.
+
+    Takes the same arguments and returns the same text; concurrency is
+    bounded per provider by the shared transport.
+    """
+    provider, model_id = _resolve_provider_model(llm_provider, llm_model_id)
+    transport = get_llm_transport()
 
+    with profile_stage("llm:call", provider=provider, model=model_id) as span:
+        span.add(count=1, bytes=len(prompt))
+        if provider == "openai":
+            _check_openai_available(log_callback)
+            try:
+                response = await transport.aopenai_chat(
+                    **_openai_kwargs(prompt, model_id, temperature, json_mode, timeout, system_context)
+                )
+            except Exception as e:
+                error_msg = f"OpenAI API error: {str(e)}"
+                log_error(error_msg, log_callback, prefix="[LLM] ")
+                raise Exception(error_msg) from e
+            _record_openai_usage(response.usage, model_id, doc_name, log_callback)
+            return response.choices[0].message.content or ""
+
+        try:
+            return await transport.aollama_chat(
+                model_id=model_id,
+                messages=_ollama_messages(prompt, system_context),
+                temperature=temperature,
+                json_mode=json_mode,
+                timeout=timeout,
+            )
+        except Exception as e:
+            raise _ollama_error(e, model_id, log_callback) from e
+
+
+def _ollama_messages(prompt: str, system_context: Optional[str]) -> List[Dict]:
     default_system_context = "You are an investigation assistant."
-    payload: Dict = {
-        "model": model_id,
-        "messages": [
-            {"role": "system", "content": system_context if system_context else default_system_context},
-            {"role": "user", "content": prompt}
-        ],
-        "stream": False,
-        "options": {
-            "temperature": temperature,
-        },
-    }
+    return [
+        {"role": "system", "content": system_context if system_context else default_system_context},
+        {"role": "user", "content": prompt}
+    ]
 
-    if json_mode:
-        payload["format"] = "json"
 
-    # Use tuple format for timeout: (connect_timeout, read_timeout)
-    # Connect timeout: 10 seconds, Read timeout: as specified
-    try:
-        resp = requests.post(url, json=payload, timeout=(10, timeout))
-        resp.raise_for_status()
-    except requests.exceptions.HTTPError as e:
-        if e.response.status_code == 404:
-            # Model not found or endpoint issue
-            error_msg = f"Ollama API error (404): Model '{model_id}' may not be available. "
-            error_msg += f"Check that Ollama is running at {OLLAMA_BASE_URL} and the model is installed."
-            log_error(error_msg, log_callback, prefix="[LLM] ")
-            raise Exception(error_msg) from e
-        raise
-    except requests.exceptions.RequestException as e:
+def _ollama_error(
+    e: Exception,
+    model_id: str,
+    log_callback: Optional[Callable[[str], None]],
+) -> Exception:
+    """Translate a transport error into the user-facing Ollama error."""
+    if isinstance(e, httpx.HTTPStatusError) and e.response.status_code == 404:
+        # Model not found or endpoint issue
+        error_msg = f"Ollama API error (404): Model '{model_id}' may not be available. "
+        error_msg += f"Check that Ollama is running at {OLLAMA_BASE_URL} and the model is installed."
+    elif isinstance(e, httpx.HTTPError):
         error_msg = f"Failed to connect to Ollama at {OLLAMA_BASE_URL}: {str(e)}"
-        log_error(error_msg, log_callback, prefix="[LLM] ")
-        raise Exception(error_msg) from e
-
-    data = resp.json()
-    # Ollama chat response shape: { message: { role: "...", content: "..." }, ... }
-    return (data.get("message") or {}).get("content", "") or ""
+    else:
+        return e
+    log_error(error_msg, log_callback, prefix="[LLM] ")
+    return Exception(error_msg)
 
 
-def _call_openai(
+def _call_ollama(
     prompt: str,
     model_id: str,
     temperature: float,
@@ -170,9 +264,25 @@ def _call_openai(
     timeout: int,
     system_context: Optional[str],
     log_callback: Optional[Callable[[str], None]],
-    doc_name: Optional[str] = None,
 ) -> str:
-    """Call OpenAI LLM endpoint."""
+    """Call Ollama LLM endpoint."""
+    # Pooled keep-alive connection; connect timeout 10s, read timeout as specified
+    try:
+        return get_llm_transport().ollama_chat(
+            model_id=model_id,
+            messages=_ollama_messages(prompt, system_context),
+            temperature=temperature,
+            json_mode=json_mode,
+            timeout=timeout,
+        )
+    except Exception as e:
+        error = _ollama_error(e, model_id, log_callback)
+        if error is e:
+            raise
+        raise error from e
+
+
+def _check_openai_available(log_callback: Optional[Callable[[str], None]]) -> None:
     if not OPENAI_AVAILABLE:
         error_msg = "OpenAI package not installed. Install with: pip install openai"
         log_error(error_msg, log_callback, prefix="[LLM] ")
@@ -182,101 +292,130 @@ def _call_openai(
         error_msg = "OPENAI_API_KEY not set in environment variables"
         log_error(error_msg, log_callback, prefix="[LLM] ")
         raise ValueError(error_msg)
+
+
+def _openai_kwargs(
+    prompt: str,
+    model_id: str,
+    temperature: float,
+    json_mode: bool,
+    timeout: int,
+    system_context: Optional[str],
+) -> Dict:
+    messages = []
+    if system_context:
+        messages.append({"role": "system", "content": system_context})
+    messages.append({"role": "user", "content": prompt})
     
-    try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-        
-        messages = []
-        if system_context:
-            messages.append({"role": "system", "content": system_context})
-        messages.append({"role": "user", "content": prompt})
-        
-        kwargs = {
-            "model": model_id,
-            "messages": messages,
-            "temperature": temperature if model_id != "gpt-5" else 1,
-            "timeout": timeout,
-        }
-        
-        # Force JSON response if requested
-        if json_mode:
-            kwargs["response_format"] = {"type": "json_object"}
-        
-        response = client.chat.completions.create(**kwargs)
+    kwargs = {
+        "model": model_id,
+        "messages": messages,
+        "temperature": temperature if model_id != "gpt-5" else 1,
+        "timeout": timeout,
+    }
+    
+    # Force JSON response if requested
+    if json_mode:
+        kwargs["response_format"] = {"type": "json_object"}
+    return kwargs
+
+
+def _record_openai_usage(
+    usage,
+    model_id: str,
+    doc_name: Optional[str],
+    log_callback: Optional[Callable[[str], None]],
+) -> None:
+    """Track token usage and cost for ingestion (never raises)."""
+    if usage:
+        log_progress(f"[Cost Tracking] OpenAI usage - prompt: {usage.prompt_tokens}, completion: {usage.completion_tokens}, total: {usage.total_tokens}", log_callback, prefix="")
         
-        # Track token usage and cost for ingestion
-        # Check if we have usage information from OpenAI
-        usage = response.usage
-        if usage:
-            log_progress(f"[Cost Tracking] OpenAI usage - prompt: {usage.prompt_tokens}, completion: {usage.completion_tokens}, total: {usage.total_tokens}", log_callback, prefix="")
+        try:
+            from services.cost_tracking_service import record_cost, CostJobType
+            from postgres.session import get_db
             
+            # Get database session
+            db = next(get_db())
             try:
-                import sys
-                from pathlib import Path
-                backend_dir = Path(__file__).parent.parent.parent / "backend"
-                if str(backend_dir) not in sys.path:
-                    sys.path.insert(0, str(backend_dir))
+                # Use doc_name parameter if provided, otherwise try to get from calling context
+                doc_name_for_cost = doc_name or "unknown"
+                if doc_name_for_cost == "unknown":
+                    import inspect
+                    frame = inspect.currentframe()
+                    try:
+                        # Look up the call stack for doc_name
+                        caller_frame = frame.f_back
+                        if caller_frame:
+                            caller_locals = caller_frame.f_locals
+                            if 'doc_name' in caller_locals:
+                                doc_name_for_cost = caller_locals['doc_name']
+                    except Exception:
+                        pass
+                    finally:
+                        del frame
                 
-                from services.cost_tracking_service import record_cost, CostJobType
-                from postgres.session import get_db
+                log_progress(f"[Cost Tracking] Recording cost for document: {doc_name_for_cost}", log_callback, prefix="")
                 
-                # Get database session
-                db = next(get_db())
-                try:
-                    # Use doc_name parameter if provided, otherwise try to get from calling context
-                    doc_name_for_cost = doc_name or "unknown"
-                    if doc_name_for_cost == "unknown":
-                        import inspect
-                        frame = inspect.currentframe()
-                        try:
-                            # Look up the call stack for doc_name
-                            caller_frame = frame.f_back
-                            if caller_frame:
-                                caller_locals = caller_frame.f_locals
-                                if 'doc_name' in caller_locals:
-                                    doc_name_for_cost = caller_locals['doc_name']
-                        except Exception:
-                            pass
-                        finally:
-                            del frame
-                    
-                    log_progress(f"[Cost Tracking] Recording cost for document: {doc_name_for_cost}", log_callback, prefix="")
-                    
-                    record_cost(
-                        job_type=CostJobType.INGESTION,
-                        provider="openai",
-                        model_id=model_id,
-                        prompt_tokens=usage.prompt_tokens,
-                        completion_tokens=usage.completion_tokens,
-                        total_tokens=usage.total_tokens,
-                        description=f"Document ingestion: {doc_name_for_cost}",
-                        extra_metadata={"doc_name": doc_name_for_cost},
-                        db=db,
-                    )
-                    log_progress(f"[Cost Tracking] Successfully recorded cost", log_callback, prefix="")
-                except Exception as e:
-                    import traceback
-                    error_msg = f"Failed to record cost: {e}"
-                    log_error(error_msg, log_callback, prefix="[Cost Tracking] ")
-                    log_error(f"Traceback: {traceback.format_exc()}", log_callback, prefix="[Cost Tracking] ")
-                finally:
-                    db.close()
-            except ImportError as e:
-                log_error(f"Cost tracking not available (ImportError): {e}", log_callback, prefix="[Cost Tracking] ")
+                record_cost(
+                    job_type=CostJobType.INGESTION,
+                    provider="openai",
+                    model_id=model_id,
+                    prompt_tokens=usage.prompt_tokens,
+                    completion_tokens=usage.completion_tokens,
+                    total_tokens=usage.total_tokens,
+                    description=f"Document ingestion: {doc_name_for_cost}",
+                    extra_metadata={"doc_name": doc_name_for_cost},
+                    db=db,
+                )
+                log_progress(f"[Cost Tracking] Successfully recorded cost", log_callback, prefix="")
             except Exception as e:
                 import traceback
-                error_msg = f"Cost tracking error: {e}"
+                error_msg = f"Failed to record cost: {e}"
                 log_error(error_msg, log_callback, prefix="[Cost Tracking] ")
                 log_error(f"Traceback: {traceback.format_exc()}", log_callback, prefix="[Cost Tracking] ")
-        else:
-            log_progress("[Cost Tracking] No usage information available from OpenAI response", log_callback, prefix="")
-        
-        # Extract content
-        return response.choices[0].message.content or ""
+            finally:
+                db.close()
+        except ImportError as e:
+            log_error(f"Cost tracking not available (ImportError): {e}", log_callback, prefix="[Cost Tracking] ")
+        except Exception as e:
+            import traceback
+            error_msg = f"Cost tracking error: {e}"
+            log_error(error_msg, log_callback, prefix="[Cost Tracking] ")
+            log_error(f"Traceback: {traceback.format_exc()}", log_callback, prefix="[Cost Tracking] ")
+    else:
+        log_progress("[Cost Tracking] No usage information available from OpenAI response", log_callback, prefix="")
+
+
+def _call_openai(
+    prompt: str,
+    model_id: str,
+    temperature: float,
+    json_mode: bool,
+    timeout: int,
+    system_context: Optional[str],
+    log_callback: Optional[Callable[[str], None]],
+    doc_name: Optional[str] = None,
+    usage_out: Optional[Dict[str, int]] = None,
+) -> str:
+    """Call OpenAI LLM endpoint. Token counts are copied into ``usage_out`` if given."""
+    _check_openai_available(log_callback)
+    
+    try:
+        response = get_llm_transport().openai_chat(
+            **_openai_kwargs(prompt, model_id, temperature, json_mode, timeout, system_context)
+        )
     except Exception as e:
         error_msg = f"OpenAI API error: {str(e)}"
         log_error(error_msg, log_callback, prefix="[LLM] ")
         raise Exception(error_msg) from e
+    
+    _record_openai_usage(response.usage, model_id, doc_name, log_callback)
+    if usage_out is not None and response.usage:
+        usage_out["prompt_tokens"] = response.usage.prompt_tokens
+        usage_out["completion_tokens"] = response.usage.completion_tokens
+    
+    # Extract content
+    return response.choices[0].message.content or ""
 
 
 def parse_json_response(
@@ -593,6 +732,8 @@ IMPORTANT REMINDERS:
         llm_provider=llm_provider,
         llm_model_id=llm_model_id,
         doc_name=doc_name,
+        cache_site="ingestion.extraction",
+        cache_ttl=EXTRACTION_CACHE_TTL,
     )
     
     # Debug: Log raw LLM response
@@ -696,6 +837,99 @@ Return ONLY valid JSON:
     return result.get("same_entity", False)
 
 
+def disambiguate_entities_batch(
+    items: List[Dict],
+    profile_name: Optional[str] = None,
+    log_callback: Optional[Callable[[str], None]] = None,
+) -> Dict[int, Optional[str]]:
+    """
+    Ask the LLM, in one call, which existing entity (if any) each candidate is.
+
+    Args:
+        items: One dict per ambiguous candidate with key, name, type, facts and
+            ``options`` (existing entity dicts with key, name, type, summary,
+            verified_facts)
+        log_callback: Optional callback for logging progress
+
+    Returns:
+        Dict of item index -> matched existing key, or None for "new entity".
+        Keys the LLM returns that are not among the item's options are
+        treated as None.
+    """
+    blocks = []
+    for i, item in enumerate(items):
+        option_lines = []
+        for option in item["options"]:
+            try:
+                facts = json.loads(option.get("verified_facts") or "[]")
+            except (json.JSONDecodeError, TypeError):
+                facts = []
+            facts_str = "; ".join(f.get("text", "") for f in facts if isinstance(f, dict) and f.get("text"))[:300]
+            option_lines.append(
+                f"    - Key: {option.get('key')} | Name: {option.get('name')} | Type: {option.get('type')}\n"
+                f"      Summary: {(option.get('summary') or 'No summary available')[:300]}\n"
+                f"      Facts: {facts_str or 'No facts available'}"
+            )
+        blocks.append(
+            f"CANDIDATE {i}:\n"
+            f"  Key: {item['key']} | Name: {item['name']} | Type: {item['type']}\n"
+            f"  Facts from this document: {(item.get('facts') or 'None')[:500]}\n"
+            f"  Possibly the same as:\n" + "\n".join(option_lines)
+        )
+
+    prompt = f"""You are helping with entity disambiguation in a fraud investigation.
+
+Each candidate below was found in a document. For each, decide whether it is the
+SAME entity as one of the listed existing entities (just referenced differently),
+or a DIFFERENT, new entity.
+
+Consider:
+- Name variations (nicknames, abbreviations, typos)
+- Context clues
+- Entity types
+
+{chr(10).join(blocks)}
+
+Return ONLY valid JSON with one entry per candidate:
+{{
+  "decisions": [
+    {{"candidate": 0, "match_key": "existing key, or null if a new entity", "confidence": "high" or "medium" or "low"}}
+  ]
+}}
+"""
+
+    llm_config = get_llm_config(profile_name)
+    llm_provider = llm_config.get("provider") if llm_config else None
+    llm_model_id = llm_config.get("model_id") if llm_config else None
+
+    response = call_llm(
+        prompt,
+        json_mode=True,
+        log_callback=log_callback,
+        llm_provider=llm_provider,
+        llm_model_id=llm_model_id,
+    )
+    result = parse_json_response(response, log_callback=log_callback)
+    decisions = result.get("decisions")
+    if not isinstance(decisions, list):
+        raise ValueError("Batched disambiguation response has no 'decisions' list")
+
+    resolved: Dict[int, Optional[str]] = {}
+    for decision in decisions:
+        if not isinstance(decision, dict):
+            continue
+        try:
+            index = int(decision.get("candidate"))
+        except (TypeError, ValueError):
+            continue
+        if not 0 <= index < len(items):
+            continue
+        match_key = decision.get("match_key")
+        option_keys = {o.get("key") for o in items[index]["options"]}
+        resolved[index] = match_key if match_key in option_keys else None
+    return resolved
+
+
 def generate_entity_summary(
     entity_key: str,
     entity_name: str,
@@ -5,8 +5,32 @@ Provides a unified logging function that outputs to both console and
 an optional callback (for frontend progress updates).
 """
 
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
 from typing import Optional, Callable
 
+# Stage timing for the background job running this pipeline (see
+# backend/services/pipeline_profiler.py). Inside the backend process this is
+# the backend's own module, so stages report to the job's active profiler;
+# standalone runs load it by path and, with no profiler active, every stage
+# is a no-op.
+_backend_dir = Path(__file__).resolve().parent.parent.parent / "backend"
+if str(_backend_dir) not in sys.path:
+    sys.path.append(str(_backend_dir))
+try:
+    _pipeline_profiler = importlib.import_module("services.pipeline_profiler")
+except ImportError:
+    _spec = importlib.util.spec_from_file_location(
+        "ingestion_pipeline_profiler", _backend_dir / "services" / "pipeline_profiler.py"
+    )
+    _pipeline_profiler = importlib.util.module_from_spec(_spec)
+    _spec.loader.exec_module(_pipeline_profiler)
+
+profile_stage = _pipeline_profiler.stage
+profile_bind = _pipeline_profiler.bind
+
 
 def log_progress(
     message: str,
@@ -10,7 +10,7 @@ from pathlib import Path
 from typing import Dict, Optional, Callable
 
 from ingestion import ingest_document
-from logging_utils import log_progress, log_warning
+from logging_utils import log_progress, log_warning, profile_stage
 
 
 def extract_text_from_markdown(path: Path) -> str:
@@ -99,7 +99,8 @@ def ingest_markdown_file(
 
     log_progress(f"Reading Markdown file: {path}", log_callback)
 
-    text = extract_text_from_markdown(path)
+    with profile_stage("parse:markdown"):
+        text = extract_text_from_markdown(path)
 
     if not text.strip():
         log_warning(f"Markdown file is empty or contains no text content, skipping: {path}", log_callback)
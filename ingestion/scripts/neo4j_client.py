@@ -8,6 +8,7 @@ Provides functions for:
 - Search (exact and fuzzy)
 """
 
+import json
 import uuid
 import time
 import re
@@ -40,6 +41,73 @@ from neo4j.exceptions import TransientError, ServiceUnavailable
 from config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
 
 
+# Per-case graph write counters read by the backend's caches (answer cache,
+# precomputed results; names: the entity mention matcher); same node and
+# statement as backend/services/neo4j_service.py, which creates its
+# uniqueness constraint
+_BUMP_CASE_VERSION = """
+MERGE (v:CaseGraphVersion {case_key: $case_id})
+ON CREATE SET v.epoch = randomUUID(), v.graph = 0, v.names = 0
+SET v.graph = v.graph + 1,
+    v.names = coalesce(v.names, 0) + CASE WHEN $names THEN 1 ELSE 0 END
+"""
+
+# Entity properties the backend's name index is built from
+_NAME_PROPERTIES = ("name", "aliases", "name_aliases")
+
+
+def _sanitise_identifier(value: str, fallback: str) -> str:
+    """Make an entity type / relationship type safe to use as a Cypher label or type."""
+    # Replace spaces and special chars with underscores, but keep alphanumeric
+    sanitized = re.sub(r'[^a-zA-Z0-9_]', '_', (value or "").strip())
+    # Remove multiple consecutive underscores, then leading/trailing ones
+    sanitized = re.sub(r'_+', '_', sanitized).strip('_')
+    return sanitized or fallback
+
+
+def _json_list(value) -> List:
+    if isinstance(value, list):
+        return value
+    try:
+        parsed = json.loads(value) if value else []
+    except (json.JSONDecodeError, TypeError):
+        return []
+    return parsed if isinstance(parsed, list) else []
+
+
+def _merge_into_existing(existing: Dict, props: Dict) -> Dict:
+    """
+    Properties to SET when a create found its key already taken (another
+    document of the case created the entity first).
+
+    The creator's verified facts and AI insights are merged into the
+    existing node's, deduped by text as merge_entity_data does; its other
+    properties (summary, notes, location, ...) only fill ones the node lacks.
+    """
+    # entity_resolution imports this module
+    from entity_resolution import dedupe_verified_facts
+
+    updates = {
+        "verified_facts": json.dumps(dedupe_verified_facts(
+            _json_list(existing.get("verified_facts")), _json_list(props.get("verified_facts")),
+        )),
+    }
+    insights = _json_list(existing.get("ai_insights"))
+    seen = {str(i.get("text", "")).lower().strip() for i in insights if isinstance(i, dict)}
+    for insight in _json_list(props.get("ai_insights")):
+        text = str(insight.get("text", "")).lower().strip() if isinstance(insight, dict) else ""
+        if text and text not in seen:
+            seen.add(text)
+            insights.append(insight)
+    updates["ai_insights"] = json.dumps(insights)
+    for prop, value in props.items():
+        if prop in ("id", "key", "case_id", "verified_facts", "ai_insights"):
+            continue
+        if value not in (None, "") and existing.get(prop) in (None, ""):
+            updates[prop] = value
+    return updates
+
+
 class Neo4jClient:
     """
     Client for Neo4j database operations.
@@ -149,6 +217,67 @@ class Neo4jClient:
             )
             return [record["key"] for record in result]
 
+    def get_entity_name_index(self, case_id: str) -> List[Dict]:
+        """
+        Get key, name, type and aliases of every entity in a case.
+
+        One query used to build the in-memory resolution index for an ingest.
+
+        Args:
+            case_id: The case ID to filter by
+
+        Returns:
+            List of dicts with key, name, type, aliases
+        """
+        with self.driver.session() as session:
+            result = session.run(
+                """
+                MATCH (e)
+                WHERE e.key IS NOT NULL
+                  AND NOT e:Document
+                  AND e.case_id = $case_id
+                RETURN e.key AS key,
+                       e.name AS name,
+                       labels(e)[0] AS type,
+                       coalesce(e.aliases, []) + coalesce(e.name_aliases, []) AS aliases
+                """,
+                case_id=case_id,
+            )
+            return [dict(record) for record in result]
+
+    def find_entities_by_keys(self, keys: List[str], case_id: str) -> List[Dict]:
+        """
+        Find several entities by exact key within a specific case.
+
+        Args:
+            keys: Normalised entity keys
+            case_id: The case ID to filter by
+
+        Returns:
+            List of entity dicts (same fields as find_entity_by_key)
+        """
+        if not keys:
+            return []
+        with self.driver.session() as session:
+            result = session.run(
+                """
+                MATCH (e)
+                WHERE e.key IN $keys
+                  AND e.case_id = $case_id
+                  AND NOT e:Document
+                RETURN e.id AS id,
+                       e.key AS key,
+                       e.name AS name,
+                       labels(e)[0] AS type,
+                       e.notes AS notes,
+                       e.summary AS summary,
+                       e.verified_facts AS verified_facts
+                """,
+                keys=list(keys),
+                case_id=case_id,
+            )
+            return [dict(record) for record in result]
+
     def find_entity_by_key(self, key: str, case_id: str) -> Optional[Dict]:
         """
         Find an entity by exact key match within a specific case.
@@ -289,6 +418,22 @@ class Neo4jClient:
             )
             return [dict(record) for record in result]
 
+    def _unique_amount_key(self, key: str, case_id: str, amount, taken=()) -> str:
+        """
+        Guard against duplicate keys for financial entities (same date + amount
+        can produce the same LLM-suggested key). Append a short hex suffix
+        until the key is unique within the case (and not in ``taken``).
+        """
+        if not (amount and key):
+            return key
+        if key in taken or self.find_entity_by_key(key, case_id):
+            base_key = key
+            for _ in range(20):
+                key = f"{base_key}-{uuid.uuid4().hex[:4]}"
+                if key not in taken and not self.find_entity_by_key(key, case_id):
+                    break
+        return key
+
     def create_entity(
         self,
         key: str,
@@ -318,7 +463,8 @@ class Neo4jClient:
             extra_props: Additional properties to set
 
         Returns:
-            The generated UUID for the entity
+            The entity's UUID (the existing node's if the key already exists
+            in the case; its facts and insights are merged into that node)
 
         Raises:
             ValueError: If case_id is not provided
@@ -326,18 +472,7 @@ class Neo4jClient:
         if not case_id:
             raise ValueError("case_id is required for creating entities")
 
-        # Guard against duplicate keys for financial entities (same date + amount
-        # can produce the same LLM-suggested key).  Append a short hex suffix
-        # until the key is unique within the case.
-        if amount and key:
-            existing = self.find_entity_by_key(key, case_id)
-            if existing:
-                base_key = key
-                for _ in range(20):
-                    key = f"{base_key}-{uuid.uuid4().hex[:4]}"
-                    if not self.find_entity_by_key(key, case_id):
-                        break
-
+        key = self._unique_amount_key(key, case_id, amount)
         entity_id = str(uuid.uuid4())
 
         props = {
@@ -361,30 +496,41 @@ class Neo4jClient:
         if extra_props:
             props.update(extra_props)
 
-        # Sanitize entity_type for use as Cypher label
-        # Remove or replace characters that aren't valid in Cypher labels
-        # Labels can contain alphanumeric and underscore, but we'll allow common patterns
-        sanitized_type = entity_type.strip()
-        # Replace spaces and special chars with underscores, but keep alphanumeric
-        sanitized_type = re.sub(r'[^a-zA-Z0-9_]', '_', sanitized_type)
-        # Remove multiple consecutive underscores
-        sanitized_type = re.sub(r'_+', '_', sanitized_type)
-        # Remove leading/trailing underscores
-        sanitized_type = sanitized_type.strip('_')
-        # Fallback to "Other" if empty after sanitization
-        if not sanitized_type:
-            sanitized_type = "Other"
+        # Sanitize entity_type for use as Cypher label (fallback to "Other")
+        sanitized_type = _sanitise_identifier(entity_type, "Other")
+
+        # MERGE on (key, case_id): documents of a case are ingested
+        # concurrently, and another one may have created the key since this
+        # caller last looked. The existing node is then kept, with this
+        # caller's facts merged in (see _merge_into_existing) under the
+        # node's write lock.
+        def _write(tx):
+            record = tx.run(
+                f"""
+                MERGE (e:`{sanitized_type}` {{key: $key, case_id: $case_id}})
+                ON CREATE SET e = $props, e._created = true
+                ON MATCH SET e._merging = true
+                WITH e, coalesce(e._created, false) AS created
+                REMOVE e._created, e._merging
+                RETURN e.id AS id, created, properties(e) AS existing
+                """,
+                key=key,
+                case_id=case_id,
+                props=props,
+            ).single()
+            if not record["created"]:
+                tx.run(
+                    "MATCH (e {key: $key, case_id: $case_id}) SET e += $updates",
+                    key=key, case_id=case_id, updates=_merge_into_existing(record["existing"], props),
+                ).consume()
+            return record["id"] or entity_id
 
         def _create():
             with self.driver.session() as session:
-                session.run(
-                    f"""
-                    CREATE (e:`{sanitized_type}` $props)
-                    """,
-                    props=props,
-                )
-        
-        self._execute_with_retry(_create)
+                return session.execute_write(_write)
+
+        entity_id = self._execute_with_retry(_create)
+        self.bump_case_version(case_id, names=True)
         return entity_id
 
     def update_entity(
@@ -444,6 +590,7 @@ class Neo4jClient:
                 )
 
         self._execute_with_retry(_update)
+        self.bump_case_version(case_id, names=any(p in _NAME_PROPERTIES for p in extra_props or {}))
 
     # -------------------------------------------------------------------------
     # Document Operations
@@ -503,7 +650,9 @@ class Neo4jClient:
                 record = result.single()
                 return record["id"] if record else doc_id
 
-        return self._execute_with_retry(_ensure)
+        doc_id = self._execute_with_retry(_ensure)
+        self.bump_case_version(case_id)
+        return doc_id
 
     def update_document(
         self,
@@ -538,6 +687,106 @@ class Neo4jClient:
                 )
 
         self._execute_with_retry(_update_doc)
+        self.bump_case_version(case_id)
+
+    def get_document_chunk_hashes(self, doc_key: str, case_id: str) -> List[str]:
+        """
+        Content hashes of the chunks the document was last ingested with.
+
+        Args:
+            doc_key: Normalised document key
+            case_id: The case ID to filter by
+
+        Returns:
+            Chunk content hashes in chunk order ([] if never recorded)
+        """
+        with self.driver.session() as session:
+            record = session.run(
+                """
+                MATCH (d:Document {key: $key, case_id: $case_id})
+                RETURN d.chunk_hashes AS chunk_hashes
+                """,
+                key=doc_key,
+                case_id=case_id,
+            ).single()
+        if not record or not record["chunk_hashes"]:
+            return []
+        try:
+            hashes = json.loads(record["chunk_hashes"])
+        except (json.JSONDecodeError, TypeError):
+            return []
+        # None marks a chunk whose extraction failed (retried next time)
+        return [h if isinstance(h, str) else None for h in hashes]
+
+    def retire_chunk_citations(
+        self,
+        doc_key: str,
+        doc_name: str,
+        case_id: str,
+        chunk_hashes: List[str],
+    ) -> int:
+        """
+        Remove verified facts cited from chunks that no longer exist in a document.
+
+        On entities MENTIONED_IN the document, ``chunk_hashes`` are removed
+        from the citing chunks of facts sourced from ``doc_name``; a fact is
+        removed once no chunk cites it any more.
+
+        Returns:
+            Number of facts removed
+        """
+        from entity_resolution import fact_chunk_hashes
+
+        if not case_id:
+            raise ValueError("case_id is required for retiring citations")
+        if not chunk_hashes:
+            return 0
+        retired_hashes = set(chunk_hashes)
+        rows = self.run_query(
+            """
+            MATCH (e)-[:MENTIONED_IN]->(d:Document {key: $doc_key, case_id: $case_id})
+            WHERE e.verified_facts IS NOT NULL
+            RETURN e.key AS key, e.verified_facts AS verified_facts
+            """,
+            doc_key=doc_key,
+            case_id=case_id,
+        )
+        updates = []
+        removed = 0
+        for row in rows:
+            try:
+                facts = json.loads(row["verified_facts"])
+            except (json.JSONDecodeError, TypeError):
+                continue
+            kept = []
+            changed = False
+            for f in facts:
+                hashes = fact_chunk_hashes(f) if isinstance(f, dict) and f.get("source_doc") == doc_name else []
+                remaining = [h for h in hashes if h not in retired_hashes]
+                if len(remaining) == len(hashes):
+                    kept.append(f)
+                    continue
+                changed = True
+                if remaining:
+                    f = {k: v for k, v in f.items() if k != "chunk_hash"}
+                    f["chunk_hashes"] = remaining
+                    kept.append(f)
+                else:
+                    removed += 1
+            if changed:
+                updates.append({"key": row["key"], "verified_facts": json.dumps(kept)})
+        if updates:
+            self.run_query(
+                """
+                UNWIND $rows AS row
+                MATCH (e {key: row.key, case_id: $case_id})
+                SET e.verified_facts = row.verified_facts
+                """,
+                rows=updates,
+                case_id=case_id,
+            )
+            self.bump_case_version(case_id)
+        return removed
 
     # -------------------------------------------------------------------------
     # Relationship Operations
@@ -570,18 +819,7 @@ class Neo4jClient:
             raise ValueError("case_id is required for creating relationships")
 
         # Sanitize relationship type for use as Cypher relationship type
-        # Relationship types can contain alphanumeric and underscores, but we'll sanitize special chars
-        import re
-        sanitized_rel_type = rel_type.strip()
-        # Replace spaces and special chars with underscores, but keep alphanumeric
-        sanitized_rel_type = re.sub(r'[^a-zA-Z0-9_]', '_', sanitized_rel_type)
-        # Remove multiple consecutive underscores
-        sanitized_rel_type = re.sub(r'_+', '_', sanitized_rel_type)
-        # Remove leading/trailing underscores
-        sanitized_rel_type = sanitized_rel_type.strip('_')
-        # Fallback to "RELATED_TO" if empty after sanitization
-        if not sanitized_rel_type:
-            sanitized_rel_type = "RELATED_TO"
+        sanitized_rel_type = _sanitise_identifier(rel_type, "RELATED_TO")
 
         def _create_rel():
             with self.driver.session() as session:
@@ -612,6 +850,7 @@ class Neo4jClient:
                     )
 
         self._execute_with_retry(_create_rel)
+        self.bump_case_version(case_id)
 
     def link_entity_to_document(self, entity_key: str, doc_key: str, case_id: str):
         """
@@ -642,6 +881,27 @@ class Neo4jClient:
                 )
 
         self._execute_with_retry(_link)
+        self.bump_case_version(case_id)
+
+    def bump_case_version(self, case_id: str, names: bool = False) -> None:
+        """
+        Mark a case's graph as changed (``names``: including entity names or
+        aliases), so the backend's caches built from it (answers, precomputed
+        results, the entity mention matcher) are refreshed. The write methods
+        here call it themselves; callers writing through run_query call it
+        once they are done.
+        """
+        self.run_query(_BUMP_CASE_VERSION, case_id=case_id, names=names)
+
+    def write_batch(self, case_id: str) -> "ChunkWriteBatch":
+        """
+        Start a unit of work for one chunk's writes.
+
+        Entity creates/updates, document links and relationships queued on the
+        returned batch are written by ``commit()`` as a few UNWIND statements
+        in one transaction, instead of one session and query per call.
+        """
+        return ChunkWriteBatch(self, case_id)
 
     # -------------------------------------------------------------------------
     # Utility Operations
@@ -680,3 +940,241 @@ class Neo4jClient:
         """
         with self.driver.session() as session:
             session.run("MATCH (n) DETACH DELETE n")
+
+
+class ChunkWriteBatch:
+    """
+    Unit of work accumulating one chunk's graph writes.
+
+    Mirrors create_entity, update_entity, link_entity_to_document and
+    create_relationship, then commits everything in one managed write
+    transaction with the client's retry semantics: creates (one UNWIND MERGE
+    per label), updates, document links, relationships (one UNWIND per type), in
+    that order. The transaction is all-or-nothing, so a retry never leaves a
+    chunk half-written.
+
+    find_entity_by_key sees queued creates and updates, so reads between
+    queued writes behave as if each write had already run.
+    """
+
+    def __init__(self, client: Neo4jClient, case_id: str):
+        if not case_id:
+            raise ValueError("case_id is required for batched writes")
+        self.client = client
+        self.case_id = case_id
+        self._creates: Dict[str, List[Dict]] = {}
+        self._created: Dict[str, Dict] = {}
+        self._updates: Dict[str, Dict] = {}
+        self._links: List[Dict] = []
+        self._link_set: set = set()
+        self._relationships: Dict[str, List[Dict]] = {}
+        self._merged = 0
+
+    def __len__(self) -> int:
+        return (
+            sum(len(rows) for rows in self._creates.values())
+            + len(self._updates)
+            + len(self._links)
+            + sum(len(rows) for rows in self._relationships.values())
+        )
+
+    def find_entity_by_key(self, key: str, case_id: str) -> Optional[Dict]:
+        """Neo4jClient.find_entity_by_key including this batch's pending writes."""
+        if key in self._created:
+            props = self._created[key]
+            return {
+                "id": props.get("id"), "key": key, "name": props.get("name"),
+                "type": props.get("_label"), "notes": props.get("notes"),
+                "summary": props.get("summary"), "latitude": props.get("latitude"),
+                "longitude": props.get("longitude"), "location_raw": props.get("location_raw"),
+                "verified_facts": props.get("verified_facts"), "ai_insights": props.get("ai_insights"),
+            }
+        existing = self.client.find_entity_by_key(key, case_id)
+        if existing and key in self._updates:
+            existing = {**existing, **{k: v for k, v in self._updates[key].items() if k in existing}}
+        return existing
+
+    def create_entity(
+        self,
+        key: str,
+        entity_type: str,
+        name: str,
+        notes: str,
+        case_id: str,
+        summary: Optional[str] = None,
+        date: Optional[str] = None,
+        time: Optional[str] = None,
+        amount: Optional[str] = None,
+        extra_props: Optional[Dict] = None,
+    ) -> str:
+        """Queue Neo4jClient.create_entity. Returns the generated UUID."""
+        key = self.client._unique_amount_key(key, self.case_id, amount, taken=self._created)
+        entity_id = str(uuid.uuid4())
+        props = {"id": entity_id, "key": key, "name": name, "notes": notes, "case_id": self.case_id}
+        if summary:
+            props["summary"] = summary
+        if date:
+            props["date"] = date
+        if time:
+            props["time"] = time
+        if amount:
+            props["amount"] = normalize_amount(str(amount))
+        if extra_props:
+            props.update(extra_props)
+
+        label = _sanitise_identifier(entity_type, "Other")
+        self._creates.setdefault(label, []).append(props)
+        self._created[key] = {**props, "_label": label}
+        return entity_id
+
+    def update_entity(
+        self,
+        key: str,
+        case_id: str,
+        notes: Optional[str] = None,
+        summary: Optional[str] = None,
+        extra_props: Optional[Dict] = None,
+    ):
+        """Queue Neo4jClient.update_entity (later updates to a key win per property)."""
+        props: Dict[str, Any] = {}
+        if notes is not None:
+            props["notes"] = notes
+        if summary is not None:
+            props["summary"] = summary
+        if extra_props:
+            props.update(extra_props)
+        if not props:
+            return
+        if key in self._created:
+            # Created in this batch: fold the update into the CREATE
+            for rows in self._creates.values():
+                for row in rows:
+                    if row["key"] == key:
+                        row.update(props)
+            self._created[key].update(props)
+            return
+        self._updates.setdefault(key, {}).update(props)
+
+    def link_entity_to_document(self, entity_key: str, doc_key: str, case_id: str):
+        """Queue Neo4jClient.link_entity_to_document."""
+        if (entity_key, doc_key) not in self._link_set:
+            self._link_set.add((entity_key, doc_key))
+            self._links.append({"entity_key": entity_key, "doc_key": doc_key})
+
+    def create_relationship(
+        self,
+        from_key: str,
+        to_key: str,
+        rel_type: str,
+        case_id: str,
+        doc_name: Optional[str] = None,
+        notes: Optional[str] = None,
+    ):
+        """Queue Neo4jClient.create_relationship."""
+        rel = _sanitise_identifier(rel_type, "RELATED_TO")
+        self._relationships.setdefault(rel, []).append({
+            "from_key": from_key,
+            "to_key": to_key,
+            "doc_ref": f"\n\n[{doc_name}]\n{notes}" if doc_name and notes else None,
+        })
+
+    def _write(self, tx) -> None:
+        self._merged = 0
+        for label, rows in self._creates.items():
+            # MERGE, not CREATE: a concurrently ingested document of the
+            # case may have created the same key since it was resolved. Its
+            # node is kept and write-locked, and this chunk's facts are
+            # merged into it (see _merge_into_existing).
+            existing = tx.run(
+                f"""
+                UNWIND $rows AS props
+                MERGE (e:`{label}` {{key: props.key, case_id: props.case_id}})
+                ON CREATE SET e = props, e._created = true
+                ON MATCH SET e._merging = true
+                WITH e, props, coalesce(e._created, false) AS created
+                REMOVE e._created, e._merging
+                WITH e, props, created WHERE NOT created
+                RETURN props, properties(e) AS existing
+                """,
+                rows=rows,
+            ).data()
+            if existing:
+                tx.run(
+                    f"""
+                    UNWIND $rows AS row
+                    MATCH (e:`{label}` {{key: row.key, case_id: $case_id}})
+                    SET e += row.updates
+                    """,
+                    rows=[
+                        {"key": r["props"]["key"], "updates": _merge_into_existing(r["existing"], r["props"])}
+                        for r in existing
+                    ],
+                    case_id=self.case_id,
+                ).consume()
+                self._merged += len(existing)
+        if self._updates:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH (e {key: row.key, case_id: $case_id})
+                SET e += row.props
+                """,
+                rows=[{"key": k, "props": v} for k, v in self._updates.items()],
+                case_id=self.case_id,
+            ).consume()
+        if self._links:
+            tx.run(
+                """
+                UNWIND $rows AS row
+                MATCH (e {key: row.entity_key, case_id: $case_id})
+                MATCH (d:Document {key: row.doc_key, case_id: $case_id})
+                MERGE (e)-[r:MENTIONED_IN {case_id: $case_id}]->(d)
+                """,
+                rows=self._links,
+                case_id=self.case_id,
+            ).consume()
+        for rel, rows in self._relationships.items():
+            tx.run(
+                f"""
+                UNWIND $rows AS row
+                MATCH (from {{key: row.from_key, case_id: $case_id}})
+                MATCH (to {{key: row.to_key, case_id: $case_id}})
+                MERGE (from)-[r:`{rel}` {{case_id: $case_id}}]->(to)
+                FOREACH (_ IN CASE WHEN row.doc_ref IS NULL THEN [] ELSE [1] END |
+                    SET r.doc_refs = COALESCE(r.doc_refs, '') + row.doc_ref)
+                """,
+                rows=rows,
+                case_id=self.case_id,
+            ).consume()
+        names = bool(self._creates) or any(
+            p in _NAME_PROPERTIES for props in self._updates.values() for p in props
+        )
+        tx.run(_BUMP_CASE_VERSION, case_id=self.case_id, names=names).consume()
+
+    def commit(self) -> Dict[str, int]:
+        """
+        Write everything queued in one transaction and clear the batch.
+
+        Returns:
+            Counts of entities_created, entities_merged (creates whose key
+            another document created first), entities_updated, links,
+            relationships and statements
+        """
+        stats = {
+            "entities_created": sum(len(rows) for rows in self._creates.values()),
+            "entities_merged": 0,
+            "entities_updated": len(self._updates),
+            "links": len(self._links),
+            "relationships": sum(len(rows) for rows in self._relationships.values()),
+            "statements": len(self._creates) + bool(self._updates) + bool(self._links) + len(self._relationships),
+        }
+        if stats["statements"]:
+            def _commit():
+                with self.client.driver.session() as session:
+                    session.execute_write(self._write)
+
+            self.client._execute_with_retry(_commit)
+            stats["entities_merged"] = self._merged
+            stats["entities_created"] -= self._merged
+        self.__init__(self.client, self.case_id)
+        return stats
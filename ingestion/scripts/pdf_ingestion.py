@@ -11,7 +11,7 @@ from typing import Dict, Optional, Callable
 from pypdf import PdfReader
 
 from ingestion import ingest_document
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 
 
 def extract_text_from_pdf(path: Path) -> str:
@@ -66,7 +66,8 @@ def ingest_pdf_file(
     log_progress(f"Extracting text from PDF: {path}", log_callback)
 
     try:
-        text = extract_text_from_pdf(path)
+        with profile_stage("parse:pdf"):
+            text = extract_text_from_pdf(path)
     except Exception as e:
         log_error(f"Failed to extract text from PDF: {e}", log_callback)
         return {"status": "error", "reason": str(e), "file": str(path)}
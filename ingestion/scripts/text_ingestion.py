@@ -9,7 +9,7 @@ from pathlib import Path
 from typing import Dict, Optional, Callable
 
 from ingestion import ingest_document
-from logging_utils import log_progress, log_warning
+from logging_utils import log_progress, log_warning, profile_stage
 
 
 def ingest_text_file(
@@ -40,11 +40,12 @@ def ingest_text_file(
 
     log_progress(f"Reading text file: {path}", log_callback)
 
-    try:
-        text = path.read_text(encoding="utf-8")
-    except UnicodeDecodeError:
-        # Try with latin-1 as fallback
-        text = path.read_text(encoding="latin-1")
+    with profile_stage("parse:text"):
+        try:
+            text = path.read_text(encoding="utf-8")
+        except UnicodeDecodeError:
+            # Try with latin-1 as fallback
+            text = path.read_text(encoding="latin-1")
 
     if not text.strip():
         log_warning(f"Text file is empty, skipping: {path}", log_callback)
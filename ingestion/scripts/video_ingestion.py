@@ -10,7 +10,7 @@ from typing import Dict, Optional, Callable
 
 from video_processor import process_video
 from ingestion import ingest_document
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 
 
 VIDEO_EXTENSIONS = {".mp4", ".avi", ".mov", ".wmv", ".flv", ".mkv", ".webm"}
@@ -48,11 +48,12 @@ def ingest_video_file(
     log_progress(f"Processing video file: {path}", log_callback)
 
     try:
-        result = process_video(
-            video_path=path,
-            log_callback=log_callback,
-            doc_name=doc_name,
-        )
+        with profile_stage("vision:video"):
+            result = process_video(
+                video_path=path,
+                log_callback=log_callback,
+                doc_name=doc_name,
+            )
     except Exception as e:
         log_error(f"Failed to process video: {e}", log_callback)
         return {"status": "error", "reason": str(e), "file": str(path)}
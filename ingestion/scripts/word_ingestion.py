@@ -11,7 +11,7 @@ from typing import Dict, Optional, Callable, Tuple
 from docx import Document
 
 from ingestion import ingest_document
-from logging_utils import log_progress, log_error, log_warning
+from logging_utils import log_progress, log_error, log_warning, profile_stage
 
 
 def extract_text_from_docx(path: Path) -> Tuple[str, int]:
@@ -61,7 +61,8 @@ def ingest_word_file(
     log_progress(f"Extracting text from Word document: {path}", log_callback)
 
     try:
-        text, paragraph_count = extract_text_from_docx(path)
+        with profile_stage("parse:word"):
+            text, paragraph_count = extract_text_from_docx(path)
     except Exception as e:
         log_error(f"Failed to extract text from Word document: {e}", log_callback)
         return {"status": "error", "reason": str(e), "file": str(path)}
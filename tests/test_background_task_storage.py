@@ -0,0 +1,124 @@
+"""Journal compaction in BackgroundTaskStorage.
+
+Every update_task call appends the fields it changed to ``task_events``;
+the ``tasks`` row is only rewritten when the journal is folded into it —
+after COMPACT_EVERY_EVENTS updates, when the task finishes, or by
+compact(). These tests pin when folding happens, that reads and progress
+streams see the same task before and after it, and that folding while
+other workers append never loses an update.
+
+Runs against throwaway SQLite databases in a temp dir.
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+import services.background_task_storage as task_module  # noqa: E402
+from services.background_task_storage import BackgroundTaskStorage, TaskStatus  # noqa: E402
+
+
+def _journal(db_file, task_id):
+    with sqlite3.connect(db_file) as conn:
+        pending = conn.execute("SELECT COUNT(*) FROM task_events WHERE task_id = ?", (task_id,)).fetchone()[0]
+        applied = conn.execute("SELECT applied_seq FROM tasks WHERE id = ?", (task_id,)).fetchone()[0]
+    return pending, applied
+
+
+def test_updates_are_journaled_until_the_fold_threshold(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_module, "COMPACT_EVERY_EVENTS", 3)
+    db_file = tmp_path / "tasks.db"
+    storage = BackgroundTaskStorage(db_file, legacy_file=None)
+    task = storage.create_task(task_type="evidence_processing", task_name="Ingest")
+
+    storage.update_task(task["id"], status=TaskStatus.RUNNING.value, progress_total=3)
+    storage.update_task(task["id"], progress_completed=1)
+    assert _journal(db_file, task["id"]) == (2, 0)
+    assert storage.get_task(task["id"])["progress"]["completed"] == 1
+
+    storage.update_task(task["id"], progress_completed=2)
+    pending, applied = _journal(db_file, task["id"])
+    assert pending == 0 and applied > 0
+    assert storage.get_task(task["id"])["progress"] == {"total": 3, "completed": 2, "failed": 0}
+
+
+def test_finishing_a_task_folds_its_journal(tmp_path):
+    db_file = tmp_path / "tasks.db"
+    storage = BackgroundTaskStorage(db_file, legacy_file=None)
+    task = storage.create_task(task_type="t", task_name="Short")
+
+    storage.update_task(task["id"], file_status={"file_id": "f1", "filename": "a.pdf", "status": "processed"})
+    storage.update_task(task["id"], status=TaskStatus.COMPLETED.value)
+
+    assert _journal(db_file, task["id"])[0] == 0
+    done = storage.get_task(task["id"])
+    assert done["status"] == "completed"
+    assert [f["file_id"] for f in done["files"]] == ["f1"]
+
+
+def test_compact_leaves_reads_unchanged_and_drops_orphaned_entries(tmp_path):
+    db_file = tmp_path / "tasks.db"
+    storage = BackgroundTaskStorage(db_file, legacy_file=None)
+    kept = storage.create_task(task_type="t", task_name="Kept", owner="alice")
+    gone = storage.create_task(task_type="t", task_name="Gone")
+    storage.update_task(kept["id"], status=TaskStatus.RUNNING.value)
+    storage.update_task(kept["id"], progress_completed=4)
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("INSERT INTO task_events (task_id, changes) VALUES (?, '{}')", (gone["id"],))
+        conn.execute("DELETE FROM tasks WHERE id = ?", (gone["id"],))
+    before = storage.list_tasks(owner="alice", status="running")
+
+    assert storage.compact() == 2
+    assert storage.list_tasks(owner="alice", status="running") == before
+    with sqlite3.connect(db_file) as conn:
+        assert conn.execute("SELECT COUNT(*) FROM task_events").fetchone()[0] == 0
+
+
+def test_progress_stream_gets_a_snapshot_once_its_deltas_are_compacted(tmp_path):
+    storage = BackgroundTaskStorage(tmp_path / "tasks.db", legacy_file=None)
+    task = storage.create_task(task_type="t", task_name="Watched", case_id="c1")
+    messages, cursor = storage.changes_since(None, case_id="c1")
+    assert [m["type"] for m in messages] == ["snapshot"]
+
+    storage.update_task(task["id"], progress_completed=1)
+    messages, cursor = storage.changes_since(cursor, [task["id"]], case_id="c1")
+    assert [(m["type"], m["changes"]["progress_completed"]) for m in messages] == [("delta", 1)]
+
+    storage.update_task(task["id"], progress_completed=2)
+    storage.compact()
+    messages, _ = storage.changes_since(cursor, [task["id"]], case_id="c1")
+    assert [m["type"] for m in messages] == ["snapshot"]
+    assert messages[0]["task"]["progress"]["completed"] == 2
+
+
+def test_folding_while_other_workers_append_keeps_every_update(tmp_path, monkeypatch):
+    monkeypatch.setattr(task_module, "COMPACT_EVERY_EVENTS", 5)
+    db_file = tmp_path / "tasks.db"
+    task = BackgroundTaskStorage(db_file, legacy_file=None).create_task(task_type="t", task_name="Shared")
+    workers = [BackgroundTaskStorage(db_file, legacy_file=None) for _ in range(4)]
+    start = threading.Barrier(len(workers))
+    errors = []
+
+    def worker(n, storage):
+        try:
+            start.wait()
+            for i in range(12):
+                storage.update_task(task["id"], file_status={"file_id": f"w{n}-{i}", "status": "processed"})
+                if i % 4 == 3:
+                    storage.compact()
+        except Exception as e:  # surfaced below; a thread's assert would be swallowed
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n, s)) for n, s in enumerate(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert len(BackgroundTaskStorage(db_file, legacy_file=None).get_task(task["id"])["files"]) == 4 * 12
@@ -0,0 +1,80 @@
+"""Applying precomputed insights in slices.
+
+The precompute job stores insights for the case's graph version; the
+generate-insights endpoint takes them ``limit`` entities at a time and
+appends them to the entities. Each append bumps the graph version, so the
+stored row is moved to the version its own appends produced. These tests
+pin that the remainder stays takeable across calls, and that any other
+write to the case still makes the row stale.
+
+Runs against a throwaway SQLite database in a temp dir; the graph is a stub
+counting version bumps.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.case_precompute_service import CasePrecomputeService  # noqa: E402
+
+
+class _StubGraph:
+    def __init__(self):
+        self.version = 0
+        self.insights = {}
+
+    def graph_version(self, case_id):
+        return f"epoch:{self.version}"
+
+    def save_insights(self, case_id, key, insights):
+        self.insights.setdefault(key, []).extend(insights)
+        self.version += 1
+        return len(insights)
+
+
+def _service(tmp_path, graph, keys=("a", "b", "c")):
+    service = CasePrecomputeService(tmp_path / "precompute.db")
+    service.enabled = True
+    service._graph_version = graph.graph_version
+    service._save_insights = graph.save_insights
+    service.schedule = lambda *args, **kwargs: None
+    conn = service._connect()
+    conn.execute(
+        "INSERT INTO case_precompute (case_id, graph_version, computed_at, suggested_questions, "
+        "entity_briefs, insights) VALUES (?, ?, '', ?, '[]', ?)",
+        ("c1", graph.graph_version("c1"), json.dumps(["Q?"]),
+         json.dumps([{"key": k, "insights": [{"text": k}]} for k in keys])),
+    )
+    conn.commit()
+    conn.close()
+    return service
+
+
+def test_taking_insights_one_at_a_time_keeps_the_rest_current(tmp_path):
+    graph = _StubGraph()
+    service = _service(tmp_path, graph)
+
+    assert service.apply_insights("c1", limit=1) == {"entities_processed": 1, "insights_generated": 1}
+    assert service.apply_insights("c1", limit=1) == {"entities_processed": 1, "insights_generated": 1}
+    assert list(graph.insights) == ["a", "b"]
+
+    # The row followed the version its own appends produced
+    stored = service.get("c1")
+    assert not stored["stale"] and stored["suggested_questions"] == ["Q?"]
+    assert service.take_insights("c1", limit=1) == [{"key": "c", "insights": [{"text": "c"}]}]
+    assert service.take_insights("c1", limit=1) is None
+
+
+def test_other_writes_still_make_the_row_stale(tmp_path):
+    graph = _StubGraph()
+    service = _service(tmp_path, graph)
+    service.apply_insights("c1", limit=1)
+
+    graph.version += 1  # someone edited the case
+    assert service.get("c1")["stale"]
+    assert service.apply_insights("c1", limit=1) is None
+    assert list(graph.insights) == ["a"]
@@ -0,0 +1,55 @@
+"""Per-case evidence write counters read by the answer cache.
+
+Cached answers record the case's evidence version and are only served while
+it is unchanged. The version is a counter in evidence.db bumped in the same
+transaction as every write to the case's records, so reading it is one
+primary-key lookup instead of a hash over every record of the case.
+
+Runs against a throwaway SQLite database in a temp dir.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.evidence_storage import EvidenceStorage  # noqa: E402
+
+
+def _file(name):
+    return {"original_filename": name, "stored_path": Path("/tmp") / name, "sha256": name * 8, "size": 1}
+
+
+def test_every_write_to_a_case_changes_only_that_cases_version(tmp_path):
+    storage = EvidenceStorage(tmp_path / "evidence.db", legacy_file=None)
+    assert storage.case_version("c1") == "0"
+
+    [rec] = storage.add_files("c1", [_file("a")])
+    storage.add_files("c2", [_file("b")])
+    seen = [storage.case_version("c1")]
+    other = storage.case_version("c2")
+
+    storage.update_record(rec["id"], status="processed")
+    seen.append(storage.case_version("c1"))
+    storage.set_relevance([rec["id"]], True)
+    seen.append(storage.case_version("c1"))
+    storage.delete_record(rec["id"])
+    seen.append(storage.case_version("c1"))
+
+    assert len(set(seen)) == len(seen)
+    assert storage.case_version("c2") == other
+
+
+def test_unchanged_records_and_reads_keep_the_version(tmp_path):
+    storage = EvidenceStorage(tmp_path / "evidence.db", legacy_file=None)
+    [rec] = storage.add_files("c1", [_file("a")])
+    version = storage.case_version("c1")
+
+    storage.list_files(case_id="c1")
+    storage.update_record(rec["id"], status="unprocessed")  # already the value
+    with storage._file_locked():
+        pass
+
+    assert storage.case_version("c1") == version
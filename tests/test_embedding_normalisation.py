@@ -0,0 +1,83 @@
+"""Unit-length embeddings whichever Ollama endpoint produced them.
+
+Ollama's /api/embed returns normalised vectors, /api/embeddings (older
+servers, and every vector stored before queries moved to /api/embed) does
+not. ChromaDB's L2 distance is not scale-invariant, so EmbeddingService
+normalises both, and VectorDBService rescales vectors already stored.
+
+Pure in-memory: the Ollama session is a stub and the collection is an
+ephemeral ChromaDB client.
+"""
+from __future__ import annotations
+
+import sys
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.embedding_service import EmbeddingService  # noqa: E402
+from services.vector_db_service import normalise_stored_vectors  # noqa: E402
+
+
+class _Response:
+    def __init__(self, status_code, body):
+        self.status_code = status_code
+        self._body = body
+        self.text = str(body)
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._body
+
+
+class _StubOllama:
+    """/api/embed answers with unit vectors unless the server is too old."""
+
+    def __init__(self, has_embed):
+        self.has_embed = has_embed
+
+    def post(self, url, json, timeout):
+        if url.endswith("/api/embed"):
+            if not self.has_embed:
+                return _Response(404, "404 page not found")
+            return _Response(200, {"embeddings": [[0.6, 0.8] for _ in json["input"]]})
+        return _Response(200, {"embedding": [3.0, 4.0]})
+
+
+def _ollama_service(has_embed):
+    service = object.__new__(EmbeddingService)
+    service.provider, service.model = "ollama", "nomic-embed-text"
+    service._session = _StubOllama(has_embed)
+    service._ollama_batch_supported = True
+    return service
+
+
+def test_both_ollama_endpoints_give_the_same_unit_vector():
+    assert _ollama_service(has_embed=True).generate_embedding("acme") == [0.6, 0.8]
+    old_server = _ollama_service(has_embed=False)
+    assert np.allclose(old_server.generate_embedding("acme"), [0.6, 0.8])
+    assert np.allclose(old_server.generate_embeddings_batch(["a", "b"]), [[0.6, 0.8], [0.6, 0.8]])
+
+
+def test_stored_vectors_are_rescaled_once_keeping_documents():
+    import chromadb
+
+    collection = chromadb.EphemeralClient().create_collection(f"test-{uuid.uuid4().hex[:8]}")
+    collection.add(
+        ids=["raw", "unit", "zero"],
+        embeddings=[[3.0, 4.0], [0.0, 1.0], [0.0, 0.0]],
+        documents=["Acme paid", "Bob", "empty"],
+        metadatas=[{"case_id": "c1"}, {"case_id": "c1"}, {"case_id": "c1"}],
+    )
+
+    assert normalise_stored_vectors(collection, batch_size=2) == 1
+    stored = collection.get(ids=["raw"], include=["embeddings", "documents", "metadatas"])
+    assert np.allclose(stored["embeddings"][0], [0.6, 0.8])
+    assert stored["documents"] == ["Acme paid"] and stored["metadatas"] == [{"case_id": "c1"}]
+    assert normalise_stored_vectors(collection) == 0
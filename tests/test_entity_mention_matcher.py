@@ -0,0 +1,101 @@
+"""Unit tests for the answer → graph node mention matcher.
+
+RAGService.extract_nodes_from_answer used to ask the LLM for a Cypher query
+to find the nodes an answer talks about. It now scans the answer with an
+Aho-Corasick automaton over the case's entity names and aliases
+(services/entity_mention_matcher.py). These tests pin the matching rules:
+case/whitespace-insensitive, word boundaries only, leftmost-longest, aliases
+resolve to their node, and a changed entity names version forces a rebuild.
+
+Pure in-memory — Neo4j is replaced by a stub exposing the two queries the
+matcher uses.
+"""
+from __future__ import annotations
+
+import random
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.entity_mention_matcher import AhoCorasick, EntityMentionMatcher  # noqa: E402
+
+
+class _StubNeo4j:
+    def __init__(self, rows):
+        self.rows = rows
+        self.builds = 0
+        self.version = 0
+
+    def write(self, rows):
+        """A names write: replaces the rows and bumps the version."""
+        self.rows = rows
+        self.version += 1
+
+    def get_entity_names(self, case_id):
+        self.builds += 1
+        return self.rows
+
+    def get_entity_names_version(self, case_id):
+        return f"epoch:{self.version}"
+
+
+ROWS = [
+    {"key": "john-smith", "name": "John Smith", "aliases": ["J. Smith"]},
+    {"key": "john", "name": "John", "aliases": []},
+    {"key": "acme", "name": "ACME  Holdings Ltd", "aliases": ["Acme"]},
+    {"key": "bob", "name": "Bob", "aliases": []},
+    {"key": "he", "name": "he", "aliases": []},  # below the minimum length
+]
+
+
+def test_matches_names_and_aliases_case_insensitively():
+    matcher = EntityMentionMatcher(_StubNeo4j(ROWS))
+    keys = matcher.match("c1", "Funds moved from J. SMITH to acme holdings   ltd.")
+    assert keys == ["john-smith", "acme"]
+
+
+def test_longest_mention_wins_and_word_boundaries_apply():
+    matcher = EntityMentionMatcher(_StubNeo4j(ROWS))
+    keys = matcher.match("c1", "John Smith met Bobby; later John called bob. The end.")
+    # "John" inside "John Smith" is not a separate mention, "Bobby" is not "Bob",
+    # and "he" inside "The" is never matched
+    assert keys == ["john-smith", "john", "bob"]
+
+
+def test_rebuilds_when_names_version_changes():
+    stub = _StubNeo4j(list(ROWS))
+    matcher = EntityMentionMatcher(stub)
+    assert matcher.match("c1", "Payment to Zeta Corp") == []
+
+    stub.write(ROWS + [{"key": "zeta", "name": "Zeta Corp", "aliases": []}])
+    assert matcher.match("c1", "Payment to Zeta Corp") == ["zeta"]
+    assert matcher.match("c1", "Payment to Zeta Corp") == ["zeta"]
+    assert stub.builds == 2
+
+
+def test_rename_to_a_name_of_the_same_length_rebuilds():
+    stub = _StubNeo4j([{"key": "bob", "name": "Bob", "aliases": []}])
+    matcher = EntityMentionMatcher(stub)
+    assert matcher.match("c1", "Rob called Bob") == ["bob"]
+
+    stub.write([{"key": "bob", "name": "Rob", "aliases": []}])
+    assert matcher.match("c1", "Rob called Bob") == ["bob"]
+    assert matcher.match("c1", "Bob called") == []
+
+
+def test_automaton_agrees_with_brute_force():
+    rnd = random.Random(7)
+    patterns = {"".join(rnd.choice("ab") for _ in range(rnd.randint(1, 4))) for _ in range(40)}
+    automaton = AhoCorasick()
+    for p in patterns:
+        automaton.add(p, p)
+    automaton.build()
+    for _ in range(50):
+        text = "".join(rnd.choice("ab ") for _ in range(40))
+        got = sorted((s, e, automaton.patterns[i]) for s, e, i in automaton.iter_matches(text))
+        expected = sorted(
+            (k, k + len(p), p) for p in patterns for k in range(len(text)) if text.startswith(p, k)
+        )
+        assert got == expected
@@ -0,0 +1,194 @@
+"""Concurrent ingestion of two documents that mention the same new entity.
+
+Evidence processing ingests several files of a case at once, and each
+document loads its CaseEntityIndex when it starts. An entity created by one
+document after the other's load must still resolve as existing (one batched
+key lookup on an index miss), and a create racing with another document's
+create must not leave two nodes with the same key (creates MERGE on
+key + case_id) nor lose the losing document's facts.
+
+Pure in-memory — Neo4j is replaced by a graph of dicts behind the three
+reads resolution uses and a transaction that applies ChunkWriteBatch's
+create and merge statements.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "ingestion" / "scripts"))
+
+from entity_resolution import CaseEntityIndex, resolve_entities_batch  # noqa: E402
+from neo4j_client import Neo4jClient  # noqa: E402
+
+
+class _Tx:
+    def __init__(self, graph):
+        self.graph = graph
+        self.matched = []
+
+    def run(self, query, rows=(), **params):
+        self.matched = []
+        if "AS props" in query:
+            merge = "MERGE" in query
+            for props in rows:
+                ident = (props["key"], props["case_id"])
+                if merge and ident in self.graph.nodes:
+                    self.matched.append({"props": props, "existing": dict(self.graph.nodes[ident])})
+                    continue
+                self.graph.created.append(ident)
+                self.graph.nodes[ident] = dict(props)
+        elif "SET e += row.updates" in query:
+            for row in rows:
+                self.graph.nodes[(row["key"], params["case_id"])].update(row["updates"])
+        return self
+
+    def data(self):
+        return self.matched
+
+    def consume(self):
+        return None
+
+
+class _Session:
+    def __init__(self, graph):
+        self.graph = graph
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute_write(self, fn):
+        with self.graph.lock:
+            fn(_Tx(self.graph))
+
+
+class _Graph:
+    def __init__(self):
+        self.nodes = {}
+        self.created = []
+        self.lock = threading.Lock()
+
+    def session(self):
+        return _Session(self)
+
+
+class _FakeNeo4j(Neo4jClient):
+    def __init__(self):
+        self.driver = _Graph()
+
+    def _rows(self, case_id, keys=None):
+        with self.driver.lock:
+            return [
+                {"key": key, "name": props["name"], "type": "Organisation", "aliases": []}
+                for (key, node_case), props in self.driver.nodes.items()
+                if node_case == case_id and (keys is None or key in keys)
+            ]
+
+    def get_entity_name_index(self, case_id):
+        return self._rows(case_id)
+
+    def find_entities_by_keys(self, keys, case_id):
+        return self._rows(case_id, set(keys))
+
+    def find_entity_by_key(self, key, case_id):
+        rows = self._rows(case_id, {key})
+        return rows[0] if rows else None
+
+
+ACME = {"key": "acme-holdings", "name": "Acme Holdings", "type": "Organisation", "facts": ""}
+
+
+def _ingest_chunk(db, index, case_id="c1"):
+    """The resolve + create part of process_chunk for one entity."""
+    [(key, existing)] = resolve_entities_batch([dict(ACME)], index=index, db=db, case_id=case_id)
+    if not existing:
+        batch = db.write_batch(case_id)
+        batch.create_entity(key=key, entity_type="Organisation", name=ACME["name"], notes="", case_id=case_id)
+        batch.commit()
+        index.add(key, ACME["name"], "Organisation")
+    return existing
+
+
+def test_entity_created_by_other_document_after_load_resolves_as_existing():
+    db = _FakeNeo4j()
+    loaded = threading.Barrier(2)
+    first_done = threading.Event()
+    results = {}
+
+    def document(name, wait_for=None):
+        index = CaseEntityIndex.load(db, "c1")
+        loaded.wait()
+        if wait_for:
+            wait_for.wait()
+        results[name] = _ingest_chunk(db, index)
+        if not wait_for:
+            first_done.set()
+
+    threads = [
+        threading.Thread(target=document, args=("a",)),
+        threading.Thread(target=document, args=("b", first_done)),
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == {"a": False, "b": True}
+    assert db.driver.created == [("acme-holdings", "c1")]
+
+
+def test_racing_creates_of_the_same_key_leave_one_node_with_both_facts():
+    db = _FakeNeo4j()
+    resolved = threading.Barrier(2)
+    stats = {}
+
+    def document(doc):
+        index = CaseEntityIndex.load(db, "c1")
+        [(key, existing)] = resolve_entities_batch([dict(ACME)], index=index, db=db, case_id="c1")
+        assert not existing
+        # Both documents decided to create before either committed
+        resolved.wait()
+        batch = db.write_batch("c1")
+        facts = [{"text": f"Acme is named in {doc}", "source_doc": doc}, {"text": "Acme is in Leeds", "source_doc": doc}]
+        batch.create_entity(
+            key=key, entity_type="Organisation", name=ACME["name"], notes="", case_id="c1",
+            summary=f"Summary from {doc}" if doc == "a.pdf" else None,
+            extra_props={"verified_facts": json.dumps(facts), "ai_insights": json.dumps([{"text": f"Check {doc}"}])},
+        )
+        stats[doc] = batch.commit()
+
+    threads = [threading.Thread(target=document, args=(doc,)) for doc in ("a.pdf", "b.pdf")]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(db.driver.created) == 1
+    assert list(db.driver.nodes) == [("acme-holdings", "c1")]
+    assert sorted(s["entities_merged"] for s in stats.values()) == [0, 1]
+
+    # The document that lost the race still contributed its facts and insights
+    node = db.driver.nodes[("acme-holdings", "c1")]
+    assert sorted(f["text"] for f in json.loads(node["verified_facts"])) == [
+        "Acme is in Leeds", "Acme is named in a.pdf", "Acme is named in b.pdf",
+    ]
+    assert sorted(i["text"] for i in json.loads(node["ai_insights"])) == ["Check a.pdf", "Check b.pdf"]
+    assert node["summary"] == "Summary from a.pdf"
+
+
+def test_refresh_picks_up_relationship_endpoints_created_since_load():
+    db = _FakeNeo4j()
+    index = CaseEntityIndex.load(db, "c1")
+    other = CaseEntityIndex.load(db, "c1")
+    _ingest_chunk(db, other)
+
+    assert "acme-holdings" not in index
+    index.refresh(db, "c1", ["acme-holdings", "unknown-key"])
+    assert "acme-holdings" in index
+    assert "unknown-key" not in index
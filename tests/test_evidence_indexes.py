@@ -0,0 +1,105 @@
+"""Evidence lookups served by indexes: hash upserts and entity links.
+
+The Cellebrite file linker registers media with upsert_by_hash (one indexed
+sha256 lookup per file instead of a scan of the case), and list_by_entity
+reads the evidence_entity_links table that every link/unlink keeps in step
+with the records. rebuild_indexes recreates that table from the records and
+runs once on its own for a database from before the table existed.
+
+Runs against throwaway SQLite databases in a temp dir.
+"""
+from __future__ import annotations
+
+import sqlite3
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.evidence_storage import EvidenceStorage  # noqa: E402
+
+
+def _media(sha, **fields):
+    return {"sha256": sha.ljust(64, "0"), "original_filename": f"{sha}.jpg", "status": "unprocessed",
+            "is_relevant": False, **fields}
+
+
+def _links(db_file):
+    with sqlite3.connect(db_file) as conn:
+        return sorted(conn.execute("SELECT evidence_id, entity_id FROM evidence_entity_links").fetchall())
+
+
+def test_upsert_by_hash_merges_only_the_given_fields(tmp_path):
+    storage = EvidenceStorage(tmp_path / "evidence.db", legacy_file=None)
+    [photo] = storage.upsert_by_hash("c1", [(_media("a", cellebrite_file_id="f1"), {"cellebrite_file_id": "f1"})])
+    storage.set_relevance([photo["id"]], True)
+    storage.mark_processed([photo["id"]])
+
+    merged, new = storage.upsert_by_hash("c1", [
+        (_media("a", cellebrite_file_id="f2"), {"cellebrite_file_id": "f2", "has_geotag": True}),
+        (_media("b"), {}),
+    ])
+
+    assert merged["id"] == photo["id"]
+    stored = storage.get(photo["id"])
+    assert (stored["cellebrite_file_id"], stored["has_geotag"]) == ("f2", True)
+    assert (stored["is_relevant"], stored["status"]) == (True, "processed")
+    assert new["id"] != photo["id"] and new["case_id"] == "c1"
+    assert storage.get_by_cellebrite_file_ids("c1", ["f1", "f2"]) == {"f2": stored}
+
+
+def test_upsert_by_hash_is_scoped_to_the_case(tmp_path):
+    storage = EvidenceStorage(tmp_path / "evidence.db", legacy_file=None)
+    [first] = storage.upsert_by_hash("c1", [(_media("a"), {})])
+    [other] = storage.upsert_by_hash("c2", [(_media("a"), {})])
+
+    assert other["id"] != first["id"]
+    assert storage.count() == 2
+
+
+def test_entity_links_follow_link_and_unlink(tmp_path):
+    db_file = tmp_path / "evidence.db"
+    storage = EvidenceStorage(db_file, legacy_file=None)
+    a, b = storage.upsert_by_hash("c1", [(_media("a"), {}), (_media("b"), {})])
+
+    storage.link_entities([a["id"], b["id"]], ["acme", "bob"])
+    assert [r["id"] for r in storage.list_by_entity("c1", "acme")] == [a["id"], b["id"]]
+    assert storage.list_by_entity("c2", "acme") == []
+
+    storage.unlink_entities([a["id"]], ["acme"])
+    assert [r["id"] for r in storage.list_by_entity("c1", "acme")] == [b["id"]]
+
+    assert storage.unlink_entities_from_all("c1", "bob") == 2
+    assert storage.delete_record(b["id"])
+    assert _links(db_file) == []
+
+
+def test_rebuild_indexes_restores_links_from_the_records(tmp_path):
+    db_file = tmp_path / "evidence.db"
+    storage = EvidenceStorage(db_file, legacy_file=None)
+    [a] = storage.upsert_by_hash("c1", [(_media("a"), {})])
+    storage.link_entities([a["id"]], ["acme"])
+    expected = _links(db_file)
+
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("DELETE FROM evidence_entity_links")
+    assert storage.list_by_entity("c1", "acme") == []
+
+    assert storage.rebuild_indexes()["entity_links"] == 1
+    assert _links(db_file) == expected
+    assert storage.index_stats()["indexes"]["entity_id"]["keys"] == 1
+
+
+def test_database_from_before_the_link_index_is_rebuilt_on_open(tmp_path):
+    db_file = tmp_path / "evidence.db"
+    storage = EvidenceStorage(db_file, legacy_file=None)
+    [a] = storage.upsert_by_hash("c1", [(_media("a"), {})])
+    storage.link_entities([a["id"]], ["acme"])
+
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("DELETE FROM evidence_entity_links")
+        conn.execute("PRAGMA user_version = 0")
+
+    reopened = EvidenceStorage(db_file, legacy_file=None)
+    assert [r["id"] for r in reopened.list_by_entity("c1", "acme")] == [a["id"]]
@@ -0,0 +1,96 @@
+"""EvidenceStorage on SQLite: record shape, indexed filters, concurrent writers.
+
+The store replaced data/evidence.json, which every worker reloaded and
+rewrote in full per mutation (a stale worker's write once wiped a 93k-row
+upload). These tests pin how old records are normalised on import, the
+round-trip through the indexed columns, and that writers on separate
+connections (one EvidenceStorage per "worker") never lose each other's
+updates. The import-once rules themselves are in test_legacy_import.py.
+
+Runs against throwaway SQLite databases in a temp dir.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.evidence_storage import EvidenceStorage  # noqa: E402
+
+
+def _file(name, case_id="c1"):
+    return {"original_filename": name, "stored_path": Path("/tmp") / case_id / name, "sha256": name.ljust(64, "0"), "size": 1}
+
+
+def test_legacy_records_are_normalised_on_import(tmp_path):
+    legacy = tmp_path / "evidence.json"
+    legacy.write_text(json.dumps({
+        "ev_1": {"id": "ev_1", "case_id": "c1", "sha256": "a" * 64, "status": "duplicate",
+                 "processed_at": "2026-01-01T00:00:00", "created_at": "2026-01-01T00:00:00"},
+        "ev_2": {"case_id": "c1", "sha256": "b" * 64, "status": "unprocessed",
+                 "linked_entity_ids": ["acme"], "created_at": "2026-01-02T00:00:00"},
+    }))
+
+    storage = EvidenceStorage(tmp_path / "evidence.db", legacy_file=legacy)
+
+    # The old "duplicate" status becomes the is_duplicate flag, records keep
+    # their JSON key as id, and links reach the entity index
+    first = storage.get("ev_1")
+    assert (first["status"], first["is_duplicate"], first["is_relevant"]) == ("processed", True, False)
+    assert storage.get("ev_2")["id"] == "ev_2"
+    assert [r["id"] for r in storage.list_by_entity("c1", "acme")] == ["ev_2"]
+    assert {r["id"] for r in storage.list_files(case_id="c1")} == {"ev_1", "ev_2"}
+
+
+def test_save_get_list_delete_round_trip(tmp_path):
+    storage = EvidenceStorage(tmp_path / "evidence.db", legacy_file=None)
+    [a] = storage.add_files("c1", [_file("a")], owner="alice")
+    storage.add_files("c2", [_file("b", "c2")])
+    [dup] = storage.add_files("c1", [_file("a")])
+
+    assert storage.get(a["id"]) == a
+    assert dup["is_duplicate"] and dup["duplicate_of"] == a["id"]
+    assert {r["id"] for r in storage.list_files(case_id="c1")} == {a["id"], dup["id"]}
+    assert [r["id"] for r in storage.list_files(owner="alice")] == [a["id"]]
+
+    storage.mark_processed([a["id"]])
+    storage.add_tags([a["id"]], ["bank"])
+    assert [r["id"] for r in storage.list_files(case_id="c1", status="processed")] == [a["id"]]
+    assert storage.get(a["id"])["tags"] == ["bank"]
+
+    assert storage.delete_record(a["id"])["id"] == a["id"]
+    assert storage.get(a["id"]) is None
+    assert storage.delete_record(a["id"]) is None
+    assert [r["id"] for r in storage.find_all_by_hash(a["sha256"])] == [dup["id"]]
+
+
+def test_concurrent_writers_keep_every_update(tmp_path):
+    db_file = tmp_path / "evidence.db"
+    [shared] = EvidenceStorage(db_file, legacy_file=None).add_files("c1", [_file("shared")])
+    workers = [EvidenceStorage(db_file, legacy_file=None) for _ in range(4)]
+    start = threading.Barrier(len(workers))
+    errors = []
+
+    def worker(n, storage):
+        try:
+            start.wait()
+            for i in range(10):
+                storage.add_files("c1", [_file(f"w{n}-{i}")])
+                storage.add_tags([shared["id"]], [f"w{n}-{i}"])
+        except Exception as e:  # surfaced below; a thread's assert would be swallowed
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n, s)) for n, s in enumerate(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    reader = EvidenceStorage(db_file, legacy_file=None)
+    assert reader.count() == 1 + 4 * 10
+    assert len(reader.get(shared["id"])["tags"]) == 4 * 10
@@ -0,0 +1,80 @@
+"""Chunk citations of verified facts across incremental re-ingestion.
+
+A verified fact extracted from several chunks of a document is stored once
+(facts are deduped by text) and keeps the content hash of every chunk that
+cites it. Re-ingestion retires the hashes of chunks that disappeared and
+only drops a fact once none of its citing chunks is left.
+
+Pure in-memory — Neo4jClient.run_query is replaced by a stub holding one
+entity's verified_facts.
+"""
+from __future__ import annotations
+
+import json
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "ingestion" / "scripts"))
+
+from entity_resolution import merge_entity_data  # noqa: E402
+from neo4j_client import Neo4jClient  # noqa: E402
+
+
+class _StubNeo4j(Neo4jClient):
+    def __init__(self, facts):
+        self.facts = facts
+
+    def run_query(self, query, **params):
+        if "CaseGraphVersion" in query:
+            return []
+        if "RETURN e.key" in query:
+            return [{"key": "acme", "verified_facts": json.dumps(self.facts)}]
+        self.facts = json.loads(params["rows"][0]["verified_facts"])
+        return []
+
+
+def _fact(text, chunk_hash):
+    return {"text": text, "chunk_hashes": [chunk_hash]}
+
+
+def _ingest(existing, new_facts, doc="report.pdf"):
+    merged = merge_entity_data(
+        existing_entity={"verified_facts": json.dumps(existing)},
+        new_verified_facts=new_facts,
+        new_ai_insights=[],
+        doc_name=doc,
+    )
+    return merged["verified_facts"]
+
+
+def test_duplicate_fact_from_same_document_keeps_every_citing_chunk():
+    facts = _ingest([], [_fact("Acme paid $5,000", "h1")])
+    facts = _ingest(facts, [_fact("acme paid $5,000 ", "h2"), _fact("Acme is in Leeds", "h2")])
+
+    assert [f["text"] for f in facts] == ["Acme paid $5,000", "Acme is in Leeds"]
+    assert facts[0]["chunk_hashes"] == ["h1", "h2"]
+
+
+def test_fact_survives_until_its_last_citing_chunk_is_retired():
+    facts = _ingest([], [_fact("Acme paid $5,000", "h1")])
+    facts = _ingest(facts, [_fact("Acme paid $5,000", "h2")])
+    db = _StubNeo4j(facts)
+
+    assert db.retire_chunk_citations("report-pdf", "report.pdf", "c1", ["h1"]) == 0
+    assert db.facts == [{"text": "Acme paid $5,000", "chunk_hashes": ["h2"], "source_doc": "report.pdf"}]
+
+    assert db.retire_chunk_citations("report-pdf", "report.pdf", "c1", ["h2"]) == 1
+    assert db.facts == []
+
+
+def test_retirement_ignores_other_documents_and_unhashed_facts():
+    facts = [
+        {"text": "Legacy fact", "source_doc": "report.pdf"},
+        {"text": "Old stamp", "source_doc": "report.pdf", "chunk_hash": "h1"},
+        {"text": "Other doc", "source_doc": "other.pdf", "chunk_hashes": ["h1"]},
+    ]
+    db = _StubNeo4j(facts)
+
+    assert db.retire_chunk_citations("report-pdf", "report.pdf", "c1", ["h1"]) == 1
+    assert [f["text"] for f in db.facts] == ["Legacy fact", "Other doc"]
@@ -0,0 +1,132 @@
+"""The one-shot legacy JSON import shared by the SQLite and file stores.
+
+services/_legacy_import.py claims an import in the same transaction (or
+under the same lock) as the rows it writes. These tests pin its rules once
+for every store: import once and rename, never re-import a file that comes
+back, leave an unreadable file for the next start, and treat a database
+populated before claims were recorded as already imported.
+
+Runs against throwaway SQLite databases and directories under pytest's
+tmp_path.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+import threading
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services._legacy_import import import_into_directory, import_into_sqlite  # noqa: E402
+
+
+def _connect(db_file):
+    conn = sqlite3.connect(db_file, timeout=30.0, isolation_level=None)
+    conn.execute("CREATE TABLE IF NOT EXISTS items (id TEXT PRIMARY KEY)")
+    return conn
+
+
+def _write_items(conn, data):
+    conn.executemany("INSERT OR IGNORE INTO items (id) VALUES (?)", [(i,) for i in data])
+    return len(data)
+
+
+def _ids(conn):
+    return sorted(r[0] for r in conn.execute("SELECT id FROM items"))
+
+
+def test_file_put_back_after_import_is_ignored(tmp_path):
+    legacy = tmp_path / "items.json"
+    legacy.write_text(json.dumps(["a", "b"]))
+    conn = _connect(tmp_path / "store.db")
+
+    assert import_into_sqlite(conn, "items", legacy, _write_items, "Test")["records"] == 2
+    assert not legacy.exists()
+    assert (tmp_path / "items.json.migrated").exists()
+
+    conn.execute("DELETE FROM items WHERE id = 'a'")
+    (tmp_path / "items.json.migrated").rename(legacy)
+    assert import_into_sqlite(conn, "items", legacy, _write_items, "Test")["status"] == "skipped"
+    assert _ids(conn) == ["b"]
+    assert legacy.exists()
+
+
+def test_unreadable_file_is_left_for_a_retry(tmp_path):
+    legacy = tmp_path / "items.json"
+    legacy.write_text("{not json")
+    conn = _connect(tmp_path / "store.db")
+
+    assert import_into_sqlite(conn, "items", legacy, _write_items, "Test")["status"] == "failed"
+    assert legacy.exists()
+
+    legacy.write_text(json.dumps(["a"]))
+    assert import_into_sqlite(conn, "items", legacy, _write_items, "Test")["status"] == "migrated"
+    assert _ids(conn) == ["a"]
+
+
+def test_populated_database_is_claimed_without_importing(tmp_path):
+    legacy = tmp_path / "items.json"
+    legacy.write_text(json.dumps(["old"]))
+    conn = _connect(tmp_path / "store.db")
+    conn.execute("INSERT INTO items (id) VALUES ('current')")
+
+    def populated(c):
+        return c.execute("SELECT 1 FROM items LIMIT 1").fetchone() is not None
+
+    result = import_into_sqlite(conn, "items", legacy, _write_items, "Test", populated=populated)
+    assert result["reason"] == "database already populated"
+    conn.execute("DELETE FROM items")
+    assert import_into_sqlite(conn, "items", legacy, _write_items, "Test", populated=populated)["status"] == "skipped"
+    assert _ids(conn) == []
+
+    assert import_into_sqlite(conn, "items", legacy, _write_items, "Test", force=True)["records"] == 1
+    assert _ids(conn) == ["old"]
+
+
+def test_workers_starting_together_import_once(tmp_path):
+    legacy = tmp_path / "items.json"
+    legacy.write_text(json.dumps(["a", "b", "c"]))
+    db_file = tmp_path / "store.db"
+    _connect(db_file).execute("PRAGMA journal_mode=WAL")
+    barrier = threading.Barrier(4)
+    statuses, errors = [], []
+
+    def worker():
+        conn = _connect(db_file)
+        try:
+            barrier.wait()
+            statuses.append(import_into_sqlite(conn, "items", legacy, _write_items, "Test")["status"])
+        except Exception as e:  # pragma: no cover - reported below
+            errors.append(e)
+        finally:
+            conn.close()
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors
+    assert statuses.count("migrated") == 1
+
+
+def test_directory_store_keeps_its_claim_as_a_marker(tmp_path):
+    store = tmp_path / "store"
+    store.mkdir()
+    legacy = tmp_path / "items.json"
+    legacy.write_text(json.dumps({"a": 1}))
+    written = []
+
+    def write(data):
+        written.append(data)
+        return len(data)
+
+    lock = store / ".lock"
+    assert import_into_directory(store, lock, "items", legacy, write, "Test")["records"] == 1
+    (tmp_path / "items.json.migrated").rename(legacy)
+    assert import_into_directory(store, lock, "items", legacy, write, "Test")["status"] == "skipped"
+    assert written == [{"a": 1}]
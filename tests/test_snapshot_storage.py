@@ -0,0 +1,176 @@
+"""Lazily loaded sections in SnapshotStorage.
+
+A snapshot is a small snapshot.json plus one gzipped file per large section
+(subgraph, timeline, chat history, ...), and listings read only the shared
+_index.json of summaries. These tests pin which reads touch which files,
+that a reader racing a re-save still gets one consistent revision, that
+saves and deletes of one snapshot can't interleave, and how chunked
+snapshots from the old single-file store are reassembled.
+
+Runs against a throwaway storage directory in a temp dir.
+"""
+from __future__ import annotations
+
+import json
+import sys
+import threading
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services import snapshot_storage as snapshot_module  # noqa: E402
+from services.snapshot_storage import SnapshotStorage  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def storage_paths(tmp_path, monkeypatch):
+    storage_dir = tmp_path / "snapshots"
+    monkeypatch.setattr(snapshot_module, "STORAGE_DIR", storage_dir)
+    monkeypatch.setattr(snapshot_module, "INDEX_FILE", storage_dir / "_index.json")
+    monkeypatch.setattr(snapshot_module, "LOCK_FILE", storage_dir / "_index.json.lock")
+    monkeypatch.setattr(snapshot_module, "LEGACY_FILE", tmp_path / "snapshots.json")
+    monkeypatch.setattr(snapshot_module, "LEGACY_CHUNK_DIR", tmp_path / "snapshot_chunks")
+    return tmp_path
+
+
+@pytest.fixture
+def section_reads(monkeypatch):
+    """Names of the section files read, in order."""
+    reads = []
+    read = snapshot_module._read_section
+
+    def counting(path):
+        reads.append(path.name.split(".")[0])
+        return read(path)
+
+    monkeypatch.setattr(snapshot_module, "_read_section", counting)
+    return reads
+
+
+def _snapshot(snapshot_id, owner="alice", case_id="c1", nodes=2):
+    return {
+        "id": snapshot_id, "name": f"Snapshot {snapshot_id}", "owner": owner, "case_id": case_id,
+        "subgraph": {"nodes": [{"key": f"n{i}"} for i in range(nodes)], "links": []},
+        "timeline": [{"date": "2026-01-01"}],
+        "chat_history": [],
+    }
+
+
+def test_listings_and_small_reads_load_no_sections(section_reads):
+    writer = SnapshotStorage()
+    writer.save("s1", _snapshot("s1", nodes=3))
+    writer.save("s2", _snapshot("s2", owner="bob", case_id="c2"))
+    section_reads.clear()
+
+    storage = SnapshotStorage()
+    summary = storage.get_summary("s1")
+    assert (summary["node_count"], summary["timeline_count"], summary["chat_count"]) == (3, 1, 0)
+    assert [s["id"] for s in storage.list_summaries(case_id="c2")] == ["s2"]
+    small = storage.get("s1", sections=[])
+    assert small["name"] == "Snapshot s1" and "subgraph" not in small
+    assert section_reads == []
+
+    assert storage.get_section("s1", "timeline") == [{"date": "2026-01-01"}]
+    assert section_reads == ["timeline"]
+    assert storage.get("s1") == _snapshot("s1", nodes=3)
+
+
+def test_sections_live_outside_snapshot_json():
+    storage = SnapshotStorage()
+    storage.save("s1", _snapshot("s1", nodes=50))
+    directory = snapshot_module._snapshot_dir("s1")
+
+    core = json.loads((directory / snapshot_module.SNAPSHOT_FILE).read_text())
+    assert "subgraph" not in core and "timeline" not in core
+    assert set(core["_sections"]) == {"subgraph", "timeline", "chat_history"}
+
+    # A re-save points at new section files and drops the old revision's
+    storage.save("s1", {**_snapshot("s1"), "timeline": []})
+    assert storage.get_section("s1", "timeline") == []
+    assert len(list(directory.glob("timeline.*.json.gz"))) == 1
+
+
+def test_reader_racing_a_resave_retries_with_the_new_revision(monkeypatch):
+    storage = SnapshotStorage()
+    storage.save("s1", _snapshot("s1", nodes=1))
+    read = snapshot_module._read_section
+
+    def resave_first(path):
+        # The files this read was about to open are replaced under it
+        monkeypatch.setattr(snapshot_module, "_read_section", read)
+        storage.save("s1", _snapshot("s1", nodes=4))
+        return read(path)
+
+    monkeypatch.setattr(snapshot_module, "_read_section", resave_first)
+    assert len(storage.get_section("s1", "subgraph")["nodes"]) == 4
+
+
+def test_concurrent_saves_of_one_snapshot_never_mix_revisions():
+    workers = [SnapshotStorage() for _ in range(4)]
+    start = threading.Barrier(len(workers))
+    errors = []
+
+    def worker(n, storage):
+        try:
+            start.wait()
+            for _ in range(5):
+                storage.save("shared", _snapshot("shared", owner=f"w{n}", nodes=n + 1))
+                snapshot = storage.get("shared")
+                assert len(snapshot["subgraph"]["nodes"]) == int(snapshot["owner"][1:]) + 1
+        except Exception as e:  # surfaced below; a thread's assert would be swallowed
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n, s)) for n, s in enumerate(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    summary = SnapshotStorage().get_summary("shared")
+    assert summary["node_count"] == int(summary["owner"][1:]) + 1
+
+
+def test_delete_during_a_save_leaves_no_orphan():
+    saver, deleter = SnapshotStorage(), SnapshotStorage()
+    write = saver._write_snapshot
+
+    def write_then_delete(snapshot_id, data):
+        summary = write(snapshot_id, data)
+        assert deleter.delete(snapshot_id)
+        return summary
+
+    saver._write_snapshot = write_then_delete
+    saver.save("s1", _snapshot("s1"))
+    assert saver.get("s1") is None
+    assert SnapshotStorage().list_summaries() == []
+
+
+def test_chunked_legacy_snapshots_are_reassembled(storage_paths):
+    chunks = storage_paths / "snapshot_chunks"
+    chunks.mkdir()
+    parts = [
+        {"_chunk_index": 1, "_chunk_type": "timeline", "timeline": [{"date": "2026-02-01"}]},
+        {"_chunk_index": 0, "_chunk_type": "subgraph_nodes", "id": "big", "name": "Big", "owner": "alice",
+         "subgraph": {"nodes": [{"key": "a"}], "links": [{"source": "a", "target": "a"}]}},
+        {"_chunk_index": 2, "_chunk_type": "subgraph_nodes", "subgraph": {"nodes": [{"key": "b"}]}},
+    ]
+    for i, part in enumerate(parts):
+        (chunks / f"big_chunk_{i}.json").write_text(json.dumps(part))
+    (storage_paths / "snapshots.json").write_text(json.dumps({
+        "big": {"_chunked": True, "_num_chunks": 3},
+        # Response object older builds saved by mistake
+        "resp": {"id": "resp", "name": "x", "node_count": 3},
+    }))
+
+    storage = SnapshotStorage()
+    assert [s["id"] for s in storage.list_summaries()] == ["big"]
+    big = storage.get("big")
+    assert [n["key"] for n in big["subgraph"]["nodes"]] == ["a", "b"]
+    assert big["subgraph"]["links"] == [{"source": "a", "target": "a"}]
+    assert big["timeline"] == [{"date": "2026-02-01"}]
+    assert not chunks.exists()
+    assert (storage_paths / "snapshot_chunks.migrated").exists()
@@ -0,0 +1,128 @@
+"""The batched writer behind SystemLogService.
+
+log() only queues an entry; a background writer commits the queue
+SYSTEM_LOG_BATCH_SIZE entries per transaction, and reads flush whatever is
+still queued first. These tests drive those flushes directly: batch sizes,
+a failed batch kept and written ahead of newer entries, a full queue
+dropping rather than blocking the caller, whole-day retention, and the
+viewer's filters and statistics answered from the indexed columns.
+
+Runs against throwaway SQLite databases in a temp dir.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+import services.system_log_service as log_module  # noqa: E402
+from services.system_log_service import LogOrigin, LogType, SystemLogService  # noqa: E402
+
+
+def _entry(action, timestamp, **extra):
+    return {"timestamp": timestamp, "type": "system", "origin": "backend", "action": action,
+            "user": "alice", "success": True, "error": None, "details": {}, **extra}
+
+
+def _quiet(service):
+    """Keep the background writer out of the way so the test drives flushes."""
+    service._ensure_writer = lambda: None
+    return service
+
+
+def test_queued_entries_are_written_in_batches(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_module, "SYSTEM_LOG_BATCH_SIZE", 4)
+    service = _quiet(SystemLogService(tmp_path / "logs.db", legacy_file=tmp_path / "none.jsonl"))
+    transactions = []
+    write = service._write
+
+    def counting_write():
+        transactions.append(1)
+        return write()
+
+    service._write = counting_write
+    for i in range(10):
+        service.log(LogType.USER_ACTION, LogOrigin.BACKEND, f"a{i}")
+    assert transactions == []
+
+    service.flush()
+    assert len(transactions) == 3  # 4 + 4 + 2
+    assert service._pending == 0
+    assert service.get_logs(limit=100)["total"] == 10
+
+
+def test_failed_batch_is_kept_and_written_first_next_time(tmp_path):
+    service = _quiet(SystemLogService(tmp_path / "logs.db", legacy_file=tmp_path / "none.jsonl"))
+    write = service._write
+
+    def failing_write():
+        service._write = write
+        raise sqlite3.OperationalError("database is locked")
+
+    service.log(LogType.USER_ACTION, LogOrigin.BACKEND, "first")
+    service._write = failing_write
+    service.flush()
+    assert [e["action"] for e in service._retry] == ["first"]
+
+    service.log(LogType.USER_ACTION, LogOrigin.BACKEND, "second")
+    assert [e["action"] for e in service.get_logs()["logs"]] == ["second", "first"]
+    assert service._retry == []
+
+
+def test_full_queue_drops_new_entries_instead_of_blocking(tmp_path, monkeypatch):
+    monkeypatch.setattr(log_module, "SYSTEM_LOG_QUEUE_SIZE", 3)
+    service = _quiet(SystemLogService(tmp_path / "logs.db", legacy_file=tmp_path / "none.jsonl"))
+    for i in range(5):
+        service.log(LogType.USER_ACTION, LogOrigin.BACKEND, f"a{i}")
+
+    assert service._dropped == 2
+    assert [e["action"] for e in service.get_logs()["logs"]] == ["a2", "a1", "a0"]
+
+
+def test_retention_drops_whole_days_past_the_window(tmp_path):
+    legacy = tmp_path / "system_logs.jsonl"
+    now = datetime.now()
+    legacy.write_text("\n".join([
+        json.dumps(_entry("today", now.isoformat())),
+        "{truncated by a crash",
+        json.dumps(_entry("edge", (now - timedelta(days=30)).replace(hour=0, minute=0).isoformat())),
+        json.dumps(_entry("old", (now - timedelta(days=31)).replace(hour=23, minute=59).isoformat())),
+    ]) + "\n")
+
+    service = SystemLogService(tmp_path / "logs.db", legacy_file=legacy, retention_days=30)
+    assert service._apply_retention(force=True) == 1
+    assert [e["action"] for e in service.get_logs()["logs"]] == ["today", "edge"]
+    # Checked at most once per RETENTION_CHECK_SECS unless forced
+    assert service._apply_retention() == 0
+
+
+def test_viewer_filters_and_statistics(tmp_path):
+    service = SystemLogService(tmp_path / "logs.db", legacy_file=tmp_path / "none.jsonl")
+    service.log(LogType.AI_ASSISTANT, LogOrigin.FRONTEND, "Asked", details={"case_id": "c1"}, user="alice")
+    service.log(LogType.GRAPH_OPERATION, LogOrigin.BACKEND, "Merged 50% of nodes", user="bob")
+    service.log(LogType.ERROR, LogOrigin.INGESTION, "Ingest", success=False, error="boom")
+
+    # Queued entries are flushed before reading
+    result = service.get_logs()
+    assert result["total"] == 3
+    assert [e["action"] for e in result["logs"]] == ["Ingest", "Merged 50% of nodes", "Asked"]
+    assert [e["action"] for e in service.get_logs(limit=1, offset=1)["logs"]] == ["Merged 50% of nodes"]
+    assert [e["action"] for e in service.get_logs(user="alice")["logs"]] == ["Asked"]
+    assert [e["action"] for e in service.get_logs(success_only=False)["logs"]] == ["Ingest"]
+    assert [e["action"] for e in service.get_logs(search="50%")["logs"]] == ["Merged 50% of nodes"]
+    assert service.get_logs(search="5_%")["total"] == 0
+    assert service.get_logs(log_types=[LogType.AI_ASSISTANT, LogType.ERROR])["total"] == 2
+
+    stats = service.get_log_statistics()
+    assert (stats["total_logs"], stats["successful"], stats["failed"]) == (3, 2, 1)
+    assert stats["by_origin"] == {"frontend": 1, "backend": 1, "ingestion": 1}
+    assert service.get_log_statistics(case_id="c1")["total_logs"] == 1
+
+    service.clear_logs()
+    assert service.get_logs()["total"] == 0
+    assert SystemLogService(tmp_path / "logs.db", legacy_file=tmp_path / "none.jsonl").get_logs()["total"] == 0
@@ -0,0 +1,117 @@
+"""Stages recorded inside triage jobs and LLM calls.
+
+A triage job used to profile as one bar per job. The scanner now marks file
+hashing and its Neo4j batches, the processor registry marks each processor
+call and artifact write, and LLMService.call marks the request under its
+cache site. Scanner and processor work runs on pool threads, so these tests
+also check that bind() carries those stages to the job's profiler.
+
+Pure in-memory — Neo4j is a stub session, the LLM provider call is
+replaced on the instance and the response cache is switched off.
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+from services.llm_response_cache import llm_response_cache  # noqa: E402
+from services.llm_service import LLMService  # noqa: E402
+from services.pipeline_profiler import PipelineProfiler  # noqa: E402
+from services.triage.processor_registry import ProcessorRegistry  # noqa: E402
+from services.triage.scanner_service import TriageScannerService  # noqa: E402
+from services.triage_processors.base_processor import (  # noqa: E402
+    BaseTriageProcessor,
+    ProcessingResult,
+)
+
+
+class _Session:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def run(self, query, **params):
+        self.driver.queries.append(query)
+        return self.driver.rows
+
+
+class _Driver:
+    def __init__(self, rows=()):
+        self.rows = list(rows)
+        self.queries = []
+
+    def session(self):
+        return _Session(self)
+
+
+class _UpperProcessor(BaseTriageProcessor):
+    name = "upper"
+
+    def process_file(self, file_path, file_info, config):
+        return [ProcessingResult(source_path=file_path, artifact_type="text",
+                                 content=file_path.upper())]
+
+
+def _stages(profiler):
+    return {s["stage"]: s for s in profiler.summary()["stages"]}
+
+
+def test_scan_records_hashing_on_worker_threads(tmp_path):
+    for i in range(3):
+        (tmp_path / f"f{i}.txt").write_bytes(b"x" * (i + 1))
+    scanner = TriageScannerService()
+    scanner._driver = _Driver()
+
+    profiler = PipelineProfiler("triage:scan")
+    with profiler.activate():
+        result = scanner.scan("t1", str(tmp_path))
+
+    stages = _stages(profiler)
+    assert result["total_files"] == 3
+    assert stages["hash:file"]["calls"] == 3
+    assert stages["hash:file"]["bytes"] == 6
+    assert stages["neo4j:scan_batch"]["count"] == 3
+
+
+def test_processor_calls_and_artifact_writes_are_staged():
+    files = [{"original_path": f"/evidence/{i}.txt", "size": 10} for i in range(4)]
+    registry = ProcessorRegistry()
+    registry._loaded = True
+    registry._driver = _Driver(files)
+    registry.register(_UpperProcessor())
+
+    profiler = PipelineProfiler("triage:process")
+    with profiler.activate():
+        result = registry.execute_stage("t1", "s1", "upper", {}, {}, max_workers=2)
+
+    stages = _stages(profiler)
+    assert result["artifacts_created"] == 4
+    assert stages["parse:upper"]["calls"] == 4
+    assert stages["parse:upper"]["bytes"] == 40
+    assert stages["neo4j:match_files"]["count"] == 4
+    assert stages["neo4j:artifacts"]["count"] == 4
+
+
+def test_llm_call_is_staged_under_its_cache_site(monkeypatch):
+    monkeypatch.setattr(llm_response_cache, "enabled", False)
+    llm = LLMService()
+    llm.provider = "ollama"
+    llm._call_ollama = lambda prompt, *args, **kwargs: "answer"
+
+    profiler = PipelineProfiler("triage:advise")
+    with profiler.activate():
+        llm.call("question")
+        llm.call("question", cache_site="triage_advice")
+
+    stages = _stages(profiler)
+    assert stages["llm:call"]["calls"] == 1
+    assert stages["llm:triage_advice"]["calls"] == 1
+    assert stages["llm:call"]["bytes"] == len("question") + len("answer")
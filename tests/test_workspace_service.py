@@ -0,0 +1,141 @@
+"""The incremental investigation timeline in WorkspaceService.
+
+Each workspace record's timeline events are stored in workspace_timeline
+and replaced in the same transaction as the record, so the investigation
+timeline reads one case's events by index instead of rebuilding them from
+every record. These tests pin that saves, updates and deletes keep the view
+in step, that a builder change rebuilds it on open, how the view is merged
+with events from the snapshot, evidence and log stores, and that importing
+the old per-kind files never overwrites records already in the database.
+
+Runs against throwaway SQLite databases in a temp dir; the other stores
+are stubs.
+"""
+from __future__ import annotations
+
+import json
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(REPO_ROOT / "backend"))
+
+import services.evidence_storage as evidence_module  # noqa: E402
+import services.snapshot_storage as snapshot_module  # noqa: E402
+import services.system_log_service as log_module  # noqa: E402
+from services import workspace_service as workspace_module  # noqa: E402
+from services.workspace_service import WorkspaceService  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def legacy_files(tmp_path, monkeypatch):
+    """Point every legacy file at the temp dir."""
+    for kind, (path, id_field) in list(workspace_module._LEGACY_FILES.items()):
+        monkeypatch.setitem(workspace_module._LEGACY_FILES, kind, (tmp_path / path.name, id_field))
+    return tmp_path
+
+
+def _timeline_ids(service, case_id):
+    with service._read() as conn:
+        rows = conn.execute(
+            "SELECT event FROM workspace_timeline WHERE case_id = ? ORDER BY date, rank, rowid", (case_id,)
+        ).fetchall()
+    return [json.loads(row["event"])["id"] for row in rows]
+
+
+def test_saves_and_deletes_replace_only_their_own_events(tmp_path):
+    service = WorkspaceService(tmp_path / "workspace.db", import_legacy=False)
+    task_id = service.save_task("c1", {"title": "Subpoena bank", "due_date": "2026-03-01"})
+    note_id = service.save_note("c1", {"content": "Met the witness"})
+    service.save_task("c2", {"title": "Other case", "due_date": "2026-03-01"})
+    assert f"task_due_{task_id}" in _timeline_ids(service, "c1")
+
+    service.save_task("c1", {**service.get_task("c1", task_id), "due_date": "2026-04-01"})
+    with service._read() as conn:
+        dates = conn.execute(
+            "SELECT date FROM workspace_timeline WHERE case_id = 'c1' AND item_id = ? AND event LIKE '%task_due%'",
+            (task_id,),
+        ).fetchall()
+    assert [row["date"] for row in dates] == ["2026-04-01"]
+
+    assert service.delete_task("c1", task_id)
+    remaining = _timeline_ids(service, "c1")
+    assert f"note_created_{note_id}" in remaining
+    assert all(task_id not in event_id for event_id in remaining)
+    assert len(_timeline_ids(service, "c2")) == 2
+
+
+def test_attorney_only_theories_stay_off_the_timeline(tmp_path):
+    service = WorkspaceService(tmp_path / "workspace.db", import_legacy=False)
+    theory_id = service.save_theory("c1", {"title": "Fraud", "privilege_level": "ATTORNEY_ONLY"})
+    assert _timeline_ids(service, "c1") == []
+
+    service.save_theory("c1", {**service.get_theory("c1", theory_id), "privilege_level": "PUBLIC"})
+    assert _timeline_ids(service, "c1") == [f"theory_{theory_id}"]
+
+
+def test_view_is_rebuilt_when_the_builders_change(tmp_path):
+    db_file = tmp_path / "workspace.db"
+    service = WorkspaceService(db_file, import_legacy=False)
+    witness_id = service.save_witness("c1", {"name": "Ann", "interviews": [{"interview_date": "2026-02-01"}]})
+    expected = _timeline_ids(service, "c1")
+    assert len(expected) == 2
+
+    with sqlite3.connect(db_file) as conn:
+        conn.execute("DELETE FROM workspace_timeline")
+        conn.execute("PRAGMA user_version = 0")
+
+    reopened = WorkspaceService(db_file, import_legacy=False)
+    assert _timeline_ids(reopened, "c1") == expected
+    assert reopened.get_witness("c1", witness_id)["name"] == "Ann"
+
+
+class _Snapshots:
+    def list_summaries(self, case_id=None):
+        return [{"id": "s1", "name": "Start", "created_at": "2026-01-05T09:00:00"}]
+
+
+class _Evidence:
+    def list_files(self, case_id=None):
+        return [{"id": "ev1", "original_filename": "a.pdf", "created_at": "2026-01-05T09:00:00",
+                 "status": "processed", "processed_at": "2026-01-06T00:00:00"}]
+
+
+class _Logs:
+    def get_logs(self, **filters):
+        return {"logs": [{"timestamp": "2026-01-04T00:00:00", "action": "Case created",
+                          "details": {"case_id": filters["case_id"]}}]}
+
+
+def test_investigation_timeline_merges_other_stores_by_date_then_section(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module, "snapshot_storage", _Snapshots())
+    monkeypatch.setattr(evidence_module, "evidence_storage", _Evidence())
+    monkeypatch.setattr(log_module, "system_log_service", _Logs())
+    service = WorkspaceService(tmp_path / "workspace.db", import_legacy=False)
+    task_id = service.save_task("c1", {"title": "Review", "created_at": "2026-01-05T09:00:00"})
+    service.save_task("c1", {**service.get_task("c1", task_id), "created_at": "2026-01-05T09:00:00"})
+
+    timeline = service.get_investigation_timeline("c1")
+    types = [e["type"] for e in timeline]
+    assert types[0] == "system_action"
+    # Same timestamp: tasks, then snapshots, then evidence
+    assert types[1:4] == ["task_created", "snapshot_created", "evidence_uploaded"]
+    assert types[-1] == "evidence_processed"
+
+
+def test_legacy_import_keeps_records_already_in_the_database(legacy_files):
+    db_file = legacy_files / "workspace.db"
+    WorkspaceService(db_file, import_legacy=False).save_witness("c1", {"witness_id": "w1", "name": "Edited"})
+    (legacy_files / "witnesses.json").write_text(json.dumps({"c1": {
+        "w1": {"witness_id": "w1", "name": "Original", "created_at": "2026-01-01T00:00:00"},
+        "w2": {"witness_id": "w2", "name": "Ben", "created_at": "2026-01-02T00:00:00"},
+    }}))
+    (legacy_files / "case_contexts.json").write_text(json.dumps({"c1": {"client_profile": "Acme"}}))
+
+    service = WorkspaceService(db_file)
+    assert {w["witness_id"]: w["name"] for w in service.get_witnesses("c1")} == {"w1": "Edited", "w2": "Ben"}
+    assert service.get_case_context("c1") == {"client_profile": "Acme"}
+    assert "witness_w2" in _timeline_ids(service, "c1")